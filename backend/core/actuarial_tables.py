@@ -0,0 +1,108 @@
+# backend/core/actuarial_tables.py
+"""
+Precomputed actuarial factor tables
+Early-reduction and delayed-credit multipliers for every month offset from
+FRA, survivor reduction multipliers by months early, and cached COLA power
+series per inflation rate. benefit_math, BaseSSCalculator, SSDICalculator,
+WidowSSCalculator and the vectorized grids all read from these tables, so
+they agree to the last bit.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+# Claim month offsets from FRA covered by the tables (-96 = 8 years early, +48 = 4 years late)
+MIN_FRA_OFFSET_MONTHS = -96
+MAX_FRA_OFFSET_MONTHS = 48
+
+# Survivor benefits: 0.396% per month before FRA (4.75% per year), capped at 28.5%
+SURVIVOR_REDUCTION_PER_MONTH = 0.00396
+SURVIVOR_MAX_REDUCTION = 0.285
+MAX_SURVIVOR_MONTHS_EARLY = 96
+
+# Longest COLA horizon kept in the power series (years / months)
+MAX_COLA_YEARS = 110
+MAX_COLA_MONTHS = MAX_COLA_YEARS * 12
+
+
+def _early_reduction(months_from_fra: int) -> float:
+    """5/9 of 1% per month for the first 36 months early, 5/12 of 1% after."""
+    m = abs(min(0, months_from_fra))
+    first_36 = min(36, m)
+    extra = max(0, m - 36)
+    reduction = first_36 * (5/9)/100.0 + extra * (5/12)/100.0
+    return max(0.0, 1.0 - reduction)
+
+
+def _delayed_credit(months_from_fra: int) -> float:
+    """2/3 of 1% per month after FRA (simple, non-compounding)."""
+    m = max(0, months_from_fra)
+    return 1.0 + (2.0/3.0)/100.0 * m
+
+
+def _survivor_reduction(months_early: int) -> float:
+    reduction = min(max(0, months_early) * SURVIVOR_REDUCTION_PER_MONTH, SURVIVOR_MAX_REDUCTION)
+    return 1.0 - reduction
+
+
+# Indexed by (months_from_fra - MIN_FRA_OFFSET_MONTHS)
+EARLY_REDUCTION_FACTORS = tuple(
+    _early_reduction(m) for m in range(MIN_FRA_OFFSET_MONTHS, MAX_FRA_OFFSET_MONTHS + 1)
+)
+DELAYED_CREDIT_FACTORS = tuple(
+    _delayed_credit(m) for m in range(MIN_FRA_OFFSET_MONTHS, MAX_FRA_OFFSET_MONTHS + 1)
+)
+
+# Indexed by months early (0 = at or after FRA); the cap applies beyond the table
+SURVIVOR_REDUCTION_FACTORS = tuple(_survivor_reduction(m) for m in range(MAX_SURVIVOR_MONTHS_EARLY + 1))
+
+
+def early_reduction_factor(months_from_fra: int) -> float:
+    """Early filing multiplier (<= 1.0) for a claim offset from FRA (negative if early)."""
+    index = months_from_fra - MIN_FRA_OFFSET_MONTHS
+    if 0 <= index < len(EARLY_REDUCTION_FACTORS):
+        return EARLY_REDUCTION_FACTORS[index]
+    return _early_reduction(months_from_fra)
+
+
+def delayed_credit_factor(months_from_fra: int) -> float:
+    """Delayed retirement credit multiplier (>= 1.0) for a claim offset from FRA."""
+    index = months_from_fra - MIN_FRA_OFFSET_MONTHS
+    if 0 <= index < len(DELAYED_CREDIT_FACTORS):
+        return DELAYED_CREDIT_FACTORS[index]
+    return _delayed_credit(months_from_fra)
+
+
+def survivor_reduction_factor(months_early: int) -> float:
+    """Survivor early filing multiplier for months claimed before the survivor's FRA."""
+    if months_early <= 0:
+        return 1.0
+    return SURVIVOR_REDUCTION_FACTORS[min(months_early, MAX_SURVIVOR_MONTHS_EARLY)]
+
+
+@lru_cache(maxsize=64)
+def cola_powers(r: float) -> Tuple[float, ...]:
+    """(1+r)^k for k = 0..MAX_COLA_YEARS, cached per inflation rate."""
+    growth = 1.0 + r
+    return tuple(growth ** k for k in range(MAX_COLA_YEARS + 1))
+
+
+@lru_cache(maxsize=64)
+def monthly_cola_powers(r: float) -> Tuple[float, ...]:
+    """(1+r)^(k/12) for k = 0..MAX_COLA_MONTHS, cached per inflation rate."""
+    growth = 1.0 + r
+    return tuple(growth ** (k / 12) for k in range(MAX_COLA_MONTHS + 1))
+
+
+def cola_factor(r: float, years: float) -> float:
+    """(1+r)^years, read from the cached series for whole years in range."""
+    if 0 <= years <= MAX_COLA_YEARS and years == int(years):
+        return cola_powers(r)[int(years)]
+    return (1.0 + r) ** years
+
+
+def monthly_cola_factor(r: float, months: int) -> float:
+    """(1+r)^(months/12), read from the cached monthly series when in range."""
+    if 0 <= months <= MAX_COLA_MONTHS:
+        return monthly_cola_powers(r)[months]
+    return (1.0 + r) ** (months / 12)
@@ -4,17 +4,68 @@ Foundation classes for all Social Security benefit calculations
 Provides shared logic for married, divorced, and widowed calculators
 """
 
+from bisect import bisect_left
+from calendar import monthrange
+from collections import OrderedDict
 from datetime import datetime, date
-from dateutil.relativedelta import relativedelta
-from typing import Dict, List, Tuple, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional, Any, Sequence
 from enum import Enum
+import threading
+
+import numpy as np
 
 # Import benefit math helpers
 from .benefit_math import (
     monthly_benefit_at_claim,
     benefit_after_claim,
     preclaim_cola_factor,
+    cola_series_sum,
+    geometric_sum,
 )
+from .actuarial_tables import cola_factor, delayed_credit_factor, early_reduction_factor
+from .benefit_timeline import BenefitTimeline
+from .break_even import BenefitStream, Segment, analyze_break_even
+from .cola_paths import ColaBands, ColaPaths, index_years, preclaim_cola_factors, stream_bands
+from .earnings_test import CLAIM_MONTHS as EARNINGS_TEST_CLAIM_MONTHS, EarningsTestGrid, earnings_test_grid
+from .evaluation_context import EvaluationContext
+from .mortality import MAX_AGE, survival_curve
+from .switch_grid import FIRST_ONLY, FIRST_THEN_SECOND, SECOND_ONLY, SECOND_THEN_FIRST, SwitchGrid, lead_phase
+
+
+def month_ordinal(d: date) -> int:
+    """Calendar month as a single integer (year*12 + zero-based month)."""
+    return d.year * 12 + d.month - 1
+
+
+def date_from_ordinal(ordinal: int, day: int) -> date:
+    """Date in the month `ordinal`, clamping day to the month length."""
+    year, month_index = divmod(ordinal, 12)
+    return date(year, month_index + 1, min(day, monthrange(year, month_index + 1)[1]))
+
+
+def add_months(d: date, months: int) -> date:
+    """Constant-time equivalent of d + relativedelta(months=months)."""
+    return date_from_ordinal(month_ordinal(d) + months, d.day)
+
+
+def _age_label(age_months: int) -> str:
+    """'67' for whole years, '67y3m' otherwise (strategy names)."""
+    years, months = divmod(int(age_months), 12)
+    return f"{years}" if months == 0 else f"{years}y{months}m"
+
+
+def months_between(start: date, end: date) -> int:
+    """
+    Whole months from start to end (negative if end is earlier).
+    Constant-time equivalent of relativedelta(end, start) in months.
+    """
+    months = month_ordinal(end) - month_ordinal(start)
+    if months > 0 and add_months(start, months) > end:
+        months -= 1
+    elif months < 0 and add_months(start, months) < end:
+        months += 1
+    return months
 
 
 class ClientType(Enum):
@@ -68,6 +119,125 @@ class SocialSecurityConstants:
             return cls.FRA_TABLE.get(birth_year, (67, 0))
 
 
+class BenefitProfile:
+    """
+    Compiled per-person benefit data for one (birth date, PIA, as-of date).
+
+    FRA, current age and every claim month from 60y0m to 70y0m (claim date,
+    effective age, FRA offset and adjustment factor) are computed once;
+    monthly benefits and pre-claim COLA factors are tabulated per inflation
+    rate on first use, keeping the MAX_RATE_TABLES most recently used rates
+    (profiles outlive requests, and rates come straight from them). Calculators for the same person share one profile via
+    compile_profile(), so repeated scenario calls are table lookups.
+    """
+
+    EARLIEST_CLAIM_AGE_MONTHS = 60 * 12
+    LATEST_CLAIM_AGE_MONTHS = 70 * 12
+    MAX_RATE_TABLES = 8
+
+    def __init__(self, birth_date: date, pia: float, as_of: date):
+        self.birth_date = birth_date
+        self.pia = pia
+        self.as_of = as_of
+        self.fra_years, self.fra_months = SocialSecurityConstants.get_fra(birth_date.year)
+        self.fra_years_float = self.fra_years + self.fra_months / 12
+
+        self.birth_ordinal = month_ordinal(birth_date)
+        self.fra_age_in_months = self.fra_years * 12 + self.fra_months
+        self.fra_ordinal = self.birth_ordinal + self.fra_age_in_months
+        self.fra_date = date_from_ordinal(self.fra_ordinal, birth_date.day)
+
+        self.current_age_in_months = months_between(birth_date, as_of)
+        self.current_age_decimal = round((as_of - birth_date).days / 365.25, 1)
+
+        claim_months = range(self.EARLIEST_CLAIM_AGE_MONTHS, self.LATEST_CLAIM_AGE_MONTHS + 1)
+        self.claim_dates = tuple(date_from_ordinal(self.birth_ordinal + m, birth_date.day) for m in claim_months)
+        # Whole months of age on each claim date (month-end birthdays can lose a month)
+        self.claim_ages_in_months = tuple(months_between(birth_date, d) for d in self.claim_dates)
+        # Same month counting as calculate_reduction_factor / calculate_delayed_credit_factor
+        self.fra_offsets = tuple(
+            -months_between(d, self.fra_date) if d < self.fra_date else months_between(self.fra_date, d)
+            for d in self.claim_dates
+        )
+        self.adjustment_factors = tuple(
+            early_reduction_factor(offset) if offset < 0 else delayed_credit_factor(offset)
+            for offset in self.fra_offsets
+        )
+
+        self._monthly_benefits: 'OrderedDict[float, Tuple[float, ...]]' = OrderedDict()
+        self._inflated_pias: 'OrderedDict[float, Tuple[float, ...]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _index(self, claim_age_in_months: int) -> Optional[int]:
+        index = claim_age_in_months - self.EARLIEST_CLAIM_AGE_MONTHS
+        return index if 0 <= index < len(self.claim_dates) else None
+
+    def claim_date(self, claim_age_in_months: int) -> Optional[date]:
+        """Claim date for a claim age, or None outside the compiled range."""
+        index = self._index(claim_age_in_months)
+        return None if index is None else self.claim_dates[index]
+
+    def adjustment_factor(self, claiming_date: date) -> Optional[float]:
+        """Early reduction / delayed credit multiplier for a compiled claim date, else None."""
+        index = self._index(month_ordinal(claiming_date) - self.birth_ordinal)
+        if index is None or self.claim_dates[index] != claiming_date:
+            return None
+        return self.adjustment_factors[index]
+
+    def _rate_table(self, tables: 'OrderedDict[float, Tuple[float, ...]]', inflation_rate: float,
+                    build) -> Tuple[float, ...]:
+        """Per-rate table from an LRU of at most MAX_RATE_TABLES rates, built on a miss."""
+        with self._lock:
+            table = tables.get(inflation_rate)
+            if table is not None:
+                tables.move_to_end(inflation_rate)
+                return table
+        table = tuple(build())
+        with self._lock:
+            tables[inflation_rate] = table
+            while len(tables) > self.MAX_RATE_TABLES:
+                tables.popitem(last=False)
+        return table
+
+    def monthly_benefits(self, inflation_rate: float) -> Tuple[float, ...]:
+        """Initial monthly benefit for every compiled claim month at one inflation rate."""
+        current_age_years = self.current_age_in_months / 12
+        return self._rate_table(self._monthly_benefits, inflation_rate, lambda: (
+            monthly_benefit_at_claim(
+                pia_fra=self.pia,
+                claim_age_years=claim_age / 12,
+                current_age_years=current_age_years,
+                r=inflation_rate,
+                fra_years=self.fra_years_float,
+            )
+            for claim_age in self.claim_ages_in_months
+        ))
+
+    def monthly_benefit(self, claim_age_in_months: int, inflation_rate: float) -> Optional[float]:
+        """Table lookup of the initial monthly benefit, or None outside the compiled range."""
+        index = self._index(claim_age_in_months)
+        return None if index is None else self.monthly_benefits(inflation_rate)[index]
+
+    def inflated_pias(self, inflation_rate: float) -> Tuple[float, ...]:
+        """PIA with pre-claim COLAs for every compiled claim month at one inflation rate."""
+        return self._rate_table(self._inflated_pias, inflation_rate, lambda: (
+            self.pia * preclaim_cola_factor(claim_months / 12, self.current_age_decimal, inflation_rate)
+            for claim_months in range(self.EARLIEST_CLAIM_AGE_MONTHS, self.LATEST_CLAIM_AGE_MONTHS + 1)
+        ))
+
+
+# Present-value and real-dollar fields added to results when the context values them
+VALUE_KEYS = ('present_value', 'real_value')
+# calculate_optimal_strategy rank_by -> strategy field
+RANK_KEYS = {'nominal': 'lifetime_total', 'present_value': 'present_value', 'real_value': 'real_value'}
+
+
+@lru_cache(maxsize=512)
+def compile_profile(birth_date: date, pia: float, as_of: date) -> BenefitProfile:
+    """Shared BenefitProfile for a person as of a date (one per person per request)."""
+    return BenefitProfile(birth_date, pia, as_of)
+
+
 class BaseSSCalculator:
     """
     Base calculator for Social Security benefits
@@ -75,30 +245,58 @@ class BaseSSCalculator:
     (married, single, divorced, widowed)
     """
 
-    def __init__(self, birth_date: date, pia: float):
+    # Strategy 'type' per switch_grid candidate kind (calculators with an
+    # exhaustive search); None uses the first phase's label
+    SWITCH_TYPES: Dict[str, str] = {}
+
+    def __init__(self, birth_date: date, pia: float, context: Optional[EvaluationContext] = None):
         """
         Initialize base calculator for one person
 
         Args:
             birth_date: Person's date of birth
             pia: Primary Insurance Amount at Full Retirement Age
+            context: As-of date and rounding policy (resolved from today if omitted)
         """
         self.birth_date = birth_date
         self.pia = pia
         self.birth_year = birth_date.year
         self.fra_years, self.fra_months = SocialSecurityConstants.get_fra(self.birth_year)
 
+        # Dates are kept as integer month ordinals so month arithmetic is O(1)
+        self.birth_ordinal = month_ordinal(birth_date)
+        self.fra_age_in_months = self.fra_years * 12 + self.fra_months
+        self.fra_ordinal = self.birth_ordinal + self.fra_age_in_months
+
         # Calculate exact FRA date
-        self.fra_date = self.birth_date + relativedelta(years=self.fra_years, months=self.fra_months)
+        self.fra_date = self._date_at_age(self.fra_years, self.fra_months)
+
+        # "Today" is fixed once per calculator so results depend only on the inputs
+        self.context = context or EvaluationContext.resolve()
+        self.as_of = self.context.as_of
+        self._profile = compile_profile(birth_date, pia, self.as_of)
+        self.current_age_in_months = self._profile.current_age_in_months
+        self.current_age_decimal = self._profile.current_age_decimal
+
+    @property
+    def profile(self) -> BenefitProfile:
+        """Compiled benefit profile (recompiled if the PIA was changed after construction)."""
+        if self._profile.pia != self.pia:
+            self._profile = compile_profile(self.birth_date, self.pia, self.as_of)
+        return self._profile
+
+    def _date_at_age(self, age_years: int, age_months: int = 0) -> date:
+        """Date on which the person reaches the given age."""
+        return date_from_ordinal(self.birth_ordinal + age_years * 12 + age_months, self.birth_date.day)
 
     def age_in_months(self, target_date: date) -> int:
         """Calculate age in months at target date"""
-        delta = relativedelta(target_date, self.birth_date)
-        return delta.years * 12 + delta.months
+        return months_between(self.birth_date, target_date)
 
     def get_claiming_date(self, claiming_age_years: int, claiming_age_months: int = 0) -> date:
         """Get the date when benefits would start based on claiming age"""
-        return self.birth_date + relativedelta(years=claiming_age_years, months=claiming_age_months)
+        compiled = self.profile.claim_date(claiming_age_years * 12 + claiming_age_months)
+        return compiled or self._date_at_age(claiming_age_years, claiming_age_months)
 
     def _age_at_date(self, target_date: date) -> float:
         """Return age in years (one decimal) at a specific date."""
@@ -107,16 +305,14 @@ class BaseSSCalculator:
     def _months_in_period(self, start_date: date, end_date: date) -> int:
         """
         Count the number of benefit months in [start_date, end_date).
-        Benefits are issued monthly, so we advance month by month.
+        Benefits are issued monthly on start_date's day of the month.
         """
         if start_date >= end_date:
             return 0
 
-        months = 0
-        current = start_date
-        while current < end_date:
+        months = month_ordinal(end_date) - month_ordinal(start_date)
+        if end_date.day > start_date.day:
             months += 1
-            current = current + relativedelta(months=1)
         return months
 
     def _build_benefit_timeline(
@@ -125,7 +321,8 @@ class BaseSSCalculator:
         end_date: date,
         initial_monthly: float,
         inflation_rate: float,
-        phase_label: str
+        phase_label: str,
+        summary_only: bool = False
     ) -> Dict[str, Any]:
         """
         Generate year-by-year benefit timeline for a given phase.
@@ -136,14 +333,21 @@ class BaseSSCalculator:
             initial_monthly: Monthly benefit at the start of the phase.
             inflation_rate: Annual COLA assumption applied after claiming.
             phase_label: Identifier for the phase (own, survivor, ex_spouse, etc.).
+            summary_only: Compute total and final monthly in closed form without
+                building the yearly entries (no 'timeline' key in the result).
 
         Returns:
-            Dict with total for the phase, final monthly value, and yearly timeline entries.
+            Dict with total for the phase, final monthly value, and the yearly
+            BenefitTimeline.
         """
-        from .benefit_math import benefit_after_claim
+        if summary_only:
+            return self._summarize_benefit_phase(start_date, end_date, initial_monthly, inflation_rate)
 
-        timeline: List[Dict[str, Any]] = []
+        timeline = BenefitTimeline()
         total_benefits = 0.0
+        deflators = self.context.deflators(inflation_rate)
+        total_present = total_real = 0.0
+        present_value = real_value = None
 
         current_date = start_date
         years_after_claim = 0
@@ -153,30 +357,441 @@ class BaseSSCalculator:
             current_benefit = benefit_after_claim(initial_monthly, years_after_claim, inflation_rate)
             final_monthly = current_benefit
 
-            next_year_start = date(current_date.year + 1, 1, 1)
-            period_end = min(next_year_start, end_date)
+            period_end = min(date(current_date.year + 1, 1, 1), end_date)
             months_in_period = self._months_in_period(current_date, period_end)
 
             if months_in_period > 0:
                 year_benefits = current_benefit * months_in_period
                 total_benefits += year_benefits
 
-                timeline.append({
-                    'year': current_date.year,
-                    'age': self._age_at_date(current_date),
-                    'monthly_benefit': round(current_benefit, 2),
-                    'annual_total': round(year_benefits, 2),
-                    'months_paid': months_in_period,
-                    'phase': phase_label
-                })
+                if deflators:
+                    present_weight, real_weight = self._month_values(
+                        deflators, month_ordinal(current_date), months_in_period
+                    )
+                    total_present += current_benefit * present_weight
+                    total_real += current_benefit * real_weight
+                    present_value = self.context.round(current_benefit * present_weight)
+                    real_value = self.context.round(current_benefit * real_weight)
+
+                timeline.append(
+                    year=current_date.year,
+                    age=self._age_at_date(current_date),
+                    monthly_benefit=self.context.round(current_benefit),
+                    annual_total=self.context.round(year_benefits),
+                    months_paid=months_in_period,
+                    phase_label=phase_label,
+                    present_value=present_value,
+                    real_value=real_value
+                )
 
             years_after_claim += 1
             current_date = period_end
 
-        return {
+        result = {
             'timeline': timeline,
-            'total': round(total_benefits, 2),
-            'final_monthly': round(final_monthly, 2) if timeline else round(initial_monthly, 2)
+            'total': self.context.round(total_benefits),
+            'final_monthly': self.context.round(final_monthly) if timeline else self.context.round(initial_monthly)
+        }
+        if deflators:
+            result['present_value'] = self.context.round(total_present)
+            result['real_value'] = self.context.round(total_real)
+        return result
+
+    def _build_phased_timeline(
+        self,
+        phases: List[Tuple[date, date, float, str]],
+        inflation_rate: float,
+        summary_only: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run _build_benefit_timeline over consecutive phases and combine them.
+
+        Args:
+            phases: (start_date, end_date, initial_monthly, phase_label) per phase
+            inflation_rate: Annual COLA assumption applied after claiming
+            summary_only: Skip the yearly entries (no 'timeline' key in the result)
+
+        Returns:
+            Dict with the combined total, per-phase results and (optionally) the joined timeline
+        """
+        results = [
+            self._build_benefit_timeline(start, end, monthly, inflation_rate, label, summary_only)
+            for start, end, monthly, label in phases
+        ]
+        combined = {
+            'total': self.context.round(sum(result['total'] for result in results)),
+            'phases': results
+        }
+        if self.context.values_present:
+            for key in ('present_value', 'real_value'):
+                combined[key] = self.context.round(sum(result[key] for result in results))
+        if not summary_only:
+            combined['timeline'] = BenefitTimeline.concat(result['timeline'] for result in results)
+        return combined
+
+    def _timeline_builder(
+        self,
+        phases: List[Tuple[date, date, float, str]],
+        inflation_rate: float
+    ):
+        """Deferred _build_phased_timeline(...)['timeline'] for _rank_strategies."""
+        return lambda: self._build_phased_timeline(phases, inflation_rate)['timeline']
+
+    def _phase_span(self, start_date: date, end_date: date) -> Tuple[int, int]:
+        """Month ordinals [first, end) paid by one _build_benefit_timeline phase."""
+        first = month_ordinal(start_date)
+        if start_date >= end_date:
+            return first, first
+        next_year_start = date(start_date.year + 1, 1, 1)
+        if end_date <= next_year_start:
+            return first, first + self._months_in_period(start_date, end_date)
+        return first, end_date.year * 12 + self._months_in_period(date(end_date.year, 1, 1), end_date)
+
+    def _lifetime_span(self, claiming_date: date, death_date: date) -> Tuple[int, int]:
+        """Month ordinals [first, end) paid by calculate_lifetime_benefits."""
+        first = month_ordinal(claiming_date)
+        if claiming_date >= death_date:
+            return first, first
+        if claiming_date.year == death_date.year:
+            return first, first + months_between(claiming_date, death_date) + 1
+        return first, death_date.year * 12 + (0 if (death_date.month, death_date.day) == (1, 1) else death_date.month)
+
+    def _phase_stream(self, phases: List[Tuple[date, date, float, str]]) -> Tuple[Segment, ...]:
+        """Break-even segments for the phases consumed by _build_phased_timeline."""
+        return tuple((*self._phase_span(start, end), monthly) for start, end, monthly, _ in phases)
+
+    def _lifetime_stream(self, claiming_age_years: int, longevity_age: int,
+                         inflation_rate: float) -> Tuple[Segment, ...]:
+        """Break-even segments for calculate_lifetime_benefits(claiming_age_years, longevity_age)."""
+        claiming_date = self.get_claiming_date(claiming_age_years)
+        span = self._lifetime_span(claiming_date, self._date_at_age(longevity_age))
+        return ((*span, self.calculate_monthly_benefit(claiming_age_years, 0, inflation_rate)),)
+
+    def _break_even_analysis(self, strategies: List[Dict], inflation_rate: float) -> Dict[str, Any]:
+        """
+        Crossover matrix and dominance intervals for ranked strategies.
+        Pops the private '_stream' segments each candidate carries.
+        """
+        streams = [BenefitStream(strategy['strategy'], strategy.pop('_stream')) for strategy in strategies]
+        return analyze_break_even(streams, inflation_rate, self.birth_ordinal).to_dict()
+
+    def _survival_curve(self, sex: str, mortality_multiplier: float = 1.0):
+        """Survival curve conditioned on the current (as-of) age."""
+        return survival_curve(sex, self.current_age_in_months, mortality_multiplier)
+
+    def _valuation(self, longevity_age: int, sex: Optional[str] = None,
+                   mortality_multiplier: float = 1.0, rank_by: str = 'nominal') -> Dict[str, Any]:
+        """
+        'valuation' block: fixed longevity age or survival-weighted expected
+        value, plus the present-value basis and ranking measure when values are on.
+        """
+        if sex is None:
+            valuation = {'mode': 'fixed', 'longevity_age': longevity_age}
+        else:
+            curve = self._survival_curve(sex, mortality_multiplier)
+            valuation = {
+                'mode': 'expected',
+                'sex': sex,
+                'mortality_multiplier': mortality_multiplier,
+                'life_expectancy_age': round(self.current_age_in_months / 12 + curve.life_expectancy(), 2),
+                'horizon_age': MAX_AGE
+            }
+        if self.context.values_present:
+            valuation.update({
+                'discount_rate': self.context.discount_rate,
+                'cpi_rate': self.context.cpi_rate,
+                'ranked_by': rank_by
+            })
+        return valuation
+
+    def _apply_expected_values(self, strategies: List[Dict], inflation_rate: float,
+                               sex: str, mortality_multiplier: float = 1.0) -> None:
+        """
+        Replace each candidate's lifetime_total with its survival-weighted
+        expected total, in one pass over every strategy's '_stream' segments.
+        """
+        expected = self._expected_values(
+            [strategy['_stream'] for strategy in strategies], inflation_rate, sex, mortality_multiplier
+        )
+        for key, values in expected.items():
+            for strategy, value in zip(strategies, values):
+                strategy[key] = value
+
+    def _value_weights(self, inflation_rate: float) -> Dict[str, np.ndarray]:
+        """
+        Present-value discount and real-dollar deflator for every month of age
+        (empty when the context only values nominal amounts).
+        """
+        deflators = self.context.deflators(inflation_rate)
+        if deflators is None:
+            return {}
+        discount, deflator = deflators
+        months = self.birth_ordinal + np.arange((MAX_AGE + 1) * 12)
+        return {
+            'present_value': discount ** (months - month_ordinal(self.as_of)),
+            'real_value': deflator ** (months // 12 - self.as_of.year)
+        }
+
+    def _expected_values(self, streams: List, inflation_rate: float, sex: str,
+                         mortality_multiplier: float = 1.0) -> Dict[str, List[float]]:
+        """
+        Rounded survival-weighted totals per stream: 'lifetime_total' and,
+        when values are on, 'present_value' and 'real_value'.
+        """
+        curve = self._survival_curve(sex, mortality_multiplier)
+        weights = {'lifetime_total': None, **self._value_weights(inflation_rate)}
+        return {
+            key: [
+                self.context.round(float(value))
+                for value in curve.expected_values(streams, inflation_rate, self.birth_ordinal, month_weights=month_weights)
+            ]
+            for key, month_weights in weights.items()
+        }
+
+    @staticmethod
+    def _strategy_values(summary: Dict) -> Dict[str, float]:
+        """A strategy's present_value / real_value from a phase or lifetime summary (empty when values are off)."""
+        return {
+            key: summary[name]
+            for key in VALUE_KEYS
+            for name in (key, f'total_{key}')
+            if name in summary
+        }
+
+    def _rank_key(self, rank_by: str) -> str:
+        """Strategy field ranked on: 'nominal', 'present_value' or 'real_value'."""
+        if rank_by not in RANK_KEYS:
+            raise ValueError(f"Unknown ranking measure: {rank_by}")
+        if rank_by != 'nominal' and not self.context.values_present:
+            raise ValueError(f"Ranking by {rank_by} requires a discount rate")
+        return RANK_KEYS[rank_by]
+
+    @staticmethod
+    def _rank_strategies(strategies: List[Dict], top_n: Optional[int] = None,
+                         key: str = 'lifetime_total') -> List[Dict]:
+        """
+        Sort candidate strategies by `key` (lifetime_total unless ranking on
+        present or real value; highest first), keep the top_n, and materialize
+        'benefit_timeline' only for the ones kept.
+
+        Candidates are ranked on closed-form totals and carry a private
+        '_timeline' callable that builds their yearly timeline on demand.
+        """
+        ranked = sorted(strategies, key=lambda x: x[key], reverse=True)
+        if top_n is not None:
+            ranked = ranked[:top_n]
+        for strategy in ranked:
+            strategy['benefit_timeline'] = strategy.pop('_timeline')()
+        return ranked
+
+    def _switch_weights(self, inflation_rate: float, rank_key: str = 'lifetime_total',
+                        sex: Optional[str] = None, mortality_multiplier: float = 1.0) -> Optional[np.ndarray]:
+        """
+        Weight per month of age a switch grid ranks on: survival probability
+        in expected mode times the present-value or real-dollar weights (None
+        for nominal totals at a fixed longevity age).
+        """
+        weights = None if sex is None else self._survival_curve(sex, mortality_multiplier).alive
+        if rank_key != 'lifetime_total':
+            values = self._value_weights(inflation_rate)[rank_key]
+            weights = values if weights is None else weights * values
+        return weights
+
+    def _switch_strategies(self, grid: SwitchGrid, top_n: Optional[int], longevity_age: int,
+                           inflation_rate: float) -> List[Dict]:
+        """
+        Strategy dicts for the best candidates of a switch grid, built from the
+        same phases (and closed-form totals) as the hand-picked candidates.
+        Types come from SWITCH_TYPES and names from _switch_strategy_name.
+
+        Args:
+            grid: Evaluated switch grid
+            top_n: Number of candidates to materialize (all if None)
+            longevity_age: Age at death (end of the last phase)
+            inflation_rate: Annual COLA assumption
+        """
+        death_date = self._date_at_age(longevity_age)
+        legs = {
+            FIRST_ONLY: (grid.first,),
+            SECOND_ONLY: (grid.second,),
+            FIRST_THEN_SECOND: (grid.first, grid.second),
+            SECOND_THEN_FIRST: (grid.second, grid.first),
+        }
+        strategies = []
+        for kind, start, switch, _ in grid.candidates(top_n):
+            picks = list(zip(legs[kind], (start, switch)))
+            ends = [axis.dates[index] for axis, index in picks[1:]] + [death_date]
+            phases = [
+                (axis.dates[index], end, float(axis.monthly[index]), axis.phase_label(index))
+                for (axis, index), end in zip(picks, ends)
+            ]
+            ages = [int(axis.age_months[index]) for axis, index in picks]
+            lead = lead_phase(grid.lead, phases[0][0])
+            paid_phases = phases if lead is None else [lead] + phases
+            summary = self._build_phased_timeline(paid_phases, inflation_rate, summary_only=True)
+
+            strategy = {
+                'strategy': self._switch_strategy_name(kind, phases, ages),
+                'claiming_age': ages[0] // 12,
+                'claiming_age_months': ages[0] % 12,
+                'type': self.SWITCH_TYPES[kind] or phases[0][3],
+                'initial_monthly': self.context.round(phases[0][2]),
+            }
+            if len(phases) == 2:
+                strategy.update({
+                    'switch_age': ages[1] // 12,
+                    'switch_age_months': ages[1] % 12,
+                    'switched_monthly': self.context.round(phases[1][2]),
+                })
+            if lead is not None:
+                strategy[f'{lead[3]}_monthly'] = self.context.round(lead[2])
+            strategy.update({
+                'lifetime_total': summary['total'],
+                **self._strategy_values(summary),
+                '_timeline': self._timeline_builder(paid_phases, inflation_rate),
+                '_stream': self._phase_stream(paid_phases)
+            })
+            strategies.append(strategy)
+        return strategies
+
+    def _switch_strategy_name(self, kind: str, phases: List[Tuple[date, date, float, str]],
+                              ages: List[int]) -> str:
+        """'Own benefit only at 62y3m' or 'Survivor at 60, switch to own at 70'."""
+        label = phases[0][3].capitalize()
+        if len(phases) == 1:
+            return f"{label} benefit only at {_age_label(ages[0])}"
+        return f"{label} at {_age_label(ages[0])}, switch to {phases[1][3]} at {_age_label(ages[1])}"
+
+    def _summarize_benefit_phase(
+        self,
+        start_date: date,
+        end_date: date,
+        initial_monthly: float,
+        inflation_rate: float
+    ) -> Dict[str, Any]:
+        """
+        Closed-form totals for one phase of _build_benefit_timeline.
+        The claim year is paid at the initial amount, each later calendar year
+        gets one more COLA, so the total is a geometric series.
+        """
+        if start_date >= end_date:
+            return {
+                'total': 0.0,
+                'final_monthly': self.context.round(initial_monthly),
+                **self._run_values(month_ordinal(start_date), 0, 0, 0, 0.0, inflation_rate)
+            }
+
+        next_year_start = date(start_date.year + 1, 1, 1)
+        first_months = self._months_in_period(start_date, min(next_year_start, end_date))
+        if end_date <= next_year_start:
+            return {
+                'total': self.context.round(initial_monthly * first_months),
+                'final_monthly': self.context.round(initial_monthly),
+                **self._run_values(month_ordinal(start_date), first_months, 0, 0, initial_monthly, inflation_rate)
+            }
+
+        full_years = end_date.year - start_date.year - 1
+        last_months = self._months_in_period(date(end_date.year, 1, 1), end_date)
+        last_year_factor = cola_factor(inflation_rate, full_years + 1)
+
+        weighted_months = (
+            first_months
+            + 12 * cola_series_sum(full_years, inflation_rate)
+            + last_months * last_year_factor
+        )
+        final_years_after_claim = full_years + 1 if last_months > 0 else full_years
+
+        return {
+            'total': self.context.round(initial_monthly * weighted_months),
+            'final_monthly': self.context.round(benefit_after_claim(initial_monthly, final_years_after_claim, inflation_rate)),
+            **self._run_values(
+                month_ordinal(start_date), first_months, full_years, last_months, initial_monthly, inflation_rate
+            )
+        }
+
+    def _summarize_lifetime(
+        self,
+        claiming_date: date,
+        death_date: date,
+        monthly_benefit: float,
+        inflation_rate: float
+    ) -> Tuple[float, float, Dict[str, float]]:
+        """
+        Closed-form (total, final monthly, present/real values) for
+        calculate_lifetime_benefits. Same month counting as the yearly loop:
+        the death month is paid, and a death on January 1st ends benefits with
+        the previous December.
+        """
+        first_ordinal = month_ordinal(claiming_date)
+        if claiming_date >= death_date:
+            return 0.0, monthly_benefit, self._run_values(first_ordinal, 0, 0, 0, 0.0, inflation_rate)
+
+        if claiming_date.year == death_date.year:
+            months = months_between(claiming_date, death_date) + 1
+            return (
+                monthly_benefit * months,
+                monthly_benefit,
+                self._run_values(first_ordinal, months, 0, 0, monthly_benefit, inflation_rate)
+            )
+
+        first_months = 12 - claiming_date.month + 1
+        full_years = death_date.year - claiming_date.year - 1
+        last_months = 0 if (death_date.month, death_date.day) == (1, 1) else death_date.month
+
+        weighted_months = (
+            first_months
+            + 12 * cola_series_sum(full_years, inflation_rate)
+            + last_months * cola_factor(inflation_rate, full_years + 1)
+        )
+        final_years_after_claim = full_years + 1 if last_months > 0 else full_years
+
+        return (
+            monthly_benefit * weighted_months,
+            benefit_after_claim(monthly_benefit, final_years_after_claim, inflation_rate),
+            self._run_values(first_ordinal, first_months, full_years, last_months, monthly_benefit, inflation_rate)
+        )
+
+    def _month_values(self, deflators: Tuple[float, float], first_ordinal: int, months: int) -> Tuple[float, float]:
+        """
+        Present value (as of the as-of month) and real dollars of 1 paid for
+        `months` months from first_ordinal, all within one calendar year.
+        """
+        discount, deflator = deflators
+        offset = first_ordinal - month_ordinal(self.as_of)
+        return (
+            discount ** offset * geometric_sum(discount, months),
+            months * deflator ** (first_ordinal // 12 - self.as_of.year)
+        )
+
+    def _run_values(self, first_ordinal: int, first_months: int, full_years: int, last_months: int,
+                    monthly: float, inflation_rate: float) -> Dict[str, float]:
+        """
+        Closed-form present_value / real_value of a COLA-adjusted run of
+        payments (empty when the context only values nominal amounts): the
+        first year's months from first_ordinal, full_years whole calendar
+        years, then last_months, one COLA higher each January. Every year is
+        the previous one times a constant, so each sum is a geometric series.
+        """
+        deflators = self.context.deflators(inflation_rate)
+        if deflators is None:
+            return {}
+        discount, deflator = deflators
+        growth = 1.0 + inflation_rate
+        january = (first_ordinal // 12 + 1) * 12
+
+        first = self._month_values(deflators, first_ordinal, first_months)
+        full_year = self._month_values(deflators, january, 12)
+        last = self._month_values(deflators, january + 12 * full_years, last_months)
+        last_growth = growth ** (full_years + 1)
+        ratios = (growth * discount ** 12, growth * deflator)
+
+        present, real = (
+            first[k] + growth * full_year[k] * geometric_sum(ratios[k], full_years) + last_growth * last[k]
+            for k in (0, 1)
+        )
+        return {
+            'present_value': self.context.round(monthly * present),
+            'real_value': self.context.round(monthly * real)
         }
 
     def _calculate_inflated_pia(self, claiming_age_years: int, inflation_rate: float) -> float:
@@ -185,13 +800,17 @@ class BaseSSCalculator:
         Delegates to benefit_math.preclaim_cola_factor to ensure correct handling
         of the age 60-61 COLA freeze.
         """
-        # Calculate current age for the freeze window logic
-        current_age = self._age_at_date(date.today())
-        
+        claim_months = claiming_age_years * 12
+        if claim_months == int(claim_months):
+            index = self.profile._index(int(claim_months))
+            if index is not None:
+                return self.profile.inflated_pias(inflation_rate)[index]
+
         # Calculate factor using the shared math module
+        # (current age as of the evaluation date drives the freeze window)
         cola_factor = preclaim_cola_factor(
             claim_age_years=float(claiming_age_years),
-            current_age_years=current_age,
+            current_age_years=self.current_age_decimal,
             r=inflation_rate
         )
         
@@ -205,21 +824,15 @@ class BaseSSCalculator:
         if claiming_date >= self.fra_date:
             return 1.0  # No reduction at or after FRA
 
-        # Calculate months early
-        months_early = relativedelta(self.fra_date, claiming_date).months + \
-                      relativedelta(self.fra_date, claiming_date).years * 12
+        factor = self.profile.adjustment_factor(claiming_date)
+        if factor is not None:
+            return factor
 
-        # Apply reduction formula
-        if months_early <= 36:
-            # First 36 months: 5/9 of 1% per month
-            reduction = months_early * SocialSecurityConstants.EARLY_REDUCTION_RATE_36_MONTHS
-        else:
-            # First 36 months at 5/9 rate, additional months at 5/12 rate
-            reduction_36 = 36 * SocialSecurityConstants.EARLY_REDUCTION_RATE_36_MONTHS
-            reduction_additional = (months_early - 36) * SocialSecurityConstants.EARLY_REDUCTION_RATE_ADDITIONAL
-            reduction = reduction_36 + reduction_additional
+        # Calculate months early
+        months_early = months_between(claiming_date, self.fra_date)
 
-        return 1.0 - reduction
+        # 5/9 of 1% for the first 36 months, 5/12 of 1% after (precomputed table)
+        return early_reduction_factor(-months_early)
 
     def calculate_delayed_credit_factor(self, claiming_date: date) -> float:
         """
@@ -229,16 +842,18 @@ class BaseSSCalculator:
         if claiming_date <= self.fra_date:
             return 1.0  # No credits before FRA
 
+        factor = self.profile.adjustment_factor(claiming_date)
+        if factor is not None:
+            return factor
+
         # Calculate months delayed (max at age 70)
-        age_70_date = self.birth_date + relativedelta(years=70)
+        age_70_date = self._date_at_age(70)
         effective_claiming_date = min(claiming_date, age_70_date)
 
-        months_delayed = relativedelta(effective_claiming_date, self.fra_date).months + \
-                        relativedelta(effective_claiming_date, self.fra_date).years * 12
+        months_delayed = months_between(self.fra_date, effective_claiming_date)
 
-        # Apply delayed credit formula
-        credit = months_delayed * SocialSecurityConstants.DELAYED_CREDIT_RATE
-        return 1.0 + credit
+        # 2/3 of 1% per month (precomputed table)
+        return delayed_credit_factor(months_delayed)
 
     def calculate_monthly_benefit(self, claiming_age_years: int, claiming_age_months: int = 0, inflation_rate: float = 0.0) -> float:
         """
@@ -252,11 +867,14 @@ class BaseSSCalculator:
         Returns:
             Monthly benefit amount
         """
+        compiled = self.profile.monthly_benefit(claiming_age_years * 12 + claiming_age_months, inflation_rate)
+        if compiled is not None:
+            return compiled
+
         claiming_date = self.get_claiming_date(claiming_age_years, claiming_age_months)
         claim_age_in_months = self.age_in_months(claiming_date)
         claim_age_years = claim_age_in_months / 12
-        current_age_in_months = self.age_in_months(date.today())
-        current_age_years = current_age_in_months / 12
+        current_age_years = self.current_age_in_months / 12
         fra_years_float = self.fra_years + self.fra_months / 12
 
         monthly_benefit = monthly_benefit_at_claim(
@@ -270,66 +888,395 @@ class BaseSSCalculator:
         return monthly_benefit
 
     def calculate_lifetime_benefits(self, claiming_age_years: int, longevity_age: int,
-                                  inflation_rate: float = 0.025, claiming_age_months: int = 0) -> Dict:
+                                  inflation_rate: float = 0.025, claiming_age_months: int = 0,
+                                  summary_only: bool = False, sex: Optional[str] = None,
+                                  mortality_multiplier: float = 1.0,
+                                  projected_earnings: Optional[Dict[int, float]] = None) -> Dict:
         """
         Calculate total lifetime benefits with inflation adjustments
 
         Args:
             claiming_age_years: Age when claiming benefits
-            longevity_age: Age at death
+            longevity_age: Age at death (ignored in expected-value mode)
             inflation_rate: Annual inflation rate (for pre- and post-claiming)
             claiming_age_months: Additional months when claiming
+            summary_only: Compute totals in closed form and omit 'annual_breakdown'
+            sex: 'male' or 'female' for expected-value mode: every benefit month
+                is weighted by the probability of being alive, the timeline runs
+                to the life table's last age, and 'valuation' describes the basis
+            mortality_multiplier: Scale applied to the life table's q(x)
+            projected_earnings: Annual earnings by year while claiming; benefits
+                before FRA are then withheld under the retirement earnings test
+                and 'earnings_test' reports the withholding
 
         Returns:
-            Dictionary with total benefits and annual breakdown
+            Dictionary with total benefits and annual breakdown (BenefitTimeline)
         """
+        if projected_earnings:
+            return self._earnings_tested_lifetime(
+                claiming_age_years * 12 + claiming_age_months, longevity_age, inflation_rate,
+                projected_earnings, summary_only, sex, mortality_multiplier
+            )
+        if sex is not None:
+            result = self.calculate_lifetime_benefits(
+                claiming_age_years, MAX_AGE, inflation_rate, claiming_age_months, summary_only
+            )
+            span = self._lifetime_span(result['claiming_date'], result['death_date'])
+            monthly_benefit = self.calculate_monthly_benefit(claiming_age_years, claiming_age_months, inflation_rate)
+            expected = self._expected_values([[(*span, monthly_benefit)]], inflation_rate, sex, mortality_multiplier)
+            result['total_lifetime_benefits'] = expected['lifetime_total'][0]
+            for key in ('present_value', 'real_value'):
+                if key in expected:
+                    result[f'total_{key}'] = expected[key][0]
+            result['valuation'] = self._valuation(MAX_AGE, sex, mortality_multiplier)
+            return result
+
         # Pass inflation to get the correct initial benefit, including pre-filing COLA
         monthly_benefit = self.calculate_monthly_benefit(claiming_age_years, claiming_age_months, inflation_rate)
         claiming_date = self.get_claiming_date(claiming_age_years, claiming_age_months)
-        death_date = self.birth_date + relativedelta(years=longevity_age)
+        death_date = self._date_at_age(longevity_age)
+
+        if summary_only:
+            total_benefits, final_monthly_benefit, values = self._summarize_lifetime(
+                claiming_date, death_date, monthly_benefit, inflation_rate
+            )
+            return {
+                'total_lifetime_benefits': self.context.round(total_benefits),
+                'initial_monthly_benefit': self.context.round(monthly_benefit),
+                'final_monthly_benefit': self.context.round(final_monthly_benefit),
+                'claiming_date': claiming_date,
+                'death_date': death_date,
+                'years_of_benefits': longevity_age - claiming_age_years,
+                **{f'total_{key}': value for key, value in values.items()}
+            }
 
         total_benefits = 0
-        annual_benefits = []
+        annual_benefits = BenefitTimeline()
 
         current_date = claiming_date
         years_after_claim = 0
         current_benefit = monthly_benefit
         final_monthly_benefit = monthly_benefit
+        deflators = self.context.deflators(inflation_rate)
+        total_present = total_real = 0.0
+        present_value = real_value = None
 
         while current_date < death_date:
             current_benefit = benefit_after_claim(monthly_benefit, years_after_claim, inflation_rate)
-            # Calculate benefits for this year
-            year_end = min(
-                date(current_date.year + 1, 1, 1) - relativedelta(days=1),
-                death_date
-            )
-
-            months_in_year = relativedelta(year_end, current_date).months + 1
-            if current_date.year != year_end.year:
+            # Calculate benefits for this year (the death month is paid)
+            if current_date.year == death_date.year:
+                months_in_year = months_between(current_date, death_date) + 1
+            else:
                 months_in_year = 12 - current_date.month + 1
 
             year_benefits = current_benefit * months_in_year
             total_benefits += year_benefits
 
-            annual_benefits.append({
-                'year': current_date.year,
-                'monthly_benefit': round(current_benefit, 2),
-                'months_paid': months_in_year,
-                'annual_total': round(year_benefits, 2),
-                'phase': 'own',
-                'age': self._age_at_date(current_date)
-            })
+            if deflators:
+                present_weight, real_weight = self._month_values(
+                    deflators, month_ordinal(current_date), months_in_year
+                )
+                total_present += current_benefit * present_weight
+                total_real += current_benefit * real_weight
+                present_value = self.context.round(current_benefit * present_weight)
+                real_value = self.context.round(current_benefit * real_weight)
+
+            annual_benefits.append(
+                year=current_date.year,
+                age=self._age_at_date(current_date),
+                monthly_benefit=self.context.round(current_benefit),
+                annual_total=self.context.round(year_benefits),
+                months_paid=months_in_year,
+                phase_label='own',
+                present_value=present_value,
+                real_value=real_value
+            )
 
             final_monthly_benefit = current_benefit
             years_after_claim += 1
             current_date = date(current_date.year + 1, 1, 1)
 
-        return {
-            'total_lifetime_benefits': round(total_benefits, 2),
-            'initial_monthly_benefit': round(monthly_benefit, 2),
-            'final_monthly_benefit': round(final_monthly_benefit, 2),
+        result = {
+            'total_lifetime_benefits': self.context.round(total_benefits),
+            'initial_monthly_benefit': self.context.round(monthly_benefit),
+            'final_monthly_benefit': self.context.round(final_monthly_benefit),
             'annual_breakdown': annual_benefits,
             'claiming_date': claiming_date,
             'death_date': death_date,
             'years_of_benefits': longevity_age - claiming_age_years
         }
+        if deflators:
+            result['total_present_value'] = self.context.round(total_present)
+            result['total_real_value'] = self.context.round(total_real)
+        return result
+
+    def calculate_cola_bands(self, claiming_age_years: int, longevity_age: int, cola_paths: ColaPaths,
+                             claiming_age_months: int = 0) -> ColaBands:
+        """
+        Own benefits per calendar year under every COLA path at once.
+
+        Pre-claim COLAs (today to 60, then each full year from 62 to the claim
+        age) and post-claim January COLAs both come from each path, so a
+        constant path matches calculate_lifetime_benefits at that rate.
+
+        Args:
+            claiming_age_years: Age when claiming benefits
+            longevity_age: Age at death
+            cola_paths: Annual COLA paths by calendar year
+            claiming_age_months: Additional months when claiming
+
+        Returns:
+            ColaBands with per-path annual benefits
+        """
+        claiming_date = self.get_claiming_date(claiming_age_years, claiming_age_months)
+        span = self._lifetime_span(claiming_date, self._date_at_age(longevity_age))
+        segments = ((*span, self.calculate_monthly_benefit(claiming_age_years, claiming_age_months, 0.0)),)
+
+        # Fractional calendar years at which the pre-claim COLA windows start
+        claim_age_years = self.age_in_months(claiming_date) / 12
+        current_age_years = self.current_age_in_months / 12
+        as_of_year = (self.birth_ordinal + self.current_age_in_months) / 12
+        age_62_year = (self.birth_ordinal + 62 * 12) / 12
+        pre60_end = as_of_year + max(0.0, 60.0 - current_age_years)
+        index = cola_paths.index(*index_years(segments, as_of_year, pre60_end, age_62_year, age_62_year + 8))
+        scale = preclaim_cola_factors(index, as_of_year, age_62_year, claim_age_years, current_age_years)
+        return stream_bands(segments, cola_paths, scale, index)
+
+    def calculate_waiting_curve(self, start_age_years: int, start_age_months: int, longevity_age: int,
+                                inflation_rate: float = 0.025) -> List[Dict]:
+        """
+        Value of waiting for every claim month from the start age through 70y0m.
+
+        Each month is derived from the previous one: monthly benefits come from
+        the compiled profile, and the lifetime COLA weight steps by one month
+        (W(c+1) = W(c) - 1 within a year, (W(c) - 1) / (1+r) across January).
+
+        Args:
+            start_age_years: Age (years) of the first claim month on the curve
+            start_age_months: Additional months of the first claim month
+            longevity_age: Age at death
+            inflation_rate: Annual inflation rate (for pre- and post-claiming)
+
+        Returns:
+            One dict per claim month with the monthly benefit, lifetime total,
+            marginal monthly and lifetime value of waiting one more month, and
+            the age at which claiming that month breaks even with the start month
+        """
+        profile = self.profile
+        start = start_age_years * 12 + start_age_months
+        end = profile.LATEST_CLAIM_AGE_MONTHS
+        if start > end:
+            return []
+        if start < profile.EARLIEST_CLAIM_AGE_MONTHS:
+            raise ValueError(f"Claim age {start_age_years}y{start_age_months}m is before the compiled range")
+
+        growth = 1.0 + inflation_rate
+        death_date = self._date_at_age(longevity_age)
+        death_ordinal = month_ordinal(death_date)
+        # First unpaid month (a January 1st death ends benefits with December)
+        paid_end = death_ordinal + (0 if (death_date.month, death_date.day) == (1, 1) else 1)
+
+        claim_dates = [profile.claim_date(m) for m in range(start, end + 1)]
+        claim_ordinals = [month_ordinal(d) for d in claim_dates]
+        benefits = [profile.monthly_benefit(m, inflation_rate) for m in range(start, end + 1)]
+
+        # Lifetime COLA weight per claim month, stepped incrementally
+        weights = []
+        for i, claim_date in enumerate(claim_dates):
+            if claim_date >= death_date:
+                weights.append(0.0)
+            elif i == 0 or claim_date.year == death_date.year:
+                weights.append(self._summarize_lifetime(claim_date, death_date, 1.0, inflation_rate)[0])
+            elif claim_date.month == 1:
+                weights.append((weights[-1] - 1.0) / growth)
+            else:
+                weights.append(weights[-1] - 1.0)
+        lifetimes = [benefit * weight for benefit, weight in zip(benefits, weights)]
+
+        # Cumulative calendar-year COLA weights from the first claim month, for break-even search
+        base_ordinal = claim_ordinals[0]
+        cumulative = [0.0]
+        for ordinal in range(base_ordinal, max(base_ordinal, paid_end)):
+            cumulative.append(cumulative[-1] + growth ** (ordinal // 12 - base_ordinal // 12))
+        base_rate = benefits[0]
+
+        curve = []
+        for i, claim_age in enumerate(range(start, end + 1)):
+            has_next = i + 1 < len(benefits)
+            # Benefits deflated to the first claim year so both streams share one weight scale
+            rate = benefits[i] * growth ** -(claim_ordinals[i] // 12 - base_ordinal // 12)
+            offset = claim_ordinals[i] - base_ordinal
+
+            break_even_age = None
+            if rate > base_rate and offset < len(cumulative):
+                target = rate * cumulative[offset] / (rate - base_rate)
+                month_index = bisect_left(cumulative, target)
+                if month_index < len(cumulative):
+                    break_even_age = (base_ordinal + month_index - 1 - self.birth_ordinal) / 12
+
+            curve.append({
+                'claim_age_years': claim_age // 12,
+                'claim_age_months': claim_age % 12,
+                'claiming_date': claim_dates[i],
+                'monthly_benefit': self.context.round(benefits[i]),
+                'lifetime_benefits': self.context.round(lifetimes[i]),
+                'marginal_monthly_increase': self.context.round(benefits[i + 1] - benefits[i]) if has_next else 0.0,
+                'marginal_lifetime_value': self.context.round(lifetimes[i + 1] - lifetimes[i]) if has_next else 0.0,
+                'break_even_age': round(break_even_age, 2) if break_even_age is not None else None
+            })
+        return curve
+
+    def calculate_earnings_test(self, projected_earnings: Dict[int, float], longevity_age: int = 90,
+                                inflation_rate: float = 0.025, earnings_scales: Sequence[float] = (1.0,),
+                                sex: Optional[str] = None, mortality_multiplier: float = 1.0) -> EarningsTestGrid:
+        """
+        Own benefits claimed at every month from 62y0m to 70y0m while working,
+        at every projected earnings level, under the retirement earnings test.
+
+        Args:
+            projected_earnings: Annual earnings by calendar year (e.g. the
+                projected rows of the SSAXMLProcessor spreadsheet)
+            longevity_age: Age at death (ignored in expected-value mode)
+            inflation_rate: Annual inflation rate (COLAs and exempt amount growth)
+            earnings_scales: Earnings levels as multiples of the projection
+            sex: 'male' or 'female' for survival-weighted totals
+            mortality_multiplier: Scale applied to the life table's q(x)
+
+        Returns:
+            EarningsTestGrid (rows: claim months, columns: earnings levels)
+        """
+        return self._earnings_test(
+            EARNINGS_TEST_CLAIM_MONTHS, projected_earnings, earnings_scales, longevity_age,
+            inflation_rate, sex, mortality_multiplier
+        )
+
+    def _claim_payments(self, claim_age_months: np.ndarray, longevity_age: int,
+                        inflation_rate: float) -> Tuple[int, np.ndarray]:
+        """
+        (first month ordinal, [claims, months] nominal payments) of
+        calculate_lifetime_benefits for each claim month.
+        """
+        death_date = self._date_at_age(longevity_age)
+        claims = [(int(m) // 12, int(m) % 12) for m in claim_age_months]
+        spans = np.asarray([self._lifetime_span(self.get_claiming_date(*claim), death_date) for claim in claims])
+        monthly = np.asarray([self.calculate_monthly_benefit(*claim, inflation_rate) for claim in claims])
+        first = int(spans[:, 0].min())
+        months = np.arange(first, max(first, int(spans[:, 1].max())))
+        paid = (months[None, :] >= spans[:, :1]) & (months[None, :] < spans[:, 1:])
+        growth = (1.0 + inflation_rate) ** (months[None, :] // 12 - spans[:, :1] // 12)
+        return first, np.where(paid, monthly[:, None] * growth, 0.0)
+
+    def _month_weights(self, first_ordinal: int, months: int, inflation_rate: float,
+                       sex: Optional[str] = None, mortality_multiplier: float = 1.0) -> Dict[str, np.ndarray]:
+        """
+        Per-month weights from first_ordinal: 'lifetime_total' (survival
+        probability with sex, else 1) and the present / real value factors.
+        """
+        ages = first_ordinal + np.arange(months) - self.birth_ordinal
+
+        def at_age(values: np.ndarray) -> np.ndarray:
+            # Months past the end of the life table count nothing
+            return np.where(ages < values.size, values[np.clip(ages, 0, values.size - 1)], 0.0)
+
+        survival = np.ones(months)
+        if sex is not None:
+            survival = at_age(self._survival_curve(sex, mortality_multiplier).alive)
+        weights = {'lifetime_total': survival}
+        weights.update({key: survival * at_age(values) for key, values in self._value_weights(inflation_rate).items()})
+        return weights
+
+    def _earnings_test(self, claim_age_months: np.ndarray, projected_earnings: Dict[int, float],
+                       earnings_scales: Sequence[float], longevity_age: int, inflation_rate: float,
+                       sex: Optional[str] = None, mortality_multiplier: float = 1.0) -> EarningsTestGrid:
+        """Earnings test grid over the given claim months and multiples of the projection."""
+        if not projected_earnings:
+            raise ValueError("Projected earnings are required for the earnings test")
+        if sex is not None:
+            longevity_age = MAX_AGE
+        first_year = min(projected_earnings)
+        projection = np.asarray([
+            projected_earnings.get(year, 0.0) for year in range(first_year, max(projected_earnings) + 1)
+        ])
+        first, payments = self._claim_payments(claim_age_months, longevity_age, inflation_rate)
+        months_early = [
+            max(0, self.fra_age_in_months - self.age_in_months(self.get_claiming_date(int(m) // 12, int(m) % 12)))
+            for m in claim_age_months
+        ]
+        return earnings_test_grid(
+            payments, first, self.fra_ordinal, np.asarray(months_early), claim_age_months,
+            np.outer(earnings_scales, projection), first_year,
+            self._month_weights(first, payments.shape[1], inflation_rate, sex, mortality_multiplier),
+            inflation_rate
+        )
+
+    def _earnings_tested_lifetime(self, claim_age_months: int, longevity_age: int, inflation_rate: float,
+                                  projected_earnings: Dict[int, float], summary_only: bool,
+                                  sex: Optional[str] = None, mortality_multiplier: float = 1.0) -> Dict:
+        """
+        calculate_lifetime_benefits with the earnings test applied: benefits
+        withheld before FRA and the recomputed benefit from FRA on.
+        """
+        if sex is not None:
+            longevity_age = MAX_AGE
+        claim = np.asarray([claim_age_months])
+        grid = self._earnings_test(claim, projected_earnings, (1.0,), longevity_age, inflation_rate)
+        first, payments = self._claim_payments(claim, longevity_age, inflation_rate)
+        months = first + np.arange(payments.shape[1])
+        paid = payments[0] * np.where(months >= self.fra_ordinal, grid.adjustment[0, 0], 1.0)
+        paid_months = np.nonzero(paid)[0]
+        claiming_date = self.get_claiming_date(claim_age_months // 12, claim_age_months % 12)
+        withheld = {int(year): float(amount) for year, amount in zip(grid.years, grid.withheld[0, 0])}
+
+        result = {
+            'total_lifetime_benefits': self.context.round(float(grid.totals['lifetime_total'][0, 0])),
+            'initial_monthly_benefit': self.context.round(float(paid[paid_months[0]]) if paid_months.size else 0.0),
+            'final_monthly_benefit': self.context.round(float(paid[paid_months[-1]]) if paid_months.size else 0.0),
+            'claiming_date': claiming_date,
+            'death_date': self._date_at_age(longevity_age),
+            'years_of_benefits': longevity_age - claim_age_months // 12,
+            **{f'total_{key}': self.context.round(float(grid.totals[key][0, 0])) for key in VALUE_KEYS
+               if key in grid.totals},
+            'earnings_test': {
+                'withheld_by_year': {year: self.context.round(amount) for year, amount in withheld.items() if amount},
+                'total_withheld': self.context.round(float(grid.withheld[0, 0].sum())),
+                'withheld_months': int(grid.withheld_months[0, 0].sum()),
+                'recomputed_adjustment': round(float(grid.adjustment[0, 0]), 6)
+            }
+        }
+
+        if not summary_only:
+            weights = self._month_weights(first, payments.shape[1], inflation_rate)
+            timeline = BenefitTimeline()
+            for year in np.unique(months[paid_months] // 12):
+                in_year = paid_months[months[paid_months] // 12 == year]
+                column = int(np.searchsorted(grid.years, year))
+                tested = column < grid.years.size and grid.years[column] == year
+                values = {
+                    key: self.context.round(float(
+                        (paid[in_year] * weights[key][in_year]).sum()
+                        - (grid.withheld_values[key][0, 0, column] if tested else 0.0)
+                    ))
+                    for key in VALUE_KEYS if key in weights
+                }
+                start = claiming_date if year == claiming_date.year else date(int(year), 1, 1)
+                timeline.append(
+                    year=int(year),
+                    age=self._age_at_date(start),
+                    monthly_benefit=self.context.round(float(paid[in_year[0]])),
+                    annual_total=self.context.round(float(paid[in_year].sum()) - withheld.get(int(year), 0.0)),
+                    months_paid=int(in_year.size - (grid.withheld_months[0, 0, column] if tested else 0)),
+                    phase_label='own',
+                    **values
+                )
+            result['annual_breakdown'] = timeline
+
+        if sex is not None:
+            expected = self._earnings_test(
+                claim, projected_earnings, (1.0,), longevity_age, inflation_rate, sex, mortality_multiplier
+            )
+            result['total_lifetime_benefits'] = self.context.round(float(expected.totals['lifetime_total'][0, 0]))
+            for key in VALUE_KEYS:
+                if key in expected.totals:
+                    result[f'total_{key}'] = self.context.round(float(expected.totals[key][0, 0]))
+            result['valuation'] = self._valuation(MAX_AGE, sex, mortality_multiplier)
+        return result
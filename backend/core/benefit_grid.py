@@ -0,0 +1,238 @@
+# backend/core/benefit_grid.py
+"""
+Vectorized companion to benefit_math.py
+Same formulas as the scalar helpers, but every argument may be a NumPy array,
+so one call can evaluate the whole 62y0m-70y0m claiming curve for several
+longevity ages and inflation rates at once.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from . import actuarial_tables
+from .actuarial_tables import MIN_FRA_OFFSET_MONTHS
+from .base_ss_calculator import compile_profile
+from .benefit_math import DEFAULT_FRA_YEARS
+
+# Every claim month from 62y0m to 70y0m (inclusive) -> 97 points
+EARLIEST_CLAIM_AGE_MONTHS = 62 * 12
+LATEST_CLAIM_AGE_MONTHS = 70 * 12
+CLAIM_AGE_MONTHS = np.arange(EARLIEST_CLAIM_AGE_MONTHS, LATEST_CLAIM_AGE_MONTHS + 1)
+
+
+def months_from_fra(claim_age_years, fra_years: float = DEFAULT_FRA_YEARS) -> np.ndarray:
+    """Months from FRA to the claim age (positive if delayed, negative if early)."""
+    return np.rint((np.asarray(claim_age_years, dtype=float) - fra_years) * 12).astype(int)
+
+
+_EARLY_REDUCTION_TABLE = np.asarray(actuarial_tables.EARLY_REDUCTION_FACTORS)
+_DELAYED_CREDIT_TABLE = np.asarray(actuarial_tables.DELAYED_CREDIT_FACTORS)
+
+
+def _fra_offset_lookup(table: np.ndarray, offsets, scalar_factor) -> np.ndarray:
+    """Gather factors from a precomputed FRA-offset table; offsets outside it use the scalar rule."""
+    offsets = np.asarray(offsets, dtype=int)
+    index = offsets - MIN_FRA_OFFSET_MONTHS
+    in_table = (index >= 0) & (index < table.size)
+    factors = table[np.clip(index, 0, table.size - 1)]
+    if in_table.all():
+        return factors
+    return np.where(in_table, factors, np.vectorize(scalar_factor, otypes=[float])(offsets))
+
+
+def drc_factor(months_after_fra) -> np.ndarray:
+    """Delayed Retirement Credits: 2/3 of 1% per month (simple, non-compounding)."""
+    m = np.maximum(0, np.asarray(months_after_fra))
+    return _fra_offset_lookup(_DELAYED_CREDIT_TABLE, m, actuarial_tables.delayed_credit_factor)
+
+
+def early_reduction_factor(months_before_fra) -> np.ndarray:
+    """
+    SSA early filing reduction (5/9 of 1% for the first 36 months, 5/12 of 1% after).
+    months_before_fra is negative; returns the multiplier (<= 1.0).
+    """
+    m = np.minimum(0, np.asarray(months_before_fra))
+    return _fra_offset_lookup(_EARLY_REDUCTION_TABLE, m, actuarial_tables.early_reduction_factor)
+
+
+def preclaim_cola_factor(claim_age_years, current_age_years, r) -> np.ndarray:
+    """
+    Pre-claim COLA accumulation with the 60-61 freeze (see benefit_math.preclaim_cola_factor).
+    """
+    claim = np.asarray(claim_age_years, dtype=float)
+    growth = 1.0 + np.asarray(r, dtype=float)
+    pre60_years = np.maximum(0.0, np.minimum(60.0, claim) - current_age_years)
+    cola_years_from_62 = np.maximum(0, np.floor(claim) - 62)
+    return growth ** pre60_years * growth ** cola_years_from_62
+
+
+def pia_at_claim_base(pia_fra: float, claim_age_years, current_age_years, r) -> np.ndarray:
+    """Inflate the FRA PIA by pre-claim COLAs (before early/late adjustment)."""
+    return pia_fra * preclaim_cola_factor(claim_age_years, current_age_years, r)
+
+
+def monthly_benefit_at_claim(
+    pia_fra: float,
+    claim_age_years,
+    current_age_years,
+    r,
+    fra_years: float = DEFAULT_FRA_YEARS,
+) -> np.ndarray:
+    """
+    Full claim calculation at the claim age, broadcast over claim ages and rates.
+    """
+    base = pia_at_claim_base(pia_fra, claim_age_years, current_age_years, r)
+    m_from_fra = months_from_fra(claim_age_years, fra_years)
+    return np.where(
+        m_from_fra >= 0,
+        base * drc_factor(m_from_fra),
+        base * early_reduction_factor(m_from_fra),
+    )
+
+
+def benefit_after_claim(base_monthly_at_claim, years_after_claim, r) -> np.ndarray:
+    """Post-claim COLAs: apply r once per year after claiming (simple annual model)."""
+    growth = 1.0 + np.asarray(r, dtype=float)
+    return np.asarray(base_monthly_at_claim) * growth ** np.maximum(0, np.asarray(years_after_claim))
+
+
+def cola_weighted_months(claim_ordinal, death_ordinal, r, pays_death_month=True) -> np.ndarray:
+    """
+    Number of benefit months between claim and death, each weighted by the
+    post-claim COLA factor of its calendar year.
+
+    Mirrors the annual model of BaseSSCalculator.calculate_lifetime_benefits:
+    the claim year is paid at (1+r)^0 and every following January adds one
+    COLA. The death month itself is paid unless pays_death_month is False
+    (the scalar loop stops before a death falling on January 1st).
+    Multiply by the initial monthly benefit to get the lifetime total.
+    """
+    claim_ordinal = np.asarray(claim_ordinal)
+    death_ordinal = np.asarray(death_ordinal)
+    growth = 1.0 + np.asarray(r, dtype=float)
+    death_month_paid = np.asarray(pays_death_month, dtype=int)
+
+    years = death_ordinal // 12 - claim_ordinal // 12
+    same_year = years == 0
+    first_months = np.where(same_year, death_ordinal - claim_ordinal + death_month_paid, 12 - claim_ordinal % 12)
+    last_months = np.where(same_year, 0, death_ordinal % 12 + death_month_paid)
+
+    # Full calendar years strictly between claim year and death year: sum of g^1..g^(K-1)
+    middle_years = np.maximum(0, years - 1)
+    middle = np.where(
+        growth == 1.0,
+        middle_years.astype(float),
+        growth * (growth ** middle_years - 1.0) / np.where(growth == 1.0, 1.0, growth - 1.0),
+    )
+
+    weighted = first_months + 12 * middle + last_months * growth ** years
+    return np.where(claim_ordinal < death_ordinal, weighted, 0.0)
+
+
+@dataclass
+class ClaimingGrid:
+    """
+    Dense result of claiming_grid().
+
+    monthly_benefit is indexed [claim, inflation]; lifetime_total is indexed
+    [claim, longevity, inflation].
+    """
+    claim_age_months: np.ndarray
+    longevity_ages: np.ndarray
+    inflation_rates: np.ndarray
+    monthly_benefit: np.ndarray
+    lifetime_total: np.ndarray
+
+    def claim_index(self, claiming_age_years: int, claiming_age_months: int = 0) -> int:
+        """Row of the claim axis for a claiming age."""
+        target = claiming_age_years * 12 + claiming_age_months
+        matches = np.nonzero(self.claim_age_months == target)[0]
+        if matches.size == 0:
+            raise ValueError(f"Claiming age {claiming_age_years}y{claiming_age_months}m is not on the grid")
+        return int(matches[0])
+
+    def lifetime_at(self, claiming_age_years: int, longevity_age: int, inflation_rate: float,
+                    claiming_age_months: int = 0) -> float:
+        """Lifetime total for a single grid cell."""
+        i = self.claim_index(claiming_age_years, claiming_age_months)
+        j = int(np.nonzero(self.longevity_ages == longevity_age)[0][0])
+        k = int(np.nonzero(np.isclose(self.inflation_rates, inflation_rate))[0][0])
+        return float(self.lifetime_total[i, j, k])
+
+    def optimal_claim_age_months(self) -> np.ndarray:
+        """Best claim age (in months) for each (longevity, inflation) pair."""
+        return self.claim_age_months[np.argmax(self.lifetime_total, axis=0)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready representation (amounts rounded to cents)."""
+        return {
+            'claim_age_months': self.claim_age_months.tolist(),
+            'longevity_ages': self.longevity_ages.tolist(),
+            'inflation_rates': self.inflation_rates.tolist(),
+            'monthly_benefit': np.round(self.monthly_benefit, 2).tolist(),
+            'lifetime_total': np.round(self.lifetime_total, 2).tolist(),
+            'optimal_claim_age_months': self.optimal_claim_age_months().tolist(),
+        }
+
+
+def claiming_grid(
+    birth_date: date,
+    pia: float,
+    longevity_ages: Iterable[int],
+    inflation_rates: Iterable[float],
+    claim_age_months: Optional[Iterable[int]] = None,
+    as_of: Optional[date] = None,
+) -> ClaimingGrid:
+    """
+    Evaluate every claim month x longevity age x inflation rate in one pass.
+
+    Args:
+        birth_date: Person's date of birth
+        pia: Primary Insurance Amount at Full Retirement Age
+        longevity_ages: Ages at death to evaluate
+        inflation_rates: Annual COLA assumptions to evaluate
+        claim_age_months: Claim ages in months (defaults to 62y0m-70y0m)
+        as_of: Date used for the current age (defaults to today)
+
+    Returns:
+        ClaimingGrid with monthly benefits and lifetime totals
+    """
+    if as_of is None:
+        as_of = date.today()
+
+    claims = np.asarray(CLAIM_AGE_MONTHS if claim_age_months is None else list(claim_age_months), dtype=int)
+    longevity = np.asarray(list(longevity_ages), dtype=int)
+    rates = np.asarray(list(inflation_rates), dtype=float)
+
+    # Shared with every calculator for this person and as-of date
+    profile = compile_profile(birth_date, pia, as_of)
+    fra_years_float = profile.fra_years_float
+    current_age_years = profile.current_age_in_months / 12
+
+    monthly = monthly_benefit_at_claim(
+        pia_fra=pia,
+        claim_age_years=(claims / 12)[:, None],
+        current_age_years=current_age_years,
+        r=rates[None, :],
+        fra_years=fra_years_float,
+    )
+
+    birth_ordinal = profile.birth_ordinal
+    weights = cola_weighted_months(
+        claim_ordinal=(birth_ordinal + claims)[:, None, None],
+        death_ordinal=(birth_ordinal + longevity * 12)[None, :, None],
+        r=rates[None, None, :],
+        pays_death_month=not (birth_date.month == 1 and birth_date.day == 1),
+    )
+    lifetime = monthly[:, None, :] * weights
+
+    return ClaimingGrid(
+        claim_age_months=claims,
+        longevity_ages=longevity,
+        inflation_rates=rates,
+        monthly_benefit=monthly,
+        lifetime_total=lifetime,
+    )
@@ -1,6 +1,9 @@
 # backend/core/benefit_math.py
 from math import floor
 
+from . import actuarial_tables
+from .actuarial_tables import cola_factor
+
 # Default FRA used if you don’t already compute FRA per birth year in callers.
 # If your calculator passes a precise FRA, this constant won’t be used.
 DEFAULT_FRA_YEARS = 67
@@ -14,8 +17,7 @@ def drc_factor(months_after_fra: int) -> float:
     Delayed Retirement Credits (SSA): 2/3 of 1% per month (simple, non-compounding).
     e.g., 36 months late -> 1 + (2/3% * 36) = 1.24
     """
-    m = max(0, months_after_fra)
-    return 1.0 + (2.0/3.0)/100.0 * m
+    return actuarial_tables.delayed_credit_factor(max(0, months_after_fra))
 
 def early_reduction_factor(months_before_fra: int) -> float:
     """
@@ -25,11 +27,7 @@ def early_reduction_factor(months_before_fra: int) -> float:
     months_before_fra is negative (e.g., -60 if 5 years early).
     Returns the multiplier (<= 1.0).
     """
-    m = abs(min(0, months_before_fra))
-    first_36 = min(36, m)
-    extra = max(0, m - 36)
-    reduction = first_36 * (5/9)/100.0 + extra * (5/12)/100.0
-    return max(0.0, 1.0 - reduction)
+    return actuarial_tables.early_reduction_factor(min(0, months_before_fra))
 
 def preclaim_cola_factor(claim_age_years: float, current_age_years: float, r: float) -> float:
     """
@@ -41,7 +39,7 @@ def preclaim_cola_factor(claim_age_years: float, current_age_years: float, r: fl
     """
     pre60_years = max(0.0, min(60.0, claim_age_years) - current_age_years)
     cola_years_from_62 = max(0, floor(claim_age_years) - 62)
-    return (1.0 + r) ** pre60_years * (1.0 + r) ** cola_years_from_62
+    return cola_factor(r, pre60_years) * cola_factor(r, cola_years_from_62)
 
 def pia_at_claim_base(pia_fra: float, claim_age_years: float, current_age_years: float, r: float) -> float:
     """
@@ -71,4 +69,24 @@ def benefit_after_claim(base_monthly_at_claim: float, years_after_claim: int, r:
     """
     Post-claim COLAs: apply r once per year after claiming (simple annual model).
     """
-    return base_monthly_at_claim * ((1.0 + r) ** max(0, years_after_claim))
\ No newline at end of file
+    return base_monthly_at_claim * cola_factor(r, max(0, years_after_claim))
+
+def cola_series_sum(years: int, r: float) -> float:
+    """
+    Closed form of sum((1 + r) ** k for k in 1..years): the COLA weight of the
+    full benefit years that follow the claim year in the annual model.
+    """
+    if years <= 0:
+        return 0.0
+    if r == 0:
+        return float(years)
+    growth = 1.0 + r
+    return growth * (growth ** years - 1.0) / r
+
+def geometric_sum(q: float, n: int) -> float:
+    """1 + q + ... + q^(n-1) (zero for n <= 0)."""
+    if n <= 0:
+        return 0.0
+    if q == 1.0:
+        return float(n)
+    return (1.0 - q ** n) / (1.0 - q)
@@ -0,0 +1,132 @@
+"""
+Columnar Benefit Timeline
+Compact year-by-year benefit timeline stored as parallel typed arrays
+instead of a list of dicts with repeated string keys
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Phase code table: the 'phase' column stores an index into this tuple
+PHASE_LABELS = ('own', 'survivor', 'ex_spouse', 'child_in_care')
+PHASE_CODES = {label: code for code, label in enumerate(PHASE_LABELS)}
+
+COLUMNS = ('year', 'age', 'monthly_benefit', 'annual_total', 'months_paid', 'phase')
+# Present as-of-date value and real (CPI-deflated) dollars of annual_total, when requested
+VALUE_COLUMNS = ('present_value', 'real_value')
+
+
+class BenefitTimeline:
+    """
+    Year-by-year benefit timeline in column-oriented form.
+
+    Iterating (or indexing) yields the legacy record dicts, so code that
+    walked the old list-of-dicts timelines keeps working; to_columns() is the
+    compact JSON form for chart endpoints. The present_value / real_value
+    columns are filled only when the calculation values amounts (see
+    EvaluationContext.discount_rate) and appear in the output only then.
+    """
+
+    __slots__ = COLUMNS + VALUE_COLUMNS
+
+    def __init__(self):
+        self.year = array('i')
+        self.age = array('d')
+        self.monthly_benefit = array('d')
+        self.annual_total = array('d')
+        self.months_paid = array('b')
+        self.phase = array('b')
+        self.present_value = array('d')
+        self.real_value = array('d')
+
+    def append(
+        self,
+        year: int,
+        age: float,
+        monthly_benefit: float,
+        annual_total: float,
+        months_paid: int,
+        phase_label: str,
+        present_value: Optional[float] = None,
+        real_value: Optional[float] = None
+    ) -> None:
+        """Add one calendar year of benefits (with its present and real value if valued)."""
+        if phase_label not in PHASE_CODES:
+            raise ValueError(f"Unknown timeline phase: {phase_label}")
+        self.year.append(year)
+        self.age.append(age)
+        self.monthly_benefit.append(monthly_benefit)
+        self.annual_total.append(annual_total)
+        self.months_paid.append(months_paid)
+        self.phase.append(PHASE_CODES[phase_label])
+        if present_value is not None:
+            self.present_value.append(present_value)
+            self.real_value.append(real_value)
+
+    def extend(self, other: 'BenefitTimeline') -> None:
+        """Append all rows of another timeline in place."""
+        for column in self.__slots__:
+            getattr(self, column).extend(getattr(other, column))
+
+    @classmethod
+    def concat(cls, timelines: Iterable['BenefitTimeline']) -> 'BenefitTimeline':
+        """Join consecutive phases (e.g. survivor then own) into one timeline."""
+        combined = cls()
+        for timeline in timelines:
+            combined.extend(timeline)
+        return combined
+
+    def __add__(self, other: 'BenefitTimeline') -> 'BenefitTimeline':
+        return BenefitTimeline.concat((self, other))
+
+    def __len__(self) -> int:
+        return len(self.year)
+
+    @property
+    def valued(self) -> bool:
+        """Whether every row carries present and real values."""
+        return len(self.present_value) == len(self.year) > 0
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        record = {
+            'year': self.year[index],
+            'age': self.age[index],
+            'monthly_benefit': self.monthly_benefit[index],
+            'annual_total': self.annual_total[index],
+            'months_paid': self.months_paid[index],
+            'phase': PHASE_LABELS[self.phase[index]]
+        }
+        if self.valued:
+            record['present_value'] = self.present_value[index]
+            record['real_value'] = self.real_value[index]
+        return record
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Legacy list-of-dicts representation."""
+        return list(self)
+
+    def to_columns(self) -> Dict[str, Any]:
+        """Column-oriented JSON representation with the phase code table."""
+        names = COLUMNS + VALUE_COLUMNS if self.valued else COLUMNS
+        columns = {column: getattr(self, column).tolist() for column in names}
+        columns['phase_labels'] = list(PHASE_LABELS)
+        return columns
+
+
+def serialize_timelines(value: Any, timeline_format: str = 'records') -> Any:
+    """
+    Recursively replace BenefitTimeline objects inside a result structure with
+    their JSON form ('records' for the legacy list of dicts, 'columns' for the
+    compact column-oriented form).
+    """
+    if isinstance(value, BenefitTimeline):
+        return value.to_columns() if timeline_format == 'columns' else value.to_records()
+    if isinstance(value, dict):
+        return {key: serialize_timelines(item, timeline_format) for key, item in value.items()}
+    if isinstance(value, list):
+        return [serialize_timelines(item, timeline_format) for item in value]
+    return value
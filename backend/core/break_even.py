@@ -0,0 +1,253 @@
+# backend/core/break_even.py
+"""
+Analytic break-even engine
+Pairwise break-even ages, the full crossover matrix and each strategy's
+dominance intervals for any set of candidate benefit streams.
+
+A stream is a list of segments (first month, end month, monthly amount in the
+first month). Under a shared COLA every payment is a per-segment constant
+times one growth index G(month), so a cumulative total is a constant times a
+difference of W(t) = sum of G(m) for m < t, which has a closed form in both
+COLA cadences. Between consecutive segment boundaries the cumulative
+difference of two streams is linear in W, so each crossing is found by
+inverting W once - the cost scales with the number of segment boundaries,
+not with the number of months or years simulated.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# COLA cadences: 'annual' raises benefits every January (lifetime and phased
+# timelines); 'monthly' compounds (1+r)^(1/12) per month (SSDI comparison).
+ANNUAL_COLA = 'annual'
+MONTHLY_COLA = 'monthly'
+
+# (first month, end month exclusive, nominal monthly amount in the first month)
+Segment = Tuple[int, int, float]
+
+# Relative tolerance for treating two cumulative totals as equal
+_TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class BenefitStream:
+    """A named candidate strategy as month segments (month ordinals or ages in months)."""
+    name: str
+    segments: Tuple[Segment, ...]
+
+
+class GrowthIndex:
+    """
+    G(m) = (1+r)^(years since origin year) for the annual cadence,
+    (1+r)^(months since origin / 12) for the monthly cadence, and its
+    continuous cumulative W(t) = sum of G(m) for origin <= m < t.
+    """
+
+    def __init__(self, origin: int, inflation_rate: float, cadence: str):
+        if cadence not in (ANNUAL_COLA, MONTHLY_COLA):
+            raise ValueError(f"Unknown COLA cadence: {cadence}")
+        self.cadence = cadence
+        # Annual steps happen in January, so anchor W at the origin's calendar year
+        self.origin = origin - origin % 12 if cadence == ANNUAL_COLA else origin
+        self.growth = 1.0 + inflation_rate if cadence == ANNUAL_COLA else (1.0 + inflation_rate) ** (1 / 12)
+
+    def level(self, month) -> np.ndarray:
+        """G at the given month(s)."""
+        steps = np.asarray(month) - self.origin
+        if self.cadence == ANNUAL_COLA:
+            steps = steps // 12
+        return self.growth ** steps
+
+    def _geometric(self, n) -> np.ndarray:
+        """1 + g + ... + g^(n-1) for real n >= 0."""
+        if self.growth == 1.0:
+            return np.asarray(n, dtype=float)
+        return (self.growth ** np.asarray(n, dtype=float) - 1.0) / (self.growth - 1.0)
+
+    def weight(self, t) -> np.ndarray:
+        """W(t): COLA-weighted month count from the origin to t (linear within a COLA step)."""
+        elapsed = np.asarray(t, dtype=float) - self.origin
+        if self.cadence == MONTHLY_COLA:
+            return self._geometric(elapsed)
+        years = np.floor(elapsed / 12)
+        return 12 * self._geometric(years) + (elapsed - 12 * years) * self.growth ** years
+
+    def inverse(self, w: float) -> float:
+        """The (real-valued) t with W(t) = w."""
+        g = self.growth
+        if self.cadence == MONTHLY_COLA:
+            elapsed = w if g == 1.0 else math.log1p(w * (g - 1.0)) / math.log(g)
+            return self.origin + elapsed
+
+        years = int(w // 12) if g == 1.0 else int(math.floor(math.log1p(w * (g - 1.0) / 12) / math.log(g)))
+        # Guard against rounding at a year boundary
+        while years > 0 and 12 * float(self._geometric(years)) > w:
+            years -= 1
+        while 12 * float(self._geometric(years + 1)) <= w:
+            years += 1
+        return self.origin + 12 * years + (w - 12 * float(self._geometric(years))) / g ** years
+
+
+@dataclass
+class BreakEvenAnalysis:
+    """
+    Break-even structure of a set of streams.
+
+    Months are in the streams' own coordinates; ages are (month - age_origin) / 12.
+    A break-even month is the payment month after which the catching-up
+    stream's cumulative total first reaches the other's, having trailed it.
+
+    Attributes:
+        names: Stream names, in input order (matrix row/column order)
+        age_origin: Month coordinate of age 0 (birth month ordinal, or 0 for ages in months)
+        totals: Final cumulative total of each stream
+        crossings: (catching-up index, overtaken index, payment month), in month order
+        leaders: (first month, end month or None, indices with the highest cumulative total)
+    """
+    names: List[str]
+    age_origin: int
+    totals: np.ndarray
+    crossings: List[Tuple[int, int, int]]
+    leaders: List[Tuple[int, Optional[int], Tuple[int, ...]]]
+
+    def age_at(self, month: int) -> float:
+        """Age (years, unrounded) at a month coordinate."""
+        years, months = divmod(month - self.age_origin, 12)
+        return years + months / 12.0
+
+    def break_even_month(self, i: int, j: int) -> Optional[int]:
+        """First month in which stream i catches up with stream j, or None."""
+        for leader, trailer, month in self.crossings:
+            if leader == i and trailer == j:
+                return month
+        return None
+
+    def break_even_age(self, i: int, j: int) -> Optional[float]:
+        month = self.break_even_month(i, j)
+        return None if month is None else self.age_at(month)
+
+    def crossover_matrix(self) -> List[List[Optional[float]]]:
+        """matrix[i][j]: age at which strategy i first breaks even with strategy j (None if never)."""
+        size = len(self.names)
+        matrix: List[List[Optional[float]]] = [[None] * size for _ in range(size)]
+        for leader, trailer, month in reversed(self.crossings):
+            matrix[leader][trailer] = round(self.age_at(month), 2)
+        return matrix
+
+    def dominance_intervals(self) -> Dict[str, List[Dict[str, Optional[float]]]]:
+        """Per strategy, the age ranges in which its cumulative total is (jointly) the highest."""
+        intervals: Dict[str, List[Dict[str, Optional[float]]]] = {name: [] for name in self.names}
+        for start, end, indices in self.leaders:
+            for index in indices:
+                runs = intervals[self.names[index]]
+                from_age = round(self.age_at(start), 2)
+                to_age = None if end is None else round(self.age_at(end), 2)
+                if runs and runs[-1]['to_age'] == from_age:
+                    runs[-1]['to_age'] = to_age
+                else:
+                    runs.append({'from_age': from_age, 'to_age': to_age})
+        return intervals
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON form attached to calculator responses."""
+        return {
+            'strategies': list(self.names),
+            'crossover_matrix': self.crossover_matrix(),
+            'crossings': [
+                {
+                    'strategy': self.names[leader],
+                    'overtakes': self.names[trailer],
+                    'age': round(self.age_at(month), 2)
+                }
+                for leader, trailer, month in self.crossings
+            ],
+            'dominance': self.dominance_intervals()
+        }
+
+
+def analyze_break_even(
+    streams: Sequence[BenefitStream],
+    inflation_rate: float,
+    age_origin: int,
+    cadence: str = ANNUAL_COLA
+) -> BreakEvenAnalysis:
+    """
+    Analytic break-even analysis over a set of benefit streams.
+
+    Args:
+        streams: Candidate strategies (segments may be empty or overlap)
+        inflation_rate: Annual COLA applied to every stream
+        age_origin: Month coordinate of age 0, used to report ages
+        cadence: ANNUAL_COLA (January steps, month ordinals) or MONTHLY_COLA
+
+    Returns:
+        BreakEvenAnalysis with totals, every crossing and the leader over time
+    """
+    names = [stream.name for stream in streams]
+    segments = [
+        [(start, end, amount) for start, end, amount in stream.segments if end > start]
+        for stream in streams
+    ]
+    bounds = sorted({month for stream in segments for start, end, _ in stream for month in (start, end)})
+    if len(bounds) < 2:
+        return BreakEvenAnalysis(names, age_origin, np.zeros(len(streams)), [], [])
+
+    breakpoints = np.asarray(bounds)
+    index = GrowthIndex(bounds[0], inflation_rate, cadence)
+    weights = index.weight(breakpoints)
+
+    # Deflated monthly rate of each stream on each [breakpoint, next breakpoint) interval
+    rates = np.zeros((len(streams), len(bounds) - 1))
+    for row, stream in enumerate(segments):
+        for start, end, amount in stream:
+            lo, hi = np.searchsorted(breakpoints, (start, end))
+            rates[row, lo:hi] += amount / index.level(start)
+
+    cumulative = np.zeros((len(streams), len(bounds)))
+    np.cumsum(rates * np.diff(weights), axis=1, out=cumulative[:, 1:])
+    tolerance = _TOLERANCE * max(1.0, float(np.abs(cumulative).max()))
+
+    # Pairwise differences at every breakpoint; a crossing of i over j lies in
+    # the interval where D_ij goes from negative to non-negative
+    difference = cumulative[:, None, :] - cumulative[None, :, :]
+    slope = rates[:, None, :] - rates[None, :, :]
+    behind = difference[:, :, :-1] < -tolerance
+    caught_up = difference[:, :, 1:] >= -tolerance
+
+    def difference_at(i: int, j: int, b: int, t: int) -> float:
+        return difference[i, j, b] + slope[i, j, b] * (float(index.weight(t)) - weights[b])
+
+    crossings = []
+    for i, j, b in zip(*np.nonzero(behind & caught_up)):
+        target = weights[b] + (-difference[i, j, b] - tolerance) / slope[i, j, b]
+        t = int(math.ceil(index.inverse(target) - 1e-9))
+        t = min(max(t, bounds[b] + 1), bounds[b + 1])
+        while t < bounds[b + 1] and difference_at(i, j, b, t) < -tolerance:
+            t += 1
+        while t - 1 > bounds[b] and difference_at(i, j, b, t - 1) >= -tolerance:
+            t -= 1
+        crossings.append((int(i), int(j), t - 1))
+    crossings.sort(key=lambda crossing: (crossing[2], crossing[0], crossing[1]))
+
+    # The ordering of cumulative totals only changes at breakpoints and crossings
+    # (ties at a critical point can split one month later)
+    critical = set(bounds) | {month + 1 for _, _, month in crossings}
+    critical = sorted(critical | {t + 1 for t in critical if t < bounds[-1]})
+    leaders = []
+    for position, t in enumerate(critical):
+        b = min(int(np.searchsorted(breakpoints, t, side='right')) - 1, len(bounds) - 2)
+        totals = cumulative[:, b] + rates[:, b] * (float(index.weight(t)) - weights[b])
+        best = totals.max()
+        if best <= tolerance:
+            continue
+        end = critical[position + 1] - 1 if position + 1 < len(critical) else None
+        indices = tuple(int(k) for k in np.nonzero(totals >= best - tolerance)[0])
+        if leaders and leaders[-1][2] == indices:
+            leaders[-1] = (leaders[-1][0], end, indices)
+        else:
+            leaders.append((t - 1, end, indices))
+
+    return BreakEvenAnalysis(names, age_origin, cumulative[:, -1], crossings, leaders)
@@ -0,0 +1,256 @@
+# backend/core/cola_paths.py
+"""
+Stochastic COLA paths
+Evaluates benefit streams under many annual COLA paths at once and reports
+percentile bands of the monthly and cumulative benefit per calendar year.
+
+A path is a sequence of annual COLAs by calendar year. Each path's
+cumulative product I(year) is built once; every COLA factor the scalar
+model computes as (1+r)**k becomes a ratio I(to) / I(from) of that array,
+so a constant path reproduces the single-rate calculators exactly.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .break_even import Segment
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+# SSA COLAs announced for December of each year 1975-2025 (percent), paid from
+# the following January. historical_cola_paths() replays windows of this series.
+HISTORICAL_COLA_FIRST_YEAR = 1975
+HISTORICAL_COLA_PERCENT = (
+    8.0, 6.4, 5.9, 6.5, 9.9, 14.3, 11.2, 7.4, 3.5, 3.5,
+    3.1, 1.3, 4.2, 4.0, 4.7, 5.4, 3.7, 3.0, 2.6, 2.8,
+    2.6, 2.9, 2.1, 1.3, 2.5, 3.5, 2.6, 1.4, 2.1, 2.7,
+    4.1, 3.3, 2.3, 5.8, 0.0, 0.0, 3.6, 1.7, 1.5, 1.7,
+    0.0, 0.3, 2.0, 2.8, 1.6, 1.3, 5.9, 8.7, 3.2, 2.5,
+    2.8,
+)
+
+
+class ColaPaths:
+    """
+    Annual COLA paths: rates[p, k] is path p's COLA effective from January of
+    start_year + k. Years before the first column reuse the first rate and
+    years after the last column reuse the last rate, so a single column is a
+    constant-rate path.
+    """
+
+    def __init__(self, rates, start_year: int):
+        rates = np.atleast_2d(np.asarray(rates, dtype=float))
+        if rates.ndim != 2 or rates.size == 0:
+            raise ValueError("COLA paths must be a non-empty [paths, years] matrix")
+        if np.any(rates <= -1.0):
+            raise ValueError("COLA rates must be greater than -100%")
+        self.rates = rates
+        self.start_year = start_year
+
+    @classmethod
+    def constant(cls, rate: float, start_year: int) -> 'ColaPaths':
+        """One path at a fixed rate (the scalar model)."""
+        return cls([[rate]], start_year)
+
+    @property
+    def paths(self) -> int:
+        return self.rates.shape[0]
+
+    def index(self, first_year: int, last_year: int) -> 'ColaIndex':
+        """Cumulative COLA levels for every path over [first_year, last_year]."""
+        years = np.arange(first_year + 1, last_year + 1)
+        columns = np.clip(years - self.start_year, 0, self.rates.shape[1] - 1)
+        growth = 1.0 + self.rates[:, columns]
+        levels = np.ones((self.paths, years.size + 1))
+        np.cumprod(growth, axis=1, out=levels[:, 1:])
+        return ColaIndex(first_year, levels, growth)
+
+
+@dataclass
+class ColaIndex:
+    """
+    levels[p, y - first_year] = product of path p's COLAs from first_year + 1
+    through y; growth[p, k] is the factor applied in January of first_year + k + 1.
+    """
+    first_year: int
+    levels: np.ndarray
+    growth: np.ndarray
+
+    def at(self, years) -> np.ndarray:
+        """Levels at whole calendar years, [paths, ...]."""
+        return self.levels[:, np.asarray(years) - self.first_year]
+
+    def at_fraction(self, year: float) -> np.ndarray:
+        """Level at a fractional year, compounding the next COLA over the fraction."""
+        whole = int(np.floor(year))
+        fraction = year - whole
+        level = self.levels[:, whole - self.first_year]
+        if fraction == 0.0:
+            return level
+        return level * self.growth[:, whole - self.first_year] ** fraction
+
+    def between(self, start_year: float, years: float) -> np.ndarray:
+        """COLA factor over `years` starting at a (fractional) calendar year, per path."""
+        if years <= 0:
+            return np.ones(self.levels.shape[0])
+        return self.at_fraction(start_year + years) / self.at_fraction(start_year)
+
+
+@dataclass
+class ColaBands:
+    """
+    Per-path benefits by calendar year.
+
+    Attributes:
+        years: Calendar years covered
+        annual: [paths, years] benefits paid in each year
+        months_paid: Months paid in each year (the same on every path)
+    """
+    years: np.ndarray
+    annual: np.ndarray
+    months_paid: np.ndarray
+
+    @property
+    def monthly(self) -> np.ndarray:
+        """Average monthly benefit in each year (0 where nothing is paid)."""
+        return np.divide(self.annual, self.months_paid, out=np.zeros_like(self.annual),
+                         where=self.months_paid > 0)
+
+    @property
+    def cumulative(self) -> np.ndarray:
+        return np.cumsum(self.annual, axis=1)
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Lifetime total per path."""
+        return self.annual.sum(axis=1)
+
+    def bands(self, values: np.ndarray, percentiles: Sequence[float] = PERCENTILES) -> Dict[str, list]:
+        """Percentiles across paths, year by year."""
+        levels = np.percentile(values, percentiles, axis=0)
+        return {str(p): np.round(levels[k], 2).tolist() for k, p in enumerate(percentiles)}
+
+    def to_dict(self, percentiles: Sequence[float] = PERCENTILES) -> Dict[str, Any]:
+        """JSON-ready bands (no per-path data)."""
+        totals = self.totals
+        return {
+            'paths': int(self.annual.shape[0]),
+            'years': self.years.tolist(),
+            'months_paid': self.months_paid.tolist(),
+            'monthly_benefit': self.bands(self.monthly, percentiles),
+            'cumulative_benefits': self.bands(self.cumulative, percentiles),
+            'lifetime_total': {
+                'mean': round(float(totals.mean()), 2),
+                'percentiles': {
+                    str(p): round(float(v), 2)
+                    for p, v in zip(percentiles, np.percentile(totals, percentiles))
+                }
+            }
+        }
+
+
+def stream_bands(
+    segments: Sequence[Segment],
+    cola_paths: ColaPaths,
+    amount_scale: Optional[np.ndarray] = None,
+    index: Optional[ColaIndex] = None
+) -> ColaBands:
+    """
+    Benefits per path and calendar year for a segment stream.
+
+    Each segment's amount is fixed in its first month and grows by the path's
+    COLA every January after that (the annual model of benefit_after_claim).
+
+    Args:
+        segments: (first month ordinal, end month ordinal, amount in the first month)
+        cola_paths: Paths to evaluate
+        amount_scale: Optional per-path multiplier on every amount (e.g. pre-claim COLAs)
+        index: Precomputed levels covering the segments' years
+
+    Returns:
+        ColaBands from the first paid year through the last
+    """
+    segments = [(start, end, amount) for start, end, amount in segments if end > start]
+    if not segments:
+        return ColaBands(np.zeros(0, dtype=int), np.zeros((cola_paths.paths, 0)), np.zeros(0, dtype=int))
+
+    starts = np.asarray([start for start, _, _ in segments])
+    ends = np.asarray([end for _, end, _ in segments])
+    amounts = np.asarray([amount for _, _, amount in segments])
+    first_year, last_year = int(starts.min() // 12), int((ends.max() - 1) // 12)
+    if index is None:
+        index = cola_paths.index(first_year, last_year)
+
+    years = np.arange(first_year, last_year + 1)
+    # Months each segment pays in each year: [segments, years]
+    months = np.maximum(
+        0, np.minimum(ends[:, None], (years[None, :] + 1) * 12) - np.maximum(starts[:, None], years[None, :] * 12)
+    )
+    # Path growth since each segment's first year: [paths, segments, years]
+    growth = index.at(years)[:, None, :] / index.at(starts // 12)[:, :, None]
+    scale = np.ones(cola_paths.paths) if amount_scale is None else np.asarray(amount_scale)
+    annual = scale[:, None] * np.einsum('s,psy,sy->py', amounts, growth, months)
+    return ColaBands(years, annual, months.sum(axis=0))
+
+
+def simulate_cola_paths(
+    paths: int,
+    years: int,
+    start_year: int,
+    mean: float = 0.025,
+    volatility: float = 0.015,
+    persistence: float = 0.6,
+    seed: Optional[int] = None
+) -> ColaPaths:
+    """
+    AR(1) annual COLA paths around a long-run mean, floored at zero (a COLA is
+    never negative). The first year starts from the long-run distribution.
+    """
+    if paths < 1 or years < 1:
+        raise ValueError("paths and years must be positive")
+    if not 0.0 <= persistence < 1.0:
+        raise ValueError("persistence must be in [0, 1)")
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((paths, years)) * volatility
+
+    deviation = np.empty((paths, years))
+    deviation[:, 0] = shocks[:, 0]
+    innovation = np.sqrt(1.0 - persistence ** 2)
+    for year in range(1, years):
+        deviation[:, year] = persistence * deviation[:, year - 1] + innovation * shocks[:, year]
+    return ColaPaths(np.maximum(0.0, mean + deviation), start_year)
+
+
+def historical_cola_paths(years: int, start_year: int) -> ColaPaths:
+    """
+    One path per historical starting year: the SSA COLA sequence from that
+    year on, wrapping around to 1975 when the window runs past the series.
+    """
+    history = np.asarray(HISTORICAL_COLA_PERCENT) / 100.0
+    offsets = (np.arange(history.size)[:, None] + np.arange(years)[None, :]) % history.size
+    return ColaPaths(history[offsets], start_year)
+
+
+def preclaim_cola_factors(
+    index: ColaIndex,
+    as_of_year: float,
+    age_62_year: float,
+    claim_age_years: float,
+    current_age_years: float
+) -> np.ndarray:
+    """
+    Path version of benefit_math.preclaim_cola_factor: COLAs over the years
+    before 60 from today, and over each full year from 62 to the claim age.
+    """
+    pre60_years = max(0.0, min(60.0, claim_age_years) - current_age_years)
+    cola_years_from_62 = max(0, int(np.floor(claim_age_years)) - 62)
+    return index.between(as_of_year, pre60_years) * index.between(age_62_year, cola_years_from_62)
+
+
+def index_years(segments: Sequence[Segment], *years: float) -> Tuple[int, int]:
+    """Whole-year range an index must cover for a stream and extra (fractional) years."""
+    first = min([int(np.floor(year)) for year in years] + [start // 12 for start, _, _ in segments])
+    last = max([int(np.floor(year)) + 1 for year in years] + [(end - 1) // 12 for _, end, _ in segments])
+    return first, last
@@ -0,0 +1,312 @@
+# backend/core/couple_grid.py
+"""
+Vectorized couple claiming optimizer
+Evaluates every (spouse1 claim month, spouse2 claim month) pair from 62y0m to
+70y0m - 97 x 97 = 9,409 cells - for a set of death-age pairs, including the
+spousal top-up and the survivor step-up after the first death.
+
+Every benefit stream in the annual COLA model is "amount at claim" x
+(1+r)^(calendar year - claim year). Dividing each amount by (1+r)^(claim
+year) turns it into a constant, so any lifetime sum is that constant times a
+difference of one cumulative month-weight array. Each household component is
+then a 97-vector or a 97 x 97 outer operation.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import actuarial_tables
+from .base_ss_calculator import compile_profile, month_ordinal
+from .benefit_grid import (
+    CLAIM_AGE_MONTHS,
+    early_reduction_factor,
+    monthly_benefit_at_claim,
+    months_from_fra,
+    pia_at_claim_base,
+)
+
+SPOUSAL_SHARE = 0.5
+SURVIVOR_MIN_AGE_MONTHS = 60 * 12
+
+_SURVIVOR_REDUCTION_TABLE = np.asarray(actuarial_tables.SURVIVOR_REDUCTION_FACTORS)
+
+
+@dataclass
+class _SpouseCurve:
+    """Per-spouse arrays over the claim axis, in normalized (claim-year-deflated) dollars."""
+    birth_date: date
+    birth_ordinal: int
+    fra_age_months: int
+    fra_years: float
+    current_age_years: float
+    pia: float
+    claim_ordinal: np.ndarray
+    monthly: np.ndarray
+    normalized_own: np.ndarray
+    normalized_pia: np.ndarray
+    spousal_reduction: np.ndarray
+    pays_death_month: int
+
+    def death_end(self, longevity_age):
+        """First month ordinal after the last paid month (per longevity age if given an array)."""
+        return self.birth_ordinal + np.asarray(longevity_age) * 12 + self.pays_death_month
+
+    def own_lifetime(self, longevity_ages: np.ndarray, weights: '_MonthWeights') -> np.ndarray:
+        """
+        Normalized own benefit x weighted months paid, indexed [claim, longevity]
+        (nothing if claiming at or after death).
+        """
+        death_ordinal = self.birth_ordinal + np.asarray(longevity_ages) * 12
+        claim = self.claim_ordinal[:, None]
+        paid = weights.between(claim, self.death_end(longevity_ages)[None, :])
+        return self.normalized_own[:, None] * np.where(claim < death_ordinal[None, :], paid, 0.0)
+
+
+def _spouse_curve(birth_date: date, pia: float, claims: np.ndarray, r: float,
+                  base_year: int, as_of: date) -> _SpouseCurve:
+    profile = compile_profile(birth_date, pia, as_of)
+    fra_years_float = profile.fra_years_float
+    current_age_years = profile.current_age_in_months / 12
+    claim_age_years = claims / 12
+
+    birth_ordinal = profile.birth_ordinal
+    claim_ordinal = birth_ordinal + claims
+    deflator = (1.0 + r) ** -(claim_ordinal // 12 - base_year)
+
+    monthly = monthly_benefit_at_claim(pia, claim_age_years, current_age_years, r, fra_years_float)
+    inflated_pia = pia_at_claim_base(pia, claim_age_years, current_age_years, r)
+
+    return _SpouseCurve(
+        birth_date=birth_date,
+        birth_ordinal=birth_ordinal,
+        fra_age_months=profile.fra_age_in_months,
+        fra_years=fra_years_float,
+        current_age_years=current_age_years,
+        pia=pia,
+        claim_ordinal=claim_ordinal,
+        monthly=monthly,
+        normalized_own=monthly * deflator,
+        normalized_pia=inflated_pia * deflator,
+        spousal_reduction=early_reduction_factor(months_from_fra(claim_age_years, fra_years_float)),
+        pays_death_month=int(not (birth_date.month == 1 and birth_date.day == 1)),
+    )
+
+
+class _MonthWeights:
+    """Cumulative sum of (1+r)^(calendar year - base year) over month ordinals."""
+
+    def __init__(self, start_ordinal: int, end_ordinal: int, r: float):
+        self.start = start_ordinal
+        self.end = end_ordinal
+        months = np.arange(start_ordinal, end_ordinal)
+        weights = (1.0 + r) ** (months // 12 - start_ordinal // 12)
+        self.cumulative = np.concatenate(([0.0], np.cumsum(weights)))
+
+    def between(self, start, end) -> np.ndarray:
+        """Weighted month count for [start, end); zero where end <= start."""
+        start = np.clip(start, self.start, self.end)
+        end = np.clip(end, self.start, self.end)
+        span = self.cumulative[end - self.start] - self.cumulative[start - self.start]
+        return np.where(end > start, span, 0.0)
+
+
+def survivor_reduction_factor(survivor_age_months, survivor_fra_age_months) -> np.ndarray:
+    """Survivor early-filing multiplier: 0.396% per month before FRA, capped at 28.5%."""
+    months_early = np.asarray(survivor_fra_age_months) - np.asarray(survivor_age_months)
+    return _SURVIVOR_REDUCTION_TABLE[np.clip(months_early, 0, _SURVIVOR_REDUCTION_TABLE.size - 1)]
+
+
+def _survivor_step_up(deceased: _SpouseCurve, survivor: _SpouseCurve, deceased_longevity: np.ndarray,
+                      survivor_end: np.ndarray, weights: _MonthWeights, r: float, base_year: int) -> np.ndarray:
+    """
+    Extra survivor income after the deceased's last paid month, indexed
+    [deceased claim, survivor claim, death pair].
+
+    The survivor receives the deceased's benefit (or the PIA plus credits
+    earned to death if they had not yet claimed) until their own claim, then
+    the larger of the two. Pairs where the survivor's benefit window is empty
+    come out as zero.
+    """
+    deceased_end = deceased.death_end(deceased_longevity)
+    start = np.maximum(deceased_end, survivor.birth_ordinal + SURVIVOR_MIN_AGE_MONTHS)
+
+    death_age_years = np.clip(deceased_longevity, deceased.fra_years, 70)
+    unclaimed = monthly_benefit_at_claim(
+        deceased.pia, death_age_years, deceased.current_age_years, r, deceased.fra_years
+    ) * (1.0 + r) ** -((deceased_end - 1) // 12 - base_year)
+    reference = np.where(deceased.claim_ordinal[:, None] < deceased_end[None, :],
+                         deceased.normalized_own[:, None], unclaimed[None, :])
+    reference = reference * survivor_reduction_factor(start - survivor.birth_ordinal, survivor.fra_age_months)
+
+    own_start = np.maximum(start[None, :], survivor.claim_ordinal[:, None])
+    before_own_claim = weights.between(start[None, :], np.minimum(own_start, survivor_end[None, :]))
+    after_own_claim = weights.between(own_start, survivor_end[None, :])
+
+    return (reference[:, None, :] * before_own_claim[None, :, :]
+            + np.maximum(0.0, reference[:, None, :] - survivor.normalized_own[None, :, None])
+            * after_own_claim[None, :, :])
+
+
+@dataclass
+class CoupleGrid:
+    """
+    Dense result of couple_grid().
+
+    household_total is indexed [spouse1 claim, spouse2 claim, death pair];
+    death_age_pairs[k] is (spouse1 longevity, spouse2 longevity).
+    """
+    claim_age_months: np.ndarray
+    death_age_pairs: np.ndarray
+    weights: np.ndarray
+    inflation_rate: float
+    spouse1_monthly: np.ndarray
+    spouse2_monthly: np.ndarray
+    household_total: np.ndarray
+    components: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def claim_index(self, claiming_age_years: int, claiming_age_months: int = 0) -> int:
+        """Row of the claim axis for a claiming age."""
+        target = claiming_age_years * 12 + claiming_age_months
+        matches = np.nonzero(self.claim_age_months == target)[0]
+        if matches.size == 0:
+            raise ValueError(f"Claiming age {claiming_age_years}y{claiming_age_months}m is not on the grid")
+        return int(matches[0])
+
+    def expected_total(self) -> np.ndarray:
+        """Probability-weighted household total over the death-age pairs."""
+        return np.tensordot(self.household_total, self.weights, axes=([2], [0]))
+
+    def total_at(self, spouse1_age: Tuple[int, int], spouse2_age: Tuple[int, int],
+                 death_index: Optional[int] = None) -> float:
+        """Household total for one cell; the weighted expectation when death_index is None."""
+        i, j = self.claim_index(*spouse1_age), self.claim_index(*spouse2_age)
+        if death_index is None:
+            return float(self.expected_total()[i, j])
+        return float(self.household_total[i, j, death_index])
+
+    def optimal_pair(self, death_index: Optional[int] = None) -> Tuple[int, int]:
+        """Best (spouse1, spouse2) claim ages in months; weighted expectation when death_index is None."""
+        surface = self.expected_total() if death_index is None else self.household_total[:, :, death_index]
+        i, j = np.unravel_index(int(np.argmax(surface)), surface.shape)
+        return int(self.claim_age_months[i]), int(self.claim_age_months[j])
+
+    def to_dict(self, include_surface: bool = True) -> Dict[str, Any]:
+        """JSON-ready representation (amounts rounded to cents)."""
+        expected = self.expected_total()
+        best1, best2 = self.optimal_pair()
+        result = {
+            'claim_age_months': self.claim_age_months.tolist(),
+            'death_age_pairs': self.death_age_pairs.tolist(),
+            'weights': self.weights.tolist(),
+            'inflation_rate': self.inflation_rate,
+            'spouse1_monthly_benefit': np.round(self.spouse1_monthly, 2).tolist(),
+            'spouse2_monthly_benefit': np.round(self.spouse2_monthly, 2).tolist(),
+            'optimal_pair': {
+                'spouse1_claim_age_months': best1,
+                'spouse2_claim_age_months': best2,
+                'expected_household_total': round(float(expected.max()), 2),
+            },
+            'optimal_pair_by_death_pair': [
+                dict(zip(('spouse1_claim_age_months', 'spouse2_claim_age_months'), self.optimal_pair(k)),
+                     household_total=round(float(self.household_total[:, :, k].max()), 2))
+                for k in range(len(self.death_age_pairs))
+            ],
+        }
+        if include_surface:
+            result['expected_total'] = np.round(expected, 2).tolist()
+        return result
+
+
+def couple_grid(
+    spouse1_birth_date: date,
+    spouse1_pia: float,
+    spouse2_birth_date: date,
+    spouse2_pia: float,
+    death_age_pairs: Iterable[Sequence[int]],
+    inflation_rate: float = 0.025,
+    weights: Optional[Iterable[float]] = None,
+    claim_age_months: Optional[Iterable[int]] = None,
+    as_of: Optional[date] = None,
+) -> CoupleGrid:
+    """
+    Evaluate every spouse1 x spouse2 claim month for each death-age pair.
+
+    Args:
+        spouse1_birth_date, spouse1_pia: Spouse 1's date of birth and PIA at FRA
+        spouse2_birth_date, spouse2_pia: Spouse 2's date of birth and PIA at FRA
+        death_age_pairs: (spouse1 longevity, spouse2 longevity) pairs to evaluate
+        inflation_rate: Annual COLA assumption
+        weights: Probability of each death-age pair (defaults to equal weights)
+        claim_age_months: Claim ages in months (defaults to 62y0m-70y0m)
+        as_of: Date used for the current ages (defaults to today)
+
+    Returns:
+        CoupleGrid with the household total surface per death-age pair
+    """
+    if as_of is None:
+        as_of = date.today()
+
+    r = float(inflation_rate)
+    claims = np.asarray(CLAIM_AGE_MONTHS if claim_age_months is None else list(claim_age_months), dtype=int)
+    pairs = np.asarray([tuple(pair) for pair in death_age_pairs], dtype=int).reshape(-1, 2)
+    if pairs.size == 0:
+        raise ValueError("At least one death-age pair is required")
+    pair_weights = np.ones(len(pairs)) if weights is None else np.asarray(list(weights), dtype=float)
+    if pair_weights.shape != (len(pairs),) or pair_weights.sum() <= 0:
+        raise ValueError("weights must have one positive-sum entry per death-age pair")
+    pair_weights = pair_weights / pair_weights.sum()
+
+    first_month = min(month_ordinal(spouse1_birth_date), month_ordinal(spouse2_birth_date)) + int(claims.min())
+    base_year = first_month // 12
+    spouse1 = _spouse_curve(spouse1_birth_date, spouse1_pia, claims, r, base_year, as_of)
+    spouse2 = _spouse_curve(spouse2_birth_date, spouse2_pia, claims, r, base_year, as_of)
+    last_month = int(max(spouse1.death_end(pairs[:, 0].max()), spouse2.death_end(pairs[:, 1].max())))
+    weights_by_month = _MonthWeights(first_month, max(first_month, last_month), r)
+
+    # Spousal top-up in normalized dollars (same rule as calculate_spousal_benefit)
+    topup1 = np.maximum(0.0, SPOUSAL_SHARE * spouse1.spousal_reduction[:, None] * spouse2.normalized_pia[None, :]
+                        - spouse1.normalized_own[:, None])
+    topup2 = np.maximum(0.0, SPOUSAL_SHARE * spouse2.spousal_reduction[None, :] * spouse1.normalized_pia[:, None]
+                        - spouse2.normalized_own[None, :])
+    spousal_start = np.maximum(spouse1.claim_ordinal[:, None], spouse2.claim_ordinal[None, :])
+
+    # Every death pair at once: arrays are indexed [spouse1 claim, spouse2 claim, death pair]
+    longevity1, longevity2 = pairs[:, 0], pairs[:, 1]
+    end1, end2 = spouse1.death_end(longevity1), spouse2.death_end(longevity2)
+    first_end = np.minimum(end1, end2)
+
+    components = {
+        'own': (spouse1.own_lifetime(longevity1, weights_by_month)[:, None, :]
+                + spouse2.own_lifetime(longevity2, weights_by_month)[None, :, :]),
+        'spousal': (topup1 + topup2)[:, :, None] * weights_by_month.between(
+            spousal_start[:, :, None], first_end[None, None, :]
+        ),
+        'survivor': np.zeros((claims.size, claims.size, len(pairs))),
+    }
+
+    spouse1_first = end1 < end2
+    if spouse1_first.any():
+        components['survivor'][:, :, spouse1_first] = _survivor_step_up(
+            spouse1, spouse2, longevity1[spouse1_first], end2[spouse1_first], weights_by_month, r, base_year
+        )
+    spouse2_first = end2 < end1
+    if spouse2_first.any():
+        components['survivor'][:, :, spouse2_first] = _survivor_step_up(
+            spouse2, spouse1, longevity2[spouse2_first], end1[spouse2_first], weights_by_month, r, base_year
+        ).transpose(1, 0, 2)
+
+    household_total = components['own'] + components['spousal'] + components['survivor']
+
+    return CoupleGrid(
+        claim_age_months=claims,
+        death_age_pairs=pairs,
+        weights=pair_weights,
+        inflation_rate=r,
+        spouse1_monthly=spouse1.monthly,
+        spouse2_monthly=spouse2.monthly,
+        household_total=household_total,
+        components=components,
+    )
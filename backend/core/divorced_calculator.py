@@ -5,10 +5,22 @@ for divorced individuals
 """
 
 from datetime import date
-from dateutil.relativedelta import relativedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from .base_ss_calculator import BaseSSCalculator, SocialSecurityConstants
+import numpy as np
+
+from .actuarial_tables import cola_factor
+from .base_ss_calculator import BaseSSCalculator, SocialSecurityConstants, _age_label, add_months
+from .evaluation_context import EvaluationContext
+from .mortality import MAX_AGE
+from .switch_grid import (
+    FIRST_ONLY, FIRST_THEN_SECOND, SECOND_ONLY, SECOND_THEN_FIRST, BenefitAxis, SwitchGrid, switch_grid
+)
+
+# Claim-month range of the exhaustive search (ages in months)
+CLAIM_MONTHS = range(62 * 12, 70 * 12 + 1)
+# Strategies returned by the exhaustive search when top_n is not given
+EXHAUSTIVE_TOP_N = 10
 
 
 class DivorcedSSCalculator(BaseSSCalculator):
@@ -26,7 +38,8 @@ class DivorcedSSCalculator(BaseSSCalculator):
         divorce_date: date,
         is_remarried: bool = False,
         has_child_under_16: bool = False,
-        child_birth_date: Optional[date] = None
+        child_birth_date: Optional[date] = None,
+        context: Optional[EvaluationContext] = None
     ):
         """
         Initialize divorced calculator
@@ -40,8 +53,9 @@ class DivorcedSSCalculator(BaseSSCalculator):
             is_remarried: Whether person has remarried
             has_child_under_16: Whether person has child under 16
             child_birth_date: Child's birth date (for child-in-care benefits)
+            context: As-of date and rounding policy (resolved from today if omitted)
         """
-        super().__init__(birth_date, own_pia)
+        super().__init__(birth_date, own_pia, context)
         self.birth_date = birth_date
         self.ex_spouse_pia = ex_spouse_pia
         self.marriage_duration_years = marriage_duration_years
@@ -59,14 +73,14 @@ class DivorcedSSCalculator(BaseSSCalculator):
         Check if eligible for ex-spouse benefits
         
         Args:
-            current_date: Date to check eligibility against (defaults to today)
+            current_date: Date to check eligibility against (defaults to the evaluation as-of date)
             ignore_age_check: If True, skips the age >= 62 check (useful for future planning)
 
         Returns:
             Tuple of (is_eligible, reason)
         """
         if current_date is None:
-            current_date = date.today()
+            current_date = self.as_of
 
         # Marriage must have lasted 10+ years
         if self.marriage_duration_years < 10:
@@ -93,7 +107,7 @@ class DivorcedSSCalculator(BaseSSCalculator):
             Tuple of (is_eligible, reason)
         """
         if current_date is None:
-            current_date = date.today()
+            current_date = self.as_of
 
         if not self.has_child_under_16 or self.child_birth_date is None:
             return False, "No child under 16"
@@ -118,7 +132,8 @@ class DivorcedSSCalculator(BaseSSCalculator):
     def calculate_ex_spouse_benefit(
         self,
         claiming_age_years: int,
-        inflation_rate: float = 0.025
+        inflation_rate: float = 0.025,
+        claiming_age_months: int = 0
     ) -> float:
         """
         Calculate ex-spouse benefit (50% of ex's PIA, subject to reductions)
@@ -126,16 +141,17 @@ class DivorcedSSCalculator(BaseSSCalculator):
         Args:
             claiming_age_years: Age when claiming ex-spouse benefit
             inflation_rate: Annual inflation rate
+            claiming_age_months: Additional months past claiming_age_years
 
         Returns:
             Monthly ex-spouse benefit amount
         """
         # Ex-spouse benefit is 50% of ex's PIA
-        ex_spouse_inflated_pia = self.ex_spouse_pia * ((1 + inflation_rate) ** max(0, claiming_age_years - 62))
+        ex_spouse_inflated_pia = self.ex_spouse_pia * cola_factor(inflation_rate, max(0, claiming_age_years - 62))
         spousal_pia = ex_spouse_inflated_pia * 0.5
 
         # Apply early retirement reduction if claiming before own FRA
-        claiming_date = self.get_claiming_date(claiming_age_years)
+        claiming_date = self.get_claiming_date(claiming_age_years, claiming_age_months)
 
         if claiming_date < self.fra_date:
             reduction_factor = self.calculate_reduction_factor(claiming_date)
@@ -169,7 +185,7 @@ class DivorcedSSCalculator(BaseSSCalculator):
             }
 
         # Calculate how long benefits last
-        current_date = date.today()
+        current_date = self.as_of
         child_age_years = (current_date - self.child_birth_date).days / 365.25
         years_until_16 = 16 - child_age_years
         months_of_benefits = int(years_until_16 * 12)
@@ -177,7 +193,7 @@ class DivorcedSSCalculator(BaseSSCalculator):
         # Child-in-care benefit is 50% of ex's PIA (NO reduction for early claiming!)
         # Inflate ex-spouse PIA to current date
         years_since_62 = max(0, ((current_date - self.birth_date).days / 365.25) - 62)
-        ex_spouse_inflated_pia = self.ex_spouse_pia * ((1 + inflation_rate) ** years_since_62)
+        ex_spouse_inflated_pia = self.ex_spouse_pia * cola_factor(inflation_rate, years_since_62)
         child_in_care_benefit = ex_spouse_inflated_pia * 0.5
 
         # Calculate total value
@@ -185,18 +201,135 @@ class DivorcedSSCalculator(BaseSSCalculator):
 
         return {
             'eligible': True,
-            'monthly_benefit': round(child_in_care_benefit, 2),
+            'monthly_benefit': self.context.round(child_in_care_benefit),
             'months_of_benefits': months_of_benefits,
             'years_of_benefits': round(years_until_16, 1),
-            'total_lifetime_value': round(total_value, 2),
+            'total_lifetime_value': self.context.round(total_value),
             'child_current_age': round(child_age_years, 1),
             'reason': reason
         }
 
+    # Strategy type per switch_grid candidate kind (restricted ex-spouse axis
+    # first, filing axis second); None takes the filing's dominant benefit
+    SWITCH_TYPES = {
+        FIRST_ONLY: 'ex_spouse',  # not returned (dominated by filing for both)
+        SECOND_ONLY: None,
+        FIRST_THEN_SECOND: 'switching',
+        SECOND_THEN_FIRST: 'switching',
+    }
+
+    def calculate_filing_grid(
+        self,
+        longevity_age: int = 95,
+        inflation_rate: float = 0.025,
+        sex: Optional[str] = None,
+        mortality_multiplier: float = 1.0,
+        rank_by: str = 'nominal'
+    ) -> SwitchGrid:
+        """
+        Exhaustive monthly filing search, 62y0m-70y0m.
+
+        Filing at any month pays the higher of the own and ex-spouse benefit
+        (deemed filing: one application claims both). Those born before
+        1954-01-02 may also file a restricted application for the ex-spouse
+        benefit alone from FRA and switch to their own benefit at any later
+        month; the switch counts only when the own benefit is the larger one.
+        While a child under 16 is in care, the unreduced child-in-care benefit
+        is paid until the child turns 16 or the first claim, whichever is first.
+
+        Args:
+            longevity_age: Age at death
+            inflation_rate: Annual inflation rate
+            sex: 'male' or 'female' for survival-weighted expected totals
+                (longevity_age is then replaced by the life table's last age)
+            mortality_multiplier: Scale applied to the life table's q(x)
+            rank_by: Measure of the totals ('nominal', 'present_value' or 'real_value')
+
+        Returns:
+            SwitchGrid with the restricted ex-spouse axis first (empty under
+            deemed filing) and the filing axis second; restricted-only cells
+            are NaN since filing for both pays at least as much
+        """
+        rank_key = self._rank_key(rank_by)
+        if sex is not None:
+            longevity_age = MAX_AGE
+        eligible, _ = self.is_eligible_for_ex_spouse_benefit(ignore_age_check=True)
+
+        months = [m for m in CLAIM_MONTHS if m <= longevity_age * 12]
+        dates = [self.get_claiming_date(*divmod(m, 12)) for m in months]
+        own = np.asarray([self.calculate_monthly_benefit(m // 12, m % 12, inflation_rate) for m in months])
+        ex_spouse = np.asarray([
+            self.calculate_ex_spouse_benefit(m // 12, inflation_rate, m % 12) if eligible else 0.0
+            for m in months
+        ])
+        spousal_top_up = ex_spouse > own
+        filing = BenefitAxis(
+            'own', months, dates, np.maximum(own, ex_spouse),
+            labels=['ex_spouse' if top_up else 'own' for top_up in spousal_top_up]
+        )
+
+        restricted = np.asarray([
+            eligible and self.birth_date < date(1954, 1, 2) and m >= self.fra_years * 12 + self.fra_months
+            for m in months
+        ], dtype=bool)
+        restricted_ex_spouse = BenefitAxis(
+            'ex_spouse',
+            np.asarray(months)[restricted],
+            [d for d, keep in zip(dates, restricted) if keep],
+            ex_spouse[restricted]
+        )
+
+        lead = None
+        child_in_care = self.calculate_child_in_care_benefit(inflation_rate)
+        if child_in_care['eligible']:
+            lead = (self.as_of, add_months(self.as_of, child_in_care['months_of_benefits']),
+                    child_in_care['monthly_benefit'], 'child_in_care')
+
+        grid = switch_grid(
+            restricted_ex_spouse, filing, self._date_at_age(longevity_age), inflation_rate, self.birth_ordinal,
+            self._switch_weights(inflation_rate, rank_key, sex, mortality_multiplier),
+            lead=lead, reverse=False
+        )
+        # Filing for own while the ex-spouse benefit is still larger is not a
+        # switch, and a restricted application never beats filing for both
+        grid.first_then_second[:, spousal_top_up] = np.nan
+        grid.first_only[:] = np.nan
+        return grid
+
+    def _filing_heatmap(self, grid: SwitchGrid) -> Dict[str, Any]:
+        """
+        Totals by (ex-spouse claim month, own claim month): the diagonal is a
+        single filing, cells above it a restricted application followed by the
+        switch to own, and null where the pair is not allowed.
+        """
+        months = grid.second.age_months
+        totals = np.full((months.size, months.size), np.nan)
+        totals[np.arange(months.size), np.arange(months.size)] = grid.second_only
+        rows = np.searchsorted(months, grid.first.age_months)
+        totals[rows, :] = np.where(np.isnan(grid.first_then_second), totals[rows, :], grid.first_then_second)
+        return {
+            'ex_spouse_claim_months': months.tolist(),
+            'own_claim_months': months.tolist(),
+            'totals': [[None if np.isnan(v) else round(float(v), 2) for v in row] for row in totals]
+        }
+
+    def _switch_strategy_name(self, kind: str, phases: List[Tuple[date, date, float, str]],
+                              ages: List[int]) -> str:
+        """Names matching the standard candidates ('File at 62 (Own Benefit)', 'Restricted App: ...')."""
+        if kind == SECOND_ONLY:
+            top_up = " (Includes Spousal Top-up)" if phases[0][3] == 'ex_spouse' else " (Own Benefit)"
+            return f"File at {_age_label(ages[0])}{top_up}"
+        return f"Restricted App: Spousal at {_age_label(ages[0])}, Own at {_age_label(ages[1])}"
+
     def calculate_optimal_strategy(
         self,
         longevity_age: int = 95,
-        inflation_rate: float = 0.025
+        inflation_rate: float = 0.025,
+        top_n: Optional[int] = None,
+        sex: Optional[str] = None,
+        mortality_multiplier: float = 1.0,
+        rank_by: str = 'nominal',
+        exhaustive: bool = False
     ) -> Dict:
         """
         Calculate optimal claiming strategy comparing:
@@ -204,14 +337,92 @@ class DivorcedSSCalculator(BaseSSCalculator):
         2. Switching strategy (Restricted Application, born < 1954)
         3. Child-in-care benefits (if applicable)
 
+        Candidates are ranked on closed-form lifetime totals; yearly timelines
+        and the break-even analysis are only built for the strategies returned.
+
+        Args:
+            longevity_age: Age at death
+            inflation_rate: Annual inflation rate
+            top_n: Return only the best N strategies (all if None)
+            sex: 'male' or 'female' to rank on survival-weighted expected totals
+                (longevity_age is then replaced by the life table's last age)
+            mortality_multiplier: Scale applied to the life table's q(x)
+            rank_by: 'nominal', 'present_value' or 'real_value' (the last two
+                need a context discount rate; strategies then carry both values)
+            exhaustive: Search every filing and restricted-application switch
+                month (calculate_filing_grid) instead of ages 62/FRA/70;
+                returns the best top_n (default EXHAUSTIVE_TOP_N) strategies
+                and a heatmap of every (ex-spouse claim, own claim) pair
+
         Returns:
             Dictionary with all strategies and recommendation
         """
+        rank_key = self._rank_key(rank_by)
+        if sex is not None:
+            longevity_age = MAX_AGE
+
         # Check basic non-age eligibility (marriage length, etc.)
         eligible, reason = self.is_eligible_for_ex_spouse_benefit(ignore_age_check=True)
 
-        strategies = []
         restricted_application_available = self.birth_date < date(1954, 1, 2)
+        child_in_care = self.calculate_child_in_care_benefit(inflation_rate)
+
+        search = None
+        if exhaustive:
+            grid = self.calculate_filing_grid(longevity_age, inflation_rate, sex, mortality_multiplier, rank_by)
+            strategies = self._switch_strategies(grid, top_n or EXHAUSTIVE_TOP_N, longevity_age, inflation_rate)
+            search = {
+                'mode': 'exhaustive',
+                'candidates_evaluated': grid.candidate_count,
+                'claim_months': [CLAIM_MONTHS.start, CLAIM_MONTHS.stop - 1],
+                'heatmap': self._filing_heatmap(grid)
+            }
+        else:
+            strategies = self._standard_strategies(
+                longevity_age, inflation_rate, eligible, restricted_application_available, child_in_care
+            )
+
+        # Find optimal strategy
+        if strategies:
+            if sex is not None:
+                self._apply_expected_values(strategies, inflation_rate, sex, mortality_multiplier)
+            ranked = self._rank_strategies(strategies, top_n, rank_key)
+
+            result = {
+                'eligible_for_ex_spouse': eligible,
+                'eligibility_reason': reason,
+                'all_strategies': ranked,
+                'optimal_strategy': ranked[0],
+                'deemed_filing_applies': not restricted_application_available,
+                'child_in_care_details': child_in_care if child_in_care['eligible'] else None,
+                'break_even': self._break_even_analysis(ranked, inflation_rate),
+                'valuation': self._valuation(longevity_age, sex, mortality_multiplier, rank_by)
+            }
+            if search:
+                result['search'] = search
+            return result
+        else:
+             return {
+                'eligible_for_ex_spouse': eligible,
+                'eligibility_reason': reason,
+                'all_strategies': [],
+                'optimal_strategy': None,
+                'deemed_filing_applies': not restricted_application_available,
+                'break_even': None,
+                'valuation': self._valuation(longevity_age, sex, mortality_multiplier, rank_by),
+                'error': 'No valid strategies found'
+            }
+
+    def _standard_strategies(
+        self,
+        longevity_age: int,
+        inflation_rate: float,
+        eligible: bool,
+        restricted_application_available: bool,
+        child_in_care: Dict
+    ) -> List[Dict]:
+        """Candidates at ages 62, FRA and 70, the FRA restricted application and child-in-care."""
+        strategies = []
         
         # Standard Filing Strategies (Used for Deemed Filing OR simple comparisons)
         # For each age, we calculate what you'd get if you filed for everything available.
@@ -219,7 +430,7 @@ class DivorcedSSCalculator(BaseSSCalculator):
             if claiming_age <= longevity_age:
                 # 1. Calculate Own Benefit
                 own_benefits = self.calculate_lifetime_benefits(
-                    claiming_age, longevity_age, inflation_rate
+                    claiming_age, longevity_age, inflation_rate, summary_only=True
                 )
                 own_monthly = own_benefits['initial_monthly_benefit']
                 own_lifetime = own_benefits['total_lifetime_benefits']
@@ -242,15 +453,10 @@ class DivorcedSSCalculator(BaseSSCalculator):
                 
                 # Build the timeline for the "Max" strategy
                 claiming_date = self.get_claiming_date(claiming_age)
-                death_date = self.birth_date + relativedelta(years=longevity_age)
+                death_date = self._date_at_age(longevity_age)
                 
-                timeline = self._build_benefit_timeline(
-                    claiming_date,
-                    death_date,
-                    final_monthly,
-                    inflation_rate,
-                    strategy_type
-                )
+                phases = [(claiming_date, death_date, final_monthly, strategy_type)]
+                summary = self._build_phased_timeline(phases, inflation_rate, summary_only=True)
                 
                 label = f"File at {claiming_age}"
                 if strategy_type == 'own':
@@ -262,9 +468,11 @@ class DivorcedSSCalculator(BaseSSCalculator):
                     'strategy': label,
                     'claiming_age': claiming_age,
                     'type': strategy_type,
-                    'initial_monthly': round(final_monthly, 2),
-                    'lifetime_total': timeline['total'],
-                    'benefit_timeline': timeline['timeline']
+                    'initial_monthly': self.context.round(final_monthly),
+                    'lifetime_total': summary['total'],
+                    **self._strategy_values(summary),
+                    '_timeline': self._timeline_builder(phases, inflation_rate),
+                    '_stream': self._phase_stream(phases)
                 })
 
         # Restricted Application Strategy (Born before 1954 only)
@@ -297,45 +505,33 @@ class DivorcedSSCalculator(BaseSSCalculator):
                         ex_spouse_monthly = self.calculate_ex_spouse_benefit(current_ex_claim_age, inflation_rate)
 
                         switch_date = self.get_claiming_date(switch_age)
-                        death_date = self.birth_date + relativedelta(years=longevity_age)
-
-                        ex_phase = self._build_benefit_timeline(
-                            self.get_claiming_date(current_ex_claim_age),
-                            switch_date,
-                            ex_spouse_monthly,
-                            inflation_rate,
-                            'ex_spouse'
-                        )
+                        death_date = self._date_at_age(longevity_age)
 
                         own_monthly = self.calculate_monthly_benefit(switch_age, 0, inflation_rate)
-                        own_phase = self._build_benefit_timeline(
-                            switch_date,
-                            death_date,
-                            own_monthly,
-                            inflation_rate,
-                            'own'
-                        )
-
-                        total_benefits = ex_phase['total'] + own_phase['total']
-                        timeline = ex_phase['timeline'] + own_phase['timeline']
+                        phases = [
+                            (self.get_claiming_date(current_ex_claim_age), switch_date, ex_spouse_monthly, 'ex_spouse'),
+                            (switch_date, death_date, own_monthly, 'own'),
+                        ]
+                        summary = self._build_phased_timeline(phases, inflation_rate, summary_only=True)
 
                         strategies.append({
                             'strategy': f"Restricted App: Spousal at {current_ex_claim_age}, Own at {switch_age}",
                             'claiming_age': current_ex_claim_age,
                             'switch_age': switch_age,
                             'type': 'switching',
-                            'initial_monthly': round(ex_spouse_monthly, 2),
-                            'switched_monthly': round(own_monthly, 2),
-                            'lifetime_total': round(total_benefits, 2),
-                            'benefit_timeline': timeline,
-                            'note': 'Available due to birth before 1954'
+                            'initial_monthly': self.context.round(ex_spouse_monthly),
+                            'switched_monthly': self.context.round(own_monthly),
+                            'lifetime_total': summary['total'],
+                            **self._strategy_values(summary),
+                            'note': 'Available due to birth before 1954',
+                            '_timeline': self._timeline_builder(phases, inflation_rate),
+                            '_stream': self._phase_stream(phases)
                         })
 
         # Strategy 4: Child-in-care benefits
-        child_in_care = self.calculate_child_in_care_benefit(inflation_rate)
         if child_in_care['eligible']:
-            current_date = date.today()
-            end_date = current_date + relativedelta(months=child_in_care['months_of_benefits'])
+            current_date = self.as_of
+            end_date = add_months(current_date, child_in_care['months_of_benefits'])
             timeline = self._build_benefit_timeline(
                 current_date,
                 end_date,
@@ -350,33 +546,17 @@ class DivorcedSSCalculator(BaseSSCalculator):
 
             strategies.append({
                 'strategy': f"Child-in-care benefit NOW (until child turns 16)",
-                'claiming_age': int((date.today() - self.birth_date).days / 365.25),
+                'claiming_age': int((self.as_of - self.birth_date).days / 365.25),
                 'type': 'child_in_care',
                 'initial_monthly': child_in_care['monthly_benefit'],
                 'lifetime_total': timeline['total'],
+                **self._strategy_values(timeline),
                 'years_of_benefits': child_in_care['years_of_benefits'],
                 'note': f"Plus additional benefits from age 62+, not included in this total",
-                'benefit_timeline': timeline['timeline']
+                '_timeline': lambda: child_in_care['benefit_timeline'],
+                '_stream': self._phase_stream(
+                    [(current_date, end_date, child_in_care['monthly_benefit'], 'child_in_care')]
+                )
             })
 
-        # Find optimal strategy
-        if strategies:
-            optimal = max(strategies, key=lambda x: x['lifetime_total'])
-
-            return {
-                'eligible_for_ex_spouse': eligible,
-                'eligibility_reason': reason,
-                'all_strategies': sorted(strategies, key=lambda x: x['lifetime_total'], reverse=True),
-                'optimal_strategy': optimal,
-                'deemed_filing_applies': not restricted_application_available,
-                'child_in_care_details': child_in_care if child_in_care['eligible'] else None
-            }
-        else:
-             return {
-                'eligible_for_ex_spouse': eligible,
-                'eligibility_reason': reason,
-                'all_strategies': [],
-                'optimal_strategy': None,
-                'deemed_filing_applies': not restricted_application_available,
-                'error': 'No valid strategies found'
-            }
+        return strategies
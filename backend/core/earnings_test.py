@@ -0,0 +1,202 @@
+# backend/core/earnings_test.py
+"""
+Retirement earnings test
+Evaluates claiming before FRA while still working, for every claim month x
+projected earnings level in one pass.
+
+Before the calendar year in which FRA is reached, $1 of benefits is withheld
+for every $2 of earnings above the lower annual exempt amount; in the FRA
+year, $1 for every $3 above the higher exempt amount, counting only earnings
+in the months before FRA. Withholding takes whole monthly benefits from the
+first month of entitlement in the year until the annual amount is covered
+(any excess is refunded, so the net loss is the withholding itself). At FRA
+the reduction factor is recomputed as if the withheld months had not been
+claimed early, raising the benefit paid from FRA on.
+
+Earnings are assumed to be spread evenly over each year, and the monthly
+("grace year") test of the first year of entitlement is not modeled.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+from .actuarial_tables import EARLY_REDUCTION_FACTORS, MIN_FRA_OFFSET_MONTHS
+
+# Own-benefit claim months evaluated by the grid: 62y0m through 70y0m
+CLAIM_MONTHS = np.arange(62 * 12, 70 * 12 + 1)
+
+# Annual exempt amounts by year: (years before the FRA year, FRA year)
+EXEMPT_AMOUNTS = {
+    2015: (15720, 41880), 2016: (15720, 41880), 2017: (16920, 44880), 2018: (17040, 45360),
+    2019: (17640, 46920), 2020: (18240, 48600), 2021: (18960, 50520), 2022: (19560, 51960),
+    2023: (21240, 56520), 2024: (22320, 59520), 2025: (23400, 62160), 2026: (24480, 65160),
+}
+# $1 withheld per $2 over the lower amount, per $3 over the higher one in the FRA year
+BEFORE_FRA_YEAR_RATE = 1 / 2
+FRA_YEAR_RATE = 1 / 3
+
+
+def exempt_amounts(years: Sequence[int], growth_rate: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (lower, higher) annual exempt amounts for each year. Years past the table
+    grow the last published amounts by growth_rate per year; earlier years
+    use the first ones.
+    """
+    first, last = min(EXEMPT_AMOUNTS), max(EXEMPT_AMOUNTS)
+    years = np.asarray(years, dtype=int)
+    base = np.asarray([EXEMPT_AMOUNTS[year] for year in np.clip(years, first, last)], dtype=float).reshape(-1, 2)
+    growth = (1.0 + growth_rate) ** np.maximum(years - last, 0)
+    return base[:, 0] * growth, base[:, 1] * growth
+
+
+def _early_reduction_factors(months_early: np.ndarray) -> np.ndarray:
+    """Vectorized early_reduction_factor(-months_early) for months within the table."""
+    return np.asarray(EARLY_REDUCTION_FACTORS)[-np.asarray(months_early) - MIN_FRA_OFFSET_MONTHS]
+
+
+@dataclass
+class EarningsTestGrid:
+    """
+    Earnings-tested benefits of every claim month x earnings level.
+
+    Attributes:
+        claim_age_months: Claim ages in months (rows)
+        years: Calendar years of the earnings columns
+        earnings: [levels, years] projected annual earnings
+        withheld: [claims, levels, years] benefits withheld (net of refunds)
+        withheld_months: [claims, levels, years] whole monthly benefits withheld
+        adjustment: [claims, levels] benefit multiplier from FRA on after the
+            reduction factor is recomputed for the withheld months
+        withheld_values: Per measure, [claims, levels, years] weighted withholding
+        base_totals: Per measure, [claims] totals without the earnings test
+        totals: Per measure, [claims, levels] earnings-tested totals
+    """
+    claim_age_months: np.ndarray
+    years: np.ndarray
+    earnings: np.ndarray
+    withheld: np.ndarray
+    withheld_months: np.ndarray
+    adjustment: np.ndarray
+    withheld_values: Dict[str, np.ndarray]
+    base_totals: Dict[str, np.ndarray]
+    totals: Dict[str, np.ndarray]
+
+    def best_claims(self, key: str = 'lifetime_total') -> np.ndarray:
+        """Row of the best claim month for each earnings level."""
+        return np.argmax(self.totals[key], axis=0)
+
+    def to_dict(self, key: str = 'lifetime_total') -> Dict[str, Any]:
+        """JSON-ready grid: rows are claim months, columns earnings levels."""
+        best = self.best_claims(key)
+        return {
+            'claim_age_months': self.claim_age_months.tolist(),
+            'years': self.years.tolist(),
+            'earnings': np.round(self.earnings, 2).tolist(),
+            'withheld': np.round(self.withheld.sum(axis=2), 2).tolist(),
+            'withheld_months': self.withheld_months.sum(axis=2).tolist(),
+            'adjustment': np.round(self.adjustment, 6).tolist(),
+            'base_totals': {name: np.round(values, 2).tolist() for name, values in self.base_totals.items()},
+            'totals': {name: np.round(values, 2).tolist() for name, values in self.totals.items()},
+            'best_claim_age_months': [int(self.claim_age_months[row]) for row in best],
+            'ranked_by': key
+        }
+
+
+def earnings_test_grid(
+    payments: np.ndarray,
+    first_ordinal: int,
+    fra_ordinal: int,
+    months_early: np.ndarray,
+    claim_age_months: np.ndarray,
+    earnings: np.ndarray,
+    first_year: int,
+    weights: Dict[str, np.ndarray],
+    exempt_growth: float = 0.0
+) -> EarningsTestGrid:
+    """
+    Apply the earnings test to every claim month's payments at every earnings level.
+
+    Args:
+        payments: [claims, months] nominal monthly payments with no withholding
+        first_ordinal: Month ordinal of the first payments column
+        fra_ordinal: Month ordinal of FRA (payments from it on are not tested)
+        months_early: [claims] months each claim is before FRA (0 at or after)
+        claim_age_months: [claims] claim ages in months
+        earnings: [levels, years] projected annual earnings
+        first_year: Calendar year of the first earnings column
+        weights: Per measure, [months] weight of each payment month
+        exempt_growth: Growth of the exempt amounts after the published years
+
+    Returns:
+        EarningsTestGrid
+    """
+    payments = np.asarray(payments, dtype=float)
+    earnings = np.atleast_2d(np.asarray(earnings, dtype=float))
+    months = first_ordinal + np.arange(payments.shape[1])
+    years = first_year + np.arange(earnings.shape[1])
+    fra_year, fra_month = divmod(fra_ordinal, 12)
+
+    # Annual amount and months of entitlement subject to the test, per claim and year
+    tested = (months[:, None] // 12 == years[None, :]) & (months[:, None] < fra_ordinal)
+    annual = payments @ tested
+    entitled = (payments > 0).astype(float) @ tested
+    monthly = np.divide(annual, entitled, out=np.zeros_like(annual), where=entitled > 0)
+
+    lower, higher = exempt_amounts(years, exempt_growth)
+    excess = np.where(
+        years < fra_year,
+        (earnings - lower) * BEFORE_FRA_YEAR_RATE,
+        np.where(years == fra_year, (earnings * fra_month / 12 - higher) * FRA_YEAR_RATE, 0.0)
+    ).clip(min=0.0)
+
+    # [claims, levels, years]: whole months withheld, and the net amount after refunds
+    needed = np.ceil(np.divide(excess[None], monthly[:, None], out=np.zeros((monthly.shape[0], *excess.shape)),
+                               where=monthly[:, None] > 0) - 1e-9)
+    withheld_months = np.minimum(entitled[:, None, :], needed).astype(int)
+    withheld = np.minimum(excess[None], annual[:, None, :])
+
+    # Recomputed reduction at FRA: withheld months no longer count as early
+    total_months = withheld_months.sum(axis=2)
+    early = np.asarray(months_early, dtype=int)[:, None]
+    adjustment = np.where(
+        early > 0,
+        _early_reduction_factors(early - np.minimum(total_months, early)) / _early_reduction_factors(early),
+        1.0
+    )
+
+    # Withheld months run from the first tested month of each year
+    claim_columns = np.argmax(payments > 0, axis=1)
+    year_columns = np.maximum(years * 12 - first_ordinal, 0)
+    starts = np.maximum(year_columns[None, :], claim_columns[:, None])[:, None, :]
+    from_fra = months >= fra_ordinal
+
+    withheld_values, base_totals, totals = {}, {}, {}
+    for key, weight in weights.items():
+        weighted = payments * weight
+        cumulative = np.concatenate((np.zeros((payments.shape[0], 1)), np.cumsum(weighted, axis=1)), axis=1)
+        limit = payments.shape[1]
+        rows = np.arange(payments.shape[0])[:, None, None]
+        span = (cumulative[rows, np.minimum(starts + withheld_months, limit)]
+                - cumulative[rows, np.minimum(starts, limit)])
+        # Weight the net withholding like the months it was taken from
+        share = np.divide(withheld, withheld_months * monthly[:, None, :], out=np.zeros_like(withheld),
+                          where=withheld_months > 0)
+        withheld_values[key] = span * share
+        after_fra = weighted[:, from_fra].sum(axis=1)
+        base_totals[key] = cumulative[:, -1]
+        totals[key] = (cumulative[:, -1, None] - withheld_values[key].sum(axis=2)
+                       + (adjustment - 1.0) * after_fra[:, None])
+
+    return EarningsTestGrid(
+        claim_age_months=np.asarray(claim_age_months, dtype=int),
+        years=years,
+        earnings=earnings,
+        withheld=withheld,
+        withheld_months=withheld_months,
+        adjustment=adjustment,
+        withheld_values=withheld_values,
+        base_totals=base_totals,
+        totals=totals,
+    )
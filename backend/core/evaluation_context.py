@@ -0,0 +1,58 @@
+# backend/core/evaluation_context.py
+"""
+Evaluation Context
+Explicit as-of date, rounding policy and optional present-value basis for a
+calculation. Resolving "today" once per request makes every calculator
+result a pure function of its inputs, so results can be cached and batched.
+The inflation rate stays an argument of each calculation.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class EvaluationContext:
+    """
+    Immutable (hashable) settings shared by every calculator in one request.
+
+    Attributes:
+        as_of: Date that stands in for "today" (current ages, elapsed time)
+        rounding: Decimal places for currency amounts (None keeps full precision)
+        discount_rate: Annual rate for present values as of as_of; when set,
+            timelines and totals also carry present-value and real-dollar amounts
+        cpi_rate: Annual CPI used for real dollars (defaults to the calculation's
+            inflation rate)
+    """
+    as_of: date
+    rounding: Optional[int] = 2
+    discount_rate: Optional[float] = None
+    cpi_rate: Optional[float] = None
+
+    @classmethod
+    def resolve(cls, as_of: Optional[date] = None, rounding: Optional[int] = 2,
+                discount_rate: Optional[float] = None, cpi_rate: Optional[float] = None) -> 'EvaluationContext':
+        """Build a context, reading the clock only when no as-of date is given."""
+        return cls(as_of=as_of or date.today(), rounding=rounding, discount_rate=discount_rate, cpi_rate=cpi_rate)
+
+    @property
+    def values_present(self) -> bool:
+        """Whether present-value and real-dollar amounts are produced."""
+        return self.discount_rate is not None
+
+    def deflators(self, inflation_rate: float) -> Optional[Tuple[float, float]]:
+        """
+        (monthly discount factor, annual CPI deflator) for present values and
+        real dollars, or None when only nominal amounts are produced.
+        """
+        if self.discount_rate is None:
+            return None
+        cpi = inflation_rate if self.cpi_rate is None else self.cpi_rate
+        return (1.0 + self.discount_rate) ** (-1 / 12), 1.0 / (1.0 + cpi)
+
+    def round(self, amount: float) -> float:
+        """Apply the currency rounding policy."""
+        if self.rounding is None:
+            return amount
+        return round(amount, self.rounding)
@@ -0,0 +1,160 @@
+"""
+Family Social Security Calculator
+Worker's own benefit plus spouse and child benefits under the family maximum,
+for households with dependents (the children table)
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .actuarial_tables import early_reduction_factor
+from .base_ss_calculator import BaseSSCalculator, compile_profile, month_ordinal
+from .evaluation_context import EvaluationContext
+from .family_maximum import (
+    CHILD_AGE_LIMIT_MONTHS, CHILD_IN_CARE_AGE_LIMIT_MONTHS, DependentAxis, FamilyGrid, family_grid, family_maximum
+)
+from .mortality import MAX_AGE
+
+# Worker claim months evaluated by the grid (ages in months)
+CLAIM_MONTHS = np.arange(62 * 12, 70 * 12 + 1)
+
+
+class FamilySSCalculator(BaseSSCalculator):
+    """
+    Calculator for a worker with a spouse and/or dependent children
+    Allocates the family maximum among the dependents month by month
+    """
+
+    def __init__(
+        self,
+        birth_date: date,
+        pia: float,
+        spouse_birth_date: Optional[date] = None,
+        spouse_pia: float = 0.0,
+        children: Sequence[Dict[str, Any]] = (),
+        context: Optional[EvaluationContext] = None
+    ):
+        """
+        Initialize family calculator
+
+        Args:
+            birth_date: Worker's date of birth
+            pia: Worker's Primary Insurance Amount
+            spouse_birth_date: Spouse's date of birth (no spouse benefit if omitted)
+            spouse_pia: Spouse's own PIA (dual entitlement offset)
+            children: Rows of the children table ('date_of_birth', 'is_disabled')
+            context: As-of date and rounding policy (resolved from today if omitted)
+        """
+        super().__init__(birth_date, pia, context)
+        self.spouse_birth_date = spouse_birth_date
+        self.spouse_pia = spouse_pia
+        self.children = [
+            (self._child_birth_date(child['date_of_birth']), bool(child.get('is_disabled', False)))
+            for child in children
+        ]
+
+    @staticmethod
+    def _child_birth_date(value) -> date:
+        return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+    def family_maximum(self) -> float:
+        """Monthly family maximum at the current PIA."""
+        return family_maximum(self.pia, self.birth_year + 62)
+
+    def calculate_family_grid(
+        self,
+        longevity_age: int = 90,
+        inflation_rate: float = 0.025,
+        spouse_claim_age_months: Optional[int] = None,
+        sex: Optional[str] = None,
+        mortality_multiplier: float = 1.0
+    ) -> FamilyGrid:
+        """
+        Every beneficiary's monthly benefit for every worker claim month from
+        62y0m to 70y0m.
+
+        Args:
+            longevity_age: Worker's age at death (ignored in expected-value mode)
+            inflation_rate: Annual inflation rate (for pre- and post-claiming)
+            spouse_claim_age_months: Spouse's own / spousal claim age (their FRA if omitted)
+            sex: Worker's 'male' or 'female' life table for survival-weighted totals
+            mortality_multiplier: Scale applied to the life table's q(x)
+
+        Returns:
+            FamilyGrid (rows: worker claim months)
+        """
+        if sex is not None:
+            longevity_age = MAX_AGE
+        first, payments = self._claim_payments(CLAIM_MONTHS, longevity_age, inflation_rate)
+        months = first + np.arange(payments.shape[1])
+
+        # PIA with pre-claim COLAs at each claim, growing with the payments after it
+        indexes = [self.profile._index(int(m)) for m in CLAIM_MONTHS]
+        inflated = np.asarray([self.profile.inflated_pias(inflation_rate)[i] for i in indexes])
+        initial = np.asarray([self.profile.monthly_benefits(inflation_rate)[i] for i in indexes])
+        pias = payments * (inflated / initial)[:, None]
+
+        return family_grid(
+            payments, pias, first, CLAIM_MONTHS, self.family_maximum() / self.pia,
+            self._dependents(months, inflation_rate, spouse_claim_age_months),
+            self._month_weights(first, months.size, inflation_rate, sex, mortality_multiplier)
+        )
+
+    def calculate_family_benefits(
+        self,
+        claiming_age_years: int,
+        longevity_age: int = 90,
+        inflation_rate: float = 0.025,
+        claiming_age_months: int = 0,
+        spouse_claim_age_months: Optional[int] = None,
+        sex: Optional[str] = None,
+        mortality_multiplier: float = 1.0
+    ) -> Dict[str, Any]:
+        """
+        Family grid in JSON form, with the yearly allocation for one worker claim age.
+        """
+        claim = claiming_age_years * 12 + claiming_age_months
+        if not CLAIM_MONTHS[0] <= claim <= CLAIM_MONTHS[-1]:
+            raise ValueError(f"Claiming age {claiming_age_years}y{claiming_age_months}m is outside 62y0m-70y0m")
+        grid = self.calculate_family_grid(
+            longevity_age, inflation_rate, spouse_claim_age_months, sex, mortality_multiplier
+        )
+        result = grid.to_dict(row=int(claim - CLAIM_MONTHS[0]))
+        result['family_maximum'] = self.context.round(self.family_maximum())
+        result['valuation'] = self._valuation(longevity_age, sex, mortality_multiplier)
+        return result
+
+    def _dependents(self, months: np.ndarray, inflation_rate: float,
+                    spouse_claim_age_months: Optional[int]) -> List[DependentAxis]:
+        """Entitlement axes of the spouse (if any) and each child over the month columns."""
+        children = []
+        in_care = np.zeros(months.size, dtype=bool)
+        for index, (birth_date, is_disabled) in enumerate(self.children, start=1):
+            birth = month_ordinal(birth_date)
+            born = months >= birth
+            children.append(DependentAxis(
+                label=f'child_{index}',
+                eligible=born & (is_disabled | (months < birth + CHILD_AGE_LIMIT_MONTHS)),
+                reduction=np.ones(months.size),
+                offset=np.zeros(months.size)
+            ))
+            in_care |= born & (is_disabled | (months < birth + CHILD_IN_CARE_AGE_LIMIT_MONTHS))
+
+        if self.spouse_birth_date is None:
+            return children
+
+        spouse = compile_profile(self.spouse_birth_date, self.spouse_pia, self.as_of)
+        claim = spouse.fra_age_in_months if spouse_claim_age_months is None else spouse_claim_age_months
+        if not CLAIM_MONTHS[0] <= claim <= CLAIM_MONTHS[-1]:
+            raise ValueError("Spouse claim age must be between 62y0m and 70y0m")
+        claim_ordinal = spouse.birth_ordinal + claim
+        aged = months >= claim_ordinal
+        # Spousal benefits before the spouse's FRA are reduced unless a child is in care
+        months_early = max(0, spouse.fra_age_in_months - claim)
+        reduction = np.where(in_care, 1.0, early_reduction_factor(-months_early))
+        own = spouse.monthly_benefit(claim, inflation_rate) if self.spouse_pia else 0.0
+        offset = np.where(aged, own * (1.0 + inflation_rate) ** (months // 12 - claim_ordinal // 12), 0.0)
+        spouse_axis = DependentAxis('spouse', in_care | aged, reduction, offset)
+        return [spouse_axis] + children
@@ -0,0 +1,187 @@
+# backend/core/family_maximum.py
+"""
+Family maximum and dependent benefits
+Allocates the worker's family maximum among the spouse and children in every
+month, for every worker claim month at once.
+
+Each dependent's original rate is 50% of the worker's PIA. The family
+maximum is 150% of the PIA up to the first bend point, 272% to the second,
+134% to the third and 175% above; when the dependents' original rates add
+up to more than the maximum minus the PIA, every one of them is cut pro
+rata. Age reductions (a spouse claiming before FRA without a child in care)
+and the spouse's own benefit (dual entitlement) then apply to the reduced
+rate. The worker's own benefit is never reduced by the maximum.
+
+Arrays are indexed [worker claim, month, beneficiary]. Dependent benefits
+are paid only while the worker is, so they end with the worker's last paid
+month (the survivor benefits that follow are not modeled here).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Family maximum bend points by the year the worker turns 62
+FAMILY_MAX_BEND_POINTS = {
+    2016: (1042, 1505, 1962), 2017: (1131, 1633, 2130), 2018: (1144, 1651, 2154),
+    2019: (1184, 1708, 2228), 2020: (1226, 1770, 2309), 2021: (1272, 1837, 2395),
+    2022: (1308, 1889, 2463), 2023: (1425, 2056, 2682), 2024: (1500, 2166, 2825),
+    2025: (1567, 2262, 2950), 2026: (1643, 2371, 3093),
+}
+FAMILY_MAX_FACTORS = (1.50, 2.72, 1.34, 1.75)
+# Spouse and child original rate: 50% of the worker's PIA
+DEPENDENT_SHARE = 0.5
+CHILD_AGE_LIMIT_MONTHS = 18 * 12
+CHILD_IN_CARE_AGE_LIMIT_MONTHS = 16 * 12
+
+
+def family_maximum(pia: float, eligibility_year: int) -> float:
+    """
+    Family maximum for a PIA, with the bend points of the year the worker
+    turns 62 (the nearest published year outside the table).
+    """
+    year = min(max(eligibility_year, min(FAMILY_MAX_BEND_POINTS)), max(FAMILY_MAX_BEND_POINTS))
+    bends = (0.0, *FAMILY_MAX_BEND_POINTS[year], np.inf)
+    return float(sum(
+        factor * max(0.0, min(pia, upper) - lower)
+        for factor, lower, upper in zip(FAMILY_MAX_FACTORS, bends[:-1], bends[1:])
+    ))
+
+
+@dataclass
+class DependentAxis:
+    """
+    One dependent's entitlement by month.
+
+    Attributes:
+        label: Beneficiary label ('spouse', 'child_1', ...)
+        eligible: [months] entitled whenever the worker is paid
+        reduction: [months] age reduction of the (family-maximum reduced) rate
+        offset: [months] own benefit subtracted under dual entitlement
+    """
+    label: str
+    eligible: np.ndarray
+    reduction: np.ndarray
+    offset: np.ndarray
+
+
+@dataclass
+class FamilyGrid:
+    """
+    Monthly benefits of every beneficiary for every worker claim month.
+
+    Attributes:
+        claim_age_months: Worker claim ages in months (rows)
+        first_ordinal: Month ordinal of the first month column
+        labels: Beneficiary labels ('worker' first)
+        monthly: [claims, months, beneficiaries] nominal monthly benefits
+        maximum: [claims, months] family maximum in each month (0 when unpaid)
+        proration: [claims, months] share of the dependents' original rates paid
+        totals: Per measure, [claims, beneficiaries] weighted totals
+    """
+    claim_age_months: np.ndarray
+    first_ordinal: int
+    labels: List[str]
+    monthly: np.ndarray
+    maximum: np.ndarray
+    proration: np.ndarray
+    totals: Dict[str, np.ndarray]
+
+    def household_totals(self, key: str = 'lifetime_total') -> np.ndarray:
+        """Family total per worker claim month."""
+        return self.totals[key].sum(axis=1)
+
+    def best_claim(self, key: str = 'lifetime_total') -> int:
+        """Row of the worker claim month with the highest family total."""
+        return int(np.argmax(self.household_totals(key)))
+
+    def annual(self, row: int) -> List[Dict[str, Any]]:
+        """Per calendar year of one claim month: each beneficiary's monthly benefit (January or first paid month) and total."""
+        monthly = self.monthly[row]
+        paid = np.nonzero(monthly.sum(axis=1) > 0)[0]
+        years = (self.first_ordinal + paid) // 12
+        rows = []
+        for year in np.unique(years):
+            months = paid[years == year]
+            rows.append({
+                'year': int(year),
+                'monthly': {label: round(float(monthly[months[0], b]), 2) for b, label in enumerate(self.labels)},
+                'annual': {label: round(float(monthly[months, b].sum()), 2) for b, label in enumerate(self.labels)},
+                'family_maximum': round(float(self.maximum[row, months[0]]), 2),
+                'months_prorated': int(np.count_nonzero(self.proration[row, months] < 1.0))
+            })
+        return rows
+
+    def to_dict(self, row: Optional[int] = None, key: str = 'lifetime_total') -> Dict[str, Any]:
+        """JSON-ready totals by claim month, with one claim month's yearly allocation if row is given."""
+        best = self.best_claim(key)
+        result = {
+            'claim_age_months': self.claim_age_months.tolist(),
+            'beneficiaries': list(self.labels),
+            'totals': {
+                name: {label: np.round(values[:, b], 2).tolist() for b, label in enumerate(self.labels)}
+                for name, values in self.totals.items()
+            },
+            'household_totals': {name: np.round(values.sum(axis=1), 2).tolist() for name, values in self.totals.items()},
+            'best_claim_age_months': int(self.claim_age_months[best]),
+            'ranked_by': key
+        }
+        if row is not None:
+            result['claim_age_months_detail'] = int(self.claim_age_months[row])
+            result['timeline'] = self.annual(row)
+        return result
+
+
+def family_grid(
+    worker_payments: np.ndarray,
+    worker_pias: np.ndarray,
+    first_ordinal: int,
+    claim_age_months: np.ndarray,
+    maximum_ratio: float,
+    dependents: Sequence[DependentAxis],
+    weights: Dict[str, np.ndarray]
+) -> FamilyGrid:
+    """
+    Allocate the family maximum in every month of every worker claim.
+
+    Args:
+        worker_payments: [claims, months] worker's own nominal monthly benefits
+        worker_pias: [claims, months] worker's PIA with COLAs in each paid month
+        first_ordinal: Month ordinal of the first month column
+        claim_age_months: [claims] worker claim ages in months
+        maximum_ratio: Family maximum / PIA (COLAs scale both alike)
+        dependents: Spouse and children entitlement axes
+        weights: Per measure, [months] weight of each month
+
+    Returns:
+        FamilyGrid
+    """
+    paid = worker_payments > 0
+    maximum = maximum_ratio * worker_pias * paid
+    if dependents:
+        eligible = np.stack([axis.eligible for axis in dependents], axis=-1)[None] & paid[:, :, None]
+        reduction = np.stack([axis.reduction for axis in dependents], axis=-1)[None]
+        offset = np.stack([axis.offset for axis in dependents], axis=-1)[None]
+        original = DEPENDENT_SHARE * worker_pias[:, :, None] * eligible
+        # A dependent whose own benefit covers the original rate takes no share of the maximum
+        counted = original > offset
+        claimed = (original * counted).sum(axis=2)
+        available = np.maximum(0.0, maximum - worker_pias * paid)
+        proration = np.where(claimed > available, np.divide(available, claimed, out=np.ones_like(claimed),
+                                                            where=claimed > 0), 1.0)
+        benefits = np.maximum(0.0, original * proration[:, :, None] * reduction - offset) * counted
+    else:
+        proration = np.ones(worker_payments.shape)
+        benefits = np.zeros((*worker_payments.shape, 0))
+
+    monthly = np.concatenate((worker_payments[:, :, None], benefits), axis=2)
+    return FamilyGrid(
+        claim_age_months=np.asarray(claim_age_months, dtype=int),
+        first_ordinal=first_ordinal,
+        labels=['worker'] + [axis.label for axis in dependents],
+        monthly=monthly,
+        maximum=maximum,
+        proration=proration,
+        totals={key: np.einsum('ctb,t->cb', monthly, weight) for key, weight in weights.items()},
+    )
@@ -0,0 +1,251 @@
+# backend/core/incremental_pia.py
+"""
+Incremental PIA model for spreadsheet edits
+Keeps every year's indexed earnings and the top-35 selection between edits,
+so that changing, adding or removing one year updates AIME and PIA in
+O(log n) instead of re-indexing and re-sorting the whole history.
+
+The top 35 years are a min-heap (worst selected year on top) and the other
+years a max-heap (best unselected year on top); an edit moves at most a
+couple of years between them. Heap entries carry a per-year version and are
+discarded lazily when they surface after the year was edited or removed.
+Amounts are kept in integer cents (the processor rounds indexed earnings to
+cents), so the running total does not drift over many edits.
+
+Ties between equal indexed amounts go to the earlier year, as the
+processor's stable sort does for a history in year order.
+"""
+
+from dataclasses import dataclass
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .ssa_xml_processor import EarningsRecord, SSAXMLProcessor
+
+TOP_YEARS = 35
+
+
+@dataclass
+class TopChange:
+    """
+    Outcome of an edit.
+
+    Attributes:
+        aime: AIME after the edit
+        pia: PIA after the edit
+        pia_change: PIA after minus before
+        entered: Years that entered the top 35
+        left: Years that left the top 35 (including a removed year)
+    """
+    aime: float
+    pia: float
+    pia_change: float
+    entered: List[int]
+    left: List[int]
+
+
+class IncrementalPIA:
+    """AIME / PIA of an earnings history kept up to date under single-year edits"""
+
+    def __init__(
+        self,
+        birth_year: int,
+        earnings_history: Iterable[EarningsRecord] = (),
+        pia_year: Optional[int] = None
+    ):
+        """
+        Args:
+            birth_year: Worker's birth year (indexing year is the year they turn 60)
+            earnings_history: Initial records (one per year)
+            pia_year: Year of the bend points (birth year + 62 if omitted)
+        """
+        self.processor = SSAXMLProcessor(birth_year=birth_year)
+        self.indexing_year = self.processor.indexing_year
+        self.pia_year = pia_year if pia_year is not None else birth_year + 62
+        # year -> (original, indexed cents, indexing factor, taxable maximum, is capped)
+        self._rows: Dict[int, Tuple[float, int, float, float, bool]] = {}
+        self._version: Dict[int, int] = {}
+        self._in_top = set()
+        self._top: List[Tuple[int, int, int, int]] = []   # (cents, -year, version, year)
+        self._rest: List[Tuple[int, int, int]] = []       # (-cents, year, version)
+        self._top_cents = 0
+
+        records = list(earnings_history)
+        years = [record.year for record in records]
+        if len(set(years)) != len(years):
+            raise ValueError("Earnings history has more than one record for a year")
+        if records:
+            indexed = SSAXMLProcessor.index_earnings(
+                np.asarray(years), np.asarray([record.earnings for record in records], dtype=float),
+                self.indexing_year
+            )
+            columns = zip(years, indexed.original.tolist(), np.rint(indexed.indexed * 100).astype(int).tolist(),
+                          indexed.factors.tolist(), indexed.max_taxable.tolist(), indexed.is_capped.tolist())
+            for year, original, cents, factor, max_taxable, is_capped in columns:
+                self._rows[year] = (original, cents, factor, max_taxable, is_capped)
+                self._version[year] = 0
+            ranked = sorted(self._rows, key=lambda year: (-self._rows[year][1], year))
+            self._in_top = set(ranked[:TOP_YEARS])
+            self._top = [(self._rows[year][1], -year, 0, year) for year in ranked[:TOP_YEARS]]
+            self._rest = [(-self._rows[year][1], year, 0) for year in ranked[TOP_YEARS:]]
+            heapq.heapify(self._top)
+            heapq.heapify(self._rest)
+            self._top_cents = sum(self._rows[year][1] for year in self._in_top)
+        self._update()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def top_years(self) -> List[int]:
+        """Years in the top 35, highest indexed amount first"""
+        return sorted(self._in_top, key=lambda year: (-self._rows[year][1], year))
+
+    def set_earnings(self, year: int, earnings: Optional[float]) -> TopChange:
+        """
+        Change or add one year's earnings (None removes the year).
+
+        Returns:
+            TopChange with the new AIME / PIA and the years entering and leaving the top 35
+        """
+        if earnings is not None and earnings < 0:
+            raise ValueError("Earnings cannot be negative")
+        previous_pia = self.pia
+        entered, left = [], []
+        if year in self._rows:
+            self._discard(year, left)
+        if earnings is not None:
+            self._insert(year, float(earnings))
+        self._rebalance(entered, left)
+        if len(self._top) + len(self._rest) > 2 * len(self._rows) + 64:
+            self._compact()
+        self._update()
+        moved_in, moved_out = set(entered), set(left)
+        return TopChange(
+            aime=self.aime,
+            pia=self.pia,
+            pia_change=round(self.pia - previous_pia, 2),
+            entered=sorted(moved_in - moved_out),
+            left=sorted(moved_out - moved_in)
+        )
+
+    def remove_year(self, year: int) -> TopChange:
+        """Remove one year's earnings"""
+        if year not in self._rows:
+            raise ValueError(f"No earnings recorded for {year}")
+        return self.set_earnings(year, None)
+
+    def to_dict(self) -> Dict:
+        """Result in the shape of SSAXMLProcessor.calculate_aime_and_pia"""
+        top = [self._record(year) for year in self.top_years]
+        padding = TOP_YEARS - len(top)
+        indexed = [row['indexed_earnings'] for row in top] + [0] * padding
+        return {
+            'aime': self.aime,
+            'pia': self.pia,
+            'pia_year': self.pia_year,
+            'bend_points_used': self._bend_points,
+            'top_35_years': top,
+            'years_of_zero_in_top_35': sum(1 for row in top if row['is_zero']) + padding,
+            'lowest_year_in_top_35': min(indexed),
+            'highest_year_in_top_35': max(indexed),
+            'calculation_details': {
+                'first_bracket': round(self._brackets[0], 2),
+                'second_bracket': round(self._brackets[1], 2),
+                'third_bracket': round(self._brackets[2], 2),
+                'total_pia': round(self._pia, 2)
+            }
+        }
+
+    def _record(self, year: int) -> Dict:
+        original, cents, factor, max_taxable, is_capped = self._rows[year]
+        return {
+            'year': year,
+            'original_earnings': original,
+            'indexed_earnings': cents / 100,
+            'indexing_factor': round(factor, 4),
+            'is_zero': original == 0,
+            'is_capped': is_capped,
+            'max_taxable': max_taxable
+        }
+
+    def _insert(self, year: int, earnings: float) -> None:
+        """Index one year and add it to the unselected heap"""
+        indexed = SSAXMLProcessor.index_earnings(np.asarray([year]), np.asarray([earnings]), self.indexing_year)
+        cents = int(round(float(indexed.indexed[0]) * 100))
+        self._rows[year] = (earnings, cents, float(indexed.factors[0]), float(indexed.max_taxable[0]),
+                            bool(indexed.is_capped[0]))
+        version = self._version.get(year, -1) + 1
+        self._version[year] = version
+        heapq.heappush(self._rest, (-cents, year, version))
+
+    def _discard(self, year: int, left: List[int]) -> None:
+        """Drop a year; its heap entry goes stale"""
+        cents = self._rows.pop(year)[1]
+        self._version[year] += 1
+        if year in self._in_top:
+            self._in_top.remove(year)
+            self._top_cents -= cents
+            left.append(year)
+
+    def _top_worst(self) -> Optional[Tuple[int, int, int, int]]:
+        while self._top:
+            entry = self._top[0]
+            if entry[3] in self._in_top and self._version[entry[3]] == entry[2]:
+                return entry
+            heapq.heappop(self._top)
+        return None
+
+    def _rest_best(self) -> Optional[Tuple[int, int, int]]:
+        while self._rest:
+            entry = self._rest[0]
+            year = entry[1]
+            if year in self._rows and year not in self._in_top and self._version[year] == entry[2]:
+                return entry
+            heapq.heappop(self._rest)
+        return None
+
+    def _promote(self, entered: List[int]) -> None:
+        negative_cents, year, version = heapq.heappop(self._rest)
+        self._in_top.add(year)
+        self._top_cents -= negative_cents
+        heapq.heappush(self._top, (-negative_cents, -year, version, year))
+        entered.append(year)
+
+    def _demote(self, left: List[int]) -> None:
+        cents, _, version, year = heapq.heappop(self._top)
+        self._in_top.remove(year)
+        self._top_cents -= cents
+        heapq.heappush(self._rest, (-cents, year, version))
+        left.append(year)
+
+    def _rebalance(self, entered: List[int], left: List[int]) -> None:
+        """Fill the top 35, then swap while the best unselected year beats the worst selected one"""
+        while len(self._in_top) < TOP_YEARS and self._rest_best() is not None:
+            self._promote(entered)
+        while True:
+            best, worst = self._rest_best(), self._top_worst()
+            if best is None or worst is None or (-best[0], -best[1]) <= (worst[0], worst[1]):
+                return
+            self._demote(left)
+            self._promote(entered)
+
+    def _compact(self) -> None:
+        """Rebuild both heaps from the live entries"""
+        self._top = [(self._rows[year][1], -year, self._version[year], year) for year in self._in_top]
+        self._rest = [(-row[1], year, self._version[year]) for year, row in self._rows.items()
+                      if year not in self._in_top]
+        heapq.heapify(self._top)
+        heapq.heapify(self._rest)
+
+    def _update(self) -> None:
+        """AIME and PIA from the running top-35 total"""
+        aime = self._top_cents / 100 / (TOP_YEARS * 12)
+        pia, bend_points, *brackets = self.processor._calculate_pia_components(aime, self.pia_year)
+        self._pia = pia
+        self._bend_points = bend_points
+        self._brackets = brackets
+        self.aime = round(aime, 2)
+        self.pia = round(pia, 2)
@@ -21,18 +21,31 @@ import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 import json
 import os
+import uuid
+from collections import OrderedDict
 
 
 # Import our core classes
 from .ss_core_calculator import (
     SocialSecurityConstants,
     IndividualSSCalculator,
-    HouseholdSSCalculator
+    HouseholdSSCalculator,
+    HouseholdScenarioEngine
 )
 from .ssdi_calculator import SSDICalculator
 from .divorced_calculator import DivorcedSSCalculator
 from .widow_calculator import WidowSSCalculator
+from .family_calculator import FamilySSCalculator
+from .incremental_pia import IncrementalPIA
 from .ssa_xml_processor import SSAXMLProcessor, EarningsRecord
+from .xml_parse_cache import XMLParseCache
+from .benefit_grid import claiming_grid
+from .couple_grid import couple_grid
+from .benefit_timeline import serialize_timelines
+from .evaluation_context import EvaluationContext
+from .base_ss_calculator import months_between
+from .mortality import MAX_AGE as MORTALITY_MAX_AGE, survival_curve
+from .cola_paths import ColaPaths, historical_cola_paths, simulate_cola_paths
 # from .bcr_generator import generate_bcr_data, bar_chart_race
 
 # Import API routers
@@ -48,10 +61,23 @@ from api.preferences import router as preferences_router
 load_dotenv()
 
 # Enhanced API Models
+class EvaluationSettings(BaseModel):
+    """As-of date and rounding policy, resolved once per request into an EvaluationContext"""
+    as_of: Optional[date] = Field(None, description="Evaluation date used as 'today' (defaults to the server date)")
+    rounding: Optional[int] = Field(2, ge=0, le=6, description="Decimal places for currency amounts")
+    discount_rate: Optional[float] = Field(None, ge=0.0, le=0.20, description="Adds present-value and real-dollar amounts discounted at this annual rate")
+    cpi_rate: Optional[float] = Field(None, ge=0.0, le=0.20, description="CPI for real dollars (defaults to inflation_rate)")
+
+class MortalitySettings(BaseModel):
+    """Expected-value mode: weight benefit months by survival probability instead of a fixed longevity age"""
+    sex: Optional[str] = Field(None, pattern="^(male|female)$", description="Life table to use (omit for fixed longevity)")
+    mortality_multiplier: float = Field(1.0, gt=0.0, le=3.0, description="Scale applied to the life table's q(x)")
+
 class PersonInput(BaseModel):
     birth_date: date
     pia: Optional[float] = None
     name: Optional[str] = None
+    sex: Optional[str] = Field(None, pattern="^(male|female)$", description="Life table for joint-life simulation")
     
     @validator('birth_date')
     def validate_birth_date(cls, v):
@@ -74,8 +100,9 @@ class XMLAnalysisResponse(BaseModel):
     pia_impact: Optional[Dict] = None
     spreadsheet_data: List[Dict]
     optimization_recommendations: List[str]
+    pia_sensitivity: Optional[Dict] = None  # per-year marginal PIA and zero-year replacement gains
 
-class EnhancedCalculationRequest(BaseModel):
+class EnhancedCalculationRequest(EvaluationSettings):
     spouse1: PersonInput
     spouse2: Optional[PersonInput] = None
     is_married: bool = False
@@ -96,13 +123,23 @@ class EnhancedCalculationRequest(BaseModel):
     # Death scenario analysis
     premature_death_year: Optional[int] = Field(None, ge=2025, le=2100)
 
-class MonthlyOptimizationRequest(BaseModel):
+    # Joint-life Monte Carlo (needs both spouses' sex); omit paths to skip it
+    monte_carlo_paths: Optional[int] = Field(None, ge=1000, le=100000)
+    joint_mortality_correlation: float = Field(0.3, ge=0.0, le=1.0)
+    seed: int = 0
+
+    # "records" (list of dicts) or "columns" (column-oriented arrays)
+    timeline_format: str = Field("records", pattern="^(records|columns)$")
+
+class MonthlyOptimizationRequest(EvaluationSettings):
     """Request for month-by-month optimization analysis"""
     person: PersonInput
     current_age_years: int = Field(..., ge=62, le=70)
     current_age_months: int = Field(0, ge=0, le=11)
     longevity_age: int = Field(90, ge=70, le=100)
     inflation_rate: float = Field(0.025, ge=0.0, le=0.10)
+    # "single" (this month vs next) or "curve" (every month from the current age to 70)
+    mode: str = Field("single", pattern="^(single|curve)$")
 
 class MonthlyOptimizationResponse(BaseModel):
     """Response for month-by-month optimization"""
@@ -112,6 +149,7 @@ class MonthlyOptimizationResponse(BaseModel):
     annual_increase: float
     lifetime_value_of_waiting: float
     recommendation: str
+    curve: Optional[List[Dict[str, Any]]] = None
 
 class BenefitBreakdown(BaseModel):
     """Benefit calculation breakdown for one person"""
@@ -140,13 +178,52 @@ class CalculationResponse(BaseModel):
     optimization_insights: Dict[str, Any]
     chart_data: Dict[str, Any]
 
+class ClaimingGridRequest(EvaluationSettings):
+    """Request for the full 62-70 claiming curve"""
+    birth_date: date
+    pia: float = Field(..., gt=0)
+    longevity_ages: List[int] = Field(default_factory=lambda: [80, 85, 90, 95])
+    inflation_rates: List[float] = Field(default_factory=lambda: [0.0, 0.025, 0.03])
+
+class ClaimingGridResponse(BaseModel):
+    """Dense claiming grid: monthly_benefit[claim][rate], lifetime_total[claim][longevity][rate]"""
+    claim_age_months: List[int]
+    longevity_ages: List[int]
+    inflation_rates: List[float]
+    monthly_benefit: List[List[float]]
+    lifetime_total: List[List[List[float]]]
+    optimal_claim_age_months: List[List[int]]
+
+class CoupleOptimizationRequest(EvaluationSettings):
+    """Request for the 97 x 97 couple claim-month search"""
+    spouse1_birth_date: date
+    spouse1_pia: float = Field(..., gt=0)
+    spouse2_birth_date: date
+    spouse2_pia: float = Field(..., gt=0)
+    death_age_pairs: List[List[int]] = Field(default_factory=lambda: [[85, 90], [90, 90], [95, 95]])
+    weights: Optional[List[float]] = None
+    inflation_rate: float = Field(0.025, ge=0.0, le=0.10)
+    include_surface: bool = True
+
+class CoupleOptimizationResponse(BaseModel):
+    """Optimal claim-month pair and (optionally) the expected household total surface[spouse1][spouse2]"""
+    claim_age_months: List[int]
+    death_age_pairs: List[List[int]]
+    weights: List[float]
+    inflation_rate: float
+    spouse1_monthly_benefit: List[float]
+    spouse2_monthly_benefit: List[float]
+    optimal_pair: Dict[str, Any]
+    optimal_pair_by_death_pair: List[Dict[str, Any]]
+    expected_total: Optional[List[List[float]]] = None
+
 class BCRRequest(BaseModel):
     birth_date: date
     pia: float
     longevity_age: int = 95
     inflation_rate: float = 0.025
 
-class DivorcedCalculationRequest(BaseModel):
+class DivorcedCalculationRequest(EvaluationSettings, MortalitySettings):
     """Request for divorced individual calculation"""
     birth_date: date
     own_pia: float = Field(..., gt=0, description="Person's own PIA")
@@ -158,6 +235,10 @@ class DivorcedCalculationRequest(BaseModel):
     child_birth_date: Optional[date] = None
     longevity_age: int = Field(95, ge=70, le=100)
     inflation_rate: float = Field(0.025, ge=0.0, le=0.10)
+    top_n: Optional[int] = Field(None, ge=1, description="Return only the best N strategies")
+    rank_by: str = Field("nominal", pattern="^(nominal|present_value|real_value)$", description="Measure strategies are ranked on (present/real need discount_rate)")
+    exhaustive: bool = Field(False, description="Search every filing and restricted-application switch month")
+    timeline_format: str = Field("records", pattern="^(records|columns)$")
 
 class DivorcedCalculationResponse(BaseModel):
     """Response for divorced individual calculation"""
@@ -167,8 +248,11 @@ class DivorcedCalculationResponse(BaseModel):
     all_strategies: List[Dict[str, Any]]
     child_in_care_details: Optional[Dict[str, Any]]
     deemed_filing_applies: bool
+    break_even: Optional[Dict[str, Any]] = None  # crossover matrix and dominance intervals
+    valuation: Optional[Dict[str, Any]] = None  # fixed longevity or expected value basis
+    search: Optional[Dict[str, Any]] = None  # exhaustive search summary and heatmap
 
-class WidowCalculationRequest(BaseModel):
+class WidowCalculationRequest(EvaluationSettings, MortalitySettings):
     """Request for widowed individual calculation"""
     birth_date: date
     own_pia: float = Field(..., gt=0, description="Person's own PIA")
@@ -179,6 +263,10 @@ class WidowCalculationRequest(BaseModel):
     remarriage_date: Optional[date] = None
     longevity_age: int = Field(95, ge=70, le=100)
     inflation_rate: float = Field(0.025, ge=0.0, le=0.10)
+    top_n: Optional[int] = Field(None, ge=1, description="Return only the best N strategies")
+    rank_by: str = Field("nominal", pattern="^(nominal|present_value|real_value)$", description="Measure strategies are ranked on (present/real need discount_rate)")
+    exhaustive: bool = Field(False, description="Search every survivor/own claim month in both directions")
+    timeline_format: str = Field("records", pattern="^(records|columns)$")
 
 class WidowCalculationResponse(BaseModel):
     """Response for widowed individual calculation"""
@@ -186,6 +274,9 @@ class WidowCalculationResponse(BaseModel):
     eligibility_reason: str
     optimal_strategy: Optional[Dict[str, Any]]
     all_strategies: List[Dict[str, Any]]
+    break_even: Optional[Dict[str, Any]] = None  # crossover matrix and dominance intervals
+    valuation: Optional[Dict[str, Any]] = None  # fixed longevity or expected value basis
+    search: Optional[Dict[str, Any]] = None  # exhaustive search summary
 
 class EarningsYearInput(BaseModel):
     """Single year of earnings input"""
@@ -212,6 +303,39 @@ class PIACalculationResult(BaseModel):
     highest_year_in_top_35: float
     calculation_details: Dict[str, float]
 
+class PIAEarningsEdit(BaseModel):
+    """One spreadsheet edit: set a year's earnings, or remove the year"""
+    year: int = Field(..., ge=1937, le=2100)
+    earnings: Optional[float] = Field(None, ge=0, description="New earnings (omit to remove the year)")
+
+class PIAEditRequest(BaseModel):
+    """Edits applied in order to a PIA session"""
+    edits: List[PIAEarningsEdit] = Field(..., min_length=1, max_length=200)
+
+class PIASessionResponse(BaseModel):
+    """PIA session state after creation or an edit"""
+    session_id: str
+    result: PIACalculationResult
+    pia_change: float = 0.0
+    entered_top_35: List[int] = []
+    left_top_35: List[int] = []
+
+class PIASensitivityRequest(ManualPIACalculationRequest):
+    """Request for per-year marginal PIA sensitivity"""
+    replacement_salary: Optional[float] = Field(None, ge=0, description="Salary replacing each zero year (latest nonzero earnings if omitted)")
+
+class PIASensitivityResponse(BaseModel):
+    """Marginal AIME / PIA per year and zero-year replacement gains"""
+    aime: float
+    pia: float
+    pia_year: int
+    bend_points_used: List[int]
+    bracket_rate: float
+    lowest_indexed_in_top_35: float
+    replacement_salary: float
+    years: List[Dict[str, Any]]
+    recommendations: List[str]
+
 class WhatIfComparisonRequest(BaseModel):
     """Request to compare original vs modified earnings"""
     birth_year: int = Field(..., ge=1937, le=2010)
@@ -224,12 +348,13 @@ class WhatIfComparisonResult(BaseModel):
     modified: PIACalculationResult
     impact: Dict[str, float]  # monthly_change, annual_change, lifetime_25_years
 
-class SSDICalculationRequest(BaseModel):
+class SSDICalculationRequest(EvaluationSettings, MortalitySettings):
     """Request for SSDI benefit analysis"""
     birth_date: date
     pia: float = Field(..., gt=0, description="Estimated Primary Insurance Amount")
     inflation_rate: float = Field(0.025, ge=0.0, le=0.10)
     longevity_age: int = Field(90, ge=70, le=100)
+    suspension_top_n: Optional[int] = Field(None, ge=1, le=50, description="Also return the best N suspend/resume windows")
 
 class SSDICalculationResponse(BaseModel):
     """Response for SSDI calculation and comparison"""
@@ -239,6 +364,102 @@ class SSDICalculationResponse(BaseModel):
     early_retirement: Dict[str, Any] # eligible, amount, reduction_percent
     strategies: Dict[str, Any] # standard vs suspension
     timeline: List[Dict[str, Any]] # Year by year data for charts
+    break_even: Optional[Dict[str, Any]] = None # crossover matrix and dominance intervals
+    valuation: Optional[Dict[str, Any]] = None # fixed longevity or expected value basis
+    suspension_options: Optional[Dict[str, Any]] = None # best suspend/resume windows
+
+class EarningsTestRequest(EvaluationSettings, MortalitySettings):
+    """Request for own benefits claimed while working, under the retirement earnings test"""
+    birth_date: date
+    pia: float = Field(..., gt=0)
+    inflation_rate: float = Field(0.025, ge=0.0, le=0.10)
+    longevity_age: int = Field(90, ge=70, le=100)
+    # Spreadsheet rows; years from the as-of year on are the projection
+    projected_earnings: List[EarningsYearInput] = Field(..., min_length=1)
+    earnings_scales: List[float] = Field([0.5, 1.0, 1.5], min_length=1, max_length=20,
+                                         description="Earnings levels as multiples of the projection")
+
+class EarningsTestResponse(BaseModel):
+    """Earnings-tested totals for every claim month (rows) x earnings level (columns)"""
+    claim_age_months: List[int]
+    years: List[int]
+    earnings: List[List[float]]  # [level][year] projected earnings
+    withheld: List[List[float]]  # [claim][level] total benefits withheld
+    withheld_months: List[List[int]]
+    adjustment: List[List[float]]  # benefit multiplier from FRA on (recomputed reduction)
+    base_totals: Dict[str, List[float]]  # measure -> [claim] totals without the test
+    totals: Dict[str, List[List[float]]]  # measure -> [claim][level]
+    best_claim_age_months: List[int]  # per level
+    ranked_by: str
+
+class ChildInput(BaseModel):
+    """One dependent child (a row of the children table)"""
+    date_of_birth: date
+    is_disabled: bool = False
+
+class FamilyBenefitsRequest(EvaluationSettings, MortalitySettings):
+    """Request for worker, spouse and child benefits under the family maximum"""
+    birth_date: date
+    pia: float = Field(..., gt=0)
+    claiming_age: int = Field(..., ge=62, le=70)
+    claiming_age_months: int = Field(0, ge=0, le=11)
+    inflation_rate: float = Field(0.025, ge=0.0, le=0.10)
+    longevity_age: int = Field(90, ge=70, le=100)
+    spouse_birth_date: Optional[date] = None
+    spouse_pia: float = Field(0.0, ge=0)
+    spouse_claim_age_months: Optional[int] = Field(None, ge=744, le=840, description="Spouse's claim age (their FRA if omitted)")
+    children: List[ChildInput] = Field(default_factory=list, max_length=10)
+
+class FamilyBenefitsResponse(BaseModel):
+    """Family totals for every worker claim month and the yearly allocation for the requested one"""
+    family_maximum: float
+    claim_age_months: List[int]
+    beneficiaries: List[str]
+    totals: Dict[str, Dict[str, List[float]]]  # measure -> beneficiary -> [claim]
+    household_totals: Dict[str, List[float]]  # measure -> [claim]
+    best_claim_age_months: int
+    ranked_by: str
+    claim_age_months_detail: int
+    timeline: List[Dict[str, Any]]  # per year: monthly / annual per beneficiary, family maximum
+    valuation: Optional[Dict[str, Any]] = None
+
+class LifeExpectancyRequest(EvaluationSettings):
+    """Request for a survival curve from the bundled period life tables"""
+    birth_date: date
+    sex: str = Field(..., pattern="^(male|female)$")
+    mortality_multiplier: float = Field(1.0, gt=0.0, le=3.0, description="Scale applied to the life table's q(x)")
+
+class LifeExpectancyResponse(BaseModel):
+    """Life expectancy, survival thresholds and a yearly survival curve"""
+    current_age: float
+    life_expectancy_age: float
+    threshold_ages: Dict[str, Optional[float]]  # age at which survival falls to 50% / 25% / 10%
+    survival_curve: List[Dict[str, float]]  # age, probability
+
+class ColaBandsRequest(EvaluationSettings):
+    """Request for benefit percentile bands over many annual COLA paths"""
+    birth_date: date
+    pia: float = Field(..., gt=0)
+    claiming_age: int = Field(..., ge=62, le=70)
+    claiming_age_months: int = Field(0, ge=0, le=11)
+    longevity_age: int = Field(90, ge=70, le=100)
+    # "simulated" (AR(1) around a mean), "historical" (replayed SSA COLAs) or "custom" (cola_paths)
+    source: str = Field("simulated", pattern="^(simulated|historical|custom)$")
+    cola_paths: Optional[List[List[float]]] = Field(None, description="[paths][years] COLAs from the as-of year on")
+    paths: int = Field(5000, ge=1, le=50000)
+    mean_cola: float = Field(0.025, ge=0.0, le=0.10)
+    cola_volatility: float = Field(0.015, ge=0.0, le=0.10)
+    cola_persistence: float = Field(0.6, ge=0.0, lt=1.0)
+    seed: int = 0
+
+class ColaBandsResponse(BaseModel):
+    """Yearly percentile bands of the monthly and cumulative benefit"""
+    paths: int
+    years: List[int]
+    months_paid: List[int]
+    monthly_benefit: Dict[str, List[float]]  # percentile -> value per year
+    cumulative_benefits: Dict[str, List[float]]
+    lifetime_total: Dict[str, Any]
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -254,6 +475,17 @@ _allowed_origins = (
     if _origins_env else ["*"]
 )
 
+# Limits on uploaded SSA XML files (SSA_XML_MAX_BYTES / SSA_XML_MAX_RECORDS env)
+_xml_max_bytes = int(os.getenv("SSA_XML_MAX_BYTES", SSAXMLProcessor.MAX_XML_BYTES))
+_xml_max_records = int(os.getenv("SSA_XML_MAX_RECORDS", SSAXMLProcessor.MAX_EARNINGS_RECORDS))
+
+# Parse cache of uploaded statements, persisted in SSA_XML_CACHE_DIR if set
+SSAXMLProcessor.parse_cache = XMLParseCache(
+    max_entries=int(os.getenv("SSA_XML_CACHE_ENTRIES", 256)),
+    max_bytes=int(os.getenv("SSA_XML_CACHE_BYTES", 16 * 1024 * 1024)),
+    directory=os.getenv("SSA_XML_CACHE_DIR") or None
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_allowed_origins,  # Configure for production
@@ -276,6 +508,9 @@ logger.info(f"CORS allowed_origins={_allowed_origins}")
 
 # Global session storage (use proper session management in production)
 user_sessions = {}
+# Incremental PIA models of the spreadsheet UI, least recently used dropped first
+pia_sessions: "OrderedDict[str, IncrementalPIA]" = OrderedDict()
+MAX_PIA_SESSIONS = 1000
 
 @app.get("/")
 async def root():
@@ -339,12 +574,10 @@ async def upload_ssa_xml(
         raise HTTPException(status_code=400, detail="File must be XML format")
     
     try:
-        # Read and process XML
-        content = await file.read()
-        xml_content = content.decode('utf-8')
-        
+        # Parse the spooled upload chunk by chunk (never read whole into memory);
+        # a repeat upload of the same bytes is served from the parse cache
         processor = SSAXMLProcessor()
-        parse_result = processor.parse_ssa_xml(xml_content)
+        parse_result = processor.parse_ssa_xml(file.file, max_bytes=_xml_max_bytes, max_records=_xml_max_records)
         
         # Extract birth date from XML if not provided
         if not birth_date:
@@ -366,13 +599,16 @@ async def upload_ssa_xml(
         # Create editable spreadsheet
         spreadsheet = processor.create_editable_spreadsheet()
 
-        # Generate simple recommendations
+        # Recommendations from the per-year sensitivity (top-35 method only)
+        sensitivity = None
         recommendations = []
-        zero_years = sum(1 for e in processor.earnings_history if e.earnings == 0)
-        if zero_years > 0:
-            recommendations.append(f"You have {zero_years} years with $0 earnings. Working additional years could replace these zeros and increase your PIA.")
-        if len(processor.earnings_history) < 35:
-            recommendations.append(f"You have {len(processor.earnings_history)} years of earnings. Working to 35 years maximizes your benefit calculation.")
+        if calculation_method == "disability" and disability_onset_date:
+            zero_years = sum(1 for e in processor.earnings_history if e.earnings == 0)
+            if zero_years > 0:
+                recommendations.append(f"You have {zero_years} years with $0 earnings. Working additional years could replace these zeros and increase your PIA.")
+        else:
+            sensitivity = processor.calculate_pia_sensitivity()
+            recommendations = _generate_pia_recommendations(processor, sensitivity)
         
         # Store in session
         session_id = f"user_{datetime.now().timestamp()}"
@@ -387,7 +623,8 @@ async def upload_ssa_xml(
             earnings_summary=parse_result,
             original_pia=original_pia,
             spreadsheet_data=spreadsheet,
-            optimization_recommendations=recommendations
+            optimization_recommendations=recommendations,
+            pia_sensitivity=sensitivity
         )
         
     except Exception as e:
@@ -491,53 +728,47 @@ def calculate_benefits(request: EnhancedCalculationRequest):
         else:
             spouse1_pia = request.spouse1.pia
         
-        spouse1_calc = IndividualSSCalculator(request.spouse1.birth_date, spouse1_pia)
+        context = _evaluation_context(request)
+        spouse1_calc = IndividualSSCalculator(request.spouse1.birth_date, spouse1_pia, context)
         
         spouse2_calc = None
         if request.is_married and request.spouse2:
-            spouse2_calc = IndividualSSCalculator(request.spouse2.birth_date, request.spouse2.pia)
+            spouse2_calc = IndividualSSCalculator(request.spouse2.birth_date, request.spouse2.pia, context)
         
-        # Calculate scenarios
-        scenarios = []
-        
-        # Current selection
-        s1_benefits = spouse1_calc.calculate_lifetime_benefits(
-            request.spouse1_claiming_age, request.spouse1_longevity, request.inflation_rate
+        household = HouseholdSSCalculator(spouse1_calc, spouse2_calc)
+        engine = HouseholdScenarioEngine(
+            household,
+            (request.spouse1_longevity, request.spouse2_longevity),
+            request.inflation_rate
         )
-        
+
+        # Current selection (full yearly breakdowns)
+        s1_benefits = engine.spouse_lifetime(1, request.spouse1_claiming_age, summary_only=False)
         s2_benefits = None
         if spouse2_calc:
-            s2_benefits = spouse2_calc.calculate_lifetime_benefits(
-                request.spouse2_claiming_age, request.spouse2_longevity, request.inflation_rate
-            )
-        
-        total_benefits = s1_benefits['total_lifetime_benefits'] + \
-                        (s2_benefits['total_lifetime_benefits'] if s2_benefits else 0)
-        
-        # Pass inflation to get correct adjustment percent
-        current_scenario = ScenarioComparison(
-            scenario_name='Current Selection',
-            spouse1_claiming_age=request.spouse1_claiming_age,
-            spouse2_claiming_age=request.spouse2_claiming_age,
-            total_household_benefits=total_benefits,
-            spouse1_breakdown=BenefitBreakdown(
-                pia=spouse1_pia,
-                claiming_age=request.spouse1_claiming_age,
-                monthly_benefit=s1_benefits['initial_monthly_benefit'],
-                annual_benefit=s1_benefits['initial_monthly_benefit'] * 12,
-                lifetime_benefits=s1_benefits['total_lifetime_benefits'],
-                reduction_or_credit_percent=_calculate_adjustment_percent(spouse1_calc, request.spouse1_claiming_age, request.inflation_rate)
-            ),
-            spouse2_breakdown=BenefitBreakdown(
-                pia=request.spouse2.pia if request.spouse2 else 0,
-                claiming_age=request.spouse2_claiming_age or 0,
-                monthly_benefit=s2_benefits['initial_monthly_benefit'] if s2_benefits else 0,
-                annual_benefit=(s2_benefits['initial_monthly_benefit'] * 12) if s2_benefits else 0,
-                lifetime_benefits=s2_benefits['total_lifetime_benefits'] if s2_benefits else 0,
-                reduction_or_credit_percent=_calculate_adjustment_percent(spouse2_calc, request.spouse2_claiming_age, request.inflation_rate) if spouse2_calc else 0
-            ) if request.is_married else None
-        )
-        scenarios.append(current_scenario)
+            s2_benefits = engine.spouse_lifetime(2, request.spouse2_claiming_age, summary_only=False)
+
+        current_scenario = _build_scenario_comparison(
+            'Current Selection',
+            engine.evaluate(request.spouse1_claiming_age, request.spouse2_claiming_age),
+            spouse1_calc, spouse2_calc, request
+        )
+        scenarios = [current_scenario]
+
+        # Comparison scenarios share the engine's memoized per-spouse results
+        scenario_names = {
+            'both_at_62': 'Both File at 62',
+            'both_at_70': 'Both File at 70',
+            'optimized_mixed': 'Higher Earner Waits'
+        }
+        for key, ages in engine.standard_scenarios().items():
+            scenarios.append(_build_scenario_comparison(
+                scenario_names[key], engine.evaluate(*ages), spouse1_calc, spouse2_calc, request
+            ))
+        scenarios.append(_build_scenario_comparison(
+            'Best Annual Combination', engine.comparison_table()[0], spouse1_calc, spouse2_calc, request
+        ))
+        best_scenario = max(scenarios, key=lambda s: s.total_household_benefits)
         
         # Generate chart data for visualizations
         chart_data = _generate_chart_data(scenarios, request)
@@ -551,8 +782,8 @@ def calculate_benefits(request: EnhancedCalculationRequest):
         
         # Generate optimization insights
         optimization_insights = {
-            'best_strategy': current_scenario.scenario_name,
-            'optimization_value': 0,  # Would calculate from multiple scenarios
+            'best_strategy': best_scenario.scenario_name,
+            'optimization_value': round(best_scenario.total_household_benefits - current_scenario.total_household_benefits, 2),
             'key_insights': _generate_key_insights(scenarios, request.is_married),
             'survivor_analysis': survivor_analysis
         }
@@ -563,8 +794,8 @@ def calculate_benefits(request: EnhancedCalculationRequest):
                 'total_scenarios_analyzed': len(scenarios),
                 'xml_integration_used': request.spouse1.pia is None
             },
-            spouse1_analysis=s1_benefits,
-            spouse2_analysis=s2_benefits,
+            spouse1_analysis=serialize_timelines(s1_benefits, request.timeline_format),
+            spouse2_analysis=serialize_timelines(s2_benefits, request.timeline_format),
             scenario_comparisons=scenarios,
             optimization_insights=optimization_insights,
             chart_data=chart_data
@@ -588,7 +819,10 @@ def monthly_optimization(request: MonthlyOptimizationRequest):
             session = list(user_sessions.values())[-1]
             pia = session['calculator'].pia
         
-        calc = IndividualSSCalculator(request.person.birth_date, pia)
+        calc = IndividualSSCalculator(request.person.birth_date, pia, _evaluation_context(request))
+
+        if request.mode == "curve":
+            return _monthly_optimization_curve(calc, request)
         
         # Current benefit
         current_benefit = calc.calculate_monthly_benefit(request.current_age_years, request.current_age_months, request.inflation_rate)
@@ -615,50 +849,150 @@ def monthly_optimization(request: MonthlyOptimizationRequest):
         annual_increase = monthly_increase * 12
         lifetime_value = next_month_lifetime['total_lifetime_benefits'] - current_lifetime['total_lifetime_benefits']
         
-        # Generate recommendation
-        if lifetime_value > 5000:
-            recommendation = f"Consider waiting - one month delay adds ${lifetime_value:,.0f} lifetime value"
-        elif lifetime_value > 1000:
-            recommendation = f"Moderate benefit to waiting - adds ${lifetime_value:,.0f} over lifetime"
-        else:
-            recommendation = f"Minimal benefit to waiting - only ${lifetime_value:,.0f} additional lifetime value"
-        
         return MonthlyOptimizationResponse(
             current_monthly_benefit=round(current_benefit, 2),
             next_month_benefit=round(next_month_benefit, 2),
             monthly_increase=round(monthly_increase, 2),
             annual_increase=round(annual_increase, 2),
             lifetime_value_of_waiting=round(lifetime_value, 2),
-            recommendation=recommendation
+            recommendation=_waiting_recommendation(lifetime_value)
         )
         
     except Exception as e:
         logger.error(f"Monthly optimization error: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Monthly optimization failed: {str(e)}")
 
+@app.post("/claiming-grid", response_model=ClaimingGridResponse)
+def calculate_claiming_grid(request: ClaimingGridRequest):
+    """
+    Evaluate every claim month from 62y0m to 70y0m for each longevity age and
+    inflation rate in a single vectorized pass.
+    """
+    try:
+        grid = claiming_grid(
+            birth_date=request.birth_date,
+            pia=request.pia,
+            longevity_ages=request.longevity_ages,
+            inflation_rates=request.inflation_rates,
+            as_of=_evaluation_context(request).as_of
+        )
+        return ClaimingGridResponse(**grid.to_dict())
+
+    except Exception as e:
+        logger.error(f"Claiming grid error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Claiming grid failed: {str(e)}")
+
+@app.post("/couple-optimization", response_model=CoupleOptimizationResponse)
+def calculate_couple_optimization(request: CoupleOptimizationRequest):
+    """
+    Evaluate every spouse1 x spouse2 claim month (62y0m-70y0m) with spousal
+    top-ups and the survivor step-up, for each death-age pair.
+    """
+    try:
+        grid = couple_grid(
+            spouse1_birth_date=request.spouse1_birth_date,
+            spouse1_pia=request.spouse1_pia,
+            spouse2_birth_date=request.spouse2_birth_date,
+            spouse2_pia=request.spouse2_pia,
+            death_age_pairs=request.death_age_pairs,
+            inflation_rate=request.inflation_rate,
+            weights=request.weights,
+            as_of=_evaluation_context(request).as_of
+        )
+        return CoupleOptimizationResponse(**grid.to_dict(include_surface=request.include_surface))
+
+    except Exception as e:
+        logger.error(f"Couple optimization error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Couple optimization failed: {str(e)}")
+
 # Helper functions
-def _generate_pia_recommendations(earnings_history: List[EarningsRecord], calculator: IndividualSSCalculator) -> List[str]:
-    """Generate recommendations for PIA optimization"""
+def _round_optional(value: Optional[float], digits: int = 2) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
+def _waiting_recommendation(lifetime_value: float) -> str:
+    """One-line advice for the lifetime value of a one-month delay"""
+    if lifetime_value > 5000:
+        return f"Consider waiting - one month delay adds ${lifetime_value:,.0f} lifetime value"
+    elif lifetime_value > 1000:
+        return f"Moderate benefit to waiting - adds ${lifetime_value:,.0f} over lifetime"
+    return f"Minimal benefit to waiting - only ${lifetime_value:,.0f} additional lifetime value"
+
+def _monthly_optimization_curve(calc: IndividualSSCalculator, request: MonthlyOptimizationRequest) -> MonthlyOptimizationResponse:
+    """Answer the this-month-vs-next question from the full waiting curve (one pass to age 70)"""
+    curve = calc.calculate_waiting_curve(
+        request.current_age_years, request.current_age_months, request.longevity_age, request.inflation_rate
+    )
+    if not curve:
+        # Past 70 there is nothing left to gain by waiting
+        benefit = round(calc.calculate_monthly_benefit(
+            request.current_age_years, request.current_age_months, request.inflation_rate
+        ), 2)
+        return MonthlyOptimizationResponse(
+            current_monthly_benefit=benefit,
+            next_month_benefit=benefit,
+            monthly_increase=0.0,
+            annual_increase=0.0,
+            lifetime_value_of_waiting=0.0,
+            recommendation=_waiting_recommendation(0.0),
+            curve=[]
+        )
+    current = curve[0]
+    next_month = curve[1] if len(curve) > 1 else current
+
+    return MonthlyOptimizationResponse(
+        current_monthly_benefit=current['monthly_benefit'],
+        next_month_benefit=next_month['monthly_benefit'],
+        monthly_increase=current['marginal_monthly_increase'],
+        annual_increase=round(current['marginal_monthly_increase'] * 12, 2),
+        lifetime_value_of_waiting=current['marginal_lifetime_value'],
+        recommendation=_waiting_recommendation(current['marginal_lifetime_value']),
+        curve=curve
+    )
+
+def _evaluation_context(request: EvaluationSettings) -> EvaluationContext:
+    """Resolve the request's as-of date, rounding and present-value basis once."""
+    return EvaluationContext.resolve(request.as_of, request.rounding, request.discount_rate, request.cpi_rate)
+
+def _generate_pia_recommendations(processor: SSAXMLProcessor, sensitivity: Dict[str, Any]) -> List[str]:
+    """Recommendations for PIA optimization from the per-year sensitivity analysis"""
     recommendations = []
-    
-    zero_years = [e for e in earnings_history if e.is_zero]
-    low_years = [e for e in earnings_history if 0 < e.earnings < 20000]
-    
-    if zero_years:
-        recommendations.append(f"You have {len(zero_years)} zero-earning years. Each year you can replace with earnings will increase your PIA.")
-    
-    if low_years:
-        recommendations.append(f"You have {len(low_years)} low-earning years under $20K. Higher earning years will push these out of your top 35.")
-    
+    rows = sensitivity['years']
+    salary = sensitivity['replacement_salary']
+
+    gains = [row for row in rows if row['zero_replacement_pia_gain']]
+    if gains:
+        best = max(gains, key=lambda row: row['zero_replacement_pia_gain'])
+        recommendations.append(
+            f"Replacing a zero-earning year with ${salary:,.0f} would raise your PIA by up to "
+            f"${best['zero_replacement_pia_gain']:,.2f}/month ({len(gains)} zero years qualify, best: {best['year']})."
+        )
+
+    counted = [row for row in rows if row['pia_per_1000'] > 0 and row['on_record']]
+    if counted:
+        recommendations.append(
+            f"Each extra $1,000 earned in a counted year adds ${max(row['pia_per_1000'] for row in counted):.2f}"
+            f"/month to your PIA at most (your AIME is in the {sensitivity['bracket_rate']:.0%} bracket)."
+        )
+
+    capped = [row['year'] for row in rows if row['is_capped'] and row['in_top_35']]
+    if capped:
+        recommendations.append(
+            f"{len(capped)} of your top-35 years are at the taxable maximum: more earnings in those years add nothing."
+        )
+
+    if sensitivity['lowest_indexed_in_top_35'] > 0:
+        recommendations.append(
+            f"A new year must exceed ${sensitivity['lowest_indexed_in_top_35']:,.0f} in indexed earnings "
+            f"to enter your top 35 and push out your lowest year."
+        )
+
     current_year = datetime.now().year
-    age_62_year = calculator.birth_year + 62
-    
-    if age_62_year > current_year:
-        years_until_62 = age_62_year - current_year
+    if processor.birth_year and processor.birth_year + 62 > current_year:
+        years_until_62 = processor.birth_year + 62 - current_year
         recommendations.append(f"If you stop working at 62, you\'ll add {years_until_62} zero-earning years to your record.")
-    
+
     recommendations.append("Use the spreadsheet to test different scenarios and see the impact on your PIA.")
-    
+
     return recommendations
 
 def _generate_optimization_insights(pia_impact: Dict, modified_earnings: List[Dict]) -> List[str]:
@@ -678,6 +1012,37 @@ def _generate_optimization_insights(pia_impact: Dict, modified_earnings: List[Di
     
     return insights
 
+def _build_scenario_comparison(name: str, cell: Dict, spouse1_calc: IndividualSSCalculator,
+                               spouse2_calc: Optional[IndividualSSCalculator],
+                               request: EnhancedCalculationRequest) -> ScenarioComparison:
+    """Turn one HouseholdScenarioEngine cell into a ScenarioComparison."""
+    s1_benefits = cell['spouse1_benefits']
+    s2_benefits = cell['spouse2_benefits']
+
+    # Pass inflation to get correct adjustment percent
+    return ScenarioComparison(
+        scenario_name=name,
+        spouse1_claiming_age=cell['spouse1_claiming_age'],
+        spouse2_claiming_age=cell['spouse2_claiming_age'],
+        total_household_benefits=cell['total_household_benefits'],
+        spouse1_breakdown=BenefitBreakdown(
+            pia=spouse1_calc.pia,
+            claiming_age=cell['spouse1_claiming_age'],
+            monthly_benefit=s1_benefits['initial_monthly_benefit'],
+            annual_benefit=s1_benefits['initial_monthly_benefit'] * 12,
+            lifetime_benefits=s1_benefits['total_lifetime_benefits'],
+            reduction_or_credit_percent=_calculate_adjustment_percent(spouse1_calc, cell['spouse1_claiming_age'], request.inflation_rate)
+        ),
+        spouse2_breakdown=BenefitBreakdown(
+            pia=request.spouse2.pia if request.spouse2 else 0,
+            claiming_age=cell['spouse2_claiming_age'] or 0,
+            monthly_benefit=s2_benefits['initial_monthly_benefit'] if s2_benefits else 0,
+            annual_benefit=(s2_benefits['initial_monthly_benefit'] * 12) if s2_benefits else 0,
+            lifetime_benefits=s2_benefits['total_lifetime_benefits'] if s2_benefits else 0,
+            reduction_or_credit_percent=_calculate_adjustment_percent(spouse2_calc, cell['spouse2_claiming_age'], request.inflation_rate) if spouse2_calc and s2_benefits else 0
+        ) if request.is_married else None
+    )
+
 def _calculate_adjustment_percent(calc: IndividualSSCalculator, claiming_age: int, inflation_rate: float) -> float:
     """Calculate the reduction or credit percentage for claiming age, including pre-claiming inflation."""
     # First, get the final monthly benefit, which includes all adjustments (inflation, reduction/credit)
@@ -722,14 +1087,46 @@ def _calculate_survivor_impact(spouse1_calc: IndividualSSCalculator, spouse2_cal
     survivor_benefit = max(spouse1_benefit, spouse2_benefit)
     lost_benefit = min(spouse1_benefit, spouse2_benefit)
 
+    # Either spouse dies in the premature death year; the other lives to their longevity
+    household = HouseholdSSCalculator(spouse1_calc, spouse2_calc)
+    death_age_pairs = [
+        (request.premature_death_year - spouse1_calc.birth_date.year, request.spouse2_longevity),
+        (request.spouse1_longevity, request.premature_death_year - spouse2_calc.birth_date.year)
+    ]
+    grid = household.optimize_claiming_months(death_age_pairs, request.inflation_rate)
+    best1, best2 = grid.optimal_pair()
+
     return {
         'income_before_death': spouse1_benefit + spouse2_benefit,
         'income_after_death': survivor_benefit,
         'monthly_income_loss': lost_benefit,
         'annual_income_loss': lost_benefit * 12,
-        'analysis': f"Income drops from ${(spouse1_benefit + spouse2_benefit):,.0f} to ${survivor_benefit:,.0f} per month"
+        'analysis': f"Income drops from ${(spouse1_benefit + spouse2_benefit):,.0f} to ${survivor_benefit:,.0f} per month",
+        'selected_household_total': round(grid.total_at(
+            (request.spouse1_claiming_age, 0), (request.spouse2_claiming_age, 0)
+        ), 2),
+        'optimal_claiming_with_survivor_step_up': {
+            'spouse1_claim_age_months': best1,
+            'spouse2_claim_age_months': best2,
+            'expected_household_total': round(float(grid.expected_total().max()), 2)
+        },
+        'joint_life': _joint_life_distribution(household, request)
     }
 
+def _joint_life_distribution(household: HouseholdSSCalculator, request: EnhancedCalculationRequest) -> Optional[Dict]:
+    """Monte Carlo over both death ages, for the selected and the 62/FRA/70 claiming pairs"""
+    sexes = (request.spouse1.sex, request.spouse2.sex)
+    if not request.monte_carlo_paths or None in sexes:
+        return None
+
+    selected = (request.spouse1_claiming_age * 12, request.spouse2_claiming_age * 12)
+    candidates = [selected] + [pair for pair in household.default_claiming_pairs() if pair != selected]
+    simulation = household.simulate_joint_life(
+        sexes, candidates, request.monte_carlo_paths,
+        request.joint_mortality_correlation, request.inflation_rate, request.seed
+    )
+    return simulation.to_dict()
+
 @app.post("/calculate-divorced", response_model=DivorcedCalculationResponse)
 def calculate_divorced(request: DivorcedCalculationRequest):
     """
@@ -746,22 +1143,33 @@ def calculate_divorced(request: DivorcedCalculationRequest):
             divorce_date=request.divorce_date,
             is_remarried=request.is_remarried,
             has_child_under_16=request.has_child_under_16,
-            child_birth_date=request.child_birth_date
+            child_birth_date=request.child_birth_date,
+            context=_evaluation_context(request)
         )
 
         # Calculate optimal strategy
         result = calc.calculate_optimal_strategy(
             longevity_age=request.longevity_age,
-            inflation_rate=request.inflation_rate
+            inflation_rate=request.inflation_rate,
+            top_n=request.top_n,
+            sex=request.sex,
+            mortality_multiplier=request.mortality_multiplier,
+            rank_by=request.rank_by,
+            exhaustive=request.exhaustive
         )
 
+        result = serialize_timelines(result, request.timeline_format)
+
         return DivorcedCalculationResponse(
             eligible_for_ex_spouse=result['eligible_for_ex_spouse'],
             eligibility_reason=result['eligibility_reason'],
             optimal_strategy=result.get('optimal_strategy'),
             all_strategies=result.get('all_strategies', []),
             child_in_care_details=result.get('child_in_care_details'),
-            deemed_filing_applies=result.get('deemed_filing_applies', False)
+            deemed_filing_applies=result.get('deemed_filing_applies', False),
+            break_even=result.get('break_even'),
+            valuation=result.get('valuation'),
+            search=result.get('search')
         )
 
     except Exception as e:
@@ -783,20 +1191,31 @@ def calculate_widow(request: WidowCalculationRequest):
             deceased_actual_benefit=request.deceased_actual_benefit,
             deceased_spouse_death_date=request.deceased_spouse_death_date,
             is_remarried=request.is_remarried,
-            remarriage_date=request.remarriage_date
+            remarriage_date=request.remarriage_date,
+            context=_evaluation_context(request)
         )
 
         # Calculate optimal strategy
         result = calc.calculate_optimal_strategy(
             longevity_age=request.longevity_age,
-            inflation_rate=request.inflation_rate
+            inflation_rate=request.inflation_rate,
+            top_n=request.top_n,
+            sex=request.sex,
+            mortality_multiplier=request.mortality_multiplier,
+            rank_by=request.rank_by,
+            exhaustive=request.exhaustive
         )
 
+        result = serialize_timelines(result, request.timeline_format)
+
         return WidowCalculationResponse(
             eligible_for_survivor=result['eligible_for_survivor'],
             eligibility_reason=result['eligibility_reason'],
             optimal_strategy=result.get('optimal_strategy'),
-            all_strategies=result.get('all_strategies', [])
+            all_strategies=result.get('all_strategies', []),
+            break_even=result.get('break_even'),
+            valuation=result.get('valuation'),
+            search=result.get('search')
         )
 
     except Exception as e:
@@ -809,11 +1228,14 @@ async def calculate_ssdi(request: SSDICalculationRequest):
     Calculate SSDI benefits and compare with early retirement and suspension strategies.
     """
     try:
-        calc = SSDICalculator(request.birth_date, request.pia)
+        calc = SSDICalculator(request.birth_date, request.pia, _evaluation_context(request))
         
         result = calc.calculate_ssdi_comparison(
             inflation_rate=request.inflation_rate,
-            longevity_age=request.longevity_age
+            longevity_age=request.longevity_age,
+            sex=request.sex,
+            mortality_multiplier=request.mortality_multiplier,
+            top_n=request.suspension_top_n
         )
         
         return SSDICalculationResponse(**result)
@@ -822,6 +1244,111 @@ async def calculate_ssdi(request: SSDICalculationRequest):
         logger.error(f"SSDI calculation error: {str(e)}")
         raise HTTPException(status_code=400, detail=f"SSDI calculation failed: {str(e)}")
 
+@app.post("/earnings-test", response_model=EarningsTestResponse)
+def earnings_test(request: EarningsTestRequest):
+    """
+    Claiming before FRA while still working: withholding under the annual
+    exempt amounts and the recomputed benefit at FRA, for every claim month
+    and earnings level in one vectorized pass
+    """
+    try:
+        context = _evaluation_context(request)
+        calc = IndividualSSCalculator(request.birth_date, request.pia, context)
+        projection = SSAXMLProcessor.projected_earnings(
+            [row.dict() for row in request.projected_earnings], context.as_of.year
+        )
+        grid = calc.calculate_earnings_test(
+            projection, request.longevity_age, request.inflation_rate, request.earnings_scales,
+            request.sex, request.mortality_multiplier
+        )
+        return EarningsTestResponse(**grid.to_dict())
+
+    except Exception as e:
+        logger.error(f"Earnings test error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Earnings test calculation failed: {str(e)}")
+
+@app.post("/family-benefits", response_model=FamilyBenefitsResponse)
+def family_benefits(request: FamilyBenefitsRequest):
+    """
+    Spouse and child benefits with the family maximum allocated pro rata in
+    every month, for every worker claim month in one vectorized pass
+    """
+    try:
+        calc = FamilySSCalculator(
+            request.birth_date, request.pia, request.spouse_birth_date, request.spouse_pia,
+            [child.dict() for child in request.children], _evaluation_context(request)
+        )
+        result = calc.calculate_family_benefits(
+            request.claiming_age, request.longevity_age, request.inflation_rate, request.claiming_age_months,
+            request.spouse_claim_age_months, request.sex, request.mortality_multiplier
+        )
+        return FamilyBenefitsResponse(**result)
+
+    except Exception as e:
+        logger.error(f"Family benefits error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Family benefit calculation failed: {str(e)}")
+
+@app.post("/life-expectancy", response_model=LifeExpectancyResponse)
+def life_expectancy(request: LifeExpectancyRequest):
+    """
+    Survival probabilities from the current age, the backend counterpart of
+    the frontend life expectancy calculator (same q(x) table)
+    """
+    try:
+        context = _evaluation_context(request)
+        current_age_months = months_between(request.birth_date, context.as_of)
+        curve = survival_curve(request.sex, current_age_months, request.mortality_multiplier)
+
+        first_age = current_age_months // 12 + 1
+        return LifeExpectancyResponse(
+            current_age=round(current_age_months / 12, 2),
+            life_expectancy_age=round(current_age_months / 12 + curve.life_expectancy(), 2),
+            threshold_ages={
+                str(int(p * 100)): _round_optional(curve.age_at_probability(p)) for p in (0.5, 0.25, 0.1)
+            },
+            survival_curve=[
+                {'age': age, 'probability': round(curve.probability_alive_at(age), 4)}
+                for age in range(first_age, MORTALITY_MAX_AGE + 1)
+            ]
+        )
+
+    except Exception as e:
+        logger.error(f"Life expectancy error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Life expectancy calculation failed: {str(e)}")
+
+@app.post("/cola-bands", response_model=ColaBandsResponse)
+def cola_bands(request: ColaBandsRequest):
+    """
+    Percentile bands of benefits when inflation is uncertain: every COLA
+    path is evaluated in one vectorized pass instead of one run per rate
+    """
+    try:
+        context = _evaluation_context(request)
+        calc = IndividualSSCalculator(request.birth_date, request.pia, context)
+        start_year = context.as_of.year
+        horizon = request.birth_date.year + request.longevity_age - start_year + 1
+
+        if request.source == "custom":
+            if not request.cola_paths:
+                raise ValueError("cola_paths is required for a custom source")
+            paths = ColaPaths(request.cola_paths, start_year)
+        elif request.source == "historical":
+            paths = historical_cola_paths(horizon, start_year)
+        else:
+            paths = simulate_cola_paths(
+                request.paths, horizon, start_year, request.mean_cola,
+                request.cola_volatility, request.cola_persistence, request.seed
+            )
+
+        bands = calc.calculate_cola_bands(
+            request.claiming_age, request.longevity_age, paths, request.claiming_age_months
+        )
+        return ColaBandsResponse(**bands.to_dict())
+
+    except Exception as e:
+        logger.error(f"COLA bands error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"COLA band calculation failed: {str(e)}")
+
 @app.post("/calculate-pia-from-earnings", response_model=PIACalculationResult)
 async def calculate_pia_from_earnings(request: ManualPIACalculationRequest):
     """
@@ -936,6 +1463,84 @@ async def compare_earnings_scenarios(request: WhatIfComparisonRequest):
         logger.error(f"Earnings comparison error: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Earnings comparison failed: {str(e)}")
 
+@app.post("/pia-sensitivity", response_model=PIASensitivityResponse)
+async def pia_sensitivity(request: PIASensitivityRequest):
+    """
+    What one more dollar earned in each year is worth: marginal AIME and PIA
+    per year (bracket, taxable maximum and top-35 aware), the earnings a year
+    needs to enter the top 35, and the PIA gain from replacing each zero year.
+    """
+    try:
+        processor = SSAXMLProcessor(birth_year=request.birth_year)
+        processor.earnings_history = [
+            EarningsRecord(year=e.year, earnings=e.earnings, is_zero=(e.earnings == 0), is_projected=e.is_projected)
+            for e in request.earnings_history
+        ]
+        sensitivity = processor.calculate_pia_sensitivity(request.replacement_salary, request.pia_calculation_year)
+        return PIASensitivityResponse(
+            recommendations=_generate_pia_recommendations(processor, sensitivity), **sensitivity
+        )
+
+    except Exception as e:
+        logger.error(f"PIA sensitivity error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"PIA sensitivity failed: {str(e)}")
+
+def _pia_session_response(session_id: str, model: IncrementalPIA, previous_top=None,
+                          pia_change: float = 0.0) -> PIASessionResponse:
+    top = set(model.top_years)
+    previous_top = top if previous_top is None else previous_top
+    return PIASessionResponse(
+        session_id=session_id,
+        result=PIACalculationResult(indexing_year=model.indexing_year, **model.to_dict()),
+        pia_change=round(pia_change, 2),
+        entered_top_35=sorted(top - previous_top),
+        left_top_35=sorted(previous_top - top)
+    )
+
+@app.post("/pia-sessions", response_model=PIASessionResponse)
+async def create_pia_session(request: ManualPIACalculationRequest):
+    """
+    Start an incremental PIA session for the spreadsheet UI.
+    Later single-year edits go to /pia-sessions/{session_id}/edits and update
+    AIME and PIA without re-posting or re-indexing the whole history.
+    """
+    try:
+        model = IncrementalPIA(
+            request.birth_year,
+            [EarningsRecord(year=e.year, earnings=e.earnings, is_zero=(e.earnings == 0), is_projected=e.is_projected)
+             for e in request.earnings_history],
+            pia_year=request.pia_calculation_year
+        )
+        session_id = f"pia_{uuid.uuid4().hex}"
+        pia_sessions[session_id] = model
+        while len(pia_sessions) > MAX_PIA_SESSIONS:
+            pia_sessions.popitem(last=False)
+        return _pia_session_response(session_id, model)
+
+    except Exception as e:
+        logger.error(f"PIA session error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"PIA session failed: {str(e)}")
+
+@app.post("/pia-sessions/{session_id}/edits", response_model=PIASessionResponse)
+async def edit_pia_session(session_id: str, request: PIAEditRequest):
+    """
+    Apply spreadsheet edits to a PIA session: each sets or removes one year
+    in O(log n). Reports the PIA change and the years entering / leaving the top 35.
+    """
+    model = pia_sessions.get(session_id)
+    if model is None:
+        raise HTTPException(status_code=404, detail="PIA session not found")
+    pia_sessions.move_to_end(session_id)
+    try:
+        previous_top, previous_pia = set(model.top_years), model.pia
+        for edit in request.edits:
+            model.set_earnings(edit.year, edit.earnings)
+        return _pia_session_response(session_id, model, previous_top, model.pia - previous_pia)
+
+    except Exception as e:
+        logger.error(f"PIA edit error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"PIA edit failed: {str(e)}")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
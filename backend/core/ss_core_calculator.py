@@ -4,8 +4,7 @@ Foundation classes for Social Security benefit calculations
 """
 
 from datetime import datetime, date
-from dateutil.relativedelta import relativedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 import math
 
 # Import base calculator and constants
@@ -14,6 +13,7 @@ from .base_ss_calculator import (
     SocialSecurityConstants,
     ClientType,
 )
+from .evaluation_context import EvaluationContext
 
 # Import benefit math helpers
 from .benefit_math import (
@@ -21,6 +21,12 @@ from .benefit_math import (
     benefit_after_claim,
 )
 
+# Vectorized couple optimizer
+from .couple_grid import SPOUSAL_SHARE, CoupleGrid, couple_grid
+
+# Joint-life Monte Carlo
+from .joint_life import DEFAULT_CORRELATION, JointLifeSimulation, simulate_joint_life
+
 
 class IndividualSSCalculator(BaseSSCalculator):
     """
@@ -28,16 +34,17 @@ class IndividualSSCalculator(BaseSSCalculator):
     Inherits base calculation logic from BaseSSCalculator
     """
 
-    def __init__(self, birth_date: date, pia: float):
+    def __init__(self, birth_date: date, pia: float, context: Optional[EvaluationContext] = None):
         """
         Initialize calculator for one person
 
         Args:
             birth_date: Person's date of birth
             pia: Primary Insurance Amount at Full Retirement Age
+            context: As-of date and rounding policy (resolved from today if omitted)
         """
         # Call parent constructor
-        super().__init__(birth_date, pia)
+        super().__init__(birth_date, pia, context)
 
 
 class HouseholdSSCalculator:
@@ -57,20 +64,24 @@ class HouseholdSSCalculator:
     
     def calculate_spousal_benefit(self, spouse_calc: IndividualSSCalculator, 
                                 primary_calc: IndividualSSCalculator, 
-                                spouse_claiming_age: int, primary_claiming_age: int, inflation_rate: float) -> float:
+                                spouse_claiming_age: int, primary_claiming_age: int, inflation_rate: float,
+                                spouse_claiming_months: int = 0, primary_claiming_months: int = 0) -> float:
         """
         Calculate spousal benefit (50% of primary's PIA, subject to reductions)
-        This is a simplified calculation - actual spousal benefits are more complex
+        This is a simplified calculation - actual spousal benefits are more complex.
+        couple_grid applies the same rule to every claim-month pair at once.
         """
         if not self.is_married:
             return 0
         
         # Spousal benefit is based on 50% of the primary earner's INFLATED PIA at FRA
-        primary_inflated_pia = primary_calc._calculate_inflated_pia(primary_claiming_age, inflation_rate)
-        spousal_pia = primary_inflated_pia * 0.5
+        primary_inflated_pia = primary_calc._calculate_inflated_pia(
+            primary_claiming_age + primary_claiming_months / 12, inflation_rate
+        )
+        spousal_pia = primary_inflated_pia * SPOUSAL_SHARE
         
         # Apply early retirement reduction if spouse claims before their FRA
-        spouse_claiming_date = spouse_calc.get_claiming_date(spouse_claiming_age)
+        spouse_claiming_date = spouse_calc.get_claiming_date(spouse_claiming_age, spouse_claiming_months)
         
         if spouse_claiming_date < spouse_calc.fra_date:
             reduction_factor = spouse_calc.calculate_reduction_factor(spouse_claiming_date)
@@ -79,12 +90,74 @@ class HouseholdSSCalculator:
             spousal_benefit = spousal_pia
         
         # Spousal benefit is reduced by their own benefit
-        own_benefit = spouse_calc.calculate_monthly_benefit(spouse_claiming_age, 0, inflation_rate)
+        own_benefit = spouse_calc.calculate_monthly_benefit(spouse_claiming_age, spouse_claiming_months, inflation_rate)
         
         return max(0, spousal_benefit - own_benefit)
+
+    def optimize_claiming_months(self, death_age_pairs: Iterable[Tuple[int, int]],
+                                 inflation_rate: float = 0.025,
+                                 weights: Optional[Iterable[float]] = None) -> CoupleGrid:
+        """
+        Search every spouse1 x spouse2 claim month (62y0m-70y0m) at once.
+
+        Args:
+            death_age_pairs: (spouse1 longevity, spouse2 longevity) pairs to evaluate
+            inflation_rate: Annual inflation rate
+            weights: Probability of each death-age pair (equal if omitted)
+
+        Returns:
+            CoupleGrid with own, spousal top-up and survivor step-up components
+        """
+        if not self.is_married:
+            raise ValueError("Couple optimization requires two spouses")
+        return couple_grid(
+            self.spouse1.birth_date, self.spouse1.pia,
+            self.spouse2.birth_date, self.spouse2.pia,
+            death_age_pairs, inflation_rate, weights, as_of=self.spouse1.as_of
+        )
     
+    def default_claiming_pairs(self) -> List[Tuple[int, int]]:
+        """Both spouses at 62, FRA and 70 (claim ages in months): nine candidate pairs."""
+        ages1 = sorted({744, self.spouse1.fra_age_in_months, 840})
+        ages2 = sorted({744, self.spouse2.fra_age_in_months, 840})
+        return [(age1, age2) for age1 in ages1 for age2 in ages2]
+
+    def simulate_joint_life(self, sexes: Tuple[str, str],
+                            claiming_pairs: Optional[Iterable[Tuple[int, int]]] = None,
+                            paths: int = 10000,
+                            correlation: float = DEFAULT_CORRELATION,
+                            inflation_rate: float = 0.025,
+                            seed: Optional[int] = None,
+                            mortality_multipliers: Tuple[float, float] = (1.0, 1.0)) -> JointLifeSimulation:
+        """
+        Distribution of household lifetime benefits over correlated death ages.
+
+        Args:
+            sexes: Life table for each spouse ('male' or 'female')
+            claiming_pairs: (spouse1, spouse2) claim ages in months (62/FRA/70 grid if omitted)
+            paths: Number of simulated death-age pairs
+            correlation: Rank correlation between the spouses' death ages
+            inflation_rate: Annual inflation rate
+            seed: Random seed for reproducible results
+            mortality_multipliers: Scale applied to each spouse's q(x)
+
+        Returns:
+            JointLifeSimulation with per-path totals for every candidate
+        """
+        if not self.is_married:
+            raise ValueError("Joint-life simulation requires two spouses")
+        if claiming_pairs is None:
+            claiming_pairs = self.default_claiming_pairs()
+        return simulate_joint_life(
+            self.spouse1.birth_date, self.spouse1.pia, sexes[0],
+            self.spouse2.birth_date, self.spouse2.pia, sexes[1],
+            claiming_pairs, paths, correlation, inflation_rate, seed,
+            mortality_multipliers, as_of=self.spouse1.as_of
+        )
+
     def calculate_household_benefits(self, spouse1_claiming_age: int, spouse2_claiming_age: int,
-                                   longevity_ages: Tuple[int, int], inflation_rate: float = 0.025) -> Dict:
+                                   longevity_ages: Tuple[int, int], inflation_rate: float = 0.025,
+                                   engine: Optional['HouseholdScenarioEngine'] = None) -> Dict:
         """
         Calculate combined household Social Security benefits
         
@@ -93,60 +166,110 @@ class HouseholdSSCalculator:
             spouse2_claiming_age: When spouse 2 claims (ignored if single)
             longevity_ages: Tuple of (spouse1_longevity, spouse2_longevity)
             inflation_rate: Annual inflation rate
+            engine: Scenario engine to reuse (and share its memoized results)
             
         Returns:
             Dictionary with household benefit analysis
         """
-        # Calculate individual benefits
-        spouse1_benefits = self.spouse1.calculate_lifetime_benefits(
-            spouse1_claiming_age, longevity_ages[0], inflation_rate
-        )
-        
+        if engine is None:
+            engine = HouseholdScenarioEngine(self, longevity_ages, inflation_rate)
+
+        # Full yearly breakdowns for the selected scenario only
+        spouse1_benefits = engine.spouse_lifetime(1, spouse1_claiming_age, summary_only=False)
         household_total = spouse1_benefits['total_lifetime_benefits']
-        
+
+        spouse2_benefits = None
         if self.is_married and spouse2_claiming_age:
-            spouse2_benefits = self.spouse2.calculate_lifetime_benefits(
-                spouse2_claiming_age, longevity_ages[1], inflation_rate
-            )
+            spouse2_benefits = engine.spouse_lifetime(2, spouse2_claiming_age, summary_only=False)
             household_total += spouse2_benefits['total_lifetime_benefits']
             
         return {
-            'total_household_benefits': round(household_total, 2),
+            'total_household_benefits': self.spouse1.context.round(household_total),
             'spouse1_benefits': spouse1_benefits,
-            'spouse2_benefits': self.spouse2.calculate_lifetime_benefits(
-                spouse2_claiming_age, longevity_ages[1], inflation_rate
-            ) if self.is_married else None,
-            'optimization_scenarios': self._calculate_optimization_scenarios(longevity_ages, inflation_rate)
+            'spouse2_benefits': spouse2_benefits,
+            'optimization_scenarios': self._calculate_optimization_scenarios(longevity_ages, inflation_rate, engine)
         }
     
     def _calculate_optimization_scenarios(self, longevity_ages: Tuple[int, int], 
-                                        inflation_rate: float) -> Dict:
+                                        inflation_rate: float,
+                                        engine: Optional['HouseholdScenarioEngine'] = None) -> Dict:
         """Calculate key optimization scenarios for comparison"""
-        scenarios = {}
-        
-        # Scenario 1: Both file at 62
-        scenarios['both_at_62'] = self.calculate_household_benefits(
-            62, 62 if self.is_married else None, longevity_ages, inflation_rate
-        )
-        
-        # Scenario 2: Both file at 70
-        scenarios['both_at_70'] = self.calculate_household_benefits(
-            70, 70 if self.is_married else None, longevity_ages, inflation_rate
-        )
-        
-        # Scenario 3: Mixed strategy (higher earner waits)
-        if self.is_married:
-            if self.spouse1.pia > self.spouse2.pia:
-                scenarios['optimized_mixed'] = self.calculate_household_benefits(
-                    70, 62, longevity_ages, inflation_rate
-                )
+        if engine is None:
+            engine = HouseholdScenarioEngine(self, longevity_ages, inflation_rate)
+        return {name: engine.evaluate(*ages) for name, ages in engine.standard_scenarios().items()}
+
+
+class HouseholdScenarioEngine:
+    """
+    Evaluates household claiming scenarios in a single bounded pass.
+
+    Each (spouse1 age, spouse2 age) cell is computed once, and per-spouse
+    lifetime results are memoized by (spouse, claim age, longevity,
+    inflation), so a full comparison table costs one lifetime calculation per
+    spouse per claiming age.
+    """
+
+    def __init__(self, household: HouseholdSSCalculator, longevity_ages: Tuple[int, int],
+                 inflation_rate: float = 0.025):
+        self.household = household
+        self.longevity_ages = longevity_ages
+        self.inflation_rate = inflation_rate
+        self._lifetime_cache: Dict[Tuple, Dict] = {}
+        self._cell_cache: Dict[Tuple[int, Optional[int]], Dict] = {}
+
+    def spouse_lifetime(self, spouse: int, claiming_age: int, summary_only: bool = True) -> Dict:
+        """Memoized calculate_lifetime_benefits for spouse 1 or 2."""
+        longevity = self.longevity_ages[spouse - 1]
+        key = (spouse, claiming_age, longevity, self.inflation_rate, summary_only)
+        if key not in self._lifetime_cache:
+            calc = self.household.spouse1 if spouse == 1 else self.household.spouse2
+            self._lifetime_cache[key] = calc.calculate_lifetime_benefits(
+                claiming_age, longevity, self.inflation_rate, summary_only=summary_only
+            )
+        return self._lifetime_cache[key]
+
+    def evaluate(self, spouse1_claiming_age: int, spouse2_claiming_age: Optional[int]) -> Dict:
+        """Household totals for one (spouse1 age, spouse2 age) cell."""
+        if not self.household.is_married:
+            spouse2_claiming_age = None
+
+        key = (spouse1_claiming_age, spouse2_claiming_age)
+        if key not in self._cell_cache:
+            spouse1_benefits = self.spouse_lifetime(1, spouse1_claiming_age)
+            spouse2_benefits = self.spouse_lifetime(2, spouse2_claiming_age) if spouse2_claiming_age else None
+            household_total = spouse1_benefits['total_lifetime_benefits'] + \
+                (spouse2_benefits['total_lifetime_benefits'] if spouse2_benefits else 0)
+
+            self._cell_cache[key] = {
+                'spouse1_claiming_age': spouse1_claiming_age,
+                'spouse2_claiming_age': spouse2_claiming_age,
+                'total_household_benefits': self.household.spouse1.context.round(household_total),
+                'spouse1_benefits': spouse1_benefits,
+                'spouse2_benefits': spouse2_benefits
+            }
+        return self._cell_cache[key]
+
+    def standard_scenarios(self) -> Dict[str, Tuple[int, Optional[int]]]:
+        """Named scenarios shown alongside the user's selection."""
+        scenarios = {'both_at_62': (62, 62), 'both_at_70': (70, 70)}
+        if self.household.is_married:
+            # Mixed strategy: higher earner waits
+            if self.household.spouse1.pia > self.household.spouse2.pia:
+                scenarios['optimized_mixed'] = (70, 62)
             else:
-                scenarios['optimized_mixed'] = self.calculate_household_benefits(
-                    62, 70, longevity_ages, inflation_rate
-                )
-        
+                scenarios['optimized_mixed'] = (62, 70)
         return scenarios
 
+    def comparison_table(self, claiming_ages: Iterable[int] = range(62, 71)) -> List[Dict]:
+        """
+        Every combination of claiming ages, best household total first.
+        Singles get one row per spouse1 age.
+        """
+        ages = list(claiming_ages)
+        spouse2_ages = ages if self.household.is_married else [None]
+        table = [self.evaluate(age1, age2) for age1 in ages for age2 in spouse2_ages]
+        return sorted(table, key=lambda cell: cell['total_household_benefits'], reverse=True)
+
 
 # Test the calculator with example data
 if __name__ == "__main__":
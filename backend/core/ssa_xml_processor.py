@@ -3,11 +3,24 @@ SSA XML File Processor & PIA Impact Analyzer
 Processes SSA earnings history XML files and calculates AIME/PIA impact
 """
 
+import hashlib
+import logging
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Tuple, Optional
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple, Optional, Union
 from datetime import date, datetime
 from dataclasses import dataclass
 
+import numpy as np
+
+from .xml_parse_cache import XMLParseCache
+
+logger = logging.getLogger(__name__)
+
+# Upload streams and in-memory content are parsed in chunks of this size
+XML_CHUNK_SIZE = 64 * 1024
+# Statement and person fields read from the first element with each tag
+XML_FIELD_TAGS = ('StatementDate', 'AsOfDate', 'DateGenerated', 'Name', 'SSN', 'BirthDate', 'EstimatedPIA')
+
 @dataclass
 class EarningsRecord:
     """Individual year earnings record"""
@@ -15,9 +28,79 @@ class EarningsRecord:
     earnings: float
     is_zero: bool
     is_projected: bool = False  # For future years user might add
-    
+
+
+@dataclass
+class IndexedEarnings:
+    """Indexed earnings of every record as arrays, in record order"""
+    years: np.ndarray
+    original: np.ndarray
+    indexed: np.ndarray  # capped and rounded to cents
+    factors: np.ndarray
+    max_taxable: np.ndarray
+    is_zero: np.ndarray
+    is_capped: np.ndarray
+    indexing_year: Optional[int] = None  # unknown when rebuilt from a dict view
+
+    def top(self, count: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Rows of the count highest indexed amounts (among mask), highest first
+        and ties in record order, by partial selection instead of a full sort
+        """
+        rows = np.arange(self.years.size) if mask is None else np.flatnonzero(mask)
+        if count <= 0:
+            return rows[:0]
+        values = self.indexed[rows]
+        if rows.size > count:
+            cutoff = rows.size - count
+            threshold = np.partition(values, cutoff)[cutoff]
+            above = values > threshold
+            # Amounts equal to the cutoff enter in record order, as a stable sort would take them
+            ties = np.flatnonzero(values == threshold)[:count - np.count_nonzero(above)]
+            keep = np.concatenate((np.flatnonzero(above), ties))
+            rows, values = rows[keep], values[keep]
+        return rows[np.lexsort((rows, -values))]
+
+    def total_cents(self, rows: np.ndarray) -> int:
+        """Exact sum of the given rows' indexed amounts, in cents"""
+        return int(np.rint(self.indexed[rows] * 100).astype(np.int64).sum())
+
+    def records(self, rows: Optional[np.ndarray] = None) -> List[Dict]:
+        """Dict view of the given rows (all by default)"""
+        rows = slice(None) if rows is None else rows
+        columns = zip(self.years[rows].tolist(), self.original[rows].tolist(), self.indexed[rows].tolist(),
+                      self.factors[rows].tolist(), self.is_zero[rows].tolist(), self.is_capped[rows].tolist(),
+                      self.max_taxable[rows].tolist())
+        return [
+            {
+                'year': year,
+                'original_earnings': original,
+                'indexed_earnings': indexed,
+                'indexing_factor': round(factor, 4),
+                'is_zero': is_zero,
+                'is_capped': is_capped,
+                'max_taxable': max_taxable
+            }
+            for year, original, indexed, factor, is_zero, is_capped, max_taxable in columns
+        ]
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> 'IndexedEarnings':
+        """Arrays of a dict view"""
+        def column(key, dtype=float):
+            return np.asarray([record[key] for record in records], dtype=dtype)
+        return cls(column('year', int), column('original_earnings'), column('indexed_earnings'),
+                   column('indexing_factor'), column('max_taxable'), column('is_zero', bool), column('is_capped', bool))
+
+
 class SSAXMLProcessor:
     """Processes SSA XML files and calculates AIME/PIA"""
+
+    # Upload limits: an SSA statement is a few KB with one record per year worked
+    MAX_XML_BYTES = 5 * 1024 * 1024
+    MAX_EARNINGS_RECORDS = 200
+    # Parsed statements by content hash, shared by every processor
+    parse_cache: Optional[XMLParseCache] = XMLParseCache()
     
     # SSA bend points by year (updated values)
     PIA_BEND_POINTS_BY_YEAR = {
@@ -61,10 +144,13 @@ class SSAXMLProcessor:
         1984: 16135.07, 1983: 15239.24, 1982: 14531.34, 1981: 13773.10,
         1980: 12513.46, 1979: 11479.46, 1978: 10556.03, 1977: 9779.44,
     }
+    # Dense indexing tables per indexing year (see _indexing_tables)
+    _indexing_cache: Dict[int, Tuple[int, np.ndarray, np.ndarray]] = {}
     
     def __init__(self, birth_year: Optional[int] = None, statement_date: Optional[date] = None):
         self.earnings_history = []
-        self.indexed_earnings = []
+        self.indexed: Optional[IndexedEarnings] = None
+        self._indexed_view: Optional[List[Dict]] = None
         self.top_35_years = []
         self.current_aime = 0
         self.current_pia = 0
@@ -74,21 +160,53 @@ class SSAXMLProcessor:
         # Calculate indexing year (year person turns 60)
         self.indexing_year = birth_year + 60 if birth_year else datetime.now().year - 2
         
-    def parse_ssa_xml(self, xml_content: str) -> Dict:
+    def parse_ssa_xml(
+        self,
+        xml_content: Union[str, bytes, BinaryIO, Iterable[bytes]],
+        max_bytes: Optional[int] = None,
+        max_records: Optional[int] = None
+    ) -> Dict:
         """
         Parse SSA XML file and extract earnings history
         Note: Actual SSA XML structure may vary - this is a template
+
+        The content (a string, bytes, a binary file, or an iterable of byte
+        chunks such as an upload stream) is parsed incrementally in a single
+        pass; elements are discarded once read, and the byte and record limits
+        are enforced as the chunks arrive. Parsed statements are cached by
+        content hash in parse_cache (None disables it).
         """
+        max_bytes = self.MAX_XML_BYTES if max_bytes is None else max_bytes
+        max_records = self.MAX_EARNINGS_RECORDS if max_records is None else max_records
+        cache = self.parse_cache
         try:
-            root = ET.fromstring(xml_content)
-
-            # Extract statement date (critical for AWI accuracy!)
-            statement_date_str = self._safe_find_text(root, './/StatementDate', None)
-            if not statement_date_str:
-                # Try alternative XML paths
-                statement_date_str = self._safe_find_text(root, './/AsOfDate', None)
-            if not statement_date_str:
-                statement_date_str = self._safe_find_text(root, './/DateGenerated', None)
+            # Repeat uploads of the same bytes skip parsing
+            key, chunks = self._cache_key(xml_content, max_bytes) if cache is not None else (None, None)
+            parsed = cache.get(key) if key else None
+            if parsed is None:
+                digest = hashlib.sha256() if cache is not None and key is None else None
+                if chunks is None:
+                    chunks = self._xml_chunks(xml_content)
+                if digest is not None:
+                    chunks = self._hashed(chunks, digest)
+                fields, ssa_records, attribute_records = self._stream_ssa_xml(chunks, max_bytes, max_records)
+                # Only the SSN's last four digits are kept (the parse may be cached on disk)
+                if fields.get('SSN'):
+                    fields['SSN'] = self._mask_ssn(fields['SSN'])
+                # SSA nested format takes precedence over the attribute format
+                parsed = {
+                    'fields': fields,
+                    'records': [(year, earnings) for year, earnings in (ssa_records or attribute_records) if year > 0]
+                }
+                if parsed['records'] and cache is not None:
+                    cache.put(key or digest.hexdigest(), parsed)
+            elif len(parsed['records']) > max_records:
+                raise ValueError(f"XML file has more than {max_records} earnings records")
+            fields = parsed['fields']
+
+            # Extract statement date (critical for AWI accuracy!), trying alternative tags
+            statement_date_str = (fields.get('StatementDate') or fields.get('AsOfDate')
+                                  or fields.get('DateGenerated'))
 
             if statement_date_str:
                 try:
@@ -102,69 +220,23 @@ class SSAXMLProcessor:
 
             # Extract basic info (structure depends on actual SSA XML format)
             self.person_info = {
-                'name': self._safe_find_text(root, './/Name', 'Unknown'),
-                'ssn': self._safe_find_text(root, './/SSN', 'XXX-XX-XXXX'),
-                'birth_date': self._safe_find_text(root, './/BirthDate', '1900-01-01'),
-                'estimated_pia': self._safe_find_text(root, './/EstimatedPIA', '0'),
+                'name': fields.get('Name') or 'Unknown',
+                'ssn': fields.get('SSN') or 'XXX-XX-XXXX',
+                'birth_date': fields.get('BirthDate') or '1900-01-01',
+                'estimated_pia': fields.get('EstimatedPIA') or '0',
                 'statement_date': self.statement_date.strftime('%Y-%m-%d')
             }
 
-            # Extract earnings history - support multiple XML formats
-            earnings_history = []
-            
-            # Format 1: SSA nested structure with EarningsRecord elements
-            earnings_elements = root.findall('.//EarningsRecord')
-            
-            if earnings_elements:
-                # SSA format: <EarningsRecord><Year>1997</Year><Earnings>30000</Earnings></EarningsRecord>
-                print(f"DEBUG: Found {len(earnings_elements)} EarningsRecord elements (SSA format)")
-                for record in earnings_elements:
-                    year_text = self._safe_find_text(record, 'Year', '0')
-                    earnings_text = self._safe_find_text(record, 'Earnings', '0')
-                    
-                    print(f"DEBUG: SSA format - Year: {year_text}, Earnings: {earnings_text}")
-                    
-                    year = int(year_text)
-                    earnings = float(earnings_text)
-                    
-                    if year > 0:
-                        earnings_history.append(EarningsRecord(
-                            year=year,
-                            earnings=earnings,
-                            is_zero=(earnings == 0)
-                        ))
-            else:
-                # Format 2: Attribute-based format with Year elements
-                year_elements = root.findall('.//Year')
-                
-                if year_elements:
-                    # Attribute format: <Year year="1997" amount="30000"/>
-                    print(f"DEBUG: Found {len(year_elements)} Year elements (attribute format)")
-                    for year_elem in year_elements:
-                        year_text = year_elem.get('year', '0')
-                        earnings_text = year_elem.get('amount', '0')
-                        
-                        print(f"DEBUG: Attribute format - Year: {year_text}, Amount: {earnings_text}")
-                        
-                        year = int(year_text)
-                        earnings = float(earnings_text)
-                        
-                        if year > 0:
-                            earnings_history.append(EarningsRecord(
-                                year=year,
-                                earnings=earnings,
-                                is_zero=(earnings == 0)
-                            ))
-            
-            print(f"DEBUG: Total earnings records created: {len(earnings_history)}")
-            
+            earnings_history = [
+                EarningsRecord(year=year, earnings=earnings, is_zero=(earnings == 0))
+                for year, earnings in parsed['records']
+            ]
+            logger.debug("Parsed %d earnings records", len(earnings_history))
+
             # Validate that we got some earnings
             if not earnings_history:
-                print("ERROR: No earnings history loaded!")
-                print(f"DEBUG: Root tag: {root.tag}")
-                print(f"DEBUG: XML content preview: {xml_content[:500]}")
                 raise ValueError("No earnings history found in XML file. Please check XML format.")
-            
+
             # Sort by year
             earnings_history.sort(key=lambda x: x.year)
             self.earnings_history = earnings_history
@@ -182,17 +254,178 @@ class SSAXMLProcessor:
             raise ValueError(f"Invalid XML format: {str(e)}")
         except Exception as e:
             raise ValueError(f"Error processing XML: {str(e)}")
-    
-    def _safe_find_text(self, element, path: str, default: str) -> str:
-        """Safely extract text from XML element"""
-        found = element.find(path)
-        return found.text if found is not None and found.text else default
-    
+
+    @staticmethod
+    def _cache_key(
+        xml_content: Union[str, bytes, BinaryIO, Iterable[bytes]], max_bytes: int
+    ) -> Tuple[Optional[str], Optional[Iterable[bytes]]]:
+        """
+        Content hash of in-memory content or a seekable file (read once, then
+        rewound), with the chunks to parse on a miss. Other streams can only
+        be hashed while they are parsed: (None, None).
+        """
+        if isinstance(xml_content, str):
+            xml_content = xml_content.encode('utf-8')
+        if isinstance(xml_content, (bytes, bytearray)):
+            if len(xml_content) > max_bytes:
+                raise ValueError(f"XML file exceeds the {max_bytes:,} byte limit")
+            return hashlib.sha256(xml_content).hexdigest(), None
+        if hasattr(xml_content, 'read') and hasattr(xml_content, 'seek'):
+            digest, total_bytes = hashlib.sha256(), 0
+            for chunk in iter(lambda: xml_content.read(XML_CHUNK_SIZE), b''):
+                total_bytes += len(chunk)
+                if total_bytes > max_bytes:
+                    raise ValueError(f"XML file exceeds the {max_bytes:,} byte limit")
+                digest.update(chunk)
+            xml_content.seek(0)
+            return digest.hexdigest(), iter(lambda: xml_content.read(XML_CHUNK_SIZE), b'')
+        return None, None
+
+    @staticmethod
+    def _mask_ssn(ssn: str) -> str:
+        """SSN reduced to its last four digits (XXX-XX-1234)"""
+        digits = ''.join(char for char in ssn if char.isdigit())
+        return f"XXX-XX-{digits[-4:]}" if len(digits) >= 4 else 'XXX-XX-XXXX'
+
+    @staticmethod
+    def _hashed(chunks: Iterable[bytes], digest) -> Iterator[bytes]:
+        """Pass the chunks through, adding each to the digest"""
+        for chunk in chunks:
+            digest.update(chunk)
+            yield chunk
+
+    @staticmethod
+    def _xml_chunks(xml_content: Union[str, bytes, BinaryIO, Iterable[bytes]]) -> Iterator[bytes]:
+        """Byte chunks of in-memory content or a file, or the given chunk stream as is"""
+        if hasattr(xml_content, 'read'):
+            return iter(lambda: xml_content.read(XML_CHUNK_SIZE), b'')
+        if isinstance(xml_content, str):
+            xml_content = xml_content.encode('utf-8')
+        if isinstance(xml_content, (bytes, bytearray)):
+            return (xml_content[i:i + XML_CHUNK_SIZE] for i in range(0, len(xml_content), XML_CHUNK_SIZE))
+        return iter(xml_content)
+
+    @staticmethod
+    def _stream_ssa_xml(
+        chunks: Iterable[bytes], max_bytes: int, max_records: int
+    ) -> Tuple[Dict[str, Optional[str]], List[Tuple[int, float]], List[Tuple[int, float]]]:
+        """
+        Single pass over the XML chunks.
+
+        Returns the first text of each statement/person field tag, and the
+        (year, earnings) pairs of the SSA format
+        (<EarningsRecord><Year>1997</Year><Earnings>30000</Earnings></EarningsRecord>)
+        and of the attribute format (<Year year="1997" amount="30000"/>).
+        Every element is detached from its parent once its end tag is handled
+        (record children when the record ends), so only the open path is kept.
+        """
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        fields: Dict[str, Optional[str]] = {}
+        ssa_records: List[Tuple[int, float]] = []
+        attribute_records: List[Tuple[int, float]] = []
+        stack = []
+        open_records = 0
+        total_bytes = 0
+
+        def handle_events():
+            nonlocal open_records
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    stack.append(elem)
+                    if elem.tag == 'EarningsRecord':
+                        open_records += 1
+                    continue
+                stack.pop()
+                if elem.tag == 'EarningsRecord':
+                    open_records -= 1
+                    ssa_records.append((int(elem.findtext('Year') or '0'),
+                                        float(elem.findtext('Earnings') or '0')))
+                elif elem.tag == 'Year' and 'year' in elem.attrib:
+                    attribute_records.append((int(elem.get('year', '0')), float(elem.get('amount', '0'))))
+                elif elem.tag in XML_FIELD_TAGS and open_records == 0:
+                    fields.setdefault(elem.tag, elem.text)
+                if len(ssa_records) + len(attribute_records) > max_records:
+                    raise ValueError(f"XML file has more than {max_records} earnings records")
+                if open_records == 0 and stack:
+                    stack[-1].remove(elem)
+
+        for chunk in chunks:
+            total_bytes += len(chunk)
+            if total_bytes > max_bytes:
+                raise ValueError(f"XML file exceeds the {max_bytes:,} byte limit")
+            parser.feed(chunk)
+            handle_events()
+        parser.close()
+        handle_events()
+        return fields, ssa_records, attribute_records
+
+    @property
+    def indexed_earnings(self) -> List[Dict]:
+        """Dict view of the indexed earnings (one dict per year), built on first access"""
+        if self._indexed_view is None and self.indexed is not None:
+            self._indexed_view = self.indexed.records()
+        return self._indexed_view or []
+
+    @indexed_earnings.setter
+    def indexed_earnings(self, records: List[Dict]) -> None:
+        self.indexed = IndexedEarnings.from_records(records) if records else None
+        self._indexed_view = list(records) if records else None
+
+    @classmethod
+    def _indexing_tables(cls, indexing_year: int) -> Tuple[int, np.ndarray, np.ndarray]:
+        """
+        Dense year-indexed tables for one indexing year, built once per year:
+        (first year, indexing factors, taxable maximums). Both tables have a
+        sentinel year at each end standing for every year outside them.
+        """
+        tables = cls._indexing_cache.get(indexing_year)
+        if tables is None:
+            first = min(min(cls.AVERAGE_WAGE_INDEX), min(cls.TAXABLE_MAXIMUM)) - 1
+            last = max(max(cls.AVERAGE_WAGE_INDEX), max(cls.TAXABLE_MAXIMUM)) + 1
+            years = np.arange(first, last + 1)
+            awi = np.asarray([cls.AVERAGE_WAGE_INDEX.get(year, 0.0) for year in years], dtype=float)
+            # If indexing year not in table, use most recent or estimate
+            indexing_awi = cls.AVERAGE_WAGE_INDEX.get(indexing_year) or max(cls.AVERAGE_WAGE_INDEX.values())
+            # Don't index earnings at age 60 or later, nor years without an AWI
+            factors = np.where((years < indexing_year) & (awi > 0), indexing_awi / np.where(awi > 0, awi, 1.0), 1.0)
+            # Use latest published taxable maximum for years outside the table
+            latest = cls.TAXABLE_MAXIMUM[max(cls.TAXABLE_MAXIMUM)]
+            taxable = np.asarray([cls.TAXABLE_MAXIMUM.get(year, latest) for year in years], dtype=float)
+            tables = cls._indexing_cache[indexing_year] = (first, factors, taxable)
+        return tables
+
+    @classmethod
+    def index_earnings(cls, years: np.ndarray, earnings: np.ndarray, indexing_year: int) -> IndexedEarnings:
+        """Index and cap every year's earnings elementwise"""
+        years = np.asarray(years, dtype=int)
+        earnings = np.asarray(earnings, dtype=float)
+        first, factors, taxable = cls._indexing_tables(indexing_year)
+        position = years - first
+        factor = factors.take(position, mode='clip')
+        max_taxable = taxable.take(position, mode='clip')
+        indexed = earnings * factor
+        # Cap at maximum taxable earnings for that year (applied AFTER indexing)
+        return IndexedEarnings(
+            years=years,
+            original=earnings,
+            indexed=np.minimum(indexed, max_taxable).round(2),
+            factors=factor,
+            max_taxable=max_taxable,
+            is_zero=earnings == 0,
+            is_capped=indexed >= max_taxable,
+            indexing_year=indexing_year
+        )
+
     def calculate_indexed_earnings(self, indexing_year: Optional[int] = None) -> List[Dict]:
         """
         Calculate indexed earnings using SSA wage indexing formula
         Earnings are indexed to the year the person turns 60
         """
+        self._index_history(indexing_year)
+        return self.indexed_earnings
+
+    def _index_history(self, indexing_year: Optional[int] = None) -> IndexedEarnings:
+        """Array form of calculate_indexed_earnings (the dict view is built only when read)"""
         if not self.earnings_history:
             raise ValueError("No earnings history loaded")
 
@@ -200,68 +433,15 @@ class SSAXMLProcessor:
         if indexing_year is None:
             indexing_year = self.indexing_year
 
-        indexed_earnings = []
-        indexing_awi = self.AVERAGE_WAGE_INDEX.get(indexing_year)
-
-        if not indexing_awi:
-            # If indexing year not in table, use most recent or estimate
-            indexing_awi = max(self.AVERAGE_WAGE_INDEX.values())
-
-        for record in self.earnings_history:
-            # Don't index earnings at age 60 or later (use actual amounts)
-            if record.year >= indexing_year:
-                indexed_amount = record.earnings
-                indexing_factor = 1.0
-            else:
-                year_awi = self.AVERAGE_WAGE_INDEX.get(record.year)
-                if year_awi and year_awi > 0:
-                    indexing_factor = indexing_awi / year_awi
-                    indexed_amount = record.earnings * indexing_factor
-                else:
-                    # If AWI not available for that year, don't index
-                    indexed_amount = record.earnings
-                    indexing_factor = 1.0
-
-            # Cap at maximum taxable earnings for that year (applied AFTER indexing)
-            # Use latest published taxable maximum for future years
-            if record.year in self.TAXABLE_MAXIMUM:
-                max_earnings = self.TAXABLE_MAXIMUM[record.year]
-            else:
-                latest_year = max(self.TAXABLE_MAXIMUM.keys())
-                max_earnings = self.TAXABLE_MAXIMUM[latest_year]
-            is_capped = indexed_amount >= max_earnings
-            indexed_amount = min(indexed_amount, max_earnings)
-
-            indexed_earnings.append({
-                'year': record.year,
-                'original_earnings': record.earnings,
-                'indexed_earnings': round(indexed_amount, 2),
-                'indexing_factor': round(indexing_factor, 4),
-                'is_zero': record.is_zero,
-                'is_capped': is_capped,
-                'max_taxable': max_earnings
-            })
-
-        self.indexed_earnings = indexed_earnings
-        return indexed_earnings
+        history = self.earnings_history
+        self.indexed = self.index_earnings(
+            np.fromiter((record.year for record in history), dtype=int, count=len(history)),
+            np.fromiter((record.earnings for record in history), dtype=float, count=len(history)),
+            indexing_year
+        )
+        self._indexed_view = None
+        return self.indexed
     
-    def calculate_aime_and_pia(self, pia_year: Optional[int] = None) -> Dict:
-        """
-        Calculate AIME (Average Indexed Monthly Earnings) and PIA (Primary Insurance Amount)
-
-        Args:
-            pia_year: Year to use for bend points (typically year person turns 62)
-                     If not provided, uses current year or birth_year + 62
-        """
-        if not self.indexed_earnings:
-            self.calculate_indexed_earnings()
-
-        # Determine PIA calculation year (year person turns 62, or current year)
-        if pia_year is None:
-            pia_year = self.birth_year + 62 if self.birth_year else datetime.now().year
-
-        return self._calculate_pia_structure(aime, pia, pia_year, bend_points, first_bracket_pia, second_bracket_pia, third_bracket_pia)
-
     def _calculate_pia_structure(self, aime, pia, pia_year, bend_points, b1, b2, b3):
         """Helper to format PIA response structure"""
         return {
@@ -325,7 +505,7 @@ class SSAXMLProcessor:
         indexing_year = eligibility_year - 2
         
         # Re-index earnings based on disability timeline
-        self.calculate_indexed_earnings(indexing_year=indexing_year)
+        self._index_history(indexing_year=indexing_year)
         
         # 3. Computation Years Logic
         # Elapsed years = years from age 22 to year BEFORE onset (or year of onset? usually onset year - 22)
@@ -347,13 +527,11 @@ class SSAXMLProcessor:
         # We limit selection to years BEFORE onset year? 
         # Typically earnings in onset year are counted if they raise the average, but for simplicity/freeze projection 
         # we often look at prior record. However, standard practice is to use all indexed earnings up to onset.
-        valid_earnings = [e for e in self.indexed_earnings if e['year'] < onset_date.year]
-        
-        sorted_earnings = sorted(valid_earnings, key=lambda x: x['indexed_earnings'], reverse=True)
-        top_years = sorted_earnings[:computation_years]
+        indexed = self.indexed
+        top_rows = indexed.top(computation_years, mask=indexed.years < onset_date.year)
         
         # 5. AIME Calculation
-        total_indexed = sum(y['indexed_earnings'] for y in top_years)
+        total_indexed = indexed.total_cents(top_rows) / 100
         # Divisor is computation years * 12 used for benefit calc
         # Note: Regular retirement uses fixed 35 years (420 months). Disability uses actual computation years.
         divisor_months = computation_years * 12
@@ -367,7 +545,7 @@ class SSAXMLProcessor:
         self.current_pia = round(pia, 2)
         
         # Store for display
-        self.top_35_years = top_years # Technically top N years
+        self.top_35_years = indexed.records(top_rows) # Technically top N years
         
         return self._calculate_pia_structure(aime, pia, eligibility_year, bend_points, b1, b2, b3)
 
@@ -376,26 +554,24 @@ class SSAXMLProcessor:
         Calculate AIME (Average Indexed Monthly Earnings) and PIA (Primary Insurance Amount)
         Standard Retirement Method (Top 35 Years)
         """
-        if not self.indexed_earnings:
-            self.calculate_indexed_earnings()
+        indexed = self.indexed if self.indexed is not None else self._index_history()
 
         # Determine PIA calculation year (year person turns 62, or current year)
         if pia_year is None:
             pia_year = self.birth_year + 62 if self.birth_year else datetime.now().year
 
         # Get top 35 years
-        sorted_earnings = sorted(self.indexed_earnings, key=lambda x: x['indexed_earnings'], reverse=True)
-        self.top_35_years = sorted_earnings[:35]
+        top_rows = indexed.top(35)
+        self.top_35_years = indexed.records(top_rows)
         
         # Pad with zeros
-        while len(self.top_35_years) < 35:
-            self.top_35_years.append({
-                'year': None, 'original_earnings': 0, 'indexed_earnings': 0, 
-                'indexing_factor': 0, 'is_zero': True, 'is_capped': False, 'max_taxable': 0
-            })
+        self.top_35_years.extend({
+            'year': None, 'original_earnings': 0, 'indexed_earnings': 0, 
+            'indexing_factor': 0, 'is_zero': True, 'is_capped': False, 'max_taxable': 0
+        } for _ in range(35 - top_rows.size))
 
         # Calculate AIME (Fixed 35 years)
-        total_indexed_earnings = sum(year['indexed_earnings'] for year in self.top_35_years)
+        total_indexed_earnings = indexed.total_cents(top_rows) / 100
         aime = total_indexed_earnings / (35 * 12)
         self.current_aime = round(aime, 2)
 
@@ -405,6 +581,113 @@ class SSAXMLProcessor:
 
         return self._calculate_pia_structure(aime, pia, pia_year, bend_points, b1, b2, b3)
     
+    def calculate_pia_sensitivity(self, replacement_salary: Optional[float] = None,
+                                  pia_year: Optional[int] = None) -> Dict:
+        """
+        Marginal AIME / PIA of more earnings in each year, and the PIA gain from
+        replacing each zero year with replacement_salary, in one pass over the
+        indexed earnings (no what-if recomputation per year).
+
+        Covers the spreadsheet years (first record year through five years past
+        the current one, projected years included); years without a record
+        count as zeros. A dollar more in a year raises AIME by its indexing
+        factor / 420 only if the year is in the top 35 (or tied with its lowest
+        year) and under the taxable maximum; PIA then rises by the rate of the
+        bracket AIME is in. Marginal
+        values are reported per $1,000. The replacement salary defaults to the
+        latest nonzero year's earnings.
+        """
+        indexed = self.indexed if self.indexed is not None else self._index_history()
+
+        # Determine PIA calculation year (year person turns 62, or current year)
+        if pia_year is None:
+            pia_year = self.birth_year + 62 if self.birth_year else datetime.now().year
+        if replacement_salary is None:
+            paid = [record for record in self.earnings_history if record.earnings > 0]
+            replacement_salary = max(paid, key=lambda record: record.year).earnings if paid else 0.0
+
+        top_rows = indexed.top(35)
+        total_cents = indexed.total_cents(top_rows)
+        padded = top_rows.size < 35
+        lowest_cents = 0 if padded else int(round(float(indexed.indexed[top_rows[-1]]) * 100))
+        aime = total_cents / 100 / (35 * 12)
+        pia, bend_points, *_ = self._calculate_pia_components(aime, pia_year)
+        rate = self.PIA_FACTORS[0] if aime < bend_points[0] else (
+            self.PIA_FACTORS[1] if aime < bend_points[1] else self.PIA_FACTORS[2])
+
+        # Record rows, then the spreadsheet years without a record (zeros)
+        current_year = datetime.now().year
+        start_year = int(indexed.years.min())
+        end_year = max(int(indexed.years.max()), current_year) + 4
+        missing_years = np.setdiff1d(np.arange(start_year, end_year + 1), indexed.years)
+        missing = self.index_earnings(missing_years, np.zeros(missing_years.size),
+                                      indexed.indexing_year or self.indexing_year)
+        in_top = np.zeros(indexed.years.size, dtype=bool)
+        in_top[top_rows] = True
+        years = np.concatenate((indexed.years, missing.years))
+        original = np.concatenate((indexed.original, missing.original))
+        factors = np.concatenate((indexed.factors, missing.factors))
+        max_taxable = np.concatenate((indexed.max_taxable, missing.max_taxable))
+        cents = np.rint(np.concatenate((indexed.indexed, missing.indexed)) * 100).astype(np.int64)
+        is_capped = np.concatenate((indexed.is_capped, missing.is_capped))
+        # Missing years fill the zero padding when fewer than 35 years are on record
+        in_top = np.concatenate((in_top, np.full(missing.years.size, padded)))
+        projected = {record.year for record in self.earnings_history if record.is_projected}
+
+        # Derivatives: indexing factor / 420 per dollar in uncapped years that count
+        # after the dollar (top-35 years, or years tied with the lowest one)
+        counts = in_top | (cents == lowest_cents)
+        aime_per_dollar = np.where(counts & ~is_capped, factors / (35 * 12), 0.0)
+        # Earnings at which a year outside the top 35 displaces its lowest year
+        needed = (lowest_cents + 1) / 100
+        enter = np.where(~in_top & (needed <= max_taxable), np.ceil(needed / factors * 100) / 100, np.nan)
+
+        # Zero-year replacement: the salary's indexed (capped) amount replaces the
+        # year itself if counted, else the lowest top-35 year if it beats it
+        is_zero = original == 0
+        replacement = np.rint(np.minimum(replacement_salary * factors, max_taxable) * 100).astype(np.int64)
+        displaced = np.where(in_top, cents, lowest_cents)
+        new_aime = (total_cents + np.maximum(0, replacement - displaced)) / 100 / (35 * 12)
+        new_pia = self._pia_formula(new_aime, bend_points)
+        current_pia = round(pia, 2)
+
+        order = np.argsort(years, kind='stable')
+        rows = []
+        for i in order.tolist():
+            rows.append({
+                'year': int(years[i]),
+                'earnings': float(original[i]),
+                'is_projected': int(years[i]) in projected or int(years[i]) > current_year,
+                'on_record': i < indexed.years.size,
+                'is_zero': bool(is_zero[i]),
+                'in_top_35': bool(in_top[i]),
+                'is_capped': bool(is_capped[i]),
+                'indexing_factor': round(float(factors[i]), 4),
+                'aime_per_1000': round(float(aime_per_dollar[i]) * 1000, 4),
+                'pia_per_1000': round(float(aime_per_dollar[i]) * rate * 1000, 4),
+                'earnings_to_enter_top_35': None if np.isnan(enter[i]) else float(enter[i]),
+                'zero_replacement_pia_gain': round(round(float(new_pia[i]), 2) - current_pia, 2) if is_zero[i] else None
+            })
+
+        return {
+            'aime': round(aime, 2),
+            'pia': current_pia,
+            'pia_year': pia_year,
+            'bend_points_used': bend_points,
+            'bracket_rate': rate,
+            'lowest_indexed_in_top_35': lowest_cents / 100,
+            'replacement_salary': replacement_salary,
+            'years': rows
+        }
+
+    def _pia_formula(self, aime: np.ndarray, bend_points: List[int]) -> np.ndarray:
+        """_calculate_pia_components' PIA for an array of AIMEs (same operations, elementwise)"""
+        first_amount = np.minimum(aime, bend_points[0])
+        second_amount = np.minimum(aime - first_amount, bend_points[1] - bend_points[0])
+        return (first_amount * self.PIA_FACTORS[0]
+                + np.maximum(0, second_amount * self.PIA_FACTORS[1])
+                + np.maximum(0, (aime - first_amount - second_amount) * self.PIA_FACTORS[2]))
+
     def create_editable_spreadsheet(self) -> List[Dict]:
         """
         Create user-friendly spreadsheet data for editing
@@ -439,9 +722,17 @@ class SSAXMLProcessor:
 
         return spreadsheet_data
 
+    @staticmethod
+    def projected_earnings(spreadsheet_data: List[Dict], from_year: int) -> Dict[int, float]:
+        """
+        Earnings by year from from_year on in (edited) spreadsheet rows: the
+        projection the retirement earnings test is run against
+        """
+        return {row['year']: float(row['earnings']) for row in spreadsheet_data if row['year'] >= from_year}
+
     def merge_with_new_xml(
         self,
-        new_xml_content: str,
+        new_xml_content: Union[str, bytes, BinaryIO, Iterable[bytes]],
         preserve_future_projections: bool = True,
         preserve_manual_edits: bool = False
     ) -> Dict:
@@ -449,7 +740,7 @@ class SSAXMLProcessor:
         Smart merge when user uploads a newer XML file.
 
         Args:
-            new_xml_content: The new XML file content
+            new_xml_content: The new XML file content (parsed through the parse cache)
             preserve_future_projections: Keep user's custom future earnings projections
             preserve_manual_edits: Keep any manual edits to historical earnings
 
@@ -563,7 +854,7 @@ class SSAXMLProcessor:
         
         # Store original data
         original_earnings = self.earnings_history
-        original_indexed = self.indexed_earnings
+        original_indexed = (self.indexed, self._indexed_view)
         original_aime = self.current_aime
         original_pia = self.current_pia
         
@@ -597,7 +888,7 @@ class SSAXMLProcessor:
         finally:
             # Restore original data
             self.earnings_history = original_earnings
-            self.indexed_earnings = original_indexed
+            self.indexed, self._indexed_view = original_indexed
             self.current_aime = original_aime
             self.current_pia = original_pia
         
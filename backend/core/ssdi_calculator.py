@@ -1,30 +1,47 @@
 from datetime import date
-from dateutil.relativedelta import relativedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
 from .base_ss_calculator import BaseSSCalculator
-from .benefit_math import drc_factor, early_reduction_factor
+from .evaluation_context import EvaluationContext
+from .actuarial_tables import early_reduction_factor, monthly_cola_factor
+from .break_even import MONTHLY_COLA, BenefitStream, analyze_break_even
+from .mortality import MAX_AGE
+from .suspension_grid import RESUME_LIMIT_MONTHS, SuspensionGrid
 
 class SSDICalculator(BaseSSCalculator):
-    def __init__(self, birth_date: date, pia: float):
-        super().__init__(birth_date, pia)
+    def __init__(self, birth_date: date, pia: float, context: Optional[EvaluationContext] = None):
+        super().__init__(birth_date, pia, context)
 
-    def calculate_ssdi_comparison(self, inflation_rate: float = 0.0, longevity_age: int = 90):
+    def calculate_ssdi_comparison(self, inflation_rate: float = 0.0, longevity_age: int = 90,
+                                  sex: Optional[str] = None, mortality_multiplier: float = 1.0,
+                                  top_n: Optional[int] = None):
         """
         Calculates SSDI benefits and compares with:
         1. Early retirement (if currently eligible)
         2. Suspension at FRA strategy
+
+        With sex ('male'/'female') the strategy lifetime totals are
+        survival-weighted expected values and the timeline runs to the life
+        table's last age instead of longevity_age.
+
+        The comparison is a view of simulate_suspensions (the FRA -> 70
+        window); with top_n the best suspend/resume windows are added under
+        'suspension_options'.
         """
+        if sex is not None:
+            longevity_age = MAX_AGE
         fra_date = self.fra_date
         fra_age_years = self.fra_years
         fra_age_months = self.fra_months
-        current_date = date.today()
+        current_date = self.as_of
         
         # Calculate numeric FRA
         fra_numeric = fra_age_years + (fra_age_months / 12.0)
         
         # Determine current age
-        age_delta = relativedelta(current_date, self.birth_date)
-        current_age_years = age_delta.years
-        current_age_months = age_delta.months
+        current_age_years, current_age_months = divmod(self.age_in_months(current_date), 12)
         current_age_numeric = current_age_years + (current_age_months / 12.0)
         
         # 1. SSDI Amount (Always 100% PIA)
@@ -55,98 +72,41 @@ class SSDICalculator(BaseSSCalculator):
         # 3. Strategy Analysis: Continue vs Suspend
         # Strategy A: Standard (SSDI -> Retirement at FRA -> No Suspension)
         # Strategy B: Suspension (SSDI -> Retirement at FRA -> Suspend -> Reinstate at 70)
-        
-        # We need to simulate year by year to get lifetime totals
-        # Start from current age up to longevity
-        
-        # DRC potential: ~8% per year from FRA to 70
-        # Max DRC months = (70 - FRA) * 12
-        months_fra_to_70 = int(round((70 - fra_numeric) * 12))
-        # Use shared DRC logic
-        max_drc_factor = drc_factor(months_fra_to_70)
-        
-        cumulative_std = 0
-        cumulative_suspend = 0
-        cumulative_std_post70 = 0
-        cumulative_suspend_post70 = 0
-        break_even_age = None
-        
-        strategy_std_lifetime = 0
-        strategy_suspend_lifetime = 0
-        
-        # Monthly values for graph/display (simplified to annual steps for response)
-        timeline_data = []
+        # Both are cells of the suspension grid (no suspension, and FRA -> 70);
+        # past FRA the window starts now, and past 70 there is none left
+        grid = self.simulate_suspensions(inflation_rate, longevity_age, sex, mortality_multiplier)
+        suspend, resume = None, None
+        if grid.suspend_months.size:
+            suspend, resume = int(grid.suspend_months[0]), RESUME_LIMIT_MONTHS
 
-        # Calculate monthly needs
-        for age in range(current_age_years, longevity_age + 1):
-            year_data = {
-                "age": age,
-                "std_monthly": 0,
-                "suspend_monthly": 0
-            }
-            
-            # For each month in this year
-            for month in range(12):
-                # Actual numeric age at this month
-                sim_age = age + (month / 12.0)
-                
-                # Inflation adjustment from today
-                # Years from "now"
-                years_from_now = sim_age - current_age_numeric
-                if years_from_now < 0: continue # Skip past
-                
-                inflation_factor = (1 + inflation_rate) ** years_from_now
-                
-                # Logic for amounts
-                
-                # STANDARD PATH:
-                std_monthly = self.pia * inflation_factor
-                
-                # SUSPENSION PATH:
-                suspend_path_monthly = 0
-                if sim_age < fra_numeric:
-                    suspend_path_monthly = self.pia * inflation_factor
-                elif sim_age >= 70:
-                    suspend_path_monthly = self.pia * max_drc_factor * inflation_factor
-                else:
-                    # SUSPENDED
-                    suspend_path_monthly = 0
-                
-                # Update totals for lifetime
-                strategy_std_lifetime += std_monthly
-                strategy_suspend_lifetime += suspend_path_monthly
-                
-                # Update totals for break-even tracking
-                cumulative_std += std_monthly
-                cumulative_suspend += suspend_path_monthly
-                
-                # Update post-70 cumulative
-                if sim_age >= 70:
-                    cumulative_std_post70 += std_monthly
-                    cumulative_suspend_post70 += suspend_path_monthly
-
-                # Check crossover only after age 70 (when they start earning back the lost income)
-                if break_even_age is None and sim_age >= 70:
-                    if cumulative_suspend >= cumulative_std:
-                        break_even_age = sim_age
-                
-                # Capture annual snapshot (use mid-year or January)
-                if month == 0:
-                    year_data["std_monthly"] = std_monthly
-                    year_data["suspend_monthly"] = suspend_path_monthly
-                    year_data["std_cumulative"] = cumulative_std
-                    year_data["suspend_cumulative"] = cumulative_suspend
-                    year_data["std_cumulative_post70"] = cumulative_std_post70
-                    year_data["suspend_cumulative_post70"] = cumulative_suspend_post70
-            
-            timeline_data.append(year_data)
+        # DRC potential: ~8% per year suspended, up to 70
+        max_drc_factor = float(grid.credits[0, -1]) if suspend is not None else 1.0
+
+        strategy_std_lifetime = grid.standard_total()
+        strategy_suspend_lifetime = self._window_total(grid, suspend, resume)
+        deflators = self.context.deflators(inflation_rate)
+        values = {
+            key: [grid.standard_total(key), self._window_total(grid, suspend, resume, key)]
+            for key in grid.value_weights
+        }
+        timeline_data = self._annual_snapshots(grid, suspend, resume, current_age_years, longevity_age)
+
+        # Break-even of suspension vs standard, solved analytically (ages in months);
+        # the strategy's age is the grid cell's, as in suspension_options
+        streams = self._suspension_streams(
+            current_age_years * 12 + current_age_months, longevity_age, suspend, resume, max_drc_factor,
+            inflation_rate
+        )
+        break_even = analyze_break_even(streams, inflation_rate, 0, MONTHLY_COLA)
+        cell = grid.break_even_ages()[0, -1] if suspend is not None else np.nan
+        break_even_age = None if np.isnan(cell) else float(cell)
 
         # Difference at age 70 (monthly)
         # Calculate explicit Age 70 benefits in today's dollars (no inflation) for clear comparison
         benefit_at_70_std = self.pia 
         benefit_at_70_suspend = self.pia * max_drc_factor
         
-        return {
+        result = {
             "current_age": current_age_numeric,
             "fra_age": fra_numeric,
             "ssdi_monthly_benefit": self.pia,
@@ -158,13 +118,142 @@ class SSDICalculator(BaseSSCalculator):
             "strategies": {
                 "standard": {
                     "monthly_at_70": benefit_at_70_std, # Today's dollars
-                    "lifetime_total": strategy_std_lifetime
+                    "lifetime_total": strategy_std_lifetime,
+                    **({key: pair[0] for key, pair in values.items()} if deflators else {})
                 },
                 "suspension": {
                     "monthly_at_70": benefit_at_70_suspend, # Today's dollars
                     "lifetime_total": strategy_suspend_lifetime,
-                    "break_even_age": break_even_age
+                    "break_even_age": break_even_age,
+                    **({key: pair[1] for key, pair in values.items()} if deflators else {})
                 }
             },
-            "timeline": timeline_data
+            "timeline": timeline_data,
+            "break_even": break_even.to_dict(),
+            "valuation": self._valuation(longevity_age, sex, mortality_multiplier)
+        }
+        if top_n is not None:
+            result["suspension_options"] = self._suspension_options(grid, top_n, current_age_years, longevity_age)
+        return result
+
+    def _suspension_streams(self, current_age_months: int, longevity_age: int, suspend: Optional[int],
+                            resume: Optional[int], max_drc_factor: float, inflation_rate: float):
+        """
+        Standard vs suspension streams in age-month coordinates, with the
+        monthly COLA compounding from the current month (as in the timeline loop).
+        With no window left (suspend None) the suspension stream is the standard one.
+        """
+        end = (longevity_age + 1) * 12
+
+        def nominal(amount: float, age_months: int) -> float:
+            return amount * monthly_cola_factor(inflation_rate, age_months - current_age_months)
+
+        standard = BenefitStream('standard', ((current_age_months, end, self.pia),))
+        if suspend is None:
+            return [standard, BenefitStream('suspension', standard.segments)]
+        suspension = BenefitStream('suspension', (
+            (current_age_months, min(suspend, end), self.pia),
+            (resume, end, nominal(self.pia * max_drc_factor, resume)),
+        ))
+        return [standard, suspension]
+
+    def simulate_suspensions(self, inflation_rate: float = 0.0, longevity_age: int = 90,
+                             sex: Optional[str] = None, mortality_multiplier: float = 1.0) -> SuspensionGrid:
+        """
+        Every suspend (FRA, or now if later, ..70) x resume month window in
+        one pass, from the current month through the end of longevity_age (the life table's last
+        age with sex, totals then survival-weighted).
+        """
+        if sex is not None:
+            longevity_age = MAX_AGE
+        first = self.age_in_months(self.as_of)
+        months_from_now = np.arange(max(0, (longevity_age + 1) * 12 - first))
+        growth = (1.0 + inflation_rate) ** (months_from_now / 12)
+
+        value_weights = {}
+        deflators = self.context.deflators(inflation_rate)
+        if deflators:
+            value_weights = {
+                'present_value': deflators[0] ** months_from_now,
+                'real_value': deflators[1] ** (months_from_now / 12)
+            }
+        survival = np.ones(months_from_now.size)
+        if sex is not None:
+            alive = self._survival_curve(sex, mortality_multiplier).alive
+            ages = first + months_from_now
+            survival = np.where(ages < alive.size, alive[np.minimum(ages, alive.size - 1)], 0.0)
+        weights = {'lifetime_total': survival}
+        weights.update({key: survival * weight for key, weight in value_weights.items()})
+        return SuspensionGrid(self.pia, first, self.fra_age_in_months, growth, weights, value_weights)
+
+    def calculate_suspension_options(self, inflation_rate: float = 0.0, longevity_age: int = 90,
+                                     sex: Optional[str] = None, mortality_multiplier: float = 1.0,
+                                     top_n: int = 5) -> Dict[str, Any]:
+        """Best suspend/resume windows with totals, break-even ages and timelines."""
+        if sex is not None:
+            longevity_age = MAX_AGE
+        grid = self.simulate_suspensions(inflation_rate, longevity_age, sex, mortality_multiplier)
+        current_age_years = self.age_in_months(self.as_of) // 12
+        return self._suspension_options(grid, top_n, current_age_years, longevity_age)
+
+    def _window_total(self, grid: SuspensionGrid, suspend: Optional[int], resume: Optional[int],
+                      key: str = 'lifetime_total') -> float:
+        """Grid total of one window (the standard total if suspend is None)."""
+        if suspend is None:
+            return grid.standard_total(key)
+        row = int(np.searchsorted(grid.suspend_months, suspend))
+        column = int(np.searchsorted(grid.resume_months, resume))
+        return float(grid.totals(key)[row, column])
+
+    def _annual_snapshots(self, grid: SuspensionGrid, suspend: Optional[int], resume: Optional[int],
+                          current_age_years: int, longevity_age: int) -> List[Dict[str, float]]:
+        """
+        Year-by-year rows of the comparison timeline: payments in each
+        birthday month and nominal / value cumulatives through it.
+        """
+        ages = grid.ages
+        paths = {'std': grid.payments(), 'suspend': grid.payments(suspend, resume)}
+        post70 = ages >= RESUME_LIMIT_MONTHS
+        cumulative = {}
+        for name, payments in paths.items():
+            cumulative[f"{name}_cumulative"] = np.cumsum(payments)
+            cumulative[f"{name}_cumulative_post70"] = np.cumsum(np.where(post70, payments, 0.0))
+            for key, weight in grid.value_weights.items():
+                cumulative[f"{name}_cumulative_{key}"] = np.cumsum(payments * weight)
+
+        order = ["std_cumulative", "suspend_cumulative", "std_cumulative_post70", "suspend_cumulative_post70"]
+        order += [f"{name}_cumulative_{key}" for key in grid.value_weights for name in ('std', 'suspend')]
+        timeline = []
+        for age in range(current_age_years, longevity_age + 1):
+            index = age * 12 - grid.first_age_month
+            row = {"age": age, "std_monthly": 0, "suspend_monthly": 0}
+            if 0 <= index < ages.size:
+                row["std_monthly"] = float(paths['std'][index])
+                row["suspend_monthly"] = float(paths['suspend'][index])
+                row.update({key: float(cumulative[key][index]) for key in order})
+            timeline.append(row)
+        return timeline
+
+    def _suspension_options(self, grid: SuspensionGrid, top_n: int, current_age_years: int,
+                            longevity_age: int) -> Dict[str, Any]:
+        """Best windows of a grid (ranked on lifetime_total) in JSON form."""
+        break_even = grid.break_even_ages()
+        options = []
+        for suspend, resume, total in grid.best(top_n):
+            row = int(np.searchsorted(grid.suspend_months, suspend))
+            column = int(np.searchsorted(grid.resume_months, resume))
+            age = break_even[row, column]
+            options.append({
+                'suspend_age_months': suspend,
+                'resume_age_months': resume,
+                'delayed_credit_factor': round(float(grid.credits[row, column]), 6),
+                'lifetime_total': total,
+                **{key: self._window_total(grid, suspend, resume, key) for key in grid.value_weights},
+                'break_even_age': None if np.isnan(age) else round(float(age), 2),
+                'timeline': self._annual_snapshots(grid, suspend, resume, current_age_years, longevity_age)
+            })
+        return {
+            'standard_total': grid.standard_total(),
+            'windows_evaluated': int(np.count_nonzero(~np.isnan(grid.credits))),
+            'options': options
         }
@@ -0,0 +1,119 @@
+# backend/core/suspension_grid.py
+"""
+Vectorized SSDI suspension simulator
+Evaluates every (suspend month, resume month) pair between FRA (or now, if
+later) and 70 in one pass. SSDI converts to retirement at FRA; suspending it from month s to month
+e pays nothing in between and the delayed credits earned over those e - s
+months from e on.
+
+Payments follow the SSDI comparison's monthly model: the PIA compounds by
+(1+r)^(months from now / 12) each month. With P the cumulative (weighted)
+payments of the standard path, a pair's total is
+P(s) + credit(e - s) * (P(end) - P(e)), so every cell costs two gathers.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .actuarial_tables import delayed_credit_factor
+
+RESUME_LIMIT_MONTHS = 70 * 12
+
+
+@dataclass
+class SuspensionGrid:
+    """
+    Monthly payments and lifetime totals of every suspension window.
+
+    Attributes:
+        pia: Monthly SSDI / retirement benefit before COLAs
+        first_age_month: Age in months of the first simulated month (now)
+        fra_age_months: Full retirement age in months
+        growth: COLA factor of each simulated month relative to now
+        weights: Per-month weight of each measure ('lifetime_total' and, when
+            values are on, 'present_value' / 'real_value'); survival-weighted
+            in expected mode
+        value_weights: Unweighted present / real value factors per month (timelines)
+    """
+    pia: float
+    first_age_month: int
+    fra_age_months: int
+    growth: np.ndarray
+    weights: Dict[str, np.ndarray]
+    value_weights: Dict[str, np.ndarray]
+
+    def __post_init__(self):
+        # Past FRA only the remaining months can still be suspended (none past 70)
+        start = max(self.fra_age_months, self.first_age_month)
+        self.suspend_months = np.arange(start, RESUME_LIMIT_MONTHS)
+        self.resume_months = np.arange(start + 1, RESUME_LIMIT_MONTHS + 1)
+        suspended = self.resume_months[None, :] - self.suspend_months[:, None]
+        longest = max(0, RESUME_LIMIT_MONTHS - start)
+        credits = np.asarray([delayed_credit_factor(months) for months in range(longest + 1)])
+        valid = (suspended > 0) & (self.resume_months > self.first_age_month)[None, :]
+        self.credits = np.where(valid, credits[np.maximum(suspended, 0)], np.nan)
+        self.standard = self.pia * self.growth
+        self._cumulative = {
+            key: np.concatenate(([0.0], np.cumsum(self.standard * weight))) for key, weight in self.weights.items()
+        }
+
+    @property
+    def ages(self) -> np.ndarray:
+        """Age in months of each simulated month."""
+        return self.first_age_month + np.arange(self.growth.size)
+
+    def _index(self, age_months) -> np.ndarray:
+        return np.clip(np.asarray(age_months) - self.first_age_month, 0, self.growth.size)
+
+    def standard_total(self, key: str = 'lifetime_total') -> float:
+        """Total with no suspension."""
+        return float(self._cumulative[key][-1])
+
+    def totals(self, key: str = 'lifetime_total') -> np.ndarray:
+        """[suspend, resume] totals (NaN where resume is not after suspend)."""
+        cumulative = self._cumulative[key]
+        before = cumulative[self._index(self.suspend_months)][:, None]
+        after = cumulative[-1] - cumulative[self._index(self.resume_months)][None, :]
+        return before + self.credits * after
+
+    def payments(self, suspend: Optional[int] = None, resume: Optional[int] = None) -> np.ndarray:
+        """Nominal monthly payments of one window (the standard path if suspend is None)."""
+        if suspend is None:
+            return self.standard
+        ages = self.ages
+        credit = delayed_credit_factor(resume - suspend)
+        return self.standard * np.where(ages < suspend, 1.0, np.where(ages < resume, 0.0, credit))
+
+    def break_even_ages(self) -> np.ndarray:
+        """
+        [suspend, resume] age (years) at the payment month in which the
+        suspended path's nominal cumulative total catches up with the
+        standard path's, as in analyze_break_even (NaN if never by the last
+        simulated month).
+        """
+        cumulative = np.concatenate(([0.0], np.cumsum(self.standard)))
+        at_resume = cumulative[self._index(self.resume_months)][None, :]
+        forgone = at_resume - cumulative[self._index(self.suspend_months)][:, None]
+        # From the resume month on the gap closes at (credit - 1) times the standard payments
+        target = at_resume + forgone / (self.credits - 1.0)
+        tolerance = 1e-9 * max(1.0, float(cumulative[-1]))
+        months = np.searchsorted(cumulative, np.where(np.isnan(target), np.inf, target) - tolerance)
+        ages = (self.first_age_month + months - 1) / 12.0
+        return np.where((months <= self.growth.size) & ~np.isnan(self.credits), ages, np.nan)
+
+    def best(self, n: int, key: str = 'lifetime_total') -> List[Tuple[int, int, float]]:
+        """The n best windows, highest total first: (suspend month, resume month, total)."""
+        totals = self.totals(key)
+        flat = np.nonzero(~np.isnan(totals.ravel()))[0]
+        values = totals.ravel()[flat]
+        if n < flat.size:
+            keep = np.argpartition(-values, n - 1)[:n]
+            flat, values = flat[keep], values[keep]
+        order = np.argsort(-values, kind='stable')
+        rows, columns = np.unravel_index(flat[order], totals.shape)
+        return [
+            (int(self.suspend_months[row]), int(self.resume_months[column]), float(value))
+            for row, column, value in zip(rows, columns, values[order])
+        ]
@@ -0,0 +1,234 @@
+# backend/core/switch_grid.py
+"""
+Vectorized two-benefit switching search
+Evaluates every start month of one benefit against every start month of the
+other - e.g. survivor (60y0m-70y0m) x own retirement (62y0m-70y0m) - in both
+orders, plus each benefit on its own, in one pass.
+
+Only one benefit is paid at a time: after the switch the person receives the
+second benefit, so a switch only counts when the second benefit is larger
+than the first one would be in the same month (otherwise it is the first
+benefit alone). Phase months follow BaseSSCalculator._phase_span exactly, so
+each cell equals the _build_phased_timeline total of its two phases.
+
+As in couple_grid, an amount fixed in its start year grows by one COLA every
+January, so dividing it by the growth index at its start turns every phase
+total into a constant times a difference of one cumulative weight array.
+
+An optional lead benefit (e.g. child-in-care) is paid from its own start
+until the earlier of its end and the first claim, ahead of every strategy.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (start date, end date, monthly amount, phase label) of a benefit paid before the first claim
+Lead = Tuple[date, date, float, str]
+
+# Candidate kinds returned by SwitchGrid.candidates
+FIRST_ONLY = 'first_only'
+SECOND_ONLY = 'second_only'
+FIRST_THEN_SECOND = 'first_then_second'
+SECOND_THEN_FIRST = 'second_then_first'
+
+
+@dataclass
+class BenefitAxis:
+    """
+    Claim-month axis of one benefit.
+
+    Attributes:
+        label: Timeline phase label ('survivor', 'own', 'ex_spouse', ...)
+        age_months: Claim ages in months
+        dates: Claim dates (the phase start dates)
+        monthly: Initial monthly benefit when claimed on each date
+        labels: Optional phase label per claim date (label for all if omitted)
+    """
+    label: str
+    age_months: np.ndarray
+    dates: Sequence[date]
+    monthly: np.ndarray
+    labels: Optional[Sequence[str]] = None
+
+    def phase_label(self, index: int) -> str:
+        return self.label if self.labels is None else self.labels[index]
+
+    def __post_init__(self):
+        self.age_months = np.asarray(self.age_months, dtype=int)
+        self.monthly = np.asarray(self.monthly, dtype=float)
+        self.ordinals = np.asarray([d.year * 12 + d.month - 1 for d in self.dates], dtype=int)
+        self.days = np.asarray([d.day for d in self.dates], dtype=int)
+
+
+def phase_end(start_ordinal, start_day, end_ordinal, end_day) -> np.ndarray:
+    """
+    Vectorized BaseSSCalculator._phase_span: first month ordinal after a phase
+    from (start_ordinal, start_day) to (end_ordinal, end_day). A multi-year
+    phase pays its end month when the end day is past the 1st; within one
+    year, when it is past the start day. Empty phases end where they start.
+    """
+    start_ordinal, end_ordinal = np.asarray(start_ordinal), np.asarray(end_ordinal)
+    same_year = end_ordinal // 12 == start_ordinal // 12
+    end = end_ordinal + np.where(same_year, end_day > start_day, end_day > 1)
+    empty = (start_ordinal > end_ordinal) | ((start_ordinal == end_ordinal) & (start_day >= end_day))
+    return np.where(empty, start_ordinal, end)
+
+
+def _before(ordinal_a, day_a, ordinal_b, day_b) -> np.ndarray:
+    """Date a < date b, from (month ordinal, day) pairs."""
+    return (ordinal_a < ordinal_b) | ((ordinal_a == ordinal_b) & (day_a < day_b))
+
+
+def lead_phase(lead: Optional[Lead], first_claim: date) -> Optional[Tuple[date, date, float, str]]:
+    """The lead benefit's phase ahead of a strategy whose first claim is first_claim (None if empty)."""
+    if lead is None:
+        return None
+    start, end, monthly, label = lead
+    end = min(end, first_claim)
+    return (start, end, monthly, label) if start < end else None
+
+
+@dataclass
+class SwitchGrid:
+    """
+    Lifetime totals of every strategy over two benefits.
+
+    first_only / second_only are indexed by their own claim axis;
+    first_then_second is [first start, switch to second] and
+    second_then_first is [second start, switch to first], NaN where the pair
+    is not a genuine switch (switch not after the start, not before death, or
+    to a smaller benefit).
+    """
+    first: BenefitAxis
+    second: BenefitAxis
+    first_only: np.ndarray
+    second_only: np.ndarray
+    first_then_second: np.ndarray
+    second_then_first: np.ndarray
+    lead: Optional[Lead] = None
+
+    @property
+    def candidate_count(self) -> int:
+        """Number of distinct strategies evaluated."""
+        return int(sum(np.count_nonzero(~np.isnan(values)) for values in self._tables()))
+
+    def _tables(self) -> Tuple[np.ndarray, ...]:
+        return self.first_only, self.second_only, self.first_then_second, self.second_then_first
+
+    def candidates(self, top_n: Optional[int] = None) -> List[Tuple[str, int, Optional[int], float]]:
+        """
+        Best strategies, highest total first: (kind, index on the starting
+        benefit's axis, index on the switched-to benefit's axis or None, total).
+        """
+        kinds = (FIRST_ONLY, SECOND_ONLY, FIRST_THEN_SECOND, SECOND_THEN_FIRST)
+        totals = np.concatenate([table.ravel() for table in self._tables()])
+        offsets = np.cumsum([0] + [table.size for table in self._tables()])
+        valid = np.nonzero(~np.isnan(totals))[0]
+        if top_n is not None and top_n < valid.size:
+            valid = valid[np.argpartition(-totals[valid], top_n - 1)[:top_n]]
+        order = valid[np.argsort(-totals[valid], kind='stable')]
+
+        results = []
+        for flat in order:
+            table = int(np.searchsorted(offsets, flat, side='right')) - 1
+            local = int(flat - offsets[table])
+            if table < 2:
+                results.append((kinds[table], local, None, float(totals[flat])))
+            else:
+                start, switch = np.unravel_index(local, self._tables()[table].shape)
+                results.append((kinds[table], int(start), int(switch), float(totals[flat])))
+        return results
+
+
+def switch_grid(
+    first: BenefitAxis,
+    second: BenefitAxis,
+    death_date: date,
+    inflation_rate: float,
+    birth_ordinal: int,
+    age_weights: Optional[np.ndarray] = None,
+    lead: Optional[Lead] = None,
+    reverse: bool = True
+) -> SwitchGrid:
+    """
+    Evaluate every single-benefit and switching strategy over two benefits.
+
+    Args:
+        first, second: Claim-month axes of the two benefits
+        death_date: End of the last phase (as passed to _build_benefit_timeline)
+        inflation_rate: Annual COLA applied each January after a phase starts
+        birth_ordinal: Month ordinal of birth (aligns age_weights)
+        age_weights: Optional weight per month of age (survival probability,
+            present-value discount, ...); nominal totals if omitted
+        lead: Optional benefit paid until the earlier of its end and the first claim
+        reverse: Also evaluate second -> first switches (all NaN otherwise)
+
+    Returns:
+        SwitchGrid of lifetime totals
+    """
+    death_ordinal, death_day = death_date.year * 12 + death_date.month - 1, death_date.day
+    lead_ordinals = [] if lead is None else [lead[0].year * 12 + lead[0].month - 1]
+    lo = int(np.concatenate((first.ordinals, second.ordinals, [death_ordinal], lead_ordinals)).min())
+    months = np.arange(lo, death_ordinal + 2)
+    levels = (1.0 + inflation_rate) ** (months // 12 - lo // 12)
+    weights = levels
+    if age_weights is not None:
+        # Months past the end of the weights (the life table) count nothing
+        ages = months - birth_ordinal
+        weights = levels * np.where(ages < age_weights.size, age_weights[np.clip(ages, 0, age_weights.size - 1)], 0.0)
+    cumulative = np.concatenate(([0.0], np.cumsum(weights)))
+
+    def paid(start, end) -> np.ndarray:
+        return cumulative[np.asarray(end) - lo] - cumulative[np.asarray(start) - lo]
+
+    def normalized(axis: BenefitAxis) -> np.ndarray:
+        return axis.monthly / levels[axis.ordinals - lo]
+
+    def lead_paid(axis: BenefitAxis) -> np.ndarray:
+        if lead is None:
+            return np.zeros(axis.ordinals.size)
+        start, end, monthly, _ = lead
+        start_ordinal = start.year * 12 + start.month - 1
+        end_ordinal, end_day = end.year * 12 + end.month - 1, end.day
+        # The lead stops at the first claim if that comes before its own end
+        claim_first = _before(axis.ordinals, axis.days, end_ordinal, end_day)
+        stop = phase_end(
+            start_ordinal, start.day,
+            np.where(claim_first, axis.ordinals, end_ordinal), np.where(claim_first, axis.days, end_day)
+        )
+        return monthly / levels[start_ordinal - lo] * paid(start_ordinal, stop)
+
+    def single(axis: BenefitAxis) -> np.ndarray:
+        end = phase_end(axis.ordinals, axis.days, death_ordinal, death_day)
+        return lead_paid(axis) + normalized(axis) * paid(axis.ordinals, end)
+
+    def switch(start: BenefitAxis, then: BenefitAxis) -> np.ndarray:
+        s, ds = start.ordinals[:, None], start.days[:, None]
+        t, dt = then.ordinals[None, :], then.days[None, :]
+        first_end = phase_end(s, ds, t, dt)
+        second_end = phase_end(then.ordinals, then.days, death_ordinal, death_day)[None, :]
+        start_amount, then_amount = normalized(start)[:, None], normalized(then)[None, :]
+
+        total = (lead_paid(start)[:, None] + start_amount * paid(s, first_end)
+                 + then_amount * paid(t, second_end))
+        genuine = (
+            _before(s, ds, t, dt)
+            & _before(t, dt, death_ordinal, death_day)
+            & (then_amount > start_amount)
+        )
+        return np.where(genuine, total, np.nan)
+
+    return SwitchGrid(
+        first=first,
+        second=second,
+        first_only=single(first),
+        second_only=single(second),
+        first_then_second=switch(first, second),
+        second_then_first=(
+            switch(second, first) if reverse else np.full((second.ordinals.size, first.ordinals.size), np.nan)
+        ),
+        lead=lead,
+    )
@@ -4,10 +4,21 @@ Handles survivor benefits and crossover strategies for widowed individuals
 """
 
 from datetime import date
-from dateutil.relativedelta import relativedelta
 from typing import Dict, List, Optional, Tuple
 
-from .base_ss_calculator import BaseSSCalculator, SocialSecurityConstants
+from .actuarial_tables import cola_factor, survivor_reduction_factor
+from .base_ss_calculator import BaseSSCalculator, SocialSecurityConstants, add_months, months_between
+from .evaluation_context import EvaluationContext
+from .mortality import MAX_AGE
+from .switch_grid import (
+    FIRST_ONLY, FIRST_THEN_SECOND, SECOND_ONLY, SECOND_THEN_FIRST, BenefitAxis, SwitchGrid, switch_grid
+)
+
+# Claim-month ranges of the exhaustive search (ages in months)
+SURVIVOR_CLAIM_MONTHS = range(60 * 12, 70 * 12 + 1)
+OWN_CLAIM_MONTHS = range(62 * 12, 70 * 12 + 1)
+# Strategies returned by the exhaustive search when top_n is not given
+EXHAUSTIVE_TOP_N = 10
 
 
 class WidowSSCalculator(BaseSSCalculator):
@@ -24,7 +35,8 @@ class WidowSSCalculator(BaseSSCalculator):
         deceased_spouse_death_date: date,
         deceased_actual_benefit: Optional[float] = None,
         is_remarried: bool = False,
-        remarriage_date: Optional[date] = None
+        remarriage_date: Optional[date] = None,
+        context: Optional[EvaluationContext] = None
     ):
         """
         Initialize widow calculator
@@ -36,8 +48,9 @@ class WidowSSCalculator(BaseSSCalculator):
             deceased_spouse_death_date: Date of spouse's death
             is_remarried: Whether person has remarried
             remarriage_date: Date of remarriage (if applicable)
+            context: As-of date and rounding policy (resolved from today if omitted)
         """
-        super().__init__(birth_date, own_pia)
+        super().__init__(birth_date, own_pia, context)
 
         self.deceased_spouse_pia = deceased_spouse_pia
         self.deceased_actual_benefit = deceased_actual_benefit
@@ -54,14 +67,14 @@ class WidowSSCalculator(BaseSSCalculator):
         Check if eligible for survivor benefits
 
         Args:
-            current_date: Date to check eligibility against (defaults to today)
+            current_date: Date to check eligibility against (defaults to the evaluation as-of date)
             ignore_age_check: If True, skips the age >= 60 check (useful for future planning)
 
         Returns:
             Tuple of (is_eligible, reason)
         """
         if current_date is None:
-            current_date = date.today()
+            current_date = self.as_of
 
         # Calculate current age
         current_age_years = (current_date - self.birth_date).days / 365.25
@@ -86,7 +99,8 @@ class WidowSSCalculator(BaseSSCalculator):
     def calculate_survivor_benefit(
         self,
         claiming_age_years: int,
-        inflation_rate: float = 0.025
+        inflation_rate: float = 0.025,
+        claiming_age_months: int = 0
     ) -> float:
         """
         Calculate survivor benefit (up to 100% of deceased spouse's benefit)
@@ -94,37 +108,36 @@ class WidowSSCalculator(BaseSSCalculator):
         Args:
             claiming_age_years: Age when claiming survivor benefit (60-70)
             inflation_rate: Annual inflation rate
+            claiming_age_months: Additional months past claiming_age_years
 
         Returns:
             Monthly survivor benefit amount
         """
         # Apply early reduction if claiming before own FRA
-        claiming_date = self.get_claiming_date(claiming_age_years)
+        claiming_date = self.get_claiming_date(claiming_age_years, claiming_age_months)
 
         # Survivor benefit is based on what the deceased spouse was actually receiving (if known)
         # otherwise fall back to their PIA. Benefits receive COLA adjustments between death and claim date.
         if self.deceased_spouse_death_date:
-            delta = relativedelta(claiming_date, self.deceased_spouse_death_date)
-            years_since_death = max(0.0, delta.years + delta.months / 12 + delta.days / 365.25)
+            months = months_between(self.deceased_spouse_death_date, claiming_date)
+            days = (claiming_date - add_months(self.deceased_spouse_death_date, months)).days
+            years_since_death = max(0.0, months / 12 + days / 365.25)
         else:
             years_since_death = 0.0
 
         if self.deceased_actual_benefit is not None:
-            survivor_base = self.deceased_actual_benefit * ((1 + inflation_rate) ** years_since_death)
+            survivor_base = self.deceased_actual_benefit * cola_factor(inflation_rate, years_since_death)
         else:
-            survivor_base = self.deceased_spouse_pia * ((1 + inflation_rate) ** years_since_death)
+            survivor_base = self.deceased_spouse_pia * cola_factor(inflation_rate, years_since_death)
 
         if claiming_date < self.fra_date:
             # Survivor benefits have different reduction rates
             # Reduced by 28.5% if claimed at 60 (4.75% per year for ages 60-FRA)
-            months_early = relativedelta(self.fra_date, claiming_date).months + \
-                          relativedelta(self.fra_date, claiming_date).years * 12
-
-            # Survivor benefit reduction: approximately 0.396% per month (4.75% per year)
-            reduction_rate = 0.00396  # per month
-            reduction = min(months_early * reduction_rate, 0.285)  # Max 28.5% reduction
+            months_early = months_between(claiming_date, self.fra_date)
 
-            survivor_benefit = survivor_base * (1.0 - reduction)
+            # Survivor benefit reduction: approximately 0.396% per month (4.75% per year),
+            # capped at 28.5% (precomputed table)
+            survivor_benefit = survivor_base * survivor_reduction_factor(months_early)
         else:
             # No reduction at or after FRA
             survivor_benefit = survivor_base
@@ -136,7 +149,8 @@ class WidowSSCalculator(BaseSSCalculator):
         survivor_claiming_age: int,
         own_claiming_age: int,
         longevity_age: int = 95,
-        inflation_rate: float = 0.025
+        inflation_rate: float = 0.025,
+        summary_only: bool = False
     ) -> Dict:
         """
         Calculate crossover strategy: Take one benefit early, switch to the other later
@@ -146,6 +160,7 @@ class WidowSSCalculator(BaseSSCalculator):
             own_claiming_age: Age to start own benefits (and stop survivor)
             longevity_age: Age at death
             inflation_rate: Annual inflation rate
+            summary_only: Skip building the yearly timeline
 
         Returns:
             Dictionary with strategy details and lifetime value
@@ -157,47 +172,114 @@ class WidowSSCalculator(BaseSSCalculator):
                 'reason': 'Survivor claiming age must be before own claiming age for crossover'
             }
 
-        # Calculate survivor benefit amount
+        phases = self._crossover_phases(survivor_claiming_age, own_claiming_age, longevity_age, inflation_rate)
+        combined = self._build_phased_timeline(phases, inflation_rate, summary_only)
+        survivor_monthly = phases[0][2]
+        own_monthly = phases[1][2]
+
+        result = {
+            'valid': True,
+            'survivor_monthly': self.context.round(survivor_monthly),
+            'own_monthly': self.context.round(own_monthly),
+            'lifetime_total': combined['total'],
+            'survivor_years': own_claiming_age - survivor_claiming_age,
+            'own_years': longevity_age - own_claiming_age
+        }
+        if not summary_only:
+            result['timeline'] = combined['timeline']
+        return result
+
+    def _crossover_phases(
+        self,
+        survivor_claiming_age: int,
+        own_claiming_age: int,
+        longevity_age: int,
+        inflation_rate: float
+    ) -> List[Tuple[date, date, float, str]]:
+        """Survivor phase followed by own phase, as consumed by _build_phased_timeline."""
         survivor_monthly = self.calculate_survivor_benefit(survivor_claiming_age, inflation_rate)
+        own_monthly = self.calculate_monthly_benefit(own_claiming_age, 0, inflation_rate)
 
-        # Calculate lifetime value
         survivor_start = self.get_claiming_date(survivor_claiming_age)
         own_start = self.get_claiming_date(own_claiming_age)
-        death_date = self.birth_date + relativedelta(years=longevity_age)
+        death_date = self._date_at_age(longevity_age)
+
+        return [
+            (survivor_start, own_start, survivor_monthly, 'survivor'),
+            (own_start, death_date, own_monthly, 'own'),
+        ]
+
+    def _own_timeline_builder(self, claiming_age: int, longevity_age: int, inflation_rate: float):
+        """Deferred calculate_lifetime_benefits(...)['annual_breakdown'] for _rank_strategies."""
+        return lambda: self.calculate_lifetime_benefits(claiming_age, longevity_age, inflation_rate)['annual_breakdown']
+
+    # Strategy type per switch_grid candidate kind (survivor axis first)
+    SWITCH_TYPES = {
+        FIRST_ONLY: 'survivor_only',
+        SECOND_ONLY: 'own_only',
+        FIRST_THEN_SECOND: 'crossover',
+        SECOND_THEN_FIRST: 'reverse_crossover',
+    }
+
+    def calculate_crossover_grid(
+        self,
+        longevity_age: int = 95,
+        inflation_rate: float = 0.025,
+        sex: Optional[str] = None,
+        mortality_multiplier: float = 1.0,
+        rank_by: str = 'nominal'
+    ) -> SwitchGrid:
+        """
+        Exhaustive monthly search: every survivor start (60y0m-70y0m) against
+        every own start (62y0m-70y0m), in both directions, plus each benefit
+        alone. Only one benefit is paid at a time, so a switch counts only
+        when it raises the monthly amount; early survivor claims use the
+        survivor reduction table.
 
-        own_monthly = self.calculate_monthly_benefit(own_claiming_age, 0, inflation_rate)
-        survivor_phase = self._build_benefit_timeline(
-            survivor_start,
-            own_start,
-            survivor_monthly,
-            inflation_rate,
-            'survivor'
+        Args:
+            longevity_age: Age at death
+            inflation_rate: Annual inflation rate
+            sex: 'male' or 'female' for survival-weighted expected totals
+                (longevity_age is then replaced by the life table's last age)
+            mortality_multiplier: Scale applied to the life table's q(x)
+            rank_by: Measure of the totals ('nominal', 'present_value' or 'real_value')
+
+        Returns:
+            SwitchGrid with the survivor axis first and the own axis second
+        """
+        rank_key = self._rank_key(rank_by)
+        if sex is not None:
+            longevity_age = MAX_AGE
+        eligible, _ = self.is_eligible_for_survivor_benefits(ignore_age_check=True)
+
+        survivor_months = [m for m in SURVIVOR_CLAIM_MONTHS if m <= longevity_age * 12] if eligible else []
+        own_months = [m for m in OWN_CLAIM_MONTHS if m <= longevity_age * 12]
+        survivor = BenefitAxis(
+            'survivor',
+            survivor_months,
+            [self.get_claiming_date(*divmod(m, 12)) for m in survivor_months],
+            [self.calculate_survivor_benefit(m // 12, inflation_rate, m % 12) for m in survivor_months]
         )
-        own_phase = self._build_benefit_timeline(
-            own_start,
-            death_date,
-            own_monthly,
-            inflation_rate,
-            'own'
+        own = BenefitAxis(
+            'own',
+            own_months,
+            [self.get_claiming_date(*divmod(m, 12)) for m in own_months],
+            [self.calculate_monthly_benefit(m // 12, m % 12, inflation_rate) for m in own_months]
+        )
+        return switch_grid(
+            survivor, own, self._date_at_age(longevity_age), inflation_rate, self.birth_ordinal,
+            self._switch_weights(inflation_rate, rank_key, sex, mortality_multiplier)
         )
-
-        total_benefits = survivor_phase['total'] + own_phase['total']
-        combined_timeline = survivor_phase['timeline'] + own_phase['timeline']
-
-        return {
-            'valid': True,
-            'survivor_monthly': round(survivor_monthly, 2),
-            'own_monthly': round(own_monthly, 2),
-            'lifetime_total': round(total_benefits, 2),
-            'survivor_years': own_claiming_age - survivor_claiming_age,
-            'own_years': longevity_age - own_claiming_age,
-            'timeline': combined_timeline
-        }
 
     def calculate_optimal_strategy(
         self,
         longevity_age: int = 95,
-        inflation_rate: float = 0.025
+        inflation_rate: float = 0.025,
+        top_n: Optional[int] = None,
+        sex: Optional[str] = None,
+        mortality_multiplier: float = 1.0,
+        rank_by: str = 'nominal',
+        exhaustive: bool = False
     ) -> Dict:
         """
         Calculate optimal claiming strategy comparing:
@@ -206,18 +288,80 @@ class WidowSSCalculator(BaseSSCalculator):
         3. Crossover: Survivor early → Own later
         4. Reverse crossover: Own early → Survivor later
 
+        Candidates are ranked on closed-form lifetime totals; yearly timelines
+        and the break-even analysis are only built for the strategies returned.
+
+        Args:
+            longevity_age: Age at death
+            inflation_rate: Annual inflation rate
+            top_n: Return only the best N strategies (all if None)
+            sex: 'male' or 'female' to rank on survival-weighted expected totals
+                (longevity_age is then replaced by the life table's last age)
+            mortality_multiplier: Scale applied to the life table's q(x)
+            rank_by: 'nominal', 'present_value' or 'real_value' (the last two
+                need a context discount rate; strategies then carry both values)
+            exhaustive: Search every claim month in both directions
+                (calculate_crossover_grid) instead of the hand-picked ages;
+                returns the best top_n (default EXHAUSTIVE_TOP_N) strategies
+
         Returns:
             Dictionary with all strategies and recommendation
         """
+        rank_key = self._rank_key(rank_by)
+        if sex is not None:
+            longevity_age = MAX_AGE
         eligible, reason = self.is_eligible_for_survivor_benefits(ignore_age_check=True)
 
+        search = None
+        if exhaustive:
+            grid = self.calculate_crossover_grid(longevity_age, inflation_rate, sex, mortality_multiplier, rank_by)
+            strategies = self._switch_strategies(grid, top_n or EXHAUSTIVE_TOP_N, longevity_age, inflation_rate)
+            search = {
+                'mode': 'exhaustive',
+                'candidates_evaluated': grid.candidate_count,
+                'survivor_claim_months': [SURVIVOR_CLAIM_MONTHS.start, SURVIVOR_CLAIM_MONTHS.stop - 1],
+                'own_claim_months': [OWN_CLAIM_MONTHS.start, OWN_CLAIM_MONTHS.stop - 1]
+            }
+        else:
+            strategies = self._standard_strategies(longevity_age, inflation_rate, eligible)
+
+        # Find optimal strategy
+        if strategies:
+            if sex is not None:
+                self._apply_expected_values(strategies, inflation_rate, sex, mortality_multiplier)
+            ranked = self._rank_strategies(strategies, top_n, rank_key)
+
+            result = {
+                'eligible_for_survivor': eligible,
+                'eligibility_reason': reason,
+                'all_strategies': ranked,
+                'optimal_strategy': ranked[0],
+                'break_even': self._break_even_analysis(ranked, inflation_rate),
+                'valuation': self._valuation(longevity_age, sex, mortality_multiplier, rank_by)
+            }
+            if search:
+                result['search'] = search
+            return result
+        else:
+            return {
+                'eligible_for_survivor': False,
+                'eligibility_reason': reason,
+                'all_strategies': [],
+                'optimal_strategy': None,
+                'break_even': None,
+                'valuation': self._valuation(longevity_age, sex, mortality_multiplier, rank_by),
+                'error': 'Not eligible for survivor benefits'
+            }
+
+    def _standard_strategies(self, longevity_age: int, inflation_rate: float, eligible: bool) -> List[Dict]:
+        """Hand-picked candidates at whole-year ages (62, FRA, 70 and common crossovers)."""
         strategies = []
 
         # Strategy 1: Own benefit only at various ages
         for claiming_age in [62, self.fra_years, 70]:
             if claiming_age <= longevity_age:
                 own_benefits = self.calculate_lifetime_benefits(
-                    claiming_age, longevity_age, inflation_rate
+                    claiming_age, longevity_age, inflation_rate, summary_only=True
                 )
                 strategies.append({
                     'strategy': f"Own benefit only at {claiming_age}",
@@ -225,7 +369,9 @@ class WidowSSCalculator(BaseSSCalculator):
                     'type': 'own_only',
                     'initial_monthly': own_benefits['initial_monthly_benefit'],
                     'lifetime_total': own_benefits['total_lifetime_benefits'],
-                    'benefit_timeline': own_benefits['annual_breakdown']
+                    **self._strategy_values(own_benefits),
+                    '_timeline': self._own_timeline_builder(claiming_age, longevity_age, inflation_rate),
+                    '_stream': self._lifetime_stream(claiming_age, longevity_age, inflation_rate)
                 })
 
         # Strategy 2: Survivor benefit only (if eligible)
@@ -235,23 +381,20 @@ class WidowSSCalculator(BaseSSCalculator):
                     survivor_monthly = self.calculate_survivor_benefit(claiming_age, inflation_rate)
 
                     claiming_date = self.get_claiming_date(claiming_age)
-                    death_date = self.birth_date + relativedelta(years=longevity_age)
+                    death_date = self._date_at_age(longevity_age)
 
-                    timeline = self._build_benefit_timeline(
-                        claiming_date,
-                        death_date,
-                        survivor_monthly,
-                        inflation_rate,
-                        'survivor'
-                    )
+                    phases = [(claiming_date, death_date, survivor_monthly, 'survivor')]
+                    summary = self._build_phased_timeline(phases, inflation_rate, summary_only=True)
 
                     strategies.append({
                         'strategy': f"Survivor benefit only at {claiming_age}",
                         'claiming_age': claiming_age,
                         'type': 'survivor_only',
-                        'initial_monthly': round(survivor_monthly, 2),
-                        'lifetime_total': timeline['total'],
-                        'benefit_timeline': timeline['timeline']
+                        'initial_monthly': self.context.round(survivor_monthly),
+                        'lifetime_total': summary['total'],
+                        **self._strategy_values(summary),
+                        '_timeline': self._timeline_builder(phases, inflation_rate),
+                        '_stream': self._phase_stream(phases)
                     })
 
             # Strategy 3: Crossover strategies (if eligible)
@@ -263,23 +406,23 @@ class WidowSSCalculator(BaseSSCalculator):
             ]
 
             for survivor_age, own_age in crossover_options:
-                if own_age <= longevity_age:
-                    crossover = self.calculate_crossover_strategy(
-                        survivor_age, own_age, longevity_age, inflation_rate
-                    )
-                    if crossover['valid']:
-                        strategies.append({
-                            'strategy': f"Survivor at {survivor_age}, switch to own at {own_age}",
-                            'claiming_age': survivor_age,
-                            'switch_age': own_age,
-                            'type': 'crossover',
-                            'initial_monthly': crossover['survivor_monthly'],
-                            'switched_monthly': crossover['own_monthly'],
-                            'lifetime_total': crossover['lifetime_total'],
-                            'survivor_years': crossover['survivor_years'],
-                            'own_years': crossover['own_years'],
-                            'benefit_timeline': crossover.get('timeline', [])
-                        })
+                if own_age <= longevity_age and survivor_age < own_age:
+                    phases = self._crossover_phases(survivor_age, own_age, longevity_age, inflation_rate)
+                    summary = self._build_phased_timeline(phases, inflation_rate, summary_only=True)
+                    strategies.append({
+                        'strategy': f"Survivor at {survivor_age}, switch to own at {own_age}",
+                        'claiming_age': survivor_age,
+                        'switch_age': own_age,
+                        'type': 'crossover',
+                        'initial_monthly': self.context.round(phases[0][2]),
+                        'switched_monthly': self.context.round(phases[1][2]),
+                        'lifetime_total': summary['total'],
+                        **self._strategy_values(summary),
+                        'survivor_years': own_age - survivor_age,
+                        'own_years': longevity_age - own_age,
+                        '_timeline': self._timeline_builder(phases, inflation_rate),
+                        '_stream': self._phase_stream(phases)
+                    })
 
             # Strategy 4: Reverse crossover (Own early → Survivor later)
             # Less common but possible if own benefit is lower and will grow more
@@ -295,56 +438,26 @@ class WidowSSCalculator(BaseSSCalculator):
 
                     own_start = self.get_claiming_date(own_age)
                     survivor_start = self.get_claiming_date(survivor_age)
-                    death_date = self.birth_date + relativedelta(years=longevity_age)
-
-                    total_benefits = 0
-
-                    own_phase = self._build_benefit_timeline(
-                        own_start,
-                        survivor_start,
-                        own_monthly,
-                        inflation_rate,
-                        'own'
-                    )
+                    death_date = self._date_at_age(longevity_age)
 
                     survivor_monthly = self.calculate_survivor_benefit(survivor_age, inflation_rate)
-                    survivor_phase = self._build_benefit_timeline(
-                        survivor_start,
-                        death_date,
-                        survivor_monthly,
-                        inflation_rate,
-                        'survivor'
-                    )
-
-                    total_benefits = own_phase['total'] + survivor_phase['total']
-                    timeline = own_phase['timeline'] + survivor_phase['timeline']
+                    phases = [
+                        (own_start, survivor_start, own_monthly, 'own'),
+                        (survivor_start, death_date, survivor_monthly, 'survivor'),
+                    ]
+                    summary = self._build_phased_timeline(phases, inflation_rate, summary_only=True)
 
                     strategies.append({
                         'strategy': f"Own at {own_age}, switch to survivor at {survivor_age}",
                         'claiming_age': own_age,
                         'switch_age': survivor_age,
                         'type': 'reverse_crossover',
-                        'initial_monthly': round(own_monthly, 2),
-                        'switched_monthly': round(survivor_monthly, 2),
-                        'lifetime_total': round(total_benefits, 2),
-                        'benefit_timeline': timeline
+                        'initial_monthly': self.context.round(own_monthly),
+                        'switched_monthly': self.context.round(survivor_monthly),
+                        'lifetime_total': summary['total'],
+                        **self._strategy_values(summary),
+                        '_timeline': self._timeline_builder(phases, inflation_rate),
+                        '_stream': self._phase_stream(phases)
                     })
 
-        # Find optimal strategy
-        if strategies:
-            optimal = max(strategies, key=lambda x: x['lifetime_total'])
-
-            return {
-                'eligible_for_survivor': eligible,
-                'eligibility_reason': reason,
-                'all_strategies': sorted(strategies, key=lambda x: x['lifetime_total'], reverse=True),
-                'optimal_strategy': optimal
-            }
-        else:
-            return {
-                'eligible_for_survivor': False,
-                'eligibility_reason': reason,
-                'all_strategies': [],
-                'optimal_strategy': None,
-                'error': 'Not eligible for survivor benefits'
-            }
+        return strategies
@@ -0,0 +1,162 @@
+# backend/core/xml_parse_cache.py
+"""
+Content-addressed cache of parsed SSA statements
+Repeat uploads of the same XML (across sessions and calculators) skip
+parsing: entries are keyed by the SHA-256 of the upload bytes and hold the
+parser's output (the (year, earnings) records and the statement/person field
+texts) as compact JSON.
+
+The cache is LRU-bounded both in entries and in payload bytes. With a
+directory it is mirrored on disk (one <key>.json file per entry), so it
+survives restarts; evicted entries are removed from disk as well. The
+entries hold personal data (name, birth date), so the directory and its files
+are readable by the owner only.
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+
+class XMLParseCache:
+    """LRU cache of parsed statements keyed by content hash"""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024,
+                 directory: Optional[str] = None):
+        """
+        Args:
+            max_entries: Most statements kept
+            max_bytes: Most payload bytes kept (larger entries are not cached)
+            directory: Local directory persisting the entries, owner-only (memory only if omitted)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            os.chmod(directory, 0o700)
+            self._load()
+
+    @staticmethod
+    def key(chunks: Iterable[bytes]) -> str:
+        """SHA-256 hex digest of the content chunks"""
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    @property
+    def nbytes(self) -> int:
+        """Payload bytes held in memory"""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Parsed statement for a content hash (a fresh copy), or None"""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        if self.directory:
+            try:
+                os.utime(self._path(key))
+            except OSError:
+                pass
+        return json.loads(payload)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a parsed statement, evicting least recently used entries over the bounds"""
+        payload = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        if len(payload) > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            evicted = self._insert(key, payload)
+        if self.directory:
+            for old in evicted:
+                self._remove_file(old)
+            if key not in evicted:
+                self._write_file(key, payload)
+
+    def clear(self) -> None:
+        """Drop every entry (and its file)"""
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+        if self.directory:
+            for key in keys:
+                self._remove_file(key)
+
+    def _insert(self, key: str, payload: bytes) -> list:
+        """Insert under the lock; returns the evicted keys"""
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key))
+        self._entries[key] = payload
+        self._bytes += len(payload)
+        evicted = []
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            old, old_payload = self._entries.popitem(last=False)
+            self._bytes -= len(old_payload)
+            evicted.append(old)
+        return evicted
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def _write_file(self, key: str, payload: bytes) -> None:
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as handle:
+                handle.write(payload)
+            os.replace(tmp, path)
+        except OSError:
+            self._remove_file(tmp, path=tmp)
+
+    def _remove_file(self, key: str, path: Optional[str] = None) -> None:
+        try:
+            os.remove(path or self._path(key))
+        except OSError:
+            pass
+
+    def _load(self) -> None:
+        """Warm the cache from the directory, oldest first so recent entries survive the bounds"""
+        files = []
+        for name in os.listdir(self.directory):
+            key, ext = os.path.splitext(name)
+            if ext != '.json' or len(key) != 64:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                files.append((os.path.getmtime(path), key, path))
+            except OSError:
+                continue
+        for _, key, path in sorted(files):
+            try:
+                with open(path, 'rb') as handle:
+                    payload = handle.read()
+                json.loads(payload)
+            except (OSError, ValueError):
+                self._remove_file(key, path=path)
+                continue
+            if len(payload) > self.max_bytes:
+                self._remove_file(key, path=path)
+                continue
+            for old in self._insert(key, payload):
+                self._remove_file(old)
@@ -0,0 +1,82 @@
+"""
+Tests for actuarial_tables.py
+Verifies the precomputed factor tables match the SSA formulas and that
+benefit_math, BaseSSCalculator and the vectorized grid read the same values.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.core import actuarial_tables, benefit_grid, benefit_math
+from backend.core.actuarial_tables import (
+    MAX_FRA_OFFSET_MONTHS,
+    MIN_FRA_OFFSET_MONTHS,
+    cola_factor,
+    cola_powers,
+    delayed_credit_factor,
+    early_reduction_factor,
+    monthly_cola_factor,
+    survivor_reduction_factor,
+)
+from backend.core.base_ss_calculator import BaseSSCalculator, add_months
+
+
+class TestFactorTables:
+    """Table entries equal the piecewise SSA formulas"""
+
+    def test_known_values(self):
+        assert early_reduction_factor(-36) == pytest.approx(0.80)
+        assert early_reduction_factor(-60) == pytest.approx(0.70)
+        assert delayed_credit_factor(36) == pytest.approx(1.24)
+        assert early_reduction_factor(12) == 1.0
+        assert delayed_credit_factor(-12) == 1.0
+
+    def test_offsets_outside_table_fall_back_to_formula(self):
+        assert early_reduction_factor(MIN_FRA_OFFSET_MONTHS - 12) == pytest.approx(
+            1.0 - 0.20 - (96 - 36 + 12) * (5/12) / 100
+        )
+        assert delayed_credit_factor(MAX_FRA_OFFSET_MONTHS + 12) == pytest.approx(1.40)
+
+    def test_survivor_reduction_is_capped(self):
+        assert survivor_reduction_factor(0) == 1.0
+        assert survivor_reduction_factor(12) == pytest.approx(1.0 - 12 * 0.00396)
+        assert survivor_reduction_factor(84) == pytest.approx(0.715)
+        assert survivor_reduction_factor(500) == pytest.approx(0.715)
+
+    def test_cola_series_is_cached_per_rate(self):
+        assert cola_powers(0.025) is cola_powers(0.025)
+        assert cola_factor(0.025, 10) == 1.025 ** 10
+        assert cola_factor(0.025, 2.5) == 1.025 ** 2.5
+        assert monthly_cola_factor(0.03, 18) == 1.03 ** (18 / 12)
+
+
+class TestModulesAgree:
+    """Scalar, calculator and vectorized paths read identical factors"""
+
+    def test_benefit_math_and_grid_use_tables(self):
+        offsets = np.arange(MIN_FRA_OFFSET_MONTHS, MAX_FRA_OFFSET_MONTHS + 1)
+        early = benefit_grid.early_reduction_factor(offsets)
+        drc = benefit_grid.drc_factor(offsets)
+        for i, m in enumerate(offsets):
+            assert early[i] == benefit_math.early_reduction_factor(int(m)) == early_reduction_factor(min(0, int(m)))
+            assert drc[i] == benefit_math.drc_factor(int(m)) == delayed_credit_factor(max(0, int(m)))
+
+    def test_calculator_factors_match_tables(self):
+        calc = BaseSSCalculator(date(1962, 4, 10), 2000.0)
+        for months in range(0, 61):
+            claim_date = add_months(calc.fra_date, -months)
+            assert calc.calculate_reduction_factor(claim_date) == early_reduction_factor(-months)
+        for months in range(0, 37):
+            claim_date = add_months(calc.fra_date, months)
+            assert calc.calculate_delayed_credit_factor(claim_date) == delayed_credit_factor(months)
+
+    def test_table_bounds(self):
+        size = MAX_FRA_OFFSET_MONTHS - MIN_FRA_OFFSET_MONTHS + 1
+        assert len(actuarial_tables.EARLY_REDUCTION_FACTORS) == size
+        assert len(actuarial_tables.DELAYED_CREDIT_FACTORS) == size
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
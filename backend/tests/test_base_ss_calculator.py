@@ -0,0 +1,238 @@
+"""
+Tests for BaseSSCalculator shared logic
+Verifies:
+- Month-ordinal date helpers agree with relativedelta
+- Closed-form (summary_only) totals match the yearly timeline loops
+- Strategy ranking only materializes timelines for returned strategies
+- Present-value and real-dollar amounts match a monthly reference
+- Compiled benefit profiles match the uncompiled formulas and are shared
+"""
+
+from datetime import date, timedelta
+import random
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from backend.core import benefit_math
+from backend.core.base_ss_calculator import (
+    BaseSSCalculator,
+    BenefitProfile,
+    add_months,
+    compile_profile,
+    month_ordinal,
+    months_between,
+)
+from backend.core.evaluation_context import EvaluationContext
+from backend.core.widow_calculator import WidowSSCalculator
+
+
+class TestMonthOrdinals:
+    """Constant-time month arithmetic must match relativedelta"""
+
+    def test_add_months_matches_relativedelta(self):
+        rng = random.Random(11)
+        for _ in range(2000):
+            d = date(1950, 1, 1) + timedelta(days=rng.randint(0, 30000))
+            months = rng.randint(-240, 240)
+            assert add_months(d, months) == d + relativedelta(months=months)
+
+    def test_months_between_matches_relativedelta(self):
+        rng = random.Random(12)
+        for _ in range(2000):
+            start = date(1950, 1, 1) + timedelta(days=rng.randint(0, 30000))
+            end = start + timedelta(days=rng.randint(-5000, 5000))
+            delta = relativedelta(end, start)
+            assert months_between(start, end) == delta.years * 12 + delta.months
+
+    def test_month_end_birthday(self):
+        calc = BaseSSCalculator(date(1964, 1, 31), 2000.0)
+        assert calc.get_claiming_date(62, 1) == date(2026, 2, 28)
+        assert calc.age_in_months(date(2026, 2, 28)) == 62 * 12 + 1
+
+    def test_months_in_period(self):
+        calc = BaseSSCalculator(date(1964, 3, 15), 2000.0)
+        assert calc._months_in_period(date(2026, 3, 15), date(2027, 1, 1)) == 10
+        assert calc._months_in_period(date(2027, 1, 1), date(2027, 3, 15)) == 3
+        assert calc._months_in_period(date(2027, 1, 1), date(2027, 1, 1)) == 0
+
+
+class TestSummaryOnlyTotals:
+    """Closed-form totals must match the materialized timelines"""
+
+    @pytest.mark.parametrize("birth_date", [date(1963, 5, 17), date(1960, 1, 1), date(1958, 12, 31)])
+    @pytest.mark.parametrize("inflation_rate", [0.0, 0.025])
+    def test_lifetime_summary_matches_breakdown(self, birth_date, inflation_rate):
+        calc = BaseSSCalculator(birth_date, 2400.0)
+        for claiming_age, claiming_months in [(62, 0), (65, 7), (70, 0)]:
+            for longevity in [70, 84, 95]:
+                full = calc.calculate_lifetime_benefits(claiming_age, longevity, inflation_rate, claiming_months)
+                summary = calc.calculate_lifetime_benefits(
+                    claiming_age, longevity, inflation_rate, claiming_months, summary_only=True
+                )
+                assert 'annual_breakdown' not in summary
+                assert summary['total_lifetime_benefits'] == pytest.approx(full['total_lifetime_benefits'], abs=0.01)
+                assert summary['final_monthly_benefit'] == full['final_monthly_benefit']
+
+    def test_phase_summary_matches_timeline(self):
+        calc = BaseSSCalculator(date(1962, 8, 20), 1800.0)
+        rng = random.Random(5)
+        for _ in range(300):
+            start = date(2024, 1, 1) + timedelta(days=rng.randint(0, 4000))
+            end = start + timedelta(days=rng.randint(-40, 12000))
+            full = calc._build_benefit_timeline(start, end, 1500.0, 0.03, 'own')
+            summary = calc._build_benefit_timeline(start, end, 1500.0, 0.03, 'own', summary_only=True)
+            assert 'timeline' not in summary
+            assert summary['total'] == pytest.approx(full['total'], abs=0.01)
+            assert summary['final_monthly'] == full['final_monthly']
+
+
+class TestStrategyRanking:
+    """Only returned strategies carry a materialized timeline"""
+
+    def test_top_n_limits_strategies_and_timelines(self):
+        calc = WidowSSCalculator(
+            birth_date=date(1964, 3, 15),
+            own_pia=1800.0,
+            deceased_spouse_pia=2800.0,
+            deceased_spouse_death_date=date(2023, 6, 1),
+        )
+        full = calc.calculate_optimal_strategy(longevity_age=95, inflation_rate=0.025)
+        top = calc.calculate_optimal_strategy(longevity_age=95, inflation_rate=0.025, top_n=3)
+
+        assert len(top['all_strategies']) == 3
+        assert top['optimal_strategy']['strategy'] == full['optimal_strategy']['strategy']
+        for strategy in full['all_strategies'] + top['all_strategies']:
+            assert '_timeline' not in strategy
+            assert strategy['benefit_timeline']
+        totals = [s['lifetime_total'] for s in full['all_strategies']]
+        assert totals == sorted(totals, reverse=True)
+
+
+class TestPresentValues:
+    """Present and real values are produced alongside the nominal amounts"""
+
+    CONTEXT = EvaluationContext.resolve(date(2026, 3, 15), rounding=None, discount_rate=0.04, cpi_rate=0.03)
+
+    def _reference(self, span, monthly, r):
+        """Monthly loop: discounted to the as-of month, deflated by calendar year."""
+        as_of = month_ordinal(self.CONTEXT.as_of)
+        grown = [(m, monthly * (1 + r) ** (m // 12 - span[0] // 12)) for m in range(*span)]
+        present = sum(amount * 1.04 ** (-(m - as_of) / 12) for m, amount in grown)
+        real = sum(amount / 1.03 ** (m // 12 - 2026) for m, amount in grown)
+        return present, real
+
+    @pytest.mark.parametrize("birth_date", [date(1964, 3, 10), date(1960, 1, 1), date(1966, 12, 31)])
+    def test_lifetime_values(self, birth_date):
+        calc = BaseSSCalculator(birth_date, 2500.0, self.CONTEXT)
+        for claiming_age, claiming_months, longevity in [(62, 0, 90), (67, 7, 88), (70, 0, 70)]:
+            full = calc.calculate_lifetime_benefits(claiming_age, longevity, 0.025, claiming_months)
+            summary = calc.calculate_lifetime_benefits(claiming_age, longevity, 0.025, claiming_months, summary_only=True)
+            span = calc._lifetime_span(full['claiming_date'], full['death_date'])
+            monthly = calc.calculate_monthly_benefit(claiming_age, claiming_months, 0.025)
+            present, real = self._reference(span, monthly, 0.025)
+
+            for result in (full, summary):
+                assert result['total_present_value'] == pytest.approx(present, abs=1e-6)
+                assert result['total_real_value'] == pytest.approx(real, abs=1e-6)
+            breakdown = full['annual_breakdown']
+            assert sum(breakdown.present_value) == pytest.approx(present, abs=1e-6)
+            if breakdown:
+                assert breakdown[0]['real_value'] == breakdown.real_value[0]
+
+    def test_phase_values(self):
+        calc = BaseSSCalculator(date(1962, 8, 20), 1800.0, self.CONTEXT)
+        rng = random.Random(6)
+        for _ in range(100):
+            start = date(2024, 1, 1) + timedelta(days=rng.randint(0, 4000))
+            end = start + timedelta(days=rng.randint(-40, 12000))
+            full = calc._build_benefit_timeline(start, end, 1500.0, 0.03, 'own')
+            summary = calc._build_benefit_timeline(start, end, 1500.0, 0.03, 'own', summary_only=True)
+            present, real = self._reference(calc._phase_span(start, end), 1500.0, 0.03)
+            for result in (full, summary):
+                assert result['present_value'] == pytest.approx(present, abs=1e-6)
+                assert result['real_value'] == pytest.approx(real, abs=1e-6)
+
+    def test_nominal_only_by_default(self):
+        calc = BaseSSCalculator(date(1964, 3, 10), 2500.0, EvaluationContext.resolve(date(2026, 3, 15)))
+        result = calc.calculate_lifetime_benefits(62, 90, 0.025)
+        assert 'total_present_value' not in result
+        assert 'present_value' not in result['annual_breakdown'][0]
+        assert 'present_value' not in result['annual_breakdown'].to_columns()
+
+    def test_rank_by_present_value(self):
+        context = EvaluationContext.resolve(date(2026, 1, 15), discount_rate=0.06)
+        calc = WidowSSCalculator(date(1964, 3, 15), 2600.0, 2800.0, date(2023, 6, 1), context=context)
+        result = calc.calculate_optimal_strategy(95, 0.025, rank_by='present_value')
+        values = [s['present_value'] for s in result['all_strategies']]
+        assert values == sorted(values, reverse=True)
+        assert all(s['real_value'] > s['present_value'] for s in result['all_strategies'])
+        assert result['valuation']['ranked_by'] == 'present_value'
+
+        with pytest.raises(ValueError):
+            WidowSSCalculator(date(1964, 3, 15), 2600.0, 2800.0, date(2023, 6, 1),
+                              context=EvaluationContext.resolve(date(2026, 1, 15))
+                              ).calculate_optimal_strategy(95, 0.025, rank_by='present_value')
+
+
+class TestBenefitProfile:
+    """Compiled lookups equal the formulas they replace"""
+
+    @pytest.mark.parametrize("birth_date", [date(1964, 1, 31), date(1961, 8, 30), date(1958, 3, 1)])
+    def test_compiled_monthly_benefit_matches_formula(self, birth_date):
+        context = EvaluationContext(date(2024, 6, 1))
+        calc = BaseSSCalculator(birth_date, 2100.0, context)
+        current_age_years = months_between(birth_date, context.as_of) / 12
+        fra = calc.fra_years + calc.fra_months / 12
+        for claim_age in range(62 * 12, 70 * 12 + 1):
+            claim_date = add_months(birth_date, claim_age)
+            assert calc.get_claiming_date(*divmod(claim_age, 12)) == claim_date
+            expected = benefit_math.monthly_benefit_at_claim(
+                2100.0, months_between(birth_date, claim_date) / 12, current_age_years, 0.025, fra
+            )
+            assert calc.calculate_monthly_benefit(*divmod(claim_age, 12), 0.025) == expected
+
+    def test_adjustment_factors_match_date_formulas(self):
+        calc = BaseSSCalculator(date(1961, 8, 30), 2100.0, EvaluationContext(date(2024, 6, 1)))
+        for claim_date in calc.profile.claim_dates:
+            months = months_between(calc.fra_date, claim_date)
+            if claim_date < calc.fra_date:
+                assert calc.calculate_reduction_factor(claim_date) == pytest.approx(
+                    1 - min(36, -months) * 5 / 900 - max(0, -months - 36) * 5 / 1200
+                )
+            elif claim_date > calc.fra_date:
+                assert calc.calculate_delayed_credit_factor(claim_date) == pytest.approx(1 + months * 2 / 300)
+
+    def test_profile_shared_and_refreshed(self):
+        as_of = date(2024, 6, 1)
+        first = BaseSSCalculator(date(1964, 3, 10), 2500.0, EvaluationContext(as_of))
+        second = BaseSSCalculator(date(1964, 3, 10), 2500.0, EvaluationContext(as_of, rounding=None))
+        assert first.profile is second.profile is compile_profile(date(1964, 3, 10), 2500.0, as_of)
+
+        first.pia = 2600.0
+        assert first.profile.pia == 2600.0
+        assert first.calculate_monthly_benefit(67) == pytest.approx(2600.0)
+
+    def test_rate_tables_bounded(self):
+        profile = BenefitProfile(date(1964, 3, 10), 2500.0, date(2024, 6, 1))
+        first = profile.monthly_benefits(0.025)
+        rates = [0.001 * i for i in range(1, 40)]
+        for rate in rates:
+            profile.monthly_benefits(rate)
+            profile.inflated_pias(rate)
+            profile.monthly_benefits(0.025)
+        assert len(profile._monthly_benefits) == len(profile._inflated_pias) == BenefitProfile.MAX_RATE_TABLES
+        # The most recently used rates stay; an evicted rate is rebuilt identically
+        assert 0.025 in profile._monthly_benefits and rates[0] not in profile._monthly_benefits
+        assert profile.monthly_benefits(0.025) is first
+        fresh = BenefitProfile(date(1964, 3, 10), 2500.0, date(2024, 6, 1))
+        assert profile.inflated_pias(rates[0]) == fresh.inflated_pias(rates[0])
+
+    def test_outside_compiled_range_falls_back(self):
+        calc = BaseSSCalculator(date(1964, 3, 10), 2500.0, EvaluationContext(date(2024, 6, 1)))
+        assert calc.profile.monthly_benefit(71 * 12, 0.0) is None
+        assert calc.calculate_monthly_benefit(71, 0, 0.0) == pytest.approx(2500.0 * 1.32)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
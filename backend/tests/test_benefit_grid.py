@@ -0,0 +1,97 @@
+"""
+Tests for benefit_grid.py vectorized calculations
+Verifies the array versions agree with the scalar benefit_math helpers and
+that the claiming grid matches BaseSSCalculator.calculate_lifetime_benefits
+to the cent.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.core import benefit_math
+from backend.core import benefit_grid
+from backend.core.benefit_grid import CLAIM_AGE_MONTHS, claiming_grid
+from backend.core.ss_core_calculator import IndividualSSCalculator
+
+
+class TestVectorizedFactors:
+    """Array helpers must equal the scalar helpers element by element"""
+
+    def test_early_and_drc_factors(self):
+        offsets = np.arange(-96, 49)
+        early = benefit_grid.early_reduction_factor(offsets)
+        drc = benefit_grid.drc_factor(offsets)
+        for i, m in enumerate(offsets):
+            assert early[i] == pytest.approx(benefit_math.early_reduction_factor(int(m)), abs=1e-12)
+            assert drc[i] == pytest.approx(benefit_math.drc_factor(int(m)), abs=1e-12)
+
+    def test_preclaim_cola_factor(self):
+        claim_ages = CLAIM_AGE_MONTHS / 12
+        factors = benefit_grid.preclaim_cola_factor(claim_ages, 58.5, 0.03)
+        for claim_age, factor in zip(claim_ages, factors):
+            assert factor == pytest.approx(benefit_math.preclaim_cola_factor(claim_age, 58.5, 0.03), rel=1e-12)
+
+    def test_monthly_benefit_at_claim_broadcasts(self):
+        rates = np.array([0.0, 0.025, 0.04])
+        claim_ages = CLAIM_AGE_MONTHS / 12
+        result = benefit_grid.monthly_benefit_at_claim(3000.0, claim_ages[:, None], 61.0, rates[None, :], 67)
+        assert result.shape == (97, 3)
+        for i, claim_age in enumerate(claim_ages):
+            for k, r in enumerate(rates):
+                expected = benefit_math.monthly_benefit_at_claim(3000.0, claim_age, 61.0, r, 67)
+                assert result[i, k] == pytest.approx(expected, rel=1e-12)
+
+    def test_benefit_after_claim(self):
+        years = np.arange(0, 30)
+        result = benefit_grid.benefit_after_claim(2000.0, years, 0.025)
+        for y in years:
+            assert result[y] == pytest.approx(benefit_math.benefit_after_claim(2000.0, int(y), 0.025), rel=1e-12)
+
+
+class TestClaimingGrid:
+    """Grid lifetime totals must match the scalar calculator"""
+
+    @pytest.mark.parametrize("birth_date", [
+        date(1963, 5, 17),
+        date(1960, 1, 1),   # death falls on January 1st
+        date(1958, 12, 28),
+    ])
+    def test_matches_scalar_lifetime_to_the_cent(self, birth_date):
+        longevity_ages = [75, 88, 95]
+        rates = [0.0, 0.025]
+        grid = claiming_grid(birth_date, 2800.0, longevity_ages, rates)
+        calc = IndividualSSCalculator(birth_date, 2800.0)
+
+        assert grid.lifetime_total.shape == (97, 3, 2)
+
+        for claim_months in CLAIM_AGE_MONTHS[::7]:
+            years, months = divmod(int(claim_months), 12)
+            for longevity in longevity_ages:
+                for r in rates:
+                    scalar = calc.calculate_lifetime_benefits(years, longevity, r, months)
+                    assert grid.lifetime_at(years, longevity, r, months) == pytest.approx(
+                        scalar['total_lifetime_benefits'], abs=0.01
+                    )
+                    assert grid.monthly_benefit[grid.claim_index(years, months), rates.index(r)] == pytest.approx(
+                        scalar['initial_monthly_benefit'], abs=0.01
+                    )
+
+    def test_optimal_claim_age_shifts_with_longevity(self):
+        grid = claiming_grid(date(1964, 3, 10), 2500.0, [72, 95], [0.0])
+        optimal = grid.optimal_claim_age_months()
+        # Dying young favors claiming early; long life favors waiting to 70
+        assert optimal[0, 0] == 62 * 12
+        assert optimal[1, 0] == 70 * 12
+
+    def test_to_dict_is_json_ready(self):
+        grid = claiming_grid(date(1964, 3, 10), 2500.0, [90], [0.025])
+        data = grid.to_dict()
+        assert len(data['claim_age_months']) == 97
+        assert len(data['lifetime_total'][0][0]) == 1
+        assert isinstance(data['lifetime_total'][0][0][0], float)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
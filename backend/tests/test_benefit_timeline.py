@@ -0,0 +1,90 @@
+"""
+Tests for the columnar BenefitTimeline
+Verifies record/column serialization, phase concatenation and that the
+calculators hand back BenefitTimeline objects.
+"""
+
+from datetime import date
+
+import pytest
+
+from backend.core.benefit_timeline import BenefitTimeline, PHASE_LABELS, serialize_timelines
+from backend.core.divorced_calculator import DivorcedSSCalculator
+from backend.core.widow_calculator import WidowSSCalculator
+
+
+def _timeline(phase, years):
+    timeline = BenefitTimeline()
+    for i, year in enumerate(years):
+        timeline.append(year, 62.0 + i, 1000.0 + i, (1000.0 + i) * 12, 12, phase)
+    return timeline
+
+
+class TestBenefitTimeline:
+    """Columnar storage behaves like the legacy list of dicts"""
+
+    def test_records_round_trip(self):
+        timeline = _timeline('own', [2030, 2031])
+        assert len(timeline) == 2
+        assert timeline[1] == {
+            'year': 2031, 'age': 63.0, 'monthly_benefit': 1001.0,
+            'annual_total': 12012.0, 'months_paid': 12, 'phase': 'own'
+        }
+        assert [entry['year'] for entry in timeline] == [2030, 2031]
+
+    def test_concat_keeps_phase_order(self):
+        combined = _timeline('survivor', [2030, 2031]) + _timeline('own', [2032])
+        assert [entry['phase'] for entry in combined] == ['survivor', 'survivor', 'own']
+
+    def test_to_columns(self):
+        columns = _timeline('ex_spouse', [2030, 2031]).to_columns()
+        assert columns['year'] == [2030, 2031]
+        assert columns['phase_labels'] == list(PHASE_LABELS)
+        assert [columns['phase_labels'][code] for code in columns['phase']] == ['ex_spouse', 'ex_spouse']
+
+    def test_unknown_phase_rejected(self):
+        with pytest.raises(ValueError):
+            BenefitTimeline().append(2030, 62.0, 1.0, 12.0, 12, 'bogus')
+
+    def test_serialize_nested_result(self):
+        result = {'all_strategies': [{'benefit_timeline': _timeline('own', [2030])}]}
+        records = serialize_timelines(result)
+        columns = serialize_timelines(result, 'columns')
+        assert records['all_strategies'][0]['benefit_timeline'][0]['year'] == 2030
+        assert columns['all_strategies'][0]['benefit_timeline']['year'] == [2030]
+
+
+class TestCalculatorTimelines:
+    """Crossover and restricted-application strategies concatenate phases"""
+
+    def test_widow_crossover_timeline(self):
+        calc = WidowSSCalculator(
+            birth_date=date(1964, 3, 15),
+            own_pia=1800.0,
+            deceased_spouse_pia=2800.0,
+            deceased_spouse_death_date=date(2023, 6, 1),
+        )
+        crossover = calc.calculate_crossover_strategy(60, 70, 95, 0.025)
+        timeline = crossover['timeline']
+        assert isinstance(timeline, BenefitTimeline)
+        phases = [entry['phase'] for entry in timeline]
+        assert phases[0] == 'survivor' and phases[-1] == 'own'
+        assert sum(timeline.annual_total) == pytest.approx(crossover['lifetime_total'], abs=len(timeline) * 0.01)
+
+    def test_divorced_restricted_application_timeline(self):
+        calc = DivorcedSSCalculator(
+            birth_date=date(1953, 6, 1),
+            own_pia=2000.0,
+            ex_spouse_pia=3000.0,
+            marriage_duration_years=15,
+            divorce_date=date(2000, 1, 1),
+        )
+        result = calc.calculate_optimal_strategy(longevity_age=90, inflation_rate=0.02)
+        switching = [s for s in result['all_strategies'] if s['type'] == 'switching']
+        assert switching
+        phases = [entry['phase'] for entry in switching[0]['benefit_timeline']]
+        assert phases[0] == 'ex_spouse' and phases[-1] == 'own'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,145 @@
+"""
+Tests for break_even.py
+Verifies the analytic crossings and dominance intervals against a
+month-by-month reference, and the streams the calculators attach.
+"""
+
+from datetime import date
+import random
+
+import numpy as np
+import pytest
+
+from backend.core.break_even import ANNUAL_COLA, MONTHLY_COLA, BenefitStream, analyze_break_even
+from backend.core.divorced_calculator import DivorcedSSCalculator
+from backend.core.evaluation_context import EvaluationContext
+from backend.core.ssdi_calculator import SSDICalculator
+from backend.core.widow_calculator import WidowSSCalculator
+
+CONTEXT = EvaluationContext.resolve(date(2026, 1, 15))
+
+
+def _reference(streams, r, cadence):
+    """Monthly loop: every crossing (from behind to caught up) and the final totals."""
+    segments = [segment for stream in streams for segment in stream.segments if segment[1] > segment[0]]
+    first, last = min(s for s, _, _ in segments), max(e for _, e, _ in segments)
+
+    def paid(stream, m):
+        total = 0.0
+        for start, end, amount in stream.segments:
+            if start <= m < end:
+                steps = m // 12 - start // 12 if cadence == ANNUAL_COLA else (m - start) / 12
+                total += amount * (1 + r) ** steps
+        return total
+
+    cumulative = np.zeros(len(streams))
+    behind, crossings = set(), []
+    for m in range(first, last):
+        cumulative += [paid(stream, m) for stream in streams]
+        tolerance = 1e-9 * max(1.0, np.abs(cumulative).max())
+        for i in range(len(streams)):
+            for j in range(len(streams)):
+                if i == j:
+                    continue
+                if cumulative[i] - cumulative[j] < -tolerance:
+                    behind.add((i, j))
+                elif (i, j) in behind:
+                    behind.discard((i, j))
+                    crossings.append((i, j, m))
+    crossings.sort(key=lambda crossing: (crossing[2], crossing[0], crossing[1]))
+    return crossings, cumulative
+
+
+class TestAnalyzeBreakEven:
+    """Closed-form crossings agree with a month-by-month simulation"""
+
+    @pytest.mark.parametrize("cadence", [ANNUAL_COLA, MONTHLY_COLA])
+    @pytest.mark.parametrize("r", [0.0, 0.025])
+    def test_matches_monthly_reference(self, cadence, r):
+        rng = random.Random(7)
+        for _ in range(25):
+            streams = []
+            for k in range(rng.randint(2, 4)):
+                segments, t = [], rng.randint(24000, 24060)
+                for _ in range(rng.randint(1, 3)):
+                    start = t + rng.randint(0, 40)
+                    t = start + rng.randint(0, 200)
+                    segments.append((start, t, rng.uniform(500, 3000)))
+                streams.append(BenefitStream(f"s{k}", tuple(segments)))
+
+            analysis = analyze_break_even(streams, r, 23300, cadence)
+            crossings, totals = _reference(streams, r, cadence)
+            assert analysis.crossings == crossings
+            assert np.allclose(analysis.totals, totals, rtol=1e-10)
+
+    def test_matrix_and_dominance(self):
+        # Claim at 62 (ordinal 744) vs 70 (840) on a 1.24x larger benefit, no COLA
+        early = BenefitStream('early', ((744, 1140, 1000.0),))
+        late = BenefitStream('late', ((840, 1140, 1760.0),))
+        analysis = analyze_break_even([early, late], 0.0, 0)
+
+        # late catches up once 1760 * n >= 1000 * (96 + n): n = 126.2 -> 127th payment
+        assert analysis.break_even_month(1, 0) == 840 + 126
+        result = analysis.to_dict()
+        assert result['crossover_matrix'] == [[None, None], [round((840 + 126) / 12, 2), None]]
+        assert result['dominance'] == {
+            'early': [{'from_age': 62.0, 'to_age': 80.5}],
+            'late': [{'from_age': 80.5, 'to_age': None}],
+        }
+
+    def test_empty_streams(self):
+        analysis = analyze_break_even([BenefitStream('none', ((800, 800, 1.0),))], 0.025, 0)
+        assert analysis.to_dict()['crossings'] == []
+
+
+class TestCalculatorStreams:
+    """Attached streams reproduce each strategy's lifetime total"""
+
+    def test_widow_break_even(self):
+        calc = WidowSSCalculator(
+            birth_date=date(1964, 3, 15),
+            own_pia=2600.0,
+            deceased_spouse_pia=2800.0,
+            deceased_spouse_death_date=date(2023, 6, 1),
+            context=CONTEXT,
+        )
+        result = calc.calculate_optimal_strategy(95, 0.025)
+        break_even = result['break_even']
+        names = [strategy['strategy'] for strategy in result['all_strategies']]
+        assert break_even['strategies'] == names
+        assert all('_stream' not in strategy for strategy in result['all_strategies'])
+        # The top-ranked strategy leads at the horizon
+        assert break_even['dominance'][names[0]][-1]['to_age'] is None
+
+    @pytest.mark.parametrize("phases", [
+        [(date(2026, 3, 15), date(2030, 3, 15), 2100.0, 'survivor'), (date(2030, 3, 15), date(2059, 3, 15), 2900.0, 'own')],
+        [(date(2026, 3, 15), date(2026, 11, 20), 1500.0, 'ex_spouse')],
+        [(date(2026, 1, 31), date(2040, 1, 1), 1200.0, 'own')],
+    ])
+    def test_phase_streams_match_timelines(self, phases):
+        calc = DivorcedSSCalculator(date(1964, 3, 15), 2000.0, 3000.0, 15, date(2000, 1, 1), context=CONTEXT)
+        combined = calc._build_phased_timeline(phases, 0.025)
+        segments = calc._phase_stream(phases)
+
+        analysis = analyze_break_even([BenefitStream('phased', segments)], 0.025, calc.birth_ordinal)
+        assert analysis.totals[0] == pytest.approx(combined['total'], abs=0.01)
+        assert sum(end - start for start, end, _ in segments) == sum(combined['timeline'].months_paid)
+
+    def test_lifetime_stream_matches_total(self):
+        calc = WidowSSCalculator(date(1960, 1, 1), 1800.0, 2800.0, date(2020, 6, 1), context=CONTEXT)
+        total = calc.calculate_lifetime_benefits(62, 95, 0.025, summary_only=True)['total_lifetime_benefits']
+        stream = BenefitStream('own', calc._lifetime_stream(62, 95, 0.025))
+        assert analyze_break_even([stream], 0.025, 0).totals[0] == pytest.approx(total, abs=0.01)
+
+    def test_ssdi_break_even(self):
+        result = SSDICalculator(date(1964, 3, 10), 2500.0, CONTEXT).calculate_ssdi_comparison(0.025, 95)
+        age = result['strategies']['suspension']['break_even_age']
+        assert 70 < age < 95
+        assert result['break_even']['crossover_matrix'][1][0] == round(age, 2)
+        # The yearly snapshot after the break-even year shows suspension ahead
+        after = result['timeline'][int(age) + 1 - result['timeline'][0]['age']]
+        assert after['suspend_cumulative'] >= after['std_cumulative']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""
+Tests for cola_paths.py
+Verifies that constant COLA paths reproduce the single-rate lifetime
+calculation, and the per-path growth, generators and percentile bands.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.core.cola_paths import (
+    ColaPaths,
+    HISTORICAL_COLA_PERCENT,
+    historical_cola_paths,
+    simulate_cola_paths,
+    stream_bands,
+)
+from backend.core.evaluation_context import EvaluationContext
+from backend.core.ss_core_calculator import IndividualSSCalculator
+
+CONTEXT = EvaluationContext.resolve(date(2026, 1, 15))
+
+
+class TestConstantPaths:
+    """A constant path matches the scalar calculator at that rate"""
+
+    @pytest.mark.parametrize("birth_date", [date(1964, 3, 10), date(1975, 6, 30), date(1959, 1, 1)])
+    @pytest.mark.parametrize("claim", [(62, 0), (67, 5), (70, 0)])
+    def test_matches_lifetime_benefits(self, birth_date, claim):
+        calc = IndividualSSCalculator(birth_date, 2500.0, CONTEXT)
+        rates = (0.0, 0.025, 0.07)
+        paths = ColaPaths([[r] for r in rates], 2026)
+        bands = calc.calculate_cola_bands(claim[0], 92, paths, claim[1])
+
+        for p, r in enumerate(rates):
+            reference = calc.calculate_lifetime_benefits(claim[0], 92, r, claim[1])
+            timeline = reference['annual_breakdown']
+            assert bands.totals[p] == pytest.approx(reference['total_lifetime_benefits'], abs=0.01)
+            assert bands.years.tolist() == list(timeline.year)
+            assert bands.months_paid.tolist() == list(timeline.months_paid)
+            assert np.allclose(bands.monthly[p], timeline.monthly_benefit, atol=0.006)
+
+    def test_year_specific_rates(self):
+        # 2% through 2030, then 5%: each year's benefit compounds only the COLAs since claiming
+        paths = ColaPaths([[0.02] * 5 + [0.05]], 2026)
+        bands = stream_bands([(2026 * 12, 2036 * 12, 1000.0)], paths)
+        expected = [1000.0 * 1.02 ** min(k, 4) * 1.05 ** max(0, k - 4) for k in range(10)]
+        assert np.allclose(bands.monthly[0], expected)
+        assert bands.cumulative[0, -1] == pytest.approx(12 * sum(expected))
+
+
+class TestGenerators:
+    """Simulated and historical path matrices"""
+
+    def test_simulated_paths(self):
+        paths = simulate_cola_paths(20000, 30, 2026, mean=0.03, volatility=0.01, seed=5)
+        assert paths.rates.shape == (20000, 30)
+        assert paths.rates.min() >= 0.0
+        assert paths.rates.mean() == pytest.approx(0.03, abs=0.002)
+        assert np.array_equal(paths.rates, simulate_cola_paths(20000, 30, 2026, 0.03, 0.01, seed=5).rates)
+
+    def test_historical_windows(self):
+        paths = historical_cola_paths(60, 2026)
+        assert paths.rates.shape == (len(HISTORICAL_COLA_PERCENT), 60)
+        assert paths.rates[0, 0] == pytest.approx(0.08)
+        # Windows wrap around to the start of the series
+        assert paths.rates[-1, 1] == paths.rates[0, 0]
+
+    def test_invalid_rates(self):
+        with pytest.raises(ValueError):
+            ColaPaths([[0.02, -1.0]], 2026)
+        with pytest.raises(ValueError):
+            ColaPaths([], 2026)
+
+
+class TestBands:
+    """Percentile bands across paths"""
+
+    def test_bands_ordered(self):
+        calc = IndividualSSCalculator(date(1964, 3, 10), 2500.0, CONTEXT)
+        bands = calc.calculate_cola_bands(67, 95, simulate_cola_paths(2000, 40, 2026, seed=2))
+        result = bands.to_dict()
+        assert result['paths'] == 2000
+        assert len(result['years']) == len(result['cumulative_benefits']['50'])
+        for series in ('monthly_benefit', 'cumulative_benefits'):
+            low, median, high = (np.asarray(result[series][p]) for p in ('5', '50', '95'))
+            assert np.all(low <= median) and np.all(median <= high)
+        totals = list(result['lifetime_total']['percentiles'].values())
+        assert totals == sorted(totals)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
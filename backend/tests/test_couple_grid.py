@@ -0,0 +1,111 @@
+"""
+Tests for couple_grid.py
+Verifies the 97 x 97 couple surface against the scalar calculators and a
+month-by-month reference simulation of spousal top-ups and survivor step-ups.
+"""
+
+from datetime import date
+
+import pytest
+
+from backend.core.base_ss_calculator import month_ordinal
+from backend.core.couple_grid import couple_grid, survivor_reduction_factor
+from backend.core.ss_core_calculator import HouseholdSSCalculator, IndividualSSCalculator
+
+SPOUSE1 = (date(1963, 5, 17), 2800.0)
+SPOUSE2 = (date(1964, 9, 2), 900.0)
+DEATH_PAIRS = [(75, 95), (95, 78), (88, 88)]
+R = 0.025
+
+
+@pytest.fixture(scope="module")
+def grid():
+    return couple_grid(*SPOUSE1, *SPOUSE2, DEATH_PAIRS, R)
+
+
+def _reference_total(claim1, claim2, longevity1, longevity2):
+    """
+    Brute-force monthly loop over the household's benefits. Every amount is
+    COLA-adjusted once per calendar year after the year it was fixed in.
+    """
+    calcs = [IndividualSSCalculator(*SPOUSE1), IndividualSSCalculator(*SPOUSE2)]
+    claims = [claim1, claim2]
+    births = [month_ordinal(calc.birth_date) for calc in calcs]
+    claim_ords = [b + c for b, c in zip(births, claims)]
+    ends = [b + L * 12 + 1 for b, L in zip(births, (longevity1, longevity2))]
+
+    def grown(amount, since_ord, m):
+        return amount * (1 + R) ** (m // 12 - since_ord // 12)
+
+    own = [calc.calculate_monthly_benefit(*divmod(c, 12), R) for calc, c in zip(calcs, claims)]
+    spousal_base = [
+        0.5 * calcs[1 - p]._calculate_inflated_pia(claims[1 - p] / 12, R)
+        * calcs[p].calculate_reduction_factor(calcs[p].get_claiming_date(*divmod(claims[p], 12)))
+        for p in (0, 1)
+    ]
+
+    total = 0.0
+    for m in range(min(claim_ords), max(ends)):
+        for p in (0, 1):
+            if claim_ords[p] <= m < ends[p]:
+                total += grown(own[p], claim_ords[p], m)
+            if max(claim_ords) <= m < min(ends):
+                top_up = grown(spousal_base[p], claim_ords[1 - p], m) - grown(own[p], claim_ords[p], m)
+                total += max(0.0, top_up)
+        if ends[0] != ends[1]:
+            d = 0 if ends[0] < ends[1] else 1
+            s = 1 - d
+            start = max(ends[d], births[s] + 720)
+            if start <= m < ends[s]:
+                # The deceased had claimed in every case exercised below
+                assert claim_ords[d] < ends[d]
+                reduction = float(survivor_reduction_factor(
+                    start - births[s], calcs[s].fra_years * 12 + calcs[s].fra_months
+                ))
+                reference = grown(own[d], claim_ords[d], m) * reduction
+                paid_own = grown(own[s], claim_ords[s], m) if claim_ords[s] <= m else 0.0
+                total += max(0.0, reference - paid_own)
+    return total
+
+
+class TestCoupleGrid:
+    """Surface shape and scalar agreement"""
+
+    def test_shape(self):
+        result = couple_grid(*SPOUSE1, *SPOUSE2, [(L1, L2) for L1 in (80, 90, 100) for L2 in (80, 90, 100)], R)
+        assert result.household_total.shape == (97, 97, 9)
+
+    def test_own_component_matches_scalar(self, grid):
+        calc1, calc2 = IndividualSSCalculator(*SPOUSE1), IndividualSSCalculator(*SPOUSE2)
+        for i in range(0, 97, 16):
+            for j in range(0, 97, 24):
+                for k, (longevity1, longevity2) in enumerate(DEATH_PAIRS):
+                    expected = (
+                        calc1.calculate_lifetime_benefits(*divmod(744 + i, 12)[:1], longevity1, R, (744 + i) % 12)['total_lifetime_benefits']
+                        + calc2.calculate_lifetime_benefits(*divmod(744 + j, 12)[:1], longevity2, R, (744 + j) % 12)['total_lifetime_benefits']
+                    )
+                    assert grid.components['own'][i, j, k] == pytest.approx(expected, abs=0.02)
+
+    @pytest.mark.parametrize("claim1,claim2", [(744, 744), (804, 770), (840, 744), (760, 840)])
+    @pytest.mark.parametrize("k", range(len(DEATH_PAIRS)))
+    def test_household_total_matches_monthly_reference(self, grid, claim1, claim2, k):
+        i, j = grid.claim_index(*divmod(claim1, 12)), grid.claim_index(*divmod(claim2, 12))
+        assert grid.household_total[i, j, k] == pytest.approx(_reference_total(claim1, claim2, *DEATH_PAIRS[k]), rel=1e-9)
+
+    def test_survivor_step_up_and_optimum(self, grid):
+        # High earner dying first leaves the survivor a step-up; the low earner dying
+        # first leaves none to a high earner who waited to 70
+        assert grid.components['survivor'][:, :, 0].min() > 0
+        assert grid.components['survivor'][grid.claim_index(70), :, 1].max() == 0
+        best1, best2 = grid.optimal_pair(death_index=0)
+        assert best1 == 70 * 12
+        best1, best2 = grid.optimal_pair()
+        assert grid.expected_total().max() == pytest.approx(grid.total_at(divmod(best1, 12), divmod(best2, 12)))
+
+    def test_household_wrapper_requires_spouse(self):
+        with pytest.raises(ValueError):
+            HouseholdSSCalculator(IndividualSSCalculator(*SPOUSE1)).optimize_claiming_months([(90, 90)])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,122 @@
+"""
+Tests for earnings_test.py
+Verifies the withholding rules, the recomputed reduction factor at FRA, and
+that every grid cell equals the earnings-tested calculate_lifetime_benefits.
+"""
+
+from datetime import date
+import math
+
+import numpy as np
+import pytest
+
+from backend.core.actuarial_tables import early_reduction_factor
+from backend.core.earnings_test import exempt_amounts
+from backend.core.evaluation_context import EvaluationContext
+from backend.core.ss_core_calculator import IndividualSSCalculator
+from backend.core.ssa_xml_processor import SSAXMLProcessor
+
+AS_OF = date(2026, 1, 15)
+R = 0.025
+# Born 1964-05-17: FRA 67 in May 2031, age 62 in May 2026
+BIRTH = date(1964, 5, 17)
+WORKING = {year: 60000.0 for year in range(2026, 2032)}
+
+
+def _calc(**context):
+    return IndividualSSCalculator(BIRTH, 2400.0, EvaluationContext.resolve(AS_OF, **context))
+
+
+class TestExemptAmounts:
+    """Published and projected annual exempt amounts"""
+
+    def test_table_and_growth(self):
+        lower, higher = exempt_amounts([2024, 2026, 2028], 0.02)
+        assert lower.tolist() == pytest.approx([22320, 24480, 24480 * 1.02 ** 2])
+        assert higher.tolist() == pytest.approx([59520, 65160, 65160 * 1.02 ** 2])
+
+
+class TestWithholding:
+    """Monthly withholding and the recomputation at FRA"""
+
+    def test_no_earnings_matches_lifetime_benefits(self):
+        calc = _calc(discount_rate=0.03)
+        for years, months in ((62, 0), (64, 7), (68, 0)):
+            standard = calc.calculate_lifetime_benefits(years, 90, R, months)
+            tested = calc.calculate_lifetime_benefits(years, 90, R, months, projected_earnings={2026: 0.0})
+            for key in ('total_lifetime_benefits', 'total_present_value', 'total_real_value'):
+                assert tested[key] == pytest.approx(standard[key], abs=0.02)
+            assert tested['annual_breakdown'].to_records() == standard['annual_breakdown'].to_records()
+            assert tested['earnings_test']['withheld_months'] == 0
+
+    def test_one_for_two_before_fra_year(self):
+        result = _calc().calculate_lifetime_benefits(62, 90, R, projected_earnings=WORKING)
+        row = result['annual_breakdown'][1]  # 2027, twelve months of entitlement
+        excess = (60000 - 24480 * (1 + R)) / 2
+        assert result['earnings_test']['withheld_by_year'][2027] == pytest.approx(excess, abs=0.01)
+        assert row['months_paid'] == 12 - math.ceil(excess / row['monthly_benefit'])
+        assert row['annual_total'] == pytest.approx(12 * row['monthly_benefit'] - excess, abs=0.01)
+
+    def test_fra_year_counts_months_before_fra(self):
+        calc = _calc()
+        # Four months before May FRA: 4/12 of 240,000 exceeds the higher amount
+        result = calc.calculate_lifetime_benefits(66, 90, R, 8, projected_earnings={2031: 240000.0})
+        higher = 65160 * (1 + R) ** 5
+        assert result['earnings_test']['withheld_by_year'][2031] == pytest.approx((80000 - higher) / 3, abs=0.01)
+        quiet = calc.calculate_lifetime_benefits(66, 90, R, 8, projected_earnings={2031: 190000.0})
+        assert quiet['earnings_test']['total_withheld'] == 0
+
+    def test_reduction_recomputed_at_fra(self):
+        calc = _calc()
+        result = calc.calculate_lifetime_benefits(62, 90, R, projected_earnings=WORKING)
+        withheld = result['earnings_test']['withheld_months']
+        assert result['earnings_test']['recomputed_adjustment'] == pytest.approx(
+            early_reduction_factor(withheld - 60) / early_reduction_factor(-60), abs=1e-6)
+        after_fra = [row for row in result['annual_breakdown'] if row['year'] > 2031]
+        standard = calc.calculate_lifetime_benefits(62, 90, R)
+        before = {row['year']: row['monthly_benefit'] for row in standard['annual_breakdown']}
+        assert after_fra[0]['monthly_benefit'] == pytest.approx(
+            before[after_fra[0]['year']] * result['earnings_test']['recomputed_adjustment'], abs=0.01)
+
+
+class TestEarningsTestGrid:
+    """calculate_earnings_test over claim months x earnings levels"""
+
+    def test_cells_match_lifetime_benefits(self):
+        calc = _calc(discount_rate=0.03)
+        scales = (0.0, 0.5, 1.0, 2.0)
+        grid = calc.calculate_earnings_test(WORKING, 90, R, scales)
+        assert grid.totals['lifetime_total'].shape == (97, 4)
+        assert np.allclose(grid.totals['lifetime_total'][:, 0], grid.base_totals['lifetime_total'])
+        for row in (0, 13, 47, 60, 96):
+            age = int(grid.claim_age_months[row])
+            for column, scale in enumerate(scales):
+                earnings = {year: amount * scale for year, amount in WORKING.items()}
+                result = calc.calculate_lifetime_benefits(age // 12, 90, R, age % 12, summary_only=True,
+                                                          projected_earnings=earnings)
+                for key, name in (('lifetime_total', 'total_lifetime_benefits'), ('present_value', 'total_present_value')):
+                    assert grid.totals[key][row, column] == pytest.approx(result[name], abs=0.02)
+
+    def test_expected_mode(self):
+        calc = _calc()
+        grid = calc.calculate_earnings_test({2026: 0.0}, inflation_rate=R, sex='male')
+        for row in (0, 60, 96):
+            age = int(grid.claim_age_months[row])
+            expected = calc.calculate_lifetime_benefits(age // 12, 90, R, age % 12, summary_only=True, sex='male')
+            assert grid.totals['lifetime_total'][row, 0] == pytest.approx(expected['total_lifetime_benefits'], abs=0.05)
+
+    def test_withholding_grows_with_earnings(self):
+        grid = _calc().calculate_earnings_test(WORKING, 90, R, (0.5, 1.0, 1.5))
+        months = grid.withheld_months.sum(axis=2)
+        assert (np.diff(months, axis=1) >= 0).all()
+        assert (months[grid.claim_age_months >= 67 * 12] == 0).all()
+        assert grid.to_dict()['best_claim_age_months'] == [
+            int(grid.claim_age_months[row]) for row in grid.best_claims()]
+
+    def test_spreadsheet_projection(self):
+        rows = [{'year': year, 'earnings': 50000} for year in range(2020, 2030)]
+        assert SSAXMLProcessor.projected_earnings(rows, 2026) == {year: 50000.0 for year in range(2026, 2030)}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
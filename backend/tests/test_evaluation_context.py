@@ -0,0 +1,80 @@
+"""
+Tests for EvaluationContext
+Verifies calculators are a pure function of their inputs once the as-of
+date is fixed, and that the rounding policy is applied.
+"""
+
+from datetime import date
+
+import pytest
+
+from backend.core import (
+    base_ss_calculator,
+    divorced_calculator,
+    evaluation_context,
+    ssdi_calculator,
+    widow_calculator,
+)
+from backend.core.divorced_calculator import DivorcedSSCalculator
+from backend.core.evaluation_context import EvaluationContext
+from backend.core.ss_core_calculator import IndividualSSCalculator
+from backend.core.ssdi_calculator import SSDICalculator
+from backend.core.widow_calculator import WidowSSCalculator
+
+AS_OF = date(2024, 6, 1)
+
+
+class TestEvaluationContext:
+    """Fixed as-of dates make results reproducible and cacheable"""
+
+    def test_context_is_hashable(self):
+        first = EvaluationContext(AS_OF)
+        second = EvaluationContext.resolve(AS_OF)
+        assert first == second and hash(first) == hash(second)
+        valued = EvaluationContext.resolve(AS_OF, discount_rate=0.03)
+        assert valued != first and valued.values_present
+
+    def test_results_depend_only_on_inputs(self):
+        context = EvaluationContext(AS_OF)
+        earlier = EvaluationContext(date(2015, 6, 1))
+        calc = IndividualSSCalculator(date(1964, 3, 10), 2500.0, context)
+        same = IndividualSSCalculator(date(1964, 3, 10), 2500.0, EvaluationContext(AS_OF))
+        other = IndividualSSCalculator(date(1964, 3, 10), 2500.0, earlier)
+
+        assert calc.current_age_in_months == 60 * 12 + 2
+        assert calc.calculate_lifetime_benefits(67, 90, 0.025, summary_only=True) == \
+            same.calculate_lifetime_benefits(67, 90, 0.025, summary_only=True)
+        # Pre-60 COLAs accrue from the as-of date, so an earlier date inflates more
+        assert other.calculate_monthly_benefit(67, 0, 0.025) > calc.calculate_monthly_benefit(67, 0, 0.025)
+
+    def test_calculators_do_not_read_the_clock(self, monkeypatch):
+        class FrozenDate(date):
+            @classmethod
+            def today(cls):
+                raise AssertionError("date.today() called during evaluation")
+
+        context = EvaluationContext(AS_OF)
+        ssdi = SSDICalculator(date(1964, 3, 10), 2000.0, context)
+        widow = WidowSSCalculator(date(1964, 3, 10), 1000.0, 2500.0, date(2022, 1, 1), context=context)
+        divorced = DivorcedSSCalculator(
+            date(1964, 3, 10), 1000.0, 2500.0, 12, date(2010, 1, 1),
+            has_child_under_16=True, child_birth_date=date(2015, 3, 3), context=context
+        )
+        for module in (base_ss_calculator, divorced_calculator, evaluation_context, ssdi_calculator, widow_calculator):
+            monkeypatch.setattr(module, 'date', FrozenDate)
+
+        assert ssdi.calculate_ssdi_comparison(0.02, 90)['current_age'] == pytest.approx(60 + 2 / 12)
+        assert widow.is_eligible_for_survivor_benefits()[0]
+        assert divorced.calculate_child_in_care_benefit(0.025)['child_current_age'] == pytest.approx(9.2, abs=0.1)
+
+    def test_rounding_policy(self):
+        exact = IndividualSSCalculator(date(1964, 3, 10), 2345.67, EvaluationContext(AS_OF, rounding=None))
+        cents = IndividualSSCalculator(date(1964, 3, 10), 2345.67, EvaluationContext(AS_OF))
+        exact_total = exact.calculate_lifetime_benefits(65, 88, 0.025, 5)['total_lifetime_benefits']
+        rounded_total = cents.calculate_lifetime_benefits(65, 88, 0.025, 5)['total_lifetime_benefits']
+        assert rounded_total == round(exact_total, 2)
+        assert exact_total != rounded_total
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
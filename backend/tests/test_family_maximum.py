@@ -0,0 +1,107 @@
+"""
+Tests for family_maximum.py
+Verifies the family maximum formula, the pro-rata allocation among the
+dependents month by month, and the FamilySSCalculator grid.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.core.actuarial_tables import early_reduction_factor
+from backend.core.evaluation_context import EvaluationContext
+from backend.core.family_calculator import FamilySSCalculator
+from backend.core.family_maximum import family_maximum
+from backend.core.ss_core_calculator import IndividualSSCalculator
+
+AS_OF = date(2026, 1, 15)
+R = 0.025
+# Worker born 1964-05-17 (62 in May 2026, FRA May 2031)
+BIRTH = date(1964, 5, 17)
+CHILDREN = [{'date_of_birth': '2012-06-01'}, {'date_of_birth': date(2015, 9, 9)}, {'date_of_birth': '2018-02-20'}]
+
+
+def _calc(spouse_birth_date=date(1976, 3, 2), spouse_pia=0.0, children=CHILDREN, pia=2400.0):
+    return FamilySSCalculator(BIRTH, pia, spouse_birth_date, spouse_pia, children, EvaluationContext.resolve(AS_OF))
+
+
+class TestFamilyMaximum:
+    """150/272/134/175% bend formula"""
+
+    def test_bend_formula(self):
+        # 2026 bend points: 1643, 2371, 3093
+        assert family_maximum(1000.0, 2026) == pytest.approx(1500.0)
+        assert family_maximum(2000.0, 2026) == pytest.approx(1.5 * 1643 + 2.72 * 357)
+        assert family_maximum(4000.0, 2026) == pytest.approx(
+            1.5 * 1643 + 2.72 * (2371 - 1643) + 1.34 * (3093 - 2371) + 1.75 * (4000 - 3093))
+
+    def test_years_outside_table(self):
+        assert family_maximum(2400.0, 2040) == family_maximum(2400.0, 2026)
+        assert family_maximum(2400.0, 2000) == family_maximum(2400.0, 2016)
+
+
+class TestFamilyGrid:
+    """Monthly allocation for every worker claim month"""
+
+    def test_worker_benefit_unchanged(self):
+        grid = _calc().calculate_family_grid(90, R)
+        worker = IndividualSSCalculator(BIRTH, 2400.0, EvaluationContext.resolve(AS_OF))
+        for row in (0, 29, 60, 96):
+            age = int(grid.claim_age_months[row])
+            expected = worker.calculate_lifetime_benefits(age // 12, 90, R, age % 12, summary_only=True)
+            assert grid.totals['lifetime_total'][row, 0] == pytest.approx(expected['total_lifetime_benefits'], abs=0.02)
+
+    def test_pro_rata_within_maximum(self):
+        calc = _calc()
+        grid = calc.calculate_family_grid(90, R)
+        dependents = grid.monthly[:, :, 1:].sum(axis=2)
+        pias = grid.maximum / (calc.family_maximum() / calc.pia)
+        assert (dependents <= grid.maximum - pias + 1e-6).all()
+
+        # Claim at 62 in May 2026: four dependents share 4483.52 - 2400
+        first = int(np.argmax(grid.monthly[0, :, 0] > 0))
+        assert grid.monthly[0, first, 1:] == pytest.approx([(4483.52 - 2400) / 4] * 4, abs=0.01)
+
+    def test_child_ages_out_and_others_gain(self):
+        grid = _calc().calculate_family_grid(90, R)
+        months = grid.first_ordinal + np.arange(grid.monthly.shape[1])
+        turns_18 = 2030 * 12 + 5  # child_1 reaches 18 in June 2030
+        before, after = np.searchsorted(months, [turns_18 - 1, turns_18])
+        assert grid.monthly[0, before, 2] > 0 and grid.monthly[0, after, 2] == 0
+        assert grid.monthly[0, after, 3] > grid.monthly[0, before, 3]
+
+    def test_spouse_rules(self):
+        # No children: spouse aged benefit only, reduced before their FRA
+        no_children = _calc(spouse_birth_date=date(1965, 1, 10), children=[]).calculate_family_grid(
+            90, 0.0, spouse_claim_age_months=62 * 12)
+        paid = no_children.monthly[-1, :, 1][no_children.monthly[-1, :, 1] > 0]
+        assert paid[0] == pytest.approx(0.5 * 2400 * early_reduction_factor(-60))
+
+        # Dual entitlement: an own benefit above the spousal rate leaves nothing
+        covered = _calc(spouse_birth_date=date(1965, 1, 10), spouse_pia=2000.0, children=[])
+        assert covered.calculate_family_grid(90, 0.0).monthly[:, :, 1].max() == 0
+
+        # Child in care: unreduced regardless of the spouse's age
+        in_care = _calc(children=CHILDREN[:1]).calculate_family_grid(90, 0.0)
+        assert in_care.monthly[0, :, 1].max() == pytest.approx(in_care.monthly[0, :, 2].max())
+
+    def test_disabled_child_continues(self):
+        calc = _calc(spouse_birth_date=None, children=[{'date_of_birth': '2000-01-01', 'is_disabled': True}])
+        grid = calc.calculate_family_grid(90, R)
+        assert (grid.monthly[:, :, 1] > 0).sum(axis=1).tolist() == (grid.monthly[:, :, 0] > 0).sum(axis=1).tolist()
+
+    def test_benefits_payload(self):
+        result = _calc().calculate_family_benefits(64, 90, R, 6)
+        assert result['claim_age_months_detail'] == 64 * 12 + 6
+        assert result['beneficiaries'] == ['worker', 'spouse', 'child_1', 'child_2', 'child_3']
+        first = result['timeline'][0]
+        assert first['months_prorated'] > 0
+        totals = result['totals']['lifetime_total']
+        assert sum(row['annual']['spouse'] for row in result['timeline']) == pytest.approx(totals['spouse'][30], abs=0.5)
+        with pytest.raises(ValueError):
+            _calc().calculate_family_benefits(71)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
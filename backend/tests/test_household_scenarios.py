@@ -0,0 +1,66 @@
+"""
+Tests for HouseholdScenarioEngine
+Verifies household scenarios are computed without recursion and that
+per-spouse lifetime results are memoized across the comparison table.
+"""
+
+from datetime import date
+
+import pytest
+
+from backend.core.ss_core_calculator import (
+    HouseholdScenarioEngine,
+    HouseholdSSCalculator,
+    IndividualSSCalculator,
+)
+
+
+@pytest.fixture
+def married_household():
+    return HouseholdSSCalculator(
+        IndividualSSCalculator(date(1964, 3, 10), 3000.0),
+        IndividualSSCalculator(date(1966, 7, 4), 1200.0),
+    )
+
+
+class TestHouseholdScenarioEngine:
+    """Scenario cells are bounded, memoized and consistent with the calculators"""
+
+    def test_household_benefits_scenarios_are_flat(self, married_household):
+        result = married_household.calculate_household_benefits(67, 65, (90, 92), 0.025)
+        assert set(result['optimization_scenarios']) == {'both_at_62', 'both_at_70', 'optimized_mixed'}
+        for scenario in result['optimization_scenarios'].values():
+            assert 'optimization_scenarios' not in scenario
+        assert result['optimization_scenarios']['optimized_mixed']['spouse1_claiming_age'] == 70
+        assert result['spouse2_benefits']['annual_breakdown']
+
+    def test_cell_matches_individual_calculators(self, married_household):
+        engine = HouseholdScenarioEngine(married_household, (90, 92), 0.025)
+        cell = engine.evaluate(66, 64)
+        expected = (
+            married_household.spouse1.calculate_lifetime_benefits(66, 90, 0.025)['total_lifetime_benefits']
+            + married_household.spouse2.calculate_lifetime_benefits(64, 92, 0.025)['total_lifetime_benefits']
+        )
+        assert cell['total_household_benefits'] == pytest.approx(expected, abs=0.01)
+
+    def test_comparison_table_memoizes_lifetimes(self, married_household):
+        engine = HouseholdScenarioEngine(married_household, (90, 92), 0.025)
+        table = engine.comparison_table()
+        assert len(table) == 81
+        # One summary lifetime per spouse per claiming age
+        assert len(engine._lifetime_cache) == 18
+        totals = [cell['total_household_benefits'] for cell in table]
+        assert totals == sorted(totals, reverse=True)
+        assert engine.evaluate(70, 70) is engine.evaluate(70, 70)
+
+    def test_single_household(self):
+        household = HouseholdSSCalculator(IndividualSSCalculator(date(1964, 3, 10), 2500.0))
+        engine = HouseholdScenarioEngine(household, (95, 95), 0.0)
+        table = engine.comparison_table()
+        assert len(table) == 9
+        assert all(cell['spouse2_benefits'] is None for cell in table)
+        assert table[0]['spouse1_claiming_age'] == 70
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,102 @@
+"""
+Tests for incremental_pia.py
+Verifies that single-year edits keep AIME / PIA equal to a full
+SSAXMLProcessor recomputation and report the top-35 movements.
+"""
+
+import random
+
+import pytest
+
+from backend.core.incremental_pia import IncrementalPIA
+from backend.core.ssa_xml_processor import EarningsRecord, SSAXMLProcessor
+
+BIRTH_YEAR = 1964
+HISTORY = {year: 40000.0 + 1000 * (year - 1986) for year in range(1986, 2026)}
+
+
+def _records(history):
+    return [EarningsRecord(year, amount, amount == 0) for year, amount in sorted(history.items())]
+
+
+def _full(history, birth_year=BIRTH_YEAR):
+    processor = SSAXMLProcessor(birth_year=birth_year)
+    processor.earnings_history = _records(history)
+    return processor.calculate_aime_and_pia()
+
+
+class TestIncrementalPIA:
+    """Edits against full recomputation"""
+
+    def test_initial_matches_processor(self):
+        model = IncrementalPIA(BIRTH_YEAR, _records(HISTORY))
+        assert model.to_dict() == _full(HISTORY)
+        assert len(model.top_years) == 35
+
+    def test_projected_years_enter_top_35(self):
+        model = IncrementalPIA(BIRTH_YEAR, _records(HISTORY))
+        before = model.pia
+        first = model.set_earnings(2026, 150000.0)
+        assert (first.entered, first.left) == ([2026], [1991])
+        second = model.set_earnings(2027, 150000.0)
+        assert (second.entered, second.left) == ([2027], [1992])
+        assert first.pia_change + second.pia_change == pytest.approx(model.pia - before, abs=0.011)
+        history = {**HISTORY, 2026: 150000.0, 2027: 150000.0}
+        assert model.to_dict() == _full(history)
+
+    def test_remove_and_change_within_top(self):
+        model = IncrementalPIA(BIRTH_YEAR, _records(HISTORY))
+        removed = model.remove_year(2020)
+        assert removed.left == [2020] and removed.entered == [1990]
+        # A change that keeps the year in the top 35 moves nothing
+        kept = model.set_earnings(2024, 160000.0)
+        assert (kept.entered, kept.left) == ([], [])
+        history = {**HISTORY, 2024: 160000.0}
+        del history[2020]
+        assert model.to_dict() == _full(history)
+        with pytest.raises(ValueError):
+            model.remove_year(1950)
+
+    def test_short_history_pads_with_zeros(self):
+        model = IncrementalPIA(BIRTH_YEAR, _records({2000: 50000.0}))
+        assert model.to_dict()['years_of_zero_in_top_35'] == 34
+        change = model.set_earnings(2001, 0.0)
+        assert change.entered == [2001]
+        assert model.to_dict() == _full({2000: 50000.0, 2001: 0.0})
+        model.remove_year(2000)
+        model.remove_year(2001)
+        assert (model.aime, model.pia, len(model)) == (0.0, 0.0, 0)
+
+    def test_random_edits(self):
+        rng = random.Random(11)
+        history = {year: rng.choice([0.0, 40000.0, round(rng.uniform(0, 200000), 2)]) for year in range(1984, 2030)}
+        model = IncrementalPIA(BIRTH_YEAR, _records(history))
+        for _ in range(400):
+            year = rng.randint(1980, 2035)
+            previous = set(model.top_years)
+            if history and rng.random() < 0.2:
+                year = rng.choice(sorted(history))
+                del history[year]
+                change = model.remove_year(year)
+            else:
+                history[year] = rng.choice([0.0, 40000.0, round(rng.uniform(0, 250000), 2)])
+                change = model.set_earnings(year, history[year])
+            current = set(model.top_years)
+            assert set(change.entered) == current - previous and set(change.left) == previous - current
+            assert model.to_dict() == _full(history)
+
+    def test_duplicate_years_rejected(self):
+        with pytest.raises(ValueError):
+            IncrementalPIA(BIRTH_YEAR, [EarningsRecord(2000, 1.0, False), EarningsRecord(2000, 2.0, False)])
+
+    def test_long_edit_sequence(self):
+        history = {year: 30000.0 + 500 * (year - 1960) for year in range(1960, 2060)}
+        model = IncrementalPIA(1950, _records(history))
+        for i in range(2000):
+            history[1960 + i % 100] = 20000.0 + (i * 7919) % 150000
+            model.set_earnings(1960 + i % 100, history[1960 + i % 100])
+        assert model.to_dict() == _full(history, 1950)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+"""
+Tests for joint_life.py
+Verifies the sampled death ages against the life tables, the per-path
+household totals against couple_grid, and the distribution summary.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.core.couple_grid import couple_grid
+from backend.core.evaluation_context import EvaluationContext
+from backend.core.joint_life import death_age_distribution, sample_death_ages, simulate_joint_life
+from backend.core.mortality import survival_curve
+from backend.core.ss_core_calculator import HouseholdSSCalculator, IndividualSSCalculator
+
+AS_OF = date(2026, 1, 15)
+SPOUSE1 = (date(1963, 5, 17), 2800.0, 'male')
+SPOUSE2 = (date(1964, 9, 2), 900.0, 'female')
+PAIRS = [(744, 744), (804, 840), (840, 804), (840, 840)]
+R = 0.025
+
+
+def _simulate(paths=20000, correlation=0.3, seed=3, pairs=PAIRS):
+    return simulate_joint_life(*SPOUSE1, *SPOUSE2, pairs, paths, correlation, R, seed, as_of=AS_OF)
+
+
+class TestSampling:
+    """Death ages follow each spouse's life table"""
+
+    def test_marginals_match_life_table(self):
+        curve1, curve2 = survival_curve('male', 750), survival_curve('female', 740)
+        ages1, ages2 = sample_death_ages(curve1, curve2, 200000, 0.5, np.random.default_rng(1))
+        for curve, ages in ((curve1, ages1), (curve2, ages2)):
+            first_age, cdf = death_age_distribution(curve)
+            assert ages.min() >= first_age
+            empirical = np.searchsorted(np.sort(ages), first_age + np.arange(cdf.size), side='right') / ages.size
+            assert np.abs(empirical - cdf).max() < 0.01
+
+    def test_correlation_extremes(self):
+        curve1, curve2 = survival_curve('male', 750), survival_curve('female', 750)
+        same1, same2 = sample_death_ages(curve1, curve2, 20000, 1.0, np.random.default_rng(2))
+        # Same quantile on every path: the orderings agree (comonotonic)
+        order = np.lexsort((same2, same1))
+        assert np.all(np.diff(same2[order]) >= 0)
+
+        free1, free2 = sample_death_ages(curve1, curve2, 20000, 0.0, np.random.default_rng(2))
+        assert abs(np.corrcoef(free1, free2)[0, 1]) < 0.03
+
+        with pytest.raises(ValueError):
+            sample_death_ages(curve1, curve2, 10, 1.5)
+
+
+class TestSimulation:
+    """Per-path totals and the distribution summary"""
+
+    def test_totals_match_couple_grid(self):
+        simulation = _simulate(paths=2000)
+        sampled = [tuple(pair) for pair in simulation.death_ages[:25]]
+        grid = couple_grid(SPOUSE1[0], SPOUSE1[1], SPOUSE2[0], SPOUSE2[1], sampled, R, as_of=AS_OF)
+        for c, (claim1, claim2) in enumerate(PAIRS):
+            expected = grid.household_total[claim1 - 744, claim2 - 744, :]
+            assert np.allclose(simulation.totals[c, :25], expected)
+
+    def test_seed_reproducible(self):
+        assert np.array_equal(_simulate(seed=9).totals, _simulate(seed=9).totals)
+        assert not np.array_equal(_simulate(seed=9).death_ages, _simulate(seed=10).death_ages)
+
+    def test_summary(self):
+        simulation = _simulate()
+        wins = simulation.win_probability()
+        assert np.all(np.diag(wins) == 0)
+        assert np.all(wins + wins.T <= 1.0 + 1e-12)
+        assert simulation.best_probability().sum() == pytest.approx(1.0)
+
+        result = simulation.to_dict()
+        assert result['paths'] == 20000
+        for strategy, c in zip(result['strategies'], range(len(PAIRS))):
+            percentiles = list(strategy['percentiles'].values())
+            assert percentiles == sorted(percentiles)
+            assert strategy['mean'] == pytest.approx(simulation.totals[c].mean(), abs=0.01)
+
+    def test_household_calculator(self):
+        context = EvaluationContext.resolve(AS_OF)
+        household = HouseholdSSCalculator(
+            IndividualSSCalculator(SPOUSE1[0], SPOUSE1[1], context),
+            IndividualSSCalculator(SPOUSE2[0], SPOUSE2[1], context),
+        )
+        simulation = household.simulate_joint_life(('male', 'female'), paths=5000, seed=4)
+        assert len(simulation.claiming_pairs) == 9
+        assert simulation.totals.shape == (9, 5000)
+
+        with pytest.raises(ValueError):
+            HouseholdSSCalculator(household.spouse1).simulate_joint_life(('male', 'female'))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
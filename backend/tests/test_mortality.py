@@ -0,0 +1,102 @@
+"""
+Tests for mortality.py
+Verifies the extended life tables, monthly survival curves and the
+survival-weighted expected values used by the calculators' expected mode.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.core.break_even import MONTHLY_COLA
+from backend.core.evaluation_context import EvaluationContext
+from backend.core.mortality import MAX_AGE, QX, TABLE_FIRST_AGE, TABLE_LAST_AGE, survival_curve
+from backend.core.ssdi_calculator import SSDICalculator
+from backend.core.widow_calculator import WidowSSCalculator
+
+CONTEXT = EvaluationContext.resolve(date(2026, 1, 15))
+
+
+class TestLifeTables:
+    """Bundled q(x) keeps the tabulated ages and extends them smoothly"""
+
+    @pytest.mark.parametrize("sex", ["male", "female"])
+    def test_extended_table(self, sex):
+        q = QX[sex]
+        assert q.shape == (MAX_AGE + 1,)
+        assert np.all(np.diff(q) >= 0)
+        assert q[MAX_AGE] == 1.0
+        assert 0.0 < q[0] < q[TABLE_FIRST_AGE]
+        assert q[TABLE_LAST_AGE] < q[TABLE_LAST_AGE + 1] <= 1.0
+
+    def test_tabulated_values(self):
+        assert QX['male'][65] == pytest.approx(0.01768)
+        assert QX['female'][90] == pytest.approx(0.18970)
+        assert np.all(QX['female'][TABLE_FIRST_AGE:] <= QX['male'][TABLE_FIRST_AGE:])
+
+
+class TestSurvivalCurve:
+    """Monthly survival probabilities conditioned on the current age"""
+
+    def test_annual_survival_matches_table(self):
+        curve = survival_curve('male', 65 * 12)
+        assert curve.probability_alive_at(65) == 1.0
+        assert curve.probability_alive_at(66) == pytest.approx(1 - QX['male'][65])
+        assert curve.probability_alive_at(67) == pytest.approx((1 - QX['male'][65]) * (1 - QX['male'][66]))
+        assert curve.probability_alive_at(MAX_AGE + 1) == 0.0
+
+    def test_multiplier_and_life_expectancy(self):
+        baseline = survival_curve('female', 62 * 12)
+        healthy = survival_curve('female', 62 * 12, 0.5)
+        assert 15 < baseline.life_expectancy() < healthy.life_expectancy() < MAX_AGE - 62
+        assert baseline.age_at_probability(0.5) < healthy.age_at_probability(0.5)
+
+    @pytest.mark.parametrize("cadence", ["annual", MONTHLY_COLA])
+    def test_expected_values_match_monthly_loop(self, cadence):
+        birth_ordinal = 1964 * 12 + 2
+        curve = survival_curve('male', 61 * 12 + 10)
+        segments = [(birth_ordinal + 62 * 12, birth_ordinal + 67 * 12, 1800.0),
+                    (birth_ordinal + 67 * 12, birth_ordinal + 100 * 12, 2600.0)]
+        r = 0.025
+
+        reference = 0.0
+        for start, end, amount in segments:
+            for m in range(start, end):
+                steps = m // 12 - start // 12 if cadence == "annual" else (m - start) / 12
+                reference += amount * (1 + r) ** steps * curve.alive[m - birth_ordinal]
+
+        value = curve.expected_values([segments], r, birth_ordinal, cadence)[0]
+        assert value == pytest.approx(reference, rel=1e-12)
+
+
+class TestExpectedMode:
+    """Calculators rank and report survival-weighted expected totals"""
+
+    def test_lifetime_expected_value(self):
+        calc = WidowSSCalculator(date(1960, 1, 1), 1800.0, 2800.0, date(2020, 6, 1), context=CONTEXT)
+        fixed = calc.calculate_lifetime_benefits(67, MAX_AGE, 0.025, summary_only=True)
+        expected = calc.calculate_lifetime_benefits(67, 90, 0.025, summary_only=True, sex='female')
+        assert expected['valuation']['mode'] == 'expected'
+        assert 0 < expected['total_lifetime_benefits'] < fixed['total_lifetime_benefits']
+        assert expected['death_date'] == fixed['death_date']
+
+    def test_widow_ranking(self):
+        calc = WidowSSCalculator(date(1964, 3, 15), 1800.0, 2800.0, date(2023, 6, 1), context=CONTEXT)
+        result = calc.calculate_optimal_strategy(95, 0.025, sex='female', mortality_multiplier=1.3)
+        totals = [strategy['lifetime_total'] for strategy in result['all_strategies']]
+        assert totals == sorted(totals, reverse=True)
+        assert result['valuation']['mortality_multiplier'] == 1.3
+        assert calc.calculate_optimal_strategy(95, 0.025)['valuation'] == {'mode': 'fixed', 'longevity_age': 95}
+
+    def test_ssdi_expected(self):
+        calc = SSDICalculator(date(1964, 3, 10), 2500.0, CONTEXT)
+        fixed = calc.calculate_ssdi_comparison(0.025, 100)
+        expected = calc.calculate_ssdi_comparison(0.025, 100, sex='male')
+        for name in ('standard', 'suspension'):
+            assert 0 < expected['strategies'][name]['lifetime_total'] < fixed['strategies'][name]['lifetime_total']
+        assert expected['strategies']['suspension']['break_even_age'] == fixed['strategies']['suspension']['break_even_age']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,226 @@
+"""
+Tests for ssa_xml_processor.py
+Verifies the streaming XML parser (both earnings formats, chunked input, the
+byte and record limits), the array indexing / top-35 kernel, and the per-year
+PIA sensitivity.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.core.ssa_xml_processor import EarningsRecord, SSAXMLProcessor
+
+SSA_FORMAT = """<?xml version="1.0" encoding="UTF-8"?>
+<SSAStatement>
+  <StatementDate>2025-03-01</StatementDate>
+  <Person><Name>Jane Doe</Name><BirthDate>1964-05-17</BirthDate></Person>
+  <EarningsHistory>
+    <EarningsRecord><Year>1990</Year><Earnings>30000</Earnings></EarningsRecord>
+    <EarningsRecord><Year>1989</Year><Earnings>0</Earnings></EarningsRecord>
+    <EarningsRecord><Year>1991</Year><Earnings>32500.50</Earnings></EarningsRecord>
+  </EarningsHistory>
+</SSAStatement>"""
+
+ATTRIBUTE_FORMAT = """<Statement>
+  <AsOfDate>03/01/2025</AsOfDate>
+  <Earnings><Year year="2001" amount="41000"/><Year year="2000" amount="40000"/></Earnings>
+</Statement>"""
+
+
+def _records(count: int) -> str:
+    rows = ''.join(f'<Year year="{1980 + i}" amount="1000"/>' for i in range(count))
+    return f'<Statement><Earnings>{rows}</Earnings></Statement>'
+
+
+class TestParseFormats:
+    """Both earnings formats in one pass"""
+
+    def test_ssa_format(self):
+        processor = SSAXMLProcessor()
+        result = processor.parse_ssa_xml(SSA_FORMAT)
+        assert [(e.year, e.earnings, e.is_zero) for e in processor.earnings_history] == [
+            (1989, 0.0, True), (1990, 30000.0, False), (1991, 32500.5, False)]
+        assert result['years_covered'] == '1989-1991'
+        assert result['zero_years'] == 1
+        assert processor.person_info['name'] == 'Jane Doe'
+        assert processor.person_info['birth_date'] == '1964-05-17'
+        assert processor.person_info['statement_date'] == '2025-03-01'
+
+    def test_attribute_format(self):
+        processor = SSAXMLProcessor()
+        processor.parse_ssa_xml(ATTRIBUTE_FORMAT)
+        assert [(e.year, e.earnings) for e in processor.earnings_history] == [(2000, 40000.0), (2001, 41000.0)]
+        assert processor.person_info['statement_date'] == '2025-03-01'
+        assert processor.person_info['name'] == 'Unknown'
+
+    def test_chunked_stream_matches_string(self):
+        data = SSA_FORMAT.encode('utf-8')
+        whole, streamed = SSAXMLProcessor(), SSAXMLProcessor()
+        whole.parse_ssa_xml(data)
+        streamed.parse_ssa_xml(data[i:i + 7] for i in range(0, len(data), 7))
+        assert streamed.earnings_history == whole.earnings_history
+        assert streamed.person_info == whole.person_info
+
+    def test_errors(self):
+        with pytest.raises(ValueError, match='Invalid XML format'):
+            SSAXMLProcessor().parse_ssa_xml('<Statement><Year year="2000"')
+        with pytest.raises(ValueError, match='No earnings history'):
+            SSAXMLProcessor().parse_ssa_xml('<Statement><Name>Nobody</Name></Statement>')
+
+
+class TestLimits:
+    """Byte and record limits"""
+
+    def test_byte_limit(self):
+        data = _records(40).encode('utf-8')
+        SSAXMLProcessor().parse_ssa_xml(data, max_bytes=len(data))
+        with pytest.raises(ValueError, match='byte limit'):
+            SSAXMLProcessor().parse_ssa_xml(data, max_bytes=len(data) - 1)
+
+    def test_limit_stops_reading_stream(self):
+        consumed = []
+
+        def chunks():
+            for i in range(1000):
+                consumed.append(i)
+                yield b'<Statement>' if i == 0 else b'<Year year="2000" amount="1"/>'
+
+        with pytest.raises(ValueError, match='more than 50 earnings records'):
+            SSAXMLProcessor().parse_ssa_xml(chunks(), max_records=50)
+        assert len(consumed) == 52
+
+    def test_default_record_limit(self):
+        processor = SSAXMLProcessor()
+        processor.parse_ssa_xml(_records(SSAXMLProcessor.MAX_EARNINGS_RECORDS))
+        assert len(processor.earnings_history) == SSAXMLProcessor.MAX_EARNINGS_RECORDS
+        with pytest.raises(ValueError, match='earnings records'):
+            SSAXMLProcessor().parse_ssa_xml(_records(SSAXMLProcessor.MAX_EARNINGS_RECORDS + 1))
+
+
+def _processor(history, birth_year=1964):
+    processor = SSAXMLProcessor(birth_year=birth_year)
+    processor.earnings_history = [EarningsRecord(year, amount, amount == 0) for year, amount in history]
+    return processor
+
+
+class TestIndexing:
+    """Array indexing kernel and its dict view"""
+
+    def test_index_and_cap(self):
+        awi = SSAXMLProcessor.AVERAGE_WAGE_INDEX
+        rows = _processor([(1990, 10000.0), (1985, 60000.0), (2024, 500000.0), (2030, 10000.0), (1950, 5000.0)])
+        view = rows.calculate_indexed_earnings()
+        assert view[0]['indexed_earnings'] == round(10000.0 * awi[2024] / awi[1990], 2)
+        assert view[0]['indexing_factor'] == round(awi[2024] / awi[1990], 4)
+        # Capped after indexing at the year's taxable maximum
+        assert view[1]['indexed_earnings'] == 39600 and view[1]['is_capped']
+        # Years at/after the indexing year are not indexed; outside the tables: no AWI, latest maximum
+        assert view[2]['indexing_factor'] == 1.0 and view[2]['max_taxable'] == 168600
+        assert view[3]['max_taxable'] == 176100 and view[3]['indexed_earnings'] == 10000.0
+        assert view[4]['indexing_factor'] == 1.0 and view[4]['max_taxable'] == 176100
+
+    def test_top_selection_matches_stable_sort(self):
+        rng = np.random.default_rng(3)
+        amounts = rng.choice([0.0, 20000.0, 45000.0, 90000.0], size=60)
+        processor = _processor([(1980 + i, float(amount)) for i, amount in enumerate(amounts)])
+        processor.calculate_indexed_earnings()
+        view = processor.indexed_earnings
+        expected = sorted(view, key=lambda row: row['indexed_earnings'], reverse=True)[:35]
+        assert processor.indexed.records(processor.indexed.top(35)) == expected
+        early = processor.indexed.years < 2000
+        assert processor.indexed.top(50, early).tolist() == sorted(
+            np.flatnonzero(early).tolist(), key=lambda row: -view[row]['indexed_earnings'])
+
+    def test_aime_pads_to_35_years(self):
+        processor = _processor([(2000 + i, 42000.0) for i in range(10)])
+        result = processor.calculate_aime_and_pia()
+        assert len(result['top_35_years']) == 10
+        assert result['years_of_zero_in_top_35'] == 25 and result['lowest_year_in_top_35'] == 0
+        total = sum(row['indexed_earnings'] for row in processor.indexed_earnings)
+        assert result['aime'] == round(total / 420, 2)
+
+    def test_view_reset_and_restore(self):
+        processor = _processor([(2000 + i, 42000.0) for i in range(40)])
+        original = processor.calculate_aime_and_pia()['pia']
+        comparison = processor.calculate_what_if_scenario(
+            [{'year': 2000 + i, 'earnings': 80000.0} for i in range(40)])
+        assert comparison['modified']['pia'] > original
+        assert processor.calculate_aime_and_pia()['pia'] == original
+
+        processor.earnings_history = [EarningsRecord(2000 + i, 80000.0, False) for i in range(40)]
+        processor.indexed_earnings = []
+        assert processor.calculate_aime_and_pia()['pia'] == comparison['modified']['pia']
+
+    def test_disability_computation_years(self):
+        processor = _processor([(1990 + i, 40000.0 + 1000 * i) for i in range(30)], birth_year=1970)
+        result = processor.calculate_disability_pia(date(2016, 6, 1))
+        # Elapsed 1992-2015 = 24 years, 4 dropouts: the 20 best indexed years before 2016
+        eligible = [row for row in processor.indexed_earnings if row['year'] < 2016]
+        best = sorted(eligible, key=lambda row: row['indexed_earnings'], reverse=True)[:20]
+        assert result['top_35_years'] == best
+        assert result['aime'] == round(sum(row['indexed_earnings'] for row in best) / 240, 2)
+
+
+class TestPIASensitivity:
+    """Per-year marginal PIA against what-if recomputation"""
+
+    HISTORY = [(year, 0.0 if year % 6 == 0 else 30000.0 + 2500 * (year - 1986)) for year in range(1986, 2024)]
+
+    def _pia(self, history, year, earnings):
+        edited = dict(history)
+        edited[year] = earnings
+        return _processor(sorted(edited.items())).calculate_aime_and_pia()['pia']
+
+    def test_zero_replacement_matches_recomputation(self):
+        processor = _processor(self.HISTORY)
+        base = processor.calculate_aime_and_pia()['pia']
+        sensitivity = processor.calculate_pia_sensitivity(90000.0)
+        zero_rows = [row for row in sensitivity['years'] if row['is_zero']]
+        assert {row['year'] for row in zero_rows} >= {1986, 1992, 2028}
+        for row in zero_rows:
+            assert row['zero_replacement_pia_gain'] == round(self._pia(self.HISTORY, row['year'], 90000.0) - base, 2)
+
+    def test_marginal_matches_finite_difference(self):
+        processor = _processor(self.HISTORY)
+        base = processor.calculate_aime_and_pia()['pia']
+        sensitivity = processor.calculate_pia_sensitivity()
+        assert sensitivity['replacement_salary'] == 30000.0 + 2500 * 37
+        rows = {row['year']: row for row in sensitivity['years']}
+        earnings = dict(self.HISTORY)
+        for year in (1987, 2000, 2023):
+            row = rows[year]
+            change = self._pia(self.HISTORY, year, earnings[year] + 1000.0) - base
+            assert change == pytest.approx(row['pia_per_1000'], abs=0.02)
+        # Capped years gain nothing
+        capped = [row for row in sensitivity['years'] if row['is_capped']]
+        assert capped and all(row['pia_per_1000'] == 0 for row in capped)
+
+    def test_outside_top_35(self):
+        history = [(1970 + i, 20000.0 + 500 * i) for i in range(45)]
+        processor = _processor(history, birth_year=1950)
+        processor.calculate_aime_and_pia()
+        sensitivity = processor.calculate_pia_sensitivity()
+        outside = [row for row in sensitivity['years'] if not row['in_top_35']]
+        assert outside
+        assert any(row['earnings_to_enter_top_35'] for row in outside)
+        for row in outside:
+            assert row['pia_per_1000'] == 0
+            needed = row['earnings_to_enter_top_35']
+            # No threshold: even the year's taxable maximum stays below the lowest counted year
+            edited = _processor(sorted({**dict(history), row['year']: needed or 1e7}.items()), birth_year=1950)
+            edited.calculate_aime_and_pia()
+            assert (row['year'] in [top['year'] for top in edited.top_35_years]) == (needed is not None)
+
+    def test_recomputation_free(self, monkeypatch):
+        processor = _processor(self.HISTORY)
+        processor.calculate_aime_and_pia()
+        calls = []
+        monkeypatch.setattr(SSAXMLProcessor, 'calculate_aime_and_pia', lambda *args, **kwargs: calls.append(1))
+        processor.calculate_pia_sensitivity(60000.0)
+        assert calls == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
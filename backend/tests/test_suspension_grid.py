@@ -0,0 +1,112 @@
+"""
+Tests for suspension_grid.py
+Verifies every suspend/resume window's total and break-even age against
+direct monthly sums and the analytic break-even analysis, and the SSDI
+comparison view built on the grid.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.core.break_even import MONTHLY_COLA, BenefitStream, analyze_break_even
+from backend.core.evaluation_context import EvaluationContext
+from backend.core.ssdi_calculator import SSDICalculator
+
+AS_OF = date(2026, 1, 15)
+R = 0.025
+
+
+def _calc(birth_date=date(1964, 5, 17), pia=2100.0, **context):
+    return SSDICalculator(birth_date, pia, EvaluationContext.resolve(AS_OF, **context))
+
+
+class TestSuspensionGrid:
+    """Window totals and break-even ages"""
+
+    def test_totals_match_monthly_sums(self):
+        grid = _calc(discount_rate=0.03).simulate_suspensions(R, 90, sex='male')
+        totals = {key: grid.totals(key) for key in grid.weights}
+        rng = np.random.default_rng(0)
+        for row, column in np.argwhere(~np.isnan(grid.credits))[rng.integers(0, 500, 20)]:
+            payments = grid.payments(int(grid.suspend_months[row]), int(grid.resume_months[column]))
+            for key, weight in grid.weights.items():
+                assert totals[key][row, column] == pytest.approx(float(np.sum(payments * weight)))
+        assert np.isnan(grid.totals()[np.tril_indices(grid.suspend_months.size, -1)]).all()
+
+    def test_break_even_matches_analysis(self):
+        calc = _calc()
+        grid = calc.simulate_suspensions(R, 95)
+        ages = grid.break_even_ages()
+        first, end = grid.first_age_month, grid.first_age_month + grid.growth.size
+        for row, column in ((0, 0), (0, -1), (12, 20), (5, 30)):
+            suspend, resume = int(grid.suspend_months[row]), int(grid.resume_months[column])
+            resumed = grid.payments(suspend, resume)[resume - first]
+            streams = [
+                BenefitStream('standard', ((first, end, calc.pia),)),
+                BenefitStream('window', ((first, suspend, calc.pia), (resume, end, resumed))),
+            ]
+            expected = analyze_break_even(streams, R, 0, MONTHLY_COLA).break_even_age(1, 0)
+            assert ages[row, column] == pytest.approx(expected, abs=1e-9)
+
+    def test_best_windows(self):
+        grid = _calc().simulate_suspensions(R, 95)
+        best = grid.best(5)
+        totals = [total for _, _, total in best]
+        assert totals == sorted(totals, reverse=True)
+        assert totals[0] == pytest.approx(np.nanmax(grid.totals()))
+        # Living to 95, suspending the whole FRA-70 window pays most
+        assert best[0][:2] == (grid.fra_age_months, 840)
+
+
+class TestComparisonView:
+    """calculate_ssdi_comparison reads the FRA -> 70 cell"""
+
+    def test_suspension_cell(self):
+        calc = _calc()
+        result = calc.calculate_ssdi_comparison(R, 90, top_n=3)
+        grid = calc.simulate_suspensions(R, 90)
+        cell = grid.totals()[0, -1]
+        assert result['strategies']['suspension']['lifetime_total'] == pytest.approx(cell)
+        assert result['strategies']['standard']['lifetime_total'] == pytest.approx(grid.standard_total())
+        assert result['strategies']['suspension']['break_even_age'] == pytest.approx(grid.break_even_ages()[0, -1])
+
+        options = result['suspension_options']
+        assert len(options['options']) == 3
+        assert options['windows_evaluated'] == np.count_nonzero(~np.isnan(grid.credits))
+        best = options['options'][0]
+        assert best['lifetime_total'] == pytest.approx(np.nanmax(grid.totals()))
+        assert best['timeline'] and best['timeline'][-1]['age'] == 90
+        assert 'suspension_options' not in calc.calculate_ssdi_comparison(R, 90)
+
+    def test_past_fra(self):
+        # Born 1958-01-01: FRA 66 and 8 months, 68 now - only the remaining months can be suspended
+        calc = _calc(date(1958, 1, 1))
+        grid = calc.simulate_suspensions(0.0, 90)
+        now = calc.age_in_months(AS_OF)
+        assert grid.suspend_months[0] == now > grid.fra_age_months
+        assert (grid.resume_months[~np.isnan(grid.credits).all(axis=0)] > now).all()
+        result = calc.calculate_ssdi_comparison(0.0, 90, top_n=2)
+        best = result['suspension_options']['options'][0]
+        assert (best['suspend_age_months'], best['resume_age_months']) == (now, 840)
+        assert best['delayed_credit_factor'] == pytest.approx(1 + (840 - now) * 2 / 300)
+        assert result['suspension_options']['windows_evaluated'] == (840 - now) * (840 - now + 1) // 2
+        suspension = result['strategies']['suspension']
+        assert suspension['lifetime_total'] == pytest.approx(best['lifetime_total'])
+        assert suspension['break_even_age'] == pytest.approx(best['break_even_age'], abs=0.01)
+        assert suspension['break_even_age'] == pytest.approx(grid.break_even_ages()[0, -1])
+
+    def test_past_70(self):
+        # Born 1954-01-01: 72 now, no window left
+        calc = _calc(date(1954, 1, 1))
+        result = calc.calculate_ssdi_comparison(0.0, 90, top_n=2)
+        options = result['suspension_options']
+        assert options['windows_evaluated'] == 0 and options['options'] == []
+        suspension = result['strategies']['suspension']
+        assert suspension['lifetime_total'] == pytest.approx(result['strategies']['standard']['lifetime_total'])
+        assert suspension['monthly_at_70'] == calc.pia and suspension['break_even_age'] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
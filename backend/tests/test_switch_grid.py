@@ -0,0 +1,206 @@
+"""
+Tests for switch_grid.py
+Verifies the vectorized phase spans and every kind of grid cell against the
+scalar phased timelines, and the widow and divorced exhaustive searches.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.core.base_ss_calculator import date_from_ordinal
+from backend.core.benefit_timeline import PHASE_CODES
+from backend.core.divorced_calculator import DivorcedSSCalculator
+from backend.core.evaluation_context import EvaluationContext
+from backend.core.switch_grid import lead_phase, phase_end
+from backend.core.widow_calculator import WidowSSCalculator
+
+AS_OF = date(2026, 1, 15)
+R = 0.025
+
+
+def _widow(birth_date=date(1964, 5, 17), own_pia=1800.0, deceased_pia=2600.0, context=None, **kwargs):
+    return WidowSSCalculator(
+        birth_date, own_pia, deceased_pia, date(2022, 3, 9),
+        context=context or EvaluationContext.resolve(AS_OF), **kwargs
+    )
+
+
+def _divorced(birth_date=date(1964, 5, 17), own_pia=900.0, **kwargs):
+    return DivorcedSSCalculator(
+        birth_date, own_pia, 2800.0, 12, date(2010, 1, 1), context=EvaluationContext.resolve(AS_OF), **kwargs
+    )
+
+
+def _phased_total(calc, phases):
+    return calc._build_phased_timeline(phases, R, summary_only=True)['total']
+
+
+class TestPhaseEnd:
+    """phase_end reproduces BaseSSCalculator._phase_span"""
+
+    def test_matches_scalar_spans(self):
+        calc = _widow()
+        rng = np.random.default_rng(0)
+        for _ in range(2000):
+            start = date_from_ordinal(int(rng.integers(2025 * 12, 2040 * 12)), int(rng.integers(1, 32)))
+            end = date_from_ordinal(int(rng.integers(2025 * 12, 2045 * 12)), int(rng.integers(1, 32)))
+            first, expected = calc._phase_span(start, end)
+            got = phase_end(start.year * 12 + start.month - 1, start.day, end.year * 12 + end.month - 1, end.day)
+            assert int(got) == expected, (start, end)
+
+
+class TestWidowGrid:
+    """Grid cells equal the scalar phased timelines"""
+
+    @pytest.mark.parametrize("birth_date", [date(1964, 5, 17), date(1963, 1, 31), date(1965, 2, 1)])
+    def test_cells_match_phased_timelines(self, birth_date):
+        calc = _widow(birth_date)
+        grid = calc.calculate_crossover_grid(92, R)
+        survivor, own = grid.first, grid.second
+        death = calc._date_at_age(92)
+        rng = np.random.default_rng(1)
+
+        for i in rng.integers(0, survivor.age_months.size, 10):
+            assert grid.first_only[i] == pytest.approx(
+                _phased_total(calc, [(survivor.dates[i], death, survivor.monthly[i], 'survivor')]), abs=0.02)
+        for j in rng.integers(0, own.age_months.size, 10):
+            assert grid.second_only[j] == pytest.approx(
+                _phased_total(calc, [(own.dates[j], death, own.monthly[j], 'own')]), abs=0.02)
+
+        for table, start_axis, then_axis in ((grid.first_then_second, survivor, own),
+                                             (grid.second_then_first, own, survivor)):
+            valid = np.argwhere(~np.isnan(table))
+            assert valid.size
+            for i, j in valid[rng.integers(0, len(valid), 25)]:
+                phases = [
+                    (start_axis.dates[i], then_axis.dates[j], start_axis.monthly[i], start_axis.label),
+                    (then_axis.dates[j], death, then_axis.monthly[j], then_axis.label),
+                ]
+                assert table[i, j] == pytest.approx(_phased_total(calc, phases), abs=0.02)
+
+    def test_one_benefit_at_a_time(self):
+        grid = _widow().calculate_crossover_grid(92, R)
+        survivor, own = grid.first, grid.second
+        # A switch is only kept when it starts after the first claim and raises the amount
+        for table, start_axis, then_axis in ((grid.first_then_second, survivor, own),
+                                             (grid.second_then_first, own, survivor)):
+            for i, j in np.argwhere(~np.isnan(table)):
+                assert start_axis.age_months[i] < then_axis.age_months[j]
+                assert then_axis.monthly[j] > start_axis.monthly[i]
+        assert np.isnan(grid.first_then_second[-1, :]).all()
+
+    def test_survivor_reduction_by_month(self):
+        calc = _widow(deceased_actual_benefit=2600.0)
+        grid = calc.calculate_crossover_grid(92, 0.0)
+        monthly = grid.first.monthly
+        fra_index = int(np.searchsorted(grid.first.age_months, calc.fra_years * 12 + calc.fra_months))
+        assert monthly[0] == pytest.approx(2600.0 * 0.715)
+        assert np.all(np.diff(monthly[:fra_index + 1]) >= 0) and monthly[fra_index - 1] < monthly[fra_index]
+        assert np.allclose(monthly[fra_index:], 2600.0)
+
+    def test_expected_mode_matches_expected_values(self):
+        calc = _widow()
+        grid = calc.calculate_crossover_grid(inflation_rate=R, sex='female')
+        result = calc.calculate_optimal_strategy(inflation_rate=R, sex='female', exhaustive=True, top_n=5)
+        best = grid.candidates(1)[0][3]
+        assert result['optimal_strategy']['lifetime_total'] == pytest.approx(best, abs=0.02)
+
+
+class TestExhaustiveSearch:
+    """calculate_optimal_strategy(exhaustive=True)"""
+
+    def test_finds_true_optimum(self):
+        calc = _widow()
+        grid = calc.calculate_crossover_grid(92, R)
+        tables = [grid.first_only, grid.second_only, grid.first_then_second, grid.second_then_first]
+        best = max(np.nanmax(table) for table in tables)
+
+        result = calc.calculate_optimal_strategy(92, R, top_n=5, exhaustive=True)
+        totals = [strategy['lifetime_total'] for strategy in result['all_strategies']]
+        assert len(totals) == 5 and totals == sorted(totals, reverse=True)
+        assert totals[0] == pytest.approx(best, abs=0.02)
+        assert result['search']['candidates_evaluated'] == grid.candidate_count
+
+        standard = calc.calculate_optimal_strategy(92, R, top_n=1)
+        assert totals[0] >= standard['optimal_strategy']['lifetime_total']
+        assert 'search' not in standard
+
+    def test_strategy_fields(self):
+        result = _widow().calculate_optimal_strategy(92, R, top_n=3, exhaustive=True)
+        best = result['optimal_strategy']
+        assert best['type'] in ('crossover', 'reverse_crossover', 'survivor_only', 'own_only')
+        assert 0 <= best['claiming_age_months'] < 12
+        timeline = best['benefit_timeline']
+        assert sum(timeline.annual_total) == pytest.approx(best['lifetime_total'], abs=1.0)
+        assert result['break_even']['strategies'] == [s['strategy'] for s in result['all_strategies']]
+
+    def test_ineligible_own_only(self):
+        calc = _widow(is_remarried=True, remarriage_date=date(2020, 1, 1))
+        result = calc.calculate_optimal_strategy(92, R, exhaustive=True)
+        assert {strategy['type'] for strategy in result['all_strategies']} == {'own_only'}
+
+    def test_ranks_by_present_value(self):
+        context = EvaluationContext.resolve(AS_OF, discount_rate=0.03)
+        result = _widow(context=context).calculate_optimal_strategy(92, R, top_n=4, rank_by='present_value',
+                                                                    exhaustive=True)
+        values = [strategy['present_value'] for strategy in result['all_strategies']]
+        assert values == sorted(values, reverse=True)
+
+
+class TestDivorcedSearch:
+    """calculate_filing_grid and calculate_optimal_strategy(exhaustive=True)"""
+
+    def test_deemed_filing_single_claims(self):
+        calc = _divorced()
+        grid = calc.calculate_filing_grid(92, R)
+        assert grid.first.age_months.size == 0
+        assert grid.candidate_count == 97
+        own = [calc.calculate_monthly_benefit(m // 12, m % 12, R) for m in grid.second.age_months]
+        ex_spouse = [calc.calculate_ex_spouse_benefit(m // 12, R, m % 12) for m in grid.second.age_months]
+        assert np.allclose(grid.second.monthly, np.maximum(own, ex_spouse))
+
+        heatmap = calc.calculate_optimal_strategy(92, R, exhaustive=True)['search']['heatmap']
+        totals = heatmap['totals']
+        assert all((value is not None) == (i == j) for i, row in enumerate(totals) for j, value in enumerate(row))
+
+    def test_restricted_application(self):
+        calc = _divorced(date(1953, 6, 10), own_pia=2000.0)
+        grid = calc.calculate_filing_grid(92, R)
+        fra = calc.fra_years * 12 + calc.fra_months
+        assert grid.first.age_months.min() == fra
+        assert np.isnan(grid.first_only).all() and np.isnan(grid.second_then_first).all()
+
+        death = calc._date_at_age(92)
+        for i, j in np.argwhere(~np.isnan(grid.first_then_second))[::97]:
+            assert grid.second.phase_label(j) == 'own'
+            phases = [
+                (grid.first.dates[i], grid.second.dates[j], grid.first.monthly[i], 'ex_spouse'),
+                (grid.second.dates[j], death, grid.second.monthly[j], 'own'),
+            ]
+            assert grid.first_then_second[i, j] == pytest.approx(_phased_total(calc, phases), abs=0.02)
+
+        result = calc.calculate_optimal_strategy(92, R, top_n=3, exhaustive=True)
+        standard = calc.calculate_optimal_strategy(92, R, top_n=1)
+        assert result['optimal_strategy']['type'] == 'switching'
+        assert result['optimal_strategy']['lifetime_total'] >= standard['optimal_strategy']['lifetime_total']
+
+    def test_child_in_care_lead(self):
+        calc = _divorced(date(1966, 8, 3), has_child_under_16=True, child_birth_date=date(2016, 4, 1))
+        grid = calc.calculate_filing_grid(92, R)
+        assert grid.lead is not None and grid.lead[3] == 'child_in_care'
+
+        death = calc._date_at_age(92)
+        for j in (0, 40, 96):
+            claim = grid.second.dates[j]
+            phases = [lead_phase(grid.lead, claim), (claim, death, grid.second.monthly[j], grid.second.phase_label(j))]
+            assert grid.second_only[j] == pytest.approx(_phased_total(calc, phases), abs=0.02)
+
+        best = calc.calculate_optimal_strategy(92, R, top_n=2, exhaustive=True)['optimal_strategy']
+        assert best['child_in_care_monthly'] == grid.lead[2]
+        assert best['benefit_timeline'].phase[0] == PHASE_CODES['child_in_care']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
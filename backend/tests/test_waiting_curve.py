@@ -0,0 +1,99 @@
+"""
+Tests for BaseSSCalculator.calculate_waiting_curve
+Verifies the incremental value-of-waiting curve against the scalar
+monthly-benefit and lifetime calculations and a brute-force break-even search.
+"""
+
+from datetime import date
+import os
+
+import pytest
+
+from backend.core.evaluation_context import EvaluationContext
+from backend.core.ss_core_calculator import IndividualSSCalculator
+
+AS_OF = date(2026, 1, 15)
+R = 0.025
+
+
+def _calc(birth_date, pia=3000.0):
+    return IndividualSSCalculator(birth_date, pia, context=EvaluationContext.resolve(AS_OF))
+
+
+def _brute_break_even(calc, start, later, longevity_age):
+    """Month-by-month cumulative totals; age when claiming later catches up."""
+    birth_ord = calc.birth_date.year * 12 + calc.birth_date.month - 1
+    end_ord = birth_ord + longevity_age * 12
+
+    def payments(claim_age_months):
+        benefit = calc.calculate_monthly_benefit(claim_age_months // 12, claim_age_months % 12, R)
+        claim_ord = birth_ord + claim_age_months
+        return {m: benefit * (1 + R) ** (m // 12 - claim_ord // 12) for m in range(claim_ord, end_ord + 1)}
+
+    early, late = payments(start), payments(later)
+    early_total = late_total = 0.0
+    for m in range(birth_ord + start, end_ord + 1):
+        early_total += early.get(m, 0.0)
+        late_total += late.get(m, 0.0)
+        if m >= birth_ord + later and late_total >= early_total:
+            return round((m - birth_ord) / 12, 2)
+    return None
+
+
+class TestWaitingCurve:
+    """One incremental pass reproduces the per-month scalar answers"""
+
+    @pytest.mark.parametrize("birth_date", [date(1964, 3, 10), date(1960, 1, 31), date(1964, 2, 29)])
+    def test_matches_scalar_lifetimes(self, birth_date):
+        calc = _calc(birth_date)
+        curve = calc.calculate_waiting_curve(62, 0, 90, R)
+        assert len(curve) == 97
+        for entry in curve[::7] + [curve[-1]]:
+            years, months = entry['claim_age_years'], entry['claim_age_months']
+            lifetime = calc.calculate_lifetime_benefits(years, 90, R, months, summary_only=True)
+            assert entry['monthly_benefit'] == pytest.approx(calc.calculate_monthly_benefit(years, months, R), abs=0.005)
+            assert entry['lifetime_benefits'] == pytest.approx(lifetime['total_lifetime_benefits'], abs=0.011)
+
+    def test_marginal_values_chain(self):
+        curve = _calc(date(1964, 3, 10)).calculate_waiting_curve(64, 3, 90, R)
+        for current, following in zip(curve, curve[1:]):
+            assert current['marginal_lifetime_value'] == pytest.approx(
+                following['lifetime_benefits'] - current['lifetime_benefits'], abs=0.011)
+            assert current['marginal_monthly_increase'] == pytest.approx(
+                following['monthly_benefit'] - current['monthly_benefit'], abs=0.011)
+        assert curve[-1]['marginal_lifetime_value'] == 0.0
+        assert (curve[-1]['claim_age_years'], curve[-1]['claim_age_months']) == (70, 0)
+
+    def test_break_even_ages(self):
+        calc = _calc(date(1964, 3, 10))
+        curve = calc.calculate_waiting_curve(62, 0, 95, R)
+        assert curve[0]['break_even_age'] is None
+        for offset in (1, 10, 12, 48, 96):
+            assert curve[offset]['break_even_age'] == _brute_break_even(calc, 744, 744 + offset, 95)
+        for entry in curve[1:]:
+            if entry['break_even_age'] is not None:
+                assert entry['break_even_age'] > entry['claim_age_years'] + entry['claim_age_months'] / 12
+
+    def test_endpoint_past_70(self, monkeypatch):
+        # The API module needs Supabase settings at import time
+        monkeypatch.setenv('SUPABASE_URL', os.getenv('SUPABASE_URL') or 'http://localhost')
+        monkeypatch.setenv('SUPABASE_KEY', os.getenv('SUPABASE_KEY') or 'test')
+        api = pytest.importorskip('backend.core.integrated_ss_api')
+        request = {'person': {'birth_date': date(1955, 3, 10), 'pia': 3000.0}, 'as_of': AS_OF,
+                   'current_age_years': 70, 'current_age_months': 6}
+        single = api.monthly_optimization(api.MonthlyOptimizationRequest(**request))
+        curve = api.monthly_optimization(api.MonthlyOptimizationRequest(**request, mode='curve'))
+        assert curve.current_monthly_benefit == single.current_monthly_benefit
+        assert curve.next_month_benefit == curve.current_monthly_benefit
+        assert (curve.monthly_increase, curve.lifetime_value_of_waiting, curve.curve) == (0.0, 0.0, [])
+
+    def test_range_edges(self):
+        calc = _calc(date(1964, 3, 10))
+        assert len(calc.calculate_waiting_curve(70, 0, 90, R)) == 1
+        assert calc.calculate_waiting_curve(70, 1, 90, R) == []
+        with pytest.raises(ValueError):
+            calc.calculate_waiting_curve(59, 11, 90, R)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,144 @@
+"""
+Tests for xml_parse_cache.py
+Verifies LRU eviction by entries and bytes, disk persistence (owner-only),
+and that SSAXMLProcessor serves repeat uploads from the cache without parsing
+and without keeping the full SSN.
+"""
+
+import io
+import os
+import stat
+
+import pytest
+
+from backend.core.ssa_xml_processor import SSAXMLProcessor
+from backend.core.xml_parse_cache import XMLParseCache
+from backend.tests.test_ssa_xml_processor import ATTRIBUTE_FORMAT, SSA_FORMAT
+
+
+def _entry(year: int) -> dict:
+    return {'fields': {'Name': 'x'}, 'records': [[year, 1000.0]]}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = XMLParseCache()
+    monkeypatch.setattr(SSAXMLProcessor, 'parse_cache', cache)
+    return cache
+
+
+class TestXMLParseCache:
+    """Bounds, LRU order and persistence"""
+
+    def test_entry_bound_evicts_least_recently_used(self):
+        cache = XMLParseCache(max_entries=2)
+        cache.put('a', _entry(1))
+        cache.put('b', _entry(2))
+        assert cache.get('a') == _entry(1)
+        cache.put('c', _entry(3))
+        assert 'b' not in cache and 'a' in cache and 'c' in cache
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_byte_bound(self):
+        probe = XMLParseCache()
+        probe.put('a', _entry(1))
+        size = probe.nbytes
+        cache = XMLParseCache(max_bytes=2 * size)
+        for key, year in (('a', 1), ('b', 2), ('c', 3)):
+            cache.put(key, _entry(year))
+        assert len(cache) == 2 and cache.nbytes == 2 * size
+        tiny = XMLParseCache(max_bytes=size - 1)
+        tiny.put('a', _entry(1))
+        assert len(tiny) == 0
+
+    def test_copies_are_independent(self):
+        cache = XMLParseCache()
+        cache.put('a', _entry(1))
+        cache.get('a')['records'].append([2, 2.0])
+        assert cache.get('a') == _entry(1)
+
+    def test_disk_persistence(self, tmp_path):
+        keys = [XMLParseCache.key([bytes([i])]) for i in range(3)]
+        first = XMLParseCache(max_entries=2, directory=str(tmp_path))
+        for year, key in enumerate(keys):
+            first.put(key, _entry(year))
+        assert sorted(os.listdir(tmp_path)) == sorted(f'{key}.json' for key in keys[1:])
+
+        second = XMLParseCache(directory=str(tmp_path))
+        assert second.get(keys[2]) == _entry(2)
+        assert second.get(keys[0]) is None
+        second.clear()
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.skipif(os.name == 'nt', reason='POSIX permissions')
+    def test_disk_owner_only(self, tmp_path):
+        directory = tmp_path / 'cache'
+        directory.mkdir(mode=0o755)
+        cache = XMLParseCache(directory=str(directory))
+        key = XMLParseCache.key([b'a'])
+        cache.put(key, _entry(1))
+        assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+        assert stat.S_IMODE(os.stat(directory / f'{key}.json').st_mode) == 0o600
+
+
+class TestProcessorCache:
+    """parse_ssa_xml and merge_with_new_xml consult the cache"""
+
+    def test_repeat_upload_skips_parsing(self, cache, monkeypatch):
+        first = SSAXMLProcessor()
+        first.parse_ssa_xml(SSA_FORMAT.encode('utf-8'))
+        assert len(cache) == 1
+
+        def fail(*args):
+            raise AssertionError('parsed again')
+
+        monkeypatch.setattr(SSAXMLProcessor, '_stream_ssa_xml', staticmethod(fail))
+        repeat = SSAXMLProcessor()
+        result = repeat.parse_ssa_xml(io.BytesIO(SSA_FORMAT.encode('utf-8')))
+        assert repeat.earnings_history == first.earnings_history
+        assert repeat.person_info == first.person_info
+        assert result['years_covered'] == '1989-1991'
+        assert cache.hits == 1
+
+    def test_stream_is_hashed_while_parsed(self, cache):
+        data = ATTRIBUTE_FORMAT.encode('utf-8')
+        SSAXMLProcessor().parse_ssa_xml(iter([data[:20], data[20:]]))
+        assert XMLParseCache.key([data]) in cache
+
+    def test_limits_apply_to_hits(self, cache):
+        SSAXMLProcessor().parse_ssa_xml(SSA_FORMAT)
+        with pytest.raises(ValueError, match='more than 2 earnings records'):
+            SSAXMLProcessor().parse_ssa_xml(SSA_FORMAT, max_records=2)
+        with pytest.raises(ValueError, match='byte limit'):
+            SSAXMLProcessor().parse_ssa_xml(io.BytesIO(SSA_FORMAT.encode('utf-8')), max_bytes=100)
+
+    def test_merge_uses_cache(self, cache):
+        processor = SSAXMLProcessor(birth_year=1964)
+        processor.parse_ssa_xml(ATTRIBUTE_FORMAT)
+        newer = SSA_FORMAT.replace('2025-03-01', '2026-03-01')
+        SSAXMLProcessor().parse_ssa_xml(newer)
+        result = processor.merge_with_new_xml(newer)
+        assert result['is_newer'] and cache.hits == 1
+        assert [e.year for e in processor.earnings_history] == [1989, 1990, 1991, 2000, 2001]
+
+    def test_ssn_masked_before_caching(self, tmp_path, monkeypatch):
+        cache = XMLParseCache(directory=str(tmp_path))
+        monkeypatch.setattr(SSAXMLProcessor, 'parse_cache', cache)
+        data = SSA_FORMAT.replace('<Name>', '<SSN>123-45-6789</SSN><Name>')
+        first, repeat = SSAXMLProcessor(), SSAXMLProcessor()
+        first.parse_ssa_xml(data)
+        repeat.parse_ssa_xml(data)
+        assert first.person_info['ssn'] == repeat.person_info['ssn'] == 'XXX-XX-6789'
+        assert cache.hits == 1
+        stored = ''.join((tmp_path / name).read_text() for name in os.listdir(tmp_path))
+        assert '6789' in stored and '123-45' not in stored
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(SSAXMLProcessor, 'parse_cache', None)
+        processor = SSAXMLProcessor()
+        processor.parse_ssa_xml(io.BytesIO(SSA_FORMAT.encode('utf-8')))
+        assert len(processor.earnings_history) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -141,6 +141,7 @@ def generate_earnings_profile(
 
         # Calculate PIA with these earnings
         processor.earnings_history = earnings_records
+        processor.indexed_earnings = []  # re-index the new history
         result = processor.calculate_aime_and_pia(pia_year=pia_year)
         actual_pia = result['pia']
 